@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Throughput and pixel-equivalence benchmark for image_generator.py.
+
+Renders a fixed set of cards (all three types, with and without characters,
+several poses, positions and heights) and reports images/sec for:
+  - one process per card, as the CLI is used today (old and new script)
+  - --batch in one process, and with one worker per CPU
+
+With --compare (the previous image_generator.py), also checks that:
+  - add_sticker_outline gives identical pixels for every pose and width 1-8
+  - every card renders pixel-identical (noise disabled in both: it is random)
+  - the new grain has the same distribution as the old one
+
+If the Poppins fonts are not installed, both scripts are pointed at DejaVu Sans.
+
+Usage:
+    git show HEAD~1:agents/.skills/x-images/scripts/image_generator.py > /tmp/old_image_generator.py
+    python3 bench_images.py --compare /tmp/old_image_generator.py [--cards 24]
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image, ImageFont
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCRIPT = os.path.join(HERE, "image_generator.py")
+FALLBACK_FONTS = {"Bold": "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"}
+FALLBACK_FONT = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+
+# Run a script as __main__ with the same font substitution as this process
+LAUNCHER = """
+import runpy, sys
+sys.path.insert(0, {here!r})
+import bench_images
+bench_images.substitute_fonts()
+sys.argv = sys.argv[1:]
+runpy.run_path(sys.argv[0], run_name="__main__")
+"""
+
+
+def substitute_fonts():
+    """Map missing Poppins files to DejaVu Sans (this machine may not have Poppins)."""
+    truetype = ImageFont.truetype
+
+    def load(font=None, size=10, *args, **kwargs):
+        if isinstance(font, str) and "Poppins" in font and not os.path.exists(font):
+            bold = next((f for key, f in FALLBACK_FONTS.items() if key in font), None)
+            font = bold or FALLBACK_FONT
+        return truetype(font, size, *args, **kwargs)
+
+    ImageFont.truetype = load
+
+
+def load_module(path, name):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def card_specs(count):
+    """A deterministic mix of cards like a day of posts."""
+    headlines = ["$72,400", "-12.4%", "2.1M ETH", "43%", "$1.2B TVL", "0.0021 BTC"]
+    subtexts = ["btc bounced here like it forgot something at home", "eth chose violence",
+                "", "funds are safu until they arent"]
+    quotes = ["funny how everyone wants decentralization until they lose their password",
+              "the market can stay irrational longer than you can stay solvent\nbut not longer than I can stay online"]
+    characters = [None, "pump", "dump", "weeter_sad", "blubby_excited", "pair_money_rich", "news", "pair_popcorn"]
+    positions = ["bottom-right", "bottom-left", "right-center", "left-center"]
+    specs = []
+    for i in range(count):
+        kind = ("stat_card", "quote_card", "news_header")[i % 3]
+        spec = {"type": kind, "output": f"card_{i:03d}.png"}
+        if kind == "stat_card":
+            spec.update(headline=headlines[i % len(headlines)], subtext=subtexts[i % len(subtexts)])
+        elif kind == "quote_card":
+            spec.update(text=quotes[i % len(quotes)])
+        else:
+            spec.update(date=f"feb {i % 28 + 1}, 2026")
+        character = characters[i % len(characters)]
+        if character:
+            spec.update(character=character, char_position=positions[i % len(positions)],
+                        char_height=(None, 150, 250)[i % 3])
+        specs.append(spec)
+    return specs
+
+
+def cli_args(spec, out_dir):
+    args = ["--type", spec["type"], "--output", os.path.join(out_dir, spec["output"])]
+    for key, flag in (("headline", "--headline"), ("subtext", "--subtext"), ("text", "--text"),
+                      ("date", "--date"), ("character", "--character"),
+                      ("char_position", "--char-position"), ("char_height", "--char-height")):
+        if spec.get(key):
+            args += [f"{flag}={spec[key]}"]
+    return args
+
+
+def run_script(script, args, cwd):
+    subprocess.run([sys.executable, "-c", LAUNCHER.format(here=HERE), script, *args],
+                   cwd=cwd, check=True, stdout=subprocess.DEVNULL)
+
+
+def per_process(script, specs, tmp):
+    start = time.perf_counter()
+    for spec in specs:
+        run_script(script, cli_args(spec, tmp), tmp)
+    return len(specs) / (time.perf_counter() - start)
+
+
+def batch(script, specs, tmp, jobs):
+    path = os.path.join(tmp, "cards.jsonl")
+    with open(path, "w") as f:
+        for spec in specs:
+            f.write(json.dumps({**spec, "output": os.path.join(tmp, spec["output"])}) + "\n")
+    start = time.perf_counter()
+    run_script(script, ["--batch", path, "--jobs", str(jobs)], tmp)
+    elapsed = time.perf_counter() - start
+    for spec in specs:
+        Image.open(os.path.join(tmp, spec["output"])).verify()
+    return len(specs) / elapsed
+
+
+def old_cli_render(old, spec, tmp):
+    """What the old CLI did: render to a file, reopen it, add the character, save again."""
+    path = os.path.join(tmp, "old.png")
+    if spec["type"] == "stat_card":
+        old.create_stat_card(spec.get("headline", ""), spec.get("subtext", ""), spec.get("accent"), path)
+    elif spec["type"] == "quote_card":
+        old.create_quote_card(spec.get("text", ""), path)
+    else:
+        old.create_news_header(spec.get("date", ""), path)
+    img = Image.open(path).convert("RGBA")
+    if spec.get("character"):
+        img = old.add_character(img, spec["character"], spec.get("char_position", "bottom-right"),
+                                spec.get("char_height"))
+    return img
+
+
+def check_equivalence(old, new, specs, tmp):
+    # Sticker outlines: the distance-transform dilation against the MaxFilter passes
+    outlines = 0
+    for pose in sorted(new.CHARACTER_POSES):
+        sprite = new.load_character(pose, 202)
+        if sprite is None:
+            continue
+        for width in range(1, 9):
+            a = np.asarray(old.add_sticker_outline(sprite, width))
+            b = np.asarray(new.add_sticker_outline(sprite, width))
+            assert a.shape == b.shape and np.array_equal(a, b), f"outline differs: {pose} width {width}"
+            outlines += 1
+    print(f"✅ add_sticker_outline identical for {outlines} pose/width combinations")
+
+    # Whole cards, with the (random) grain switched off in both
+    saved = old.add_noise, new.add_noise
+    old.add_noise = new.add_noise = lambda img, intensity=6: img
+    try:
+        for spec in specs:
+            a = np.asarray(old_cli_render(old, spec, tmp))
+            b = np.asarray(new.render(spec))
+            assert np.array_equal(a, b), f"card differs: {spec}"
+    finally:
+        old.add_noise, new.add_noise = saved
+    print(f"✅ {len(specs)} cards pixel-identical to the old CLI output (grain disabled)")
+
+    # Grain: same distribution of per-pixel offsets
+    gray = Image.new("RGB", (1200, 675), (128, 128, 128))
+    offsets = [np.asarray(m.add_noise(gray, 4), dtype=np.int16).ravel() - 128 for m in (old, new)]
+    hist = [np.bincount(o + 64, minlength=129) / o.size for o in offsets]
+    drift = float(np.abs(hist[0] - hist[1]).max())
+    assert drift < 0.002, drift
+    print(f"✅ grain distribution matches (std {offsets[0].std():.3f} vs {offsets[1].std():.3f}, "
+          f"max bin difference {drift:.4%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark image_generator.py")
+    parser.add_argument("--cards", type=int, default=24)
+    parser.add_argument("--compare", help="previous image_generator.py to compare against")
+    args = parser.parse_args()
+
+    substitute_fonts()
+    specs = card_specs(args.cards)
+    cpus = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        new = load_module(SCRIPT, "image_generator")
+        if args.compare:
+            # The script finds its assets relative to itself: give the old copy the same layout
+            os.makedirs(os.path.join(tmp, "old", "scripts"))
+            os.symlink(os.path.join(os.path.dirname(HERE), "assets"), os.path.join(tmp, "old", "assets"))
+            args.compare = shutil.copy(args.compare, os.path.join(tmp, "old", "scripts", "image_generator.py"))
+            old = load_module(args.compare, "old_image_generator")
+            check_equivalence(old, new, specs, tmp)
+
+        sample = specs[:6]
+        rows = []
+        if args.compare:
+            rows.append(("old: one process per card", per_process(args.compare, sample, tmp)))
+        rows.append(("new: one process per card", per_process(SCRIPT, sample, tmp)))
+        rows.append(("new: --batch --jobs 1", batch(SCRIPT, specs, tmp, 1)))
+        if cpus > 1:
+            rows.append((f"new: --batch --jobs {cpus}", batch(SCRIPT, specs, tmp, cpus)))
+        print(f"\n{args.cards} cards ({len(sample)} for the per-process runs), {cpus} CPU(s)")
+        for label, rate in rows:
+            print(f"  {label:<30} {rate:6.2f} images/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,13 +7,22 @@ Usage:
     python3 image_generator.py --type stat_card --headline "$72,400" --subtext "btc bounced here" --output card.png
     python3 image_generator.py --type quote_card --text "funny how everyone wants decentralization..." --output quote.png
     python3 image_generator.py --type news_header --date "feb 7, 2026" --output header.png
+    python3 image_generator.py --batch cards.jsonl [--jobs 4]
+
+Batch mode renders one card per JSONL line in a single process (or a pool of
+--jobs worker processes), so fonts and prepared character sprites are loaded
+once per worker instead of once per image. Each line uses the CLI option
+names: {"type": "stat_card", "headline": "$72,400", "subtext": "...",
+"character": "pump", "char_position": "bottom-right", "output": "card.png"}.
 """
 
 import argparse
+import json
 import os
 import sys
 import textwrap
 import random
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
 
 # ─── Brand Colors ───
@@ -159,21 +168,42 @@ HEIGHT = 675
 PADDING = 60
 CORNER_RADIUS = 20
 
+# Prepared (resized, outlined, faded) character sprites kept per process
+SPRITE_CACHE_SIZE = 64
+
+@lru_cache(maxsize=None)
 def get_font(style="medium", size=32):
-    """Load a Poppins font at the given size."""
+    """Load a Poppins font at the given size (cached: each style and size is loaded once)."""
     try:
         return ImageFont.truetype(FONTS.get(style, FONTS["medium"]), size)
     except (OSError, IOError):
         # Fallback
         return ImageFont.truetype(FONTS["regular"], size)
 
+_noise_rng = None
+
+@lru_cache(maxsize=8)
+def _noise_table(intensity):
+    """
+    Gaussian noise (sigma = intensity, truncated to whole levels) indexed by a
+    uniform 16-bit draw: looking up random uint16s gives the same distribution
+    as drawing normals, several times faster.
+    """
+    import numpy as np
+    from statistics import NormalDist
+    dist = NormalDist(0, intensity)
+    return np.array([int(dist.inv_cdf((u + 0.5) / 65536)) for u in range(65536)], dtype=np.int16)
+
 def add_noise(img, intensity=6):
     """Add subtle grain/noise to the image for a more textured feel."""
     import numpy as np
-    arr = np.array(img).astype(np.int16)
-    noise = np.random.normal(0, intensity, arr.shape).astype(np.int16)
-    arr = np.clip(arr + noise, 0, 255).astype(np.uint8)
-    return Image.fromarray(arr)
+    global _noise_rng
+    if _noise_rng is None:
+        _noise_rng = np.random.default_rng()
+    arr = np.asarray(img, dtype=np.int16)
+    arr += _noise_table(intensity)[_noise_rng.integers(0, 65536, arr.shape, dtype=np.uint16)]
+    np.clip(arr, 0, 255, out=arr)
+    return Image.fromarray(arr.astype(np.uint8))
 
 def round_corners(img, radius=CORNER_RADIUS):
     """Apply rounded corners to the image."""
@@ -230,15 +260,16 @@ def wrap_text(text, font, draw, max_width):
 
     return lines
 
-def create_stat_card(headline, subtext="", accent_color=None, output_path="stat_card.png"):
+def render_stat_card(headline, subtext="", accent_color=None):
     """
-    Create a stat card with a bold number/headline and optional subtext.
+    Render a stat card with a bold number/headline and optional subtext.
 
     Args:
         headline: The main stat (e.g., "$72,400", "43%", "2.1M ETH")
         subtext: Supporting text (e.g., "btc bounced here like it forgot something at home")
         accent_color: Override accent color (hex). Defaults to brand accent.
-        output_path: Where to save the image.
+    Returns:
+        RGBA Image
     """
     img = Image.new('RGBA', (WIDTH, HEIGHT), hex_to_rgba(COLORS["bg"]))
     draw = ImageDraw.Draw(img)
@@ -282,18 +313,21 @@ def create_stat_card(headline, subtext="", accent_color=None, output_path="stat_
     except ImportError:
         pass  # numpy not available, skip noise
     img = img.convert('RGBA')
-    img = round_corners(img)
+    return round_corners(img)
 
-    img.save(output_path, "PNG")
+def create_stat_card(headline, subtext="", accent_color=None, output_path="stat_card.png"):
+    """Create a stat card (see render_stat_card) and save it to output_path."""
+    render_stat_card(headline, subtext, accent_color).save(output_path, "PNG")
     return output_path
 
-def create_quote_card(text, output_path="quote_card.png"):
+def render_quote_card(text):
     """
-    Create a quote card with text on branded background.
+    Render a quote card with text on branded background.
 
     Args:
         text: The quote text (keep it short — 4 lines max)
-        output_path: Where to save the image.
+    Returns:
+        RGBA Image
     """
     img = Image.new('RGBA', (WIDTH, HEIGHT), hex_to_rgba(COLORS["bg"]))
     draw = ImageDraw.Draw(img)
@@ -331,18 +365,21 @@ def create_quote_card(text, output_path="quote_card.png"):
     except ImportError:
         pass
     img = img.convert('RGBA')
-    img = round_corners(img)
+    return round_corners(img)
 
-    img.save(output_path, "PNG")
+def create_quote_card(text, output_path="quote_card.png"):
+    """Create a quote card (see render_quote_card) and save it to output_path."""
+    render_quote_card(text).save(output_path, "PNG")
     return output_path
 
-def create_news_header(date_str="", output_path="news_header.png"):
+def render_news_header(date_str=""):
     """
-    Create the daily news header graphic.
+    Render the daily news header graphic.
 
     Args:
         date_str: The date string (e.g., "feb 7, 2026")
-        output_path: Where to save the image.
+    Returns:
+        RGBA Image
     """
     # News header is shorter — 675 tall is too much for just a header
     header_height = 400
@@ -395,9 +432,11 @@ def create_news_header(date_str="", output_path="news_header.png"):
     except ImportError:
         pass
     img = img.convert('RGBA')
-    img = round_corners(img, radius=CORNER_RADIUS)
+    return round_corners(img, radius=CORNER_RADIUS)
 
-    img.save(output_path, "PNG")
+def create_news_header(date_str="", output_path="news_header.png"):
+    """Create the daily news header (see render_news_header) and save it to output_path."""
+    render_news_header(date_str).save(output_path, "PNG")
     return output_path
 
 def add_sticker_outline(char_img, outline_width=5, outline_color=(255, 255, 255, 255)):
@@ -429,18 +468,15 @@ def add_sticker_outline(char_img, outline_width=5, outline_color=(255, 255, 255,
     big_alpha = np.zeros((new_h, new_w), dtype=np.uint8)
     big_alpha[ow:ow+orig_h, ow:ow+orig_w] = alpha
 
-    # Dilate the alpha to create outline silhouette
-    # Use multiple passes of max filter for smooth, even dilation
-    from PIL import ImageFilter
-    dilated = Image.fromarray(big_alpha)
-    for _ in range(ow):
-        dilated = dilated.filter(ImageFilter.MaxFilter(3))
-    dilated_arr = np.array(dilated)
+    # Dilate the alpha to create outline silhouette: every pixel within ow
+    # pixels (chessboard distance, the same square reach as ow passes of a
+    # 3x3 max filter) of a visible pixel, from one distance transform
+    import cv2
+    distance = cv2.distanceTransform((big_alpha == 0).astype(np.uint8), cv2.DIST_C, 3)
+    mask = distance <= ow
 
     # Build the outline layer: dilated silhouette filled with outline color
-    outline_layer = Image.new('RGBA', (new_w, new_h), (0, 0, 0, 0))
-    outline_arr = np.array(outline_layer)
-    mask = dilated_arr > 0
+    outline_arr = np.zeros((new_h, new_w, 4), dtype=np.uint8)
     outline_arr[mask] = outline_color
     outline_layer = Image.fromarray(outline_arr)
 
@@ -453,6 +489,24 @@ def add_sticker_outline(char_img, outline_width=5, outline_color=(255, 255, 255,
     return result
 
 
+def resolve_pose(name):
+    """Pose name for a pose, "weeter"/"blubby" shorthand or mood keyword (first matching pose)."""
+    if name in MOOD_MAP:
+        return MOOD_MAP[name][0]
+    if name in ("weeter", "blubby"):
+        return f"{name}_neutral"
+    return name
+
+@lru_cache(maxsize=SPRITE_CACHE_SIZE)
+def _resized_pose(pose, target_height):
+    path = CHARACTER_POSES.get(pose)
+    if not path or not os.path.exists(path):
+        return None
+    char_img = Image.open(path).convert('RGBA')
+    ratio = target_height / char_img.height
+    new_width = int(char_img.width * ratio)
+    return char_img.resize((new_width, target_height), Image.LANCZOS)
+
 def load_character(name, target_height=200):
     """
     Load a character asset and resize to target height while preserving aspect ratio.
@@ -465,20 +519,31 @@ def load_character(name, target_height=200):
     Returns:
         RGBA Image or None if asset not found
     """
-    # Handle mood keywords — pick first matching pose
-    if name in MOOD_MAP:
-        name = MOOD_MAP[name][0]
-    # Handle shorthand (just "weeter" or "blubby" → neutral pose)
-    elif name in ("weeter", "blubby"):
-        name = f"{name}_neutral"
+    char_img = _resized_pose(resolve_pose(name), target_height)
+    return char_img.copy() if char_img is not None else None
 
-    path = CHARACTER_POSES.get(name)
-    if not path or not os.path.exists(path):
+@lru_cache(maxsize=SPRITE_CACHE_SIZE)
+def prepared_sprite(pose, target_height, outline_width, outline_color, opacity):
+    """
+    A character ready to paste: resized, outlined (outline_width None = no outline)
+    and faded to opacity. Cached and shared, so callers must not modify it.
+    """
+    char_img = _resized_pose(pose, target_height)
+    if char_img is None:
         return None
-    char_img = Image.open(path).convert('RGBA')
-    ratio = target_height / char_img.height
-    new_width = int(char_img.width * ratio)
-    char_img = char_img.resize((new_width, target_height), Image.LANCZOS)
+
+    # Add sticker outline for clean edge definition on any background
+    if outline_width is not None:
+        char_img = add_sticker_outline(char_img, outline_width, outline_color)
+
+    # Apply opacity
+    if opacity < 255:
+        r, g, b, a = char_img.split()
+        import numpy as np
+        a_arr = np.array(a).astype(np.float32)
+        a_arr = (a_arr * opacity / 255).astype(np.uint8)
+        a = Image.fromarray(a_arr)
+        char_img = Image.merge('RGBA', (r, g, b, a))
     return char_img
 
 def add_character(base_img, character="weeter", position="bottom-right", target_height=None,
@@ -501,23 +566,11 @@ def add_character(base_img, character="weeter", position="bottom-right", target_
     if target_height is None:
         target_height = int(base_img.height * 0.30)
 
-    char_img = load_character(character, target_height)
+    char_img = prepared_sprite(resolve_pose(character), target_height,
+                               outline_width if sticker_outline else None, tuple(outline_color), opacity)
     if char_img is None:
         return base_img
 
-    # Add sticker outline for clean edge definition on any background
-    if sticker_outline:
-        char_img = add_sticker_outline(char_img, outline_width, outline_color)
-
-    # Apply opacity
-    if opacity < 255:
-        r, g, b, a = char_img.split()
-        import numpy as np
-        a_arr = np.array(a).astype(np.float32)
-        a_arr = (a_arr * opacity / 255).astype(np.uint8)
-        a = Image.fromarray(a_arr)
-        char_img = Image.merge('RGBA', (r, g, b, a))
-
     # Margins — generous enough that the sticker outline never gets clipped
     margin = 40  # uniform margin on all edges
     bottom_margin = 60  # extra bottom clearance for watermark
@@ -588,10 +641,94 @@ def create_chart_base():
     }
 
 
+# ─── Rendering from a spec (CLI and batch mode) ───
+CARD_TYPES = ["stat_card", "quote_card", "news_header"]
+CHAR_POSITIONS = ["bottom-right", "bottom-left", "right-center", "left-center"]
+
+def render(spec):
+    """
+    Render one card from a spec dict with the CLI option names (type, headline,
+    subtext, text, date, accent, character, char_position, char_height).
+    """
+    card_type = spec.get("type")
+    if card_type == "stat_card":
+        img = render_stat_card(spec.get("headline", ""), spec.get("subtext", ""), spec.get("accent"))
+    elif card_type == "quote_card":
+        img = render_quote_card(spec.get("text", ""))
+    elif card_type == "news_header":
+        img = render_news_header(spec.get("date", ""))
+    else:
+        raise ValueError(f"unknown type {card_type!r} (expected one of {', '.join(CARD_TYPES)})")
+
+    # Add character overlay if requested
+    if spec.get("character"):
+        position = spec.get("char_position") or "bottom-right"
+        if position not in CHAR_POSITIONS:
+            raise ValueError(f"unknown char_position {position!r}")
+        img = add_character(img, spec["character"], position, spec.get("char_height"))
+    return img
+
+def generate(spec):
+    """Render a spec and save it to spec["output"]; returns the output path."""
+    if not spec.get("output"):
+        raise ValueError("missing output path")
+    render(spec).save(spec["output"], "PNG")
+    return spec["output"]
+
+def _batch_worker_init():
+    # Forked workers inherit the parent's noise generator state; give each its own
+    global _noise_rng
+    _noise_rng = None
+
+def _batch_job(job):
+    n, spec = job
+    try:
+        if isinstance(spec, str):
+            raise ValueError(spec)
+        if not isinstance(spec, dict):
+            raise ValueError("each line must be a JSON object")
+        return n, generate(spec), None
+    except Exception as e:
+        return n, None, str(e)
+
+def run_batch(path, jobs=None):
+    """Render every card spec in a JSONL file; returns the exit code (1 if any card failed)."""
+    specs = []
+    f = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        for n, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                specs.append((n, json.loads(line)))
+            except json.JSONDecodeError as e:
+                specs.append((n, f"invalid JSON: {e}"))
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(specs) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(jobs, len(specs)), initializer=_batch_worker_init) as pool:
+            results = list(pool.map(_batch_job, specs))
+    else:
+        results = [_batch_job(job) for job in specs]
+
+    failed = 0
+    for n, output, error in results:
+        if error:
+            failed += 1
+            print(f"Error (line {n}): {error}", file=sys.stderr)
+        else:
+            print(f"Generated: {output}")
+    print(f"{len(results) - failed} image(s) generated, {failed} error(s)", file=sys.stderr)
+    return 1 if failed else 0
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Generate @4_Bchainbasics branded images")
-    parser.add_argument("--type", required=True, choices=["stat_card", "quote_card", "news_header"],
-                        help="Type of image to generate")
+    parser.add_argument("--type", choices=CARD_TYPES, help="Type of image to generate")
     parser.add_argument("--headline", default="", help="Main headline/stat (for stat_card)")
     parser.add_argument("--subtext", default="", help="Supporting text (for stat_card)")
     parser.add_argument("--text", default="", help="Quote text (for quote_card)")
@@ -599,25 +736,21 @@ if __name__ == "__main__":
     parser.add_argument("--accent", default=None, help="Override accent color (hex)")
     parser.add_argument("--character", default=None,
                         help="Character pose (e.g. weeter_sad, blubby_excited) or mood (pump, dump, shock, funny)")
-    parser.add_argument("--char-position", default="bottom-right",
-                        choices=["bottom-right", "bottom-left", "right-center", "left-center"],
+    parser.add_argument("--char-position", default="bottom-right", choices=CHAR_POSITIONS,
                         help="Character position")
     parser.add_argument("--char-height", type=int, default=None, help="Character height in pixels")
-    parser.add_argument("--output", required=True, help="Output file path")
+    parser.add_argument("--output", help="Output file path")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="Render every card spec in a JSONL file ('-' for stdin) in one process")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Worker processes for --batch (default: one per CPU)")
 
     args = parser.parse_args()
 
-    if args.type == "stat_card":
-        create_stat_card(args.headline, args.subtext, args.accent, args.output)
-    elif args.type == "quote_card":
-        create_quote_card(args.text, args.output)
-    elif args.type == "news_header":
-        create_news_header(args.date, args.output)
-
-    # Add character overlay if requested
-    if args.character:
-        base = Image.open(args.output).convert('RGBA')
-        result = add_character(base, args.character, args.char_position, args.char_height)
-        result.save(args.output, "PNG")
+    if args.batch:
+        sys.exit(run_batch(args.batch, args.jobs))
+    if not args.type or not args.output:
+        parser.error("--type and --output are required (or use --batch)")
 
+    generate(vars(args))
     print(f"Generated: {args.output}")
@@ -1,10 +1,11 @@
 import streamlit as st
 import pandas as pd
-from catalog_manager import CatalogManager
+import app_data
 import os
 from pathlib import Path
-# Initialize Manager
-manager = CatalogManager()
+# Initialize Manager (cached per catalog version - see app_data.py)
+version = app_data.catalog_version()
+manager = app_data.get_manager(version)
 # Page Config
 st.set_page_config(page_title="Ridgemont Studio", page_icon="🎵", layout="wide")
 # Logo and Title
@@ -30,8 +31,9 @@ if page == "Dashboard":
     st.header("Catalog Overview")
 
     # metrics
-    summary = manager.get_catalog_summary()
-    revenue = manager.get_revenue_summary()
+    stats = app_data.catalog_stats(version)
+    summary = stats['summary']
+    revenue = stats['revenue']
 
     # Top row metrics
     col1, col2, col3 = st.columns(3)
@@ -49,36 +51,19 @@ if page == "Dashboard":
 
     st.markdown("---")
     st.subheader("Recent Songs")
-    songs = manager.catalog['songs'][-10:]  # Show last 10
-    if songs:
-        # Flatten data for display with deployment info
-        table_data = []
-        for s in songs:
-            deps = s.get('deployments', {})
-            reg = s.get('registration', {})
-            dist = ", ".join(deps.get('distribution', [])) or "-"
-            sync = ", ".join(deps.get('sync_libraries', [])) or "-"
-            isrc = reg.get('isrc', '-') or '-'
-            table_data.append({
-                "Song ID": s.get('legacy_code', '-'),
-                "Title": s['title'],
-                "Artist": s.get('artist', '-'),
-                "Publisher": s.get('act_id', '-').replace('_', ' ').title(),
-                "Status": s['status'],
-                "ISRC": isrc,
-                "Distributor": dist
-            })
-        st.dataframe(pd.DataFrame(table_data), use_container_width=True)
+    recent = app_data.recent_songs_frame(version)  # Show last 10
+    if not recent.empty:
+        st.dataframe(recent, use_container_width=True)
 
 elif page == "All Songs":
     st.header("📀 Complete Catalog")
 
-    songs = manager.catalog['songs']
+    songs = app_data.song_frame(version)
 
     # Artist options - the three main bands
     artist_options = ["All", "Frozen Cloud", "Park Bellevue", "Bajan Sun"]
     # Also add any other artists found in catalog (like Honest Mile)
-    other_artists = sorted(set(s.get('artist', '') for s in songs if s.get('artist') and s.get('artist') not in artist_options))
+    other_artists = [a for a in app_data.song_choices(version)['artists'] if a not in artist_options]
     artist_options.extend(other_artists)
 
     # Use a counter to force new widget keys when clearing
@@ -104,12 +89,13 @@ elif page == "All Songs":
     # Apply filters
     filtered = songs
     if artist_filter != "All":
-        filtered = [s for s in filtered if s.get('artist') == artist_filter]
+        filtered = filtered[filtered['artist'] == artist_filter]
     if status_filter != "All":
-        filtered = [s for s in filtered if s.get('status') == status_filter]
+        filtered = filtered[filtered['status'] == status_filter]
     if search:
         search_lower = search.lower()
-        filtered = [s for s in filtered if search_lower in s.get('title', '').lower() or search_lower in s.get('legacy_code', '').lower()]
+        filtered = filtered[filtered['title_lc'].str.contains(search_lower, regex=False) |
+                            filtered['code_lc'].str.contains(search_lower, regex=False)]
 
     # Display count
     st.write(f"**Showing {len(filtered)} of {len(songs)} songs**")
@@ -125,15 +111,12 @@ elif page == "All Songs":
         display_cols = ['song_id', 'legacy_code', 'title', 'artist', 'status']
         col_names = ['Song ID', 'Code', 'Title', 'Artist', 'Status']
 
-    def render_song_table(song_list, empty_msg):
-        if song_list:
-            df = pd.DataFrame(song_list)
-            available_cols = [c for c in display_cols if c in df.columns]
-            display_df = df[available_cols]
-            col_labels = [col_names[display_cols.index(c)] for c in available_cols]
-            display_df.columns = col_labels
+    def render_song_table(song_df, empty_msg):
+        if not song_df.empty:
+            display_df = song_df[display_cols].reset_index(drop=True)
+            display_df.columns = col_names
             st.dataframe(display_df, use_container_width=True, height=400)
-            st.caption(f"{len(song_list)} songs")
+            st.caption(f"{len(song_df)} songs")
         else:
             st.info(empty_msg)
 
@@ -141,15 +124,15 @@ elif page == "All Songs":
         render_song_table(filtered, "No songs match filters")
 
     with tab_fc:
-        fc_songs = [s for s in filtered if s.get('act_id') == 'FROZEN_CLOUD']
+        fc_songs = filtered[filtered['act_id'] == 'FROZEN_CLOUD']
         render_song_table(fc_songs, "No Frozen Cloud Music songs match filters")
 
     with tab_pb:
-        pb_songs = [s for s in filtered if s.get('act_id') == 'PARK_BELLEVUE']
+        pb_songs = filtered[filtered['act_id'] == 'PARK_BELLEVUE']
         render_song_table(pb_songs, "No Park Bellevue Collective songs match filters")
 
     with tab_bs:
-        bs_songs = [s for s in filtered if s.get('act_id') == 'BAJAN_SUN']
+        bs_songs = filtered[filtered['act_id'] == 'BAJAN_SUN']
         render_song_table(bs_songs, "No Bajan Sun Publishing songs match filters")
 
 elif page == "Albums":
@@ -181,17 +164,7 @@ elif page == "Albums":
                 if tracks:
                     st.markdown("---")
                     st.markdown("**Track Listing:**")
-                    track_data = []
-                    for t in tracks:
-                        # Look up song details
-                        song = next((s for s in manager.catalog['songs'] if s['song_id'] == t['song_id']), None)
-                        status = song.get('status', '-') if song else '-'
-                        track_data.append({
-                            "#": t['track_number'],
-                            "Title": t['title'],
-                            "Song ID": t['song_id'],
-                            "Status": status.title()
-                        })
+                    track_data = app_data.album_tracks(manager, album)
                     st.dataframe(pd.DataFrame(track_data), use_container_width=True, hide_index=True)
                 else:
                     st.caption("No tracks added yet.")
@@ -201,7 +174,7 @@ elif page == "Albums":
     st.subheader("➕ Add New Album")
 
     # Get unique artists
-    existing_artists = sorted(set(s.get('artist', '') for s in manager.catalog['songs'] if s.get('artist')))
+    existing_artists = app_data.song_choices(version)['artists']
 
     with st.form("new_album_form"):
         album_title = st.text_input("Album Title")
@@ -262,10 +235,10 @@ elif page == "Add Song":
     }
 
     # Get unique artists from catalog for suggestions
-    existing_artists = sorted(set(s.get('artist', '') for s in manager.catalog['songs'] if s.get('artist')))
+    existing_artists = app_data.song_choices(version)['artists']
 
     # Get existing song titles for cover selection (unique, sorted)
-    existing_songs = sorted(set(s['title'] for s in manager.catalog['songs']))
+    existing_songs = app_data.song_choices(version)['unique_titles']
 
     with st.form("new_song_form"):
         title = st.text_input("Song Title")
@@ -333,19 +306,11 @@ elif page == "Edit Song":
     else:
         # 1. Smart Selector with disambiguation for duplicates/covers
         # Build display labels: "Title | Artist (Act)" to distinguish covers
-        song_options = {}
-        for s in manager.catalog['songs']:
-            act_name = s.get('act_id', 'Unknown').replace('_', ' ').title()
-            artist = s.get('artist', act_name)
-            # Create unique display label
-            display_label = f"{s['title']} | {artist}"
-            # Handle duplicates by adding song_id suffix if needed
-            if display_label in song_options:
-                display_label = f"{s['title']} | {artist} ({s['song_id']})"
-            song_options[display_label] = s['song_id']
-
-        # Sort options alphabetically by title
-        sorted_options = sorted(song_options.keys())
+        choices = app_data.song_choices(version)
+        song_options = choices['edit_options']
+
+        # Sorted alphabetically by title
+        sorted_options = choices['edit_labels']
 
         # Initialize session state for last selection
         if 'last_selected_song_id' not in st.session_state:
@@ -376,7 +341,7 @@ elif page == "Edit Song":
         selected_song = None
         if selected_label:
             song_id = song_options[selected_label]
-            selected_song = next((s for s in manager.catalog['songs'] if s['song_id'] == song_id), None)
+            selected_song = manager.find_song_by_id(song_id)
 
         if selected_song:
             song_id = selected_song['song_id']
@@ -431,11 +396,7 @@ elif page == "Edit Song":
                     if success:
                         st.success(f"✅ Saved changes to {selected_song['title']}!")
 
-                        # 2. WAIT for file system (The Magic Fix)
-                        import time
-                        time.sleep(0.5)
-
-                        # 3. Reload Page
+                        # 2. Reload Page (the journal append bumps the catalog version)
                         st.rerun()
                     else:
                         st.error("❌ Error saving to file. Check terminal for details.")
@@ -445,14 +406,7 @@ elif page == "View Deployments":
     st.header("🚀 Deployment Overview")
     st.caption("See where your songs are distributed and streaming")
 
-    songs = manager.catalog['songs']
-
-    # Publisher mapping (legal entities)
-    PUBLISHER_MAP = {
-        "FROZEN_CLOUD": "Frozen Cloud Music",
-        "PARK_BELLEVUE": "Park Bellevue Collective",
-        "BAJAN_SUN": "Bajan Sun Publishing"
-    }
+    songs = app_data.song_frame(version)
 
     # All platform options
     ALL_DISTRIBUTORS = ["DistroKid", "TuneCore", "CD Baby", "Amuse", "AWAL", "Ditto"]
@@ -461,7 +415,7 @@ elif page == "View Deployments":
     ALL_PLATFORMS = ALL_DISTRIBUTORS + ALL_SYNC_LIBS + ALL_STREAMING
 
     # Get unique publishers from catalog
-    ALL_PUBLISHERS = sorted(set(PUBLISHER_MAP.get(s.get('act_id', ''), 'Unknown') for s in songs))
+    ALL_PUBLISHERS = app_data.song_choices(version)['publishers']
 
     # Filters Row 1: Publisher
     selected_publishers = st.multiselect(
@@ -483,79 +437,38 @@ elif page == "View Deployments":
 
     # Apply publisher filter first
     if selected_publishers:
-        filtered_songs = [s for s in songs if PUBLISHER_MAP.get(s.get('act_id', ''), 'Unknown') in selected_publishers]
+        filtered_songs = songs[songs['publisher'].isin(selected_publishers)]
     else:
         filtered_songs = songs
 
     # Apply platform filters
     if selected_platforms:
-        platform_filtered = []
-        for s in filtered_songs:
-            deps = s.get('deployments', {})
-            song_platforms = (
-                deps.get('distribution', []) +
-                deps.get('sync_libraries', []) +
-                deps.get('streaming', [])
-            )
-
-            if match_mode == "Any (OR)":
-                # Song has at least ONE of the selected platforms
-                if any(p in song_platforms for p in selected_platforms):
-                    platform_filtered.append(s)
-            else:
-                # Song has ALL of the selected platforms
-                if all(p in song_platforms for p in selected_platforms):
-                    platform_filtered.append(s)
-        filtered_songs = platform_filtered
+        hits = [filtered_songs['platforms'].str.contains(f"|{p}|", regex=False) for p in selected_platforms]
+        if match_mode == "Any (OR)":
+            # Song has at least ONE of the selected platforms
+            keep = pd.concat(hits, axis=1).any(axis=1)
+        else:
+            # Song has ALL of the selected platforms
+            keep = pd.concat(hits, axis=1).all(axis=1)
+        filtered_songs = filtered_songs[keep]
 
     st.write(f"**Showing {len(filtered_songs)} of {len(songs)} songs**")
 
     # Build the table with emoji indicators
-    if filtered_songs:
-        table_data = []
-        song_id_map = {}  # Map row index to song data for jump-to-edit
-        for idx, s in enumerate(filtered_songs):
-            deps = s.get('deployments', {})
-            dist_list = deps.get('distribution', [])
-            sync_list = deps.get('sync_libraries', [])
-            stream_list = deps.get('streaming', [])
-
-            # Format with checkmarks for selected platforms
-            def format_platforms(platforms, all_options):
-                if not platforms:
-                    return "-"
-                result = []
-                for p in platforms:
-                    if selected_platforms and p in selected_platforms:
-                        result.append(f"✅ {p}")
-                    else:
-                        result.append(p)
-                return ", ".join(result)
-
-            # Get publisher from mapping
-            act_id = s.get('act_id', '')
-            publisher = PUBLISHER_MAP.get(act_id, 'Unknown')
-            artist = s.get('artist', act_id.replace('_', ' ').title())
-
-            table_data.append({
-                "Title": s['title'],
-                "Artist": artist,
-                "Publisher": publisher,
-                "Status": s.get('status', '-').title(),
-                "Distributors": format_platforms(dist_list, ALL_DISTRIBUTORS),
-                "Sync Libraries": format_platforms(sync_list, ALL_SYNC_LIBS),
-                "Streaming": format_platforms(stream_list, ALL_STREAMING)
-            })
-
-            # Store mapping for jump-to-edit
-            song_id_map[idx] = {
-                'title': s['title'],
-                'artist': artist,
-                'song_id': s['song_id']
-            }
+    if not filtered_songs.empty:
+        # Format with checkmarks for selected platforms
+        def format_platforms(platforms):
+            if not platforms:
+                return "-"
+            return ", ".join(f"✅ {p}" if p in selected_platforms else p for p in platforms.split(", "))
+
+        table = filtered_songs[['title', 'artist_label', 'publisher', 'status_label', 'distribution', 'sync_libraries', 'streaming']]
+        table.columns = ["Title", "Artist", "Publisher", "Status", "Distributors", "Sync Libraries", "Streaming"]
+        for col in ("Distributors", "Sync Libraries", "Streaming"):
+            table[col] = table[col].map(format_platforms) if selected_platforms else table[col].replace("", "-")
 
         # Display table with row selection
-        df = pd.DataFrame(table_data)
+        df = table.reset_index(drop=True)
         selection = st.dataframe(
             df,
             use_container_width=True,
@@ -567,8 +480,10 @@ elif page == "View Deployments":
         # Jump to Edit button if a row is selected
         if selection and selection.selection and selection.selection.rows:
             selected_row_idx = selection.selection.rows[0]
-            if selected_row_idx in song_id_map:
-                selected_info = song_id_map[selected_row_idx]
+            if selected_row_idx < len(filtered_songs):
+                # Map row index back to the song for jump-to-edit
+                row = filtered_songs.iloc[selected_row_idx]
+                selected_info = {'title': row['title'], 'artist': row['artist_label'], 'song_id': row['song_id']}
                 # Build the smart key to match Edit Song dropdown format
                 smart_key = f"{selected_info['title']} | {selected_info['artist']}"
 
@@ -588,12 +503,7 @@ elif page == "View Deployments":
         st.subheader("📊 Platform Summary")
 
         # Count songs per platform
-        platform_counts = {}
-        for s in songs:
-            deps = s.get('deployments', {})
-            all_plats = deps.get('distribution', []) + deps.get('sync_libraries', []) + deps.get('streaming', [])
-            for p in all_plats:
-                platform_counts[p] = platform_counts.get(p, 0) + 1
+        platform_counts = app_data.catalog_stats(version)['platform_counts']
 
         if platform_counts:
             # Display in columns
@@ -636,7 +546,7 @@ elif page == "Financials":
     with tab1:
         st.subheader("Log an Expense")
         if manager.catalog['songs']:
-            titles = [s['title'] for s in manager.catalog['songs']]
+            titles = app_data.song_choices(version)['titles']
             with st.form("expense_form"):
                 song_title = st.selectbox("Select Song", titles)
                 amount = st.number_input("Amount ($)", min_value=0.0, step=10.0)
@@ -650,7 +560,7 @@ elif page == "Financials":
     with tab2:
         st.subheader("Royalty Forecaster")
         if manager.catalog['songs']:
-            titles = [s['title'] for s in manager.catalog['songs']]
+            titles = app_data.song_choices(version)['titles']
             f_title = st.selectbox("Song to Forecast", titles, key="forecast_song")
             streams = st.number_input("Projected Streams", min_value=1000, step=1000)
             if st.button("Run Simulation"):
@@ -660,7 +570,7 @@ elif page == "Financials":
 elif page == "Pitching":
     st.header("🚀 Pitch Engine")
     if manager.catalog['songs']:
-        titles = [s['title'] for s in manager.catalog['songs']]
+        titles = app_data.song_choices(version)['titles']
 
         with st.form("pitch_form"):
             song = st.selectbox("Song to Pitch", titles)
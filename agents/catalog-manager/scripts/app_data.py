@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Streamlit Data Layer
+Streamlit re-executes app.py on every widget interaction. Everything here is
+cached against the catalog "version": the mtime and size of each data file
+(catalog, writers, acts, supervisors, integrations and the change journal).
+A rerun therefore only re-parses JSON or rebuilds DataFrames when one of
+those files has changed - which includes right after the app itself saves,
+since add_song/update_song/save_catalog all append to the journal.
+Set CATALOG_DATA_DIR to point the app at another data directory.
+"""
+import os
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pandas as pd
+import streamlit as st
+
+from catalog_journal import JOURNAL_FILE
+from catalog_manager import CatalogManager, DATA_DIR
+
+DATA_FILES = ("catalog.json", "writers.json", "acts.json", "supervisors.json", "integrations.json", JOURNAL_FILE)
+PUBLISHER_MAP = {
+    "FROZEN_CLOUD": "Frozen Cloud Music",
+    "PARK_BELLEVUE": "Park Bellevue Collective",
+    "BAJAN_SUN": "Bajan Sun Publishing"
+}
+SONG_COLUMNS = ["song_id", "legacy_code", "title", "artist", "act_id", "status", "copyright_number", "publisher",
+                "artist_label", "status_label", "distribution", "sync_libraries", "streaming", "platforms",
+                "title_lc", "code_lc"]
+
+_live_managers: Dict[str, CatalogManager] = {}
+
+
+def data_dir() -> str:
+    return str(os.environ.get("CATALOG_DATA_DIR", DATA_DIR))
+
+
+def catalog_version(directory: str = None) -> Tuple:
+    """(data_dir, (name, mtime_ns, size) per data file) - changes whenever any file is written."""
+    directory = directory or data_dir()
+    stamps = []
+    for name in DATA_FILES:
+        try:
+            stat = (Path(directory) / name).stat()
+            stamps.append((name, stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            stamps.append((name, None, None))
+    return directory, tuple(stamps)
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _load_manager(version: Tuple) -> CatalogManager:
+    return CatalogManager(data_dir=Path(version[0]))
+
+
+def get_manager(version: Tuple) -> CatalogManager:
+    """The shared CatalogManager for this catalog version; reloaded only when the files change."""
+    manager = _load_manager(version)
+    previous = _live_managers.get(version[0])
+    # The evicted manager's journal handle would otherwise stay open (append() reopens lazily)
+    if previous is not None and previous is not manager: previous.journal.close()
+    _live_managers[version[0]] = manager
+    return manager
+
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def song_frame(version: Tuple) -> pd.DataFrame:
+    """One row per song with the columns the All Songs and Deployments pages filter and show.
+    Platform lists are stored as strings (", "-joined for display, "|a|b|" for matching) so the
+    cached frame unpickles quickly on every rerun."""
+    rows = []
+    for s in _load_manager(version).catalog['songs']:
+        deps = s.get('deployments', {})
+        dist, sync, stream = deps.get('distribution', []), deps.get('sync_libraries', []), deps.get('streaming', [])
+        rows.append({
+            "song_id": s['song_id'],
+            "legacy_code": s.get('legacy_code'),
+            "title": s['title'],
+            "artist": s.get('artist'),
+            "act_id": s.get('act_id'),
+            "status": s.get('status'),
+            "copyright_number": s.get('copyright_number'),
+            "publisher": PUBLISHER_MAP.get(s.get('act_id', ''), 'Unknown'),
+            "artist_label": s.get('artist', s.get('act_id', '').replace('_', ' ').title()),
+            "status_label": s.get('status', '-').title(),
+            "distribution": ", ".join(dist),
+            "sync_libraries": ", ".join(sync),
+            "streaming": ", ".join(stream),
+            "platforms": "|" + "|".join(dist + sync + stream) + "|",
+            "title_lc": s.get('title', '').lower(),
+            "code_lc": s.get('legacy_code', '').lower(),
+        })
+    return pd.DataFrame(rows, columns=SONG_COLUMNS)
+
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def recent_songs_frame(version: Tuple, limit: int = 10) -> pd.DataFrame:
+    table_data = []
+    for s in _load_manager(version).catalog['songs'][-limit:]:
+        deps = s.get('deployments', {})
+        reg = s.get('registration', {})
+        table_data.append({
+            "Song ID": s.get('legacy_code', '-'),
+            "Title": s['title'],
+            "Artist": s.get('artist', '-'),
+            "Publisher": s.get('act_id', '-').replace('_', ' ').title(),
+            "Status": s['status'],
+            "ISRC": reg.get('isrc', '-') or '-',
+            "Distributor": ", ".join(deps.get('distribution', [])) or "-"
+        })
+    return pd.DataFrame(table_data)
+
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def catalog_stats(version: Tuple) -> Dict:
+    """Dashboard metrics and per-platform song counts."""
+    manager = _load_manager(version)
+    platform_counts = {}
+    for s in manager.catalog['songs']:
+        deps = s.get('deployments', {})
+        for p in deps.get('distribution', []) + deps.get('sync_libraries', []) + deps.get('streaming', []):
+            platform_counts[p] = platform_counts.get(p, 0) + 1
+    return {
+        "summary": manager.get_catalog_summary(),
+        "revenue": manager.get_revenue_summary(),
+        "platform_counts": platform_counts,
+    }
+
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def song_choices(version: Tuple) -> Dict:
+    """Selectbox options: titles, artists, publishers and the Edit Song labels."""
+    songs = _load_manager(version).catalog['songs']
+    # Edit Song labels: "Title | Artist", with the song_id appended for duplicates/covers
+    edit_options = {}
+    for s in songs:
+        act_name = s.get('act_id', 'Unknown').replace('_', ' ').title()
+        artist = s.get('artist', act_name)
+        display_label = f"{s['title']} | {artist}"
+        if display_label in edit_options:
+            display_label = f"{s['title']} | {artist} ({s['song_id']})"
+        edit_options[display_label] = s['song_id']
+    return {
+        "titles": [s['title'] for s in songs],
+        "unique_titles": sorted(set(s['title'] for s in songs)),
+        "artists": sorted(set(s.get('artist', '') for s in songs if s.get('artist'))),
+        "publishers": sorted(set(PUBLISHER_MAP.get(s.get('act_id', ''), 'Unknown') for s in songs)),
+        "edit_options": edit_options,
+        "edit_labels": sorted(edit_options.keys()),
+    }
+
+
+def album_tracks(manager: CatalogManager, album: Dict) -> List[Dict]:
+    """Track listing rows, resolving each track through the manager's song_id index."""
+    track_data = []
+    for t in album.get('tracks', []):
+        song = manager.find_song_by_id(t['song_id'])
+        status = song.get('status', '-') if song else '-'
+        track_data.append({
+            "#": t['track_number'],
+            "Title": t['title'],
+            "Song ID": t['song_id'],
+            "Status": status.title()
+        })
+    return track_data
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Audio Metadata Service
+One mutagen pass per audio file yields the tags watch_and_upload.py catalogs
+(title, artist, album, year, genre, BPM) together with duration, bitrate,
+sample rate, channels and the SHA-256 of each embedded artwork picture.
+WAVs are named by their filename as they always were: titles and R2 keys of
+files uploaded earlier must not change, so their ID3 chunk only supplies
+artwork.
+Results are cached in data/metadata_cache.db keyed by path + size + mtime,
+so a file is parsed again only when it changes. scan(folder) extracts a
+whole folder on a thread pool (cache misses only) for the watcher's startup
+backfill; moved() carries an entry along when a file is moved unchanged.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, TypedDict
+
+from mutagen.mp3 import MP3
+from mutagen.wave import WAVE
+
+CACHE_FILE = "metadata_cache.db"
+CACHE_VERSION = 2  # 2: WAV tags no longer name the song
+AUDIO_EXTENSIONS = {".mp3", ".wav"}
+SCAN_WORKERS = 4
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, metadata TEXT NOT NULL);
+"""
+
+
+class AudioMetadata(TypedDict):
+    title: str
+    artist: str
+    album: str
+    year: Optional[int]
+    genre: Optional[str]
+    duration_seconds: Optional[int]
+    bpm: Optional[int]
+    bitrate: Optional[int]        # bits per second
+    sample_rate: Optional[int]
+    channels: Optional[int]
+    artwork: List[str]            # SHA-256 of each embedded picture (ID3 APIC)
+
+
+def _text(tags, *frames: str) -> Optional[str]:
+    for frame in frames:
+        if frame in tags:
+            return str(tags[frame])
+    return None
+
+
+def extract(file_path: Path) -> AudioMetadata:
+    """Read tags and stream info from an MP3 (or stream info and artwork from a WAV) in one mutagen pass."""
+    file_path = Path(file_path)
+    metadata: AudioMetadata = {
+        "title": file_path.stem,  # Default to filename
+        "artist": "Unknown Artist",
+        "album": "Unknown Album",
+        "year": None,
+        "genre": None,
+        "duration_seconds": None,
+        "bpm": None,
+        "bitrate": None,
+        "sample_rate": None,
+        "channels": None,
+        "artwork": [],
+    }
+
+    try:
+        suffix = file_path.suffix.lower()
+        if suffix == '.mp3':
+            audio = MP3(file_path)
+        elif suffix == '.wav':
+            audio = WAVE(file_path)
+        else:
+            return metadata
+
+        info = audio.info
+        metadata["duration_seconds"] = int(info.length) if info.length else None
+        metadata["bitrate"] = getattr(info, "bitrate", None) or None
+        metadata["sample_rate"] = getattr(info, "sample_rate", None) or None
+        metadata["channels"] = getattr(info, "channels", None) or None
+
+        tags = audio.tags
+        if tags and suffix == '.wav':
+            metadata["artwork"] = [hashlib.sha256(pic.data).hexdigest() for pic in tags.getall('APIC')]
+        elif tags:
+            metadata["title"] = _text(tags, 'TIT2') or metadata["title"]
+            metadata["artist"] = _text(tags, 'TPE1', 'TPE2') or metadata["artist"]
+            metadata["album"] = _text(tags, 'TALB') or metadata["album"]
+            metadata["genre"] = _text(tags, 'TCON')
+
+            year = _text(tags, 'TDRC', 'TYER')
+            if year and len(year) >= 4 and year[:4].isdigit():
+                metadata["year"] = int(year[:4])
+
+            bpm = _text(tags, 'TBPM')
+            if bpm:
+                try:
+                    metadata["bpm"] = int(float(bpm))
+                except ValueError:
+                    pass
+
+            metadata["artwork"] = [hashlib.sha256(pic.data).hexdigest() for pic in tags.getall('APIC')]
+
+    except Exception as e:
+        print(f"  [WARNING] Could not extract metadata: {e}")
+
+    return metadata
+
+
+def _stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class MetadataService:
+    def __init__(self, cache_path: Path, workers: int = None):
+        self.path = Path(cache_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.workers = workers or int(os.getenv("METADATA_WORKERS", SCAN_WORKERS))
+        # Shared by the upload worker threads; every statement runs under self.lock
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != CACHE_VERSION:
+            with self.conn:
+                self.conn.execute("DELETE FROM files")
+                self.conn.execute(f"PRAGMA user_version = {CACHE_VERSION}")
+        self.lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def close(self):
+        self.conn.close()
+
+    def get(self, file_path: Path) -> AudioMetadata:
+        """Metadata for one file, parsed only if the cached entry is missing or stale."""
+        file_path = Path(file_path).resolve()
+        stamp = _stamp(file_path)
+        if stamp is None:
+            return extract(file_path)
+        with self.lock:
+            row = self.conn.execute("SELECT size, mtime_ns, metadata FROM files WHERE path = ?",
+                                    (str(file_path),)).fetchone()
+        if row and tuple(row[:2]) == stamp:
+            self.hits += 1
+            return json.loads(row[2])
+        self.misses += 1
+        metadata = extract(file_path)
+        self._store([(file_path, stamp, metadata)])
+        return metadata
+
+    def scan(self, folder: Path, extensions: Iterable[str] = AUDIO_EXTENSIONS,
+             recursive: bool = False) -> Dict[Path, AudioMetadata]:
+        """Metadata for every audio file in `folder`; misses are parsed in parallel, in one transaction.
+        Cache entries for files no longer in the folder are dropped."""
+        folder = Path(folder).resolve()
+        extensions = {e.lower() for e in extensions}
+        files = [p for p in (folder.rglob("*") if recursive else folder.iterdir())
+                 if p.suffix.lower() in extensions and p.is_file()]
+        stamps = {p: _stamp(p) for p in files}
+        prefix = str(folder) + os.sep
+        with self.lock:
+            cached = {path: (size, mtime_ns, metadata) for path, size, mtime_ns, metadata in self.conn.execute(
+                "SELECT path, size, mtime_ns, metadata FROM files WHERE substr(path, 1, ?) = ?", (len(prefix), prefix))}
+
+        results: Dict[Path, AudioMetadata] = {}
+        stale = []
+        for path, stamp in stamps.items():
+            row = cached.get(str(path))
+            if stamp and row and row[:2] == stamp:
+                results[path] = json.loads(row[2])
+            elif stamp:
+                stale.append(path)
+        self.hits += len(results)
+        self.misses += len(stale)
+
+        if stale:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="metadata") as pool:
+                extracted = list(pool.map(extract, stale))
+            self._store([(path, stamps[path], metadata) for path, metadata in zip(stale, extracted)])
+            results.update(zip(stale, extracted))
+
+        present = {str(p) for p in files}
+        gone = [(path,) for path in cached
+                if path not in present and (recursive or os.sep not in path[len(prefix):])]
+        if gone:
+            with self.lock, self.conn:
+                self.conn.executemany("DELETE FROM files WHERE path = ?", gone)
+        return {path: results[path] for path in files if path in results}
+
+    def moved(self, src: Path, dest: Path):
+        """Re-key a cached entry after a move that kept size and mtime (shutil.move on one filesystem)."""
+        src, dest = Path(src).resolve(), Path(dest).resolve()
+        stamp = _stamp(dest)
+        with self.lock, self.conn:
+            row = self.conn.execute("SELECT size, mtime_ns FROM files WHERE path = ?", (str(src),)).fetchone()
+            if row and tuple(row) == stamp:
+                self.conn.execute("INSERT OR REPLACE INTO files SELECT ?, size, mtime_ns, metadata FROM files WHERE path = ?",
+                                  (str(dest), str(src)))
+            self.conn.execute("DELETE FROM files WHERE path = ?", (str(src),))
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def _store(self, entries: List[Tuple[Path, Tuple[int, int], AudioMetadata]]):
+        with self.lock, self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO files VALUES (?,?,?,?)",
+                                  [(str(path), stamp[0], stamp[1], json.dumps(metadata))
+                                   for path, stamp, metadata in entries])
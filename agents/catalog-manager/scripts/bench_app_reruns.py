@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Streamlit Rerun Benchmark
+Drives app.py headlessly with Streamlit's AppTest on a synthetic catalog and
+times a full script run per page: cold (caches cleared before every run, i.e.
+what each rerun cost before app_data.py), warm (cached catalog version), and
+the first rerun after a save, which must pick up the change.
+Usage: python3 scripts/bench_app_reruns.py [--songs 5000] [--reruns 10]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import app_data
+import catalog_manager
+from bench_catalog_db import synthetic_catalog
+
+APP = str(Path(__file__).parent / "app.py")
+PAGES = ["Dashboard", "All Songs", "Albums", "Edit Song", "View Deployments", "Financials"]
+
+
+def timed_run(at: AppTest) -> float:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        at.run()
+    elapsed = time.perf_counter() - start
+    if at.exception: raise RuntimeError(at.exception[0].message)
+    return elapsed
+
+
+def clear_caches():
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Time Streamlit reruns of the catalog app")
+    parser.add_argument("--songs", type=int, default=5_000)
+    parser.add_argument("--reruns", type=int, default=10)
+    args = parser.parse_args()
+    # AppTest re-parses the script for magic on every run; the server caches that, so leave it out
+    st.config.set_option("runner.magicEnabled", False)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog_manager.BACKUPS_DIR = Path(tmp) / "backups"
+        catalog_manager.PITCH_DECKS_DIR = Path(tmp) / "pitch_decks"
+        catalog = synthetic_catalog(args.songs)
+        catalog["albums"] = [{"album_id": "ALB-0001", "title": "Bench", "artist": "Frozen Cloud", "act_id": "FROZEN_CLOUD",
+                              "status": "in_progress", "tracks": [{"track_number": i + 1, "title": s["title"], "song_id": s["song_id"]}
+                                                                  for i, s in enumerate(catalog["songs"][-12:])]}]
+        (Path(tmp) / "catalog.json").write_text(json.dumps(catalog, indent=2))
+        os.environ["CATALOG_DATA_DIR"] = tmp
+
+        print(f"Catalog: {args.songs:,} songs; {args.reruns} reruns per page")
+        print(f"{'page':<18} {'cold p50':>10} {'warm p50':>10} {'speedup':>8}")
+        for page in PAGES:
+            at = AppTest.from_file(APP, default_timeout=120)
+            at.session_state["nav_page"] = page
+            cold = []
+            for _ in range(args.reruns):
+                clear_caches()
+                cold.append(timed_run(at))
+            warm = [timed_run(at) for _ in range(args.reruns)]
+            cold_ms, warm_ms = statistics.median(cold) * 1000, statistics.median(warm) * 1000
+            print(f"{page:<18} {cold_ms:>8.1f}ms {warm_ms:>8.1f}ms {cold_ms / warm_ms:>7.1f}x")
+
+        # A save through the shared manager must be visible on the very next rerun
+        at = AppTest.from_file(APP, default_timeout=120)
+        at.session_state["nav_page"] = "Dashboard"
+        timed_run(at)
+        manager = app_data.get_manager(app_data.catalog_version())
+        song_id = catalog["songs"][-1]["song_id"]
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager.update_song(song_id, {"status": "released", "registration": {"isrc": "QZBENCH00001"}})
+        after_save = timed_run(at)
+        recent = at.dataframe[0].value
+        assert "QZBENCH00001" in set(recent["ISRC"]), "rerun after save served a stale catalog"
+        print(f"rerun after save   {after_save * 1000:>8.1f}ms  (reloaded: ISRC visible in Recent Songs)")
+        reloaded = timed_run(at)
+        print(f"next rerun         {reloaded * 1000:>8.1f}ms")
+        manager.journal.close()
+        app_data.get_manager(app_data.catalog_version()).journal.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
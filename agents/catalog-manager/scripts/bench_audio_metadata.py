@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Audio Metadata Benchmark
+Writes synthetic tagged files (MP3s with ID3 + cover art, WAVs with an ID3
+chunk) and times metadata extraction: the old path (one mutagen parse per
+file, every time) against MetadataService.scan cold (thread pool, empty
+cache) and warm (cache hits), then checks the extracted fields, that a
+modified file is re-parsed and that a moved file keeps its cache entry.
+Usage: python3 scripts/bench_audio_metadata.py [--files 500]
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+from mutagen.id3 import APIC, ID3, TALB, TBPM, TCON, TDRC, TIT2, TPE1
+from mutagen.wave import WAVE
+
+from audio_metadata import MetadataService, extract
+
+# MPEG-1 Layer III, 128 kbit/s, 44.1 kHz, stereo: 417-byte frames
+MP3_FRAME = b"\xff\xfb\x90\x00" + bytes(413)
+
+
+def tag(tags, i: int, cover: bytes):
+    tags.add(TIT2(encoding=3, text=f"Bench Song {i}"))
+    tags.add(TPE1(encoding=3, text=["Frozen Cloud", "Bajan Sun", "Park Bellevue"][i % 3]))
+    tags.add(TALB(encoding=3, text=f"Bench Album {i // 50}"))
+    tags.add(TDRC(encoding=3, text=str(2000 + i % 25)))
+    tags.add(TCON(encoding=3, text="Folk"))
+    tags.add(TBPM(encoding=3, text=str(80 + i % 60)))
+    tags.add(APIC(encoding=3, mime="image/jpeg", type=3, desc="Cover", data=cover))
+
+
+def synthetic_files(folder: Path, count: int):
+    folder.mkdir(parents=True, exist_ok=True)
+    expected = {}
+    for i in range(count):
+        cover = hashlib.sha256(str(i).encode()).digest() * 512  # 16 KB "image"
+        if i % 2:
+            path = folder / f"bench_{i:04d}.mp3"
+            path.write_bytes(MP3_FRAME * 800)  # ~21 s
+            tags = ID3()
+            tag(tags, i, cover)
+            tags.save(path)
+        else:
+            path = folder / f"bench_{i:04d}.wav"
+            with wave.open(str(path), "wb") as w:
+                w.setnchannels(2)
+                w.setsampwidth(2)
+                w.setframerate(44100)
+                w.writeframes(bytes(44100 * 4 * 2))  # 2 s
+            audio = WAVE(path)
+            audio.add_tags()
+            tag(audio.tags, i, cover)
+            audio.save()
+        if i % 2:
+            named = {"title": f"Bench Song {i}", "bpm": 80 + i % 60, "year": 2000 + i % 25}
+        else:  # WAVs keep their filename-based title whatever the ID3 chunk says
+            named = {"title": path.stem, "artist": "Unknown Artist", "album": "Unknown Album", "bpm": None, "year": None}
+        expected[path.resolve()] = {**named, "artwork": [hashlib.sha256(cover).hexdigest()]}
+    return expected
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark cached, pooled audio metadata extraction")
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        folder = tmp / "drop"
+        expected = synthetic_files(folder, args.files)
+        size = sum(p.stat().st_size for p in expected) / 1e6
+        print(f"{args.files} tagged files ({size:.0f} MB, half MP3 / half WAV, cover art on each)")
+
+        _, serial_s = timed(lambda: [extract(p) for p in sorted(expected)])
+        print(f"mutagen per file (old path)  {serial_s * 1000:8.0f} ms")
+
+        service = MetadataService(tmp / "metadata_cache.db", args.workers)
+        cold, cold_s = timed(lambda: service.scan(folder))
+        print(f"scan, cold ({service.workers} workers)      {cold_s * 1000:8.0f} ms  ({service.misses} parsed)")
+        hits_before = service.hits
+        warm, warm_s = timed(lambda: service.scan(folder))
+        assert service.hits - hits_before == args.files and warm == cold
+        print(f"scan, warm                   {warm_s * 1000:8.0f} ms  ({serial_s / warm_s:.0f}x faster than re-parsing)")
+        restarted = MetadataService(tmp / "metadata_cache.db", args.workers)
+        _, restart_s = timed(lambda: restarted.scan(folder))
+        assert restarted.misses == 0
+        print(f"scan, warm after restart     {restart_s * 1000:8.0f} ms")
+        restarted.close()
+
+        for path, want in expected.items():
+            got = cold[path]
+            assert {k: got[k] for k in want} == want, (path, got)
+            assert got["sample_rate"] == 44100 and got["channels"] == 2 and got["duration_seconds"], got
+            assert got["bitrate"] == (128000 if path.suffix == ".mp3" else 44100 * 2 * 16), got
+        print("✅ MP3 title/year/BPM, WAV filename titles, duration, bitrate, sample rate, channels and artwork hashes")
+
+        # A modified file is re-parsed; a moved one keeps its entry
+        touched = sorted(expected)[1]
+        audio = ID3(touched)
+        audio.add(TIT2(encoding=3, text="Retitled"))
+        audio.save(touched)
+        misses = service.misses
+        assert service.scan(folder)[touched]["title"] == "Retitled" and service.misses == misses + 1
+        print("✅ modified file re-parsed, the rest served from cache")
+
+        completed = folder / "Completed"
+        completed.mkdir()
+        moved = completed / touched.name
+        shutil.move(str(touched), str(moved))
+        service.moved(touched, moved)
+        misses = service.misses
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert service.get(moved)["title"] == "Retitled" and service.misses == misses
+        assert len(service) == args.files and touched not in service.scan(folder)
+        print("✅ moved file keeps its cache entry; entries for vanished files are pruned")
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - SQLite Backend Benchmark
+Times summary and pitch queries on the JSON backend (Python loops) against
+the SQLite mirror, on synthetic catalogs, and checks the mirror exports back
+to the identical catalog.json document.
+Usage: python3 scripts/bench_catalog_db.py [--sizes 1000 10000 100000] [--repeat 5]
+"""
+import argparse
+import contextlib
+import io
+import json
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import catalog_manager
+from catalog_manager import CatalogManager, DEFAULT_SPLITS
+
+ACTS = list(DEFAULT_SPLITS)
+STATUSES = ["idea", "demo", "mixing", "mastered", "copyright", "released"]
+MOODS = ["upbeat", "fun", "melancholy", "dark", "hopeful", "tense", "dreamy", "nostalgic", "epic", "warm"]
+THEMES = ["love", "road trip", "summer", "city", "loss", "freedom", "night", "home", "youth", "rain"]
+KEYWORDS = ["guitar", "synth", "anthem", "trailer", "montage", "driving", "acoustic", "strings", "beat", "chorus"]
+BRIEF = "nostalgic summer road trip driving montage"
+
+
+def synthetic_catalog(n: int, seed: int = 11) -> dict:
+    rng = random.Random(seed)
+    songs = []
+    for i in range(n):
+        songs.append({
+            "song_id": f"RS-{2020 + i % 7}-{i // 7 + 1:04d}",
+            "title": f"Song {i}",
+            "act_id": ACTS[i % len(ACTS)],
+            "legacy_code": f"{i:04X}"[-4:],
+            "status": rng.choice(STATUSES),
+            "writers": DEFAULT_SPLITS[ACTS[i % len(ACTS)]],
+            "musical_info": {"genre": "Pop", "bpm": rng.randint(70, 160), "key": "C", "instrumental": rng.random() < 0.3},
+            "sync_metadata": {"moods": rng.sample(MOODS, 2), "themes": rng.sample(THEMES, 2),
+                              "keywords": rng.sample(KEYWORDS, 3), "use_cases": [], "one_stop": True},
+            "deployments": {"distribution": ["DistroKid"], "sync_libraries": [], "streaming": ["Spotify"]},
+            "revenue": {"expenses": [{"date": "2026-01-01", "amount": 25.0, "category": "Mixing"}] if i % 4 == 0 else [],
+                        "total_earned": rng.choice([0, 0, 0, 120, 2500])},
+            "rights": {"licenses": [{"license_id": f"LIC-{i}", "type": "sync", "fee": 1000.0}] if i % 50 == 0 else []},
+            "dates": {"created": "2026-01-01"},
+        })
+    return {"songs": songs, "albums": []}
+
+
+def python_pitch(songs, text: str, limit: int = 10):
+    """What pitch matching costs without an index: score every song's tags in Python."""
+    terms = set(re.findall(r"[\w']+", text.lower()))
+    scored = []
+    for pos, s in enumerate(songs):
+        meta = s.get("sync_metadata") or {}
+        words = {w for f in ("moods", "themes", "keywords", "use_cases") for tag in meta.get(f) or []
+                 for w in re.findall(r"[\w']+", str(tag).lower())}
+        hits = len(terms & words)
+        if hits: scored.append((-hits, pos, s["song_id"]))
+    return [song_id for _, _, song_id in sorted(scored)[:limit]]
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the SQLite catalog backend")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'songs':>8} {'build':>9} {'summary py':>11} {'summary sql':>12} {'pitch py':>10} {'pitch sql':>10}  lossless")
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog_manager.BACKUPS_DIR = Path(tmp) / "backups"
+        catalog_manager.PITCH_DECKS_DIR = Path(tmp) / "pitch_decks"
+        for n in args.sizes:
+            data_dir = Path(tmp) / f"n{n}"
+            data_dir.mkdir()
+            catalog = synthetic_catalog(n)
+            (data_dir / "catalog.json").write_text(json.dumps(catalog, indent=2))
+            with contextlib.redirect_stdout(io.StringIO()):
+                plain = CatalogManager(data_dir, backend="json")
+                start = time.perf_counter()
+                mirrored = CatalogManager(data_dir, backend="sqlite")
+                build_s = time.perf_counter() - start
+            assert plain.get_catalog_summary() == mirrored.get_catalog_summary()
+            assert plain.get_revenue_summary()["total_revenue"] == mirrored.get_revenue_summary()["total_revenue"]
+
+            summary_py = best_of(lambda: (plain.get_catalog_summary(), plain.get_revenue_summary()), args.repeat)
+            summary_sql = best_of(lambda: (mirrored.get_catalog_summary(), mirrored.get_revenue_summary()), args.repeat)
+            pitch_py = best_of(lambda: python_pitch(plain.catalog["songs"], BRIEF), args.repeat)
+            pitch_sql = best_of(lambda: mirrored.db.pitch_search(BRIEF), args.repeat)
+            lossless = mirrored.db.export_catalog() == catalog
+            print(f"{n:>8,} {build_s * 1000:>7.0f}ms {summary_py * 1000:>9.2f}ms {summary_sql * 1000:>10.2f}ms "
+                  f"{pitch_py * 1000:>8.2f}ms {pitch_sql * 1000:>8.2f}ms  {'yes' if lossless else 'NO'}")
+            mirrored.db.close()
+            if not lossless: return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
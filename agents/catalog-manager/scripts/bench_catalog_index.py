@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Index Benchmark
+Compares the old linear-scan lookups against CatalogIndex on a synthetic
+catalog, and measures add_song throughput (journal writes stubbed out).
+Usage: python3 scripts/bench_catalog_index.py [--songs 50000] [--lookups 2000]
+"""
+import argparse
+import json
+import random
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from catalog_manager import CatalogManager, DEFAULT_SPLITS
+
+ACTS = list(DEFAULT_SPLITS)
+WORDS = ["cold", "summer", "night", "river", "glass", "echo", "drive", "velvet", "ghost", "neon",
+         "harbor", "golden", "static", "paper", "wild", "silver", "rain", "falling", "city", "heart"]
+
+
+def synthetic_catalog(n: int, seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    songs, codes = [], set()
+    for i in range(n):
+        while True:
+            code = "".join(rng.choices(string.ascii_uppercase, k=4))
+            if code not in codes:
+                codes.add(code)
+                break
+        year = 2020 + i % 7
+        songs.append({
+            "song_id": f"RS-{year}-{i // 7 + 1:04d}",
+            "title": f"{' '.join(rng.sample(WORDS, 3)).title()} {i}",
+            "act_id": ACTS[i % len(ACTS)],
+            "legacy_code": code,
+            "status": "mastered",
+        })
+    return {"songs": songs, "albums": []}
+
+
+# Reference implementations: the linear scans CatalogManager used before the index
+def linear_by_title(songs, title):
+    return next((s for s in songs if s["title"].lower() == title.lower()), None)
+def linear_by_code(songs, code):
+    code = code.upper().strip()
+    return next((s for s in songs if s.get("legacy_code", "").upper() == code), None)
+def linear_by_id(songs, song_id):
+    return next((s for s in songs if s["song_id"] == song_id), None)
+
+
+def timed(fn, args_list):
+    start = time.perf_counter()
+    for args in args_list: fn(*args)
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark CatalogIndex lookups")
+    parser.add_argument("--songs", type=int, default=50_000)
+    parser.add_argument("--lookups", type=int, default=2_000)
+    parser.add_argument("--adds", type=int, default=2_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog = synthetic_catalog(args.songs)
+        (Path(tmp) / "catalog.json").write_text(json.dumps(catalog))
+        start = time.perf_counter()
+        manager = CatalogManager(data_dir=Path(tmp))
+        load_s = time.perf_counter() - start
+    manager._journal = lambda *args, **kwargs: None  # measure in-memory cost only
+
+    songs = manager.catalog["songs"]
+    rng = random.Random(1)
+    sample = rng.sample(songs, min(args.lookups, len(songs)))
+    probes = {
+        "title": ([(s["title"].upper(),) for s in sample], linear_by_title, manager.find_song_by_title),
+        "code": ([(s["legacy_code"].lower(),) for s in sample], linear_by_code, manager.find_song_by_code),
+        "song_id": ([(s["song_id"],) for s in sample], linear_by_id, manager.find_song_by_id),
+    }
+
+    print(f"Catalog: {len(songs):,} songs (load + index build {load_s * 1000:.0f} ms)")
+    print(f"{'lookup':<10}{'linear/s':>14}{'indexed/s':>14}{'speedup':>10}")
+    for name, (calls, linear, indexed) in probes.items():
+        for (arg,) in calls[:50]:
+            assert linear(songs, arg) is indexed(arg), f"{name} mismatch for {arg!r}"
+        linear_s = timed(lambda a: linear(songs, a), calls)
+        indexed_s = timed(indexed, calls)
+        print(f"{name:<10}{len(calls) / linear_s:>14,.0f}{len(calls) / indexed_s:>14,.0f}{linear_s / indexed_s:>9,.0f}x")
+
+    start = time.perf_counter()
+    for i in range(args.adds):
+        result = manager.add_song(f"Bench Song {i}", ACTS[i % len(ACTS)])
+        assert isinstance(result, dict), result
+    add_s = time.perf_counter() - start
+    ids = [s["song_id"] for s in songs]
+    assert len(ids) == len(set(ids)), "duplicate song IDs generated"
+    print(f"add_song: {args.adds / add_s:,.0f}/s ({args.adds:,} adds, unique codes + IDs)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - R2 Upload Benchmark
+Uploads synthetic WAVs to the local S3 stand-in (scripts/s3_standin.py) with
+a per-connection bandwidth cap, comparing the old path (one default boto3
+upload_file per file, files one at a time) with R2Client's tuned multipart
+TransferConfig on the UploadExecutor pool. Also checks that injected part
+failures are retried, and runs process_file end-to-end through the executor
+against a temporary catalog.
+Usage: python3 scripts/bench_r2_upload.py [--files 6] [--size-mb 50] [--link-mbps 5]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+import watch_and_upload
+from s3_standin import S3StandIn
+from watch_and_upload import R2Client, UploadExecutor, format_throughput
+
+
+def synthetic_wavs(folder: Path, count: int, size_mb: int):
+    folder.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(count):
+        path = folder / f"Bench Track {i + 1:02d}.wav"
+        with wave.open(str(path), "wb") as w:
+            w.setnchannels(2)
+            w.setsampwidth(2)
+            w.setframerate(44100)
+            w.writeframes(os.urandom(size_mb * 1024 * 1024))
+        paths.append(path)
+    return paths
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark concurrent multipart uploads")
+    parser.add_argument("--files", type=int, default=6)
+    parser.add_argument("--size-mb", type=int, default=50)
+    parser.add_argument("--link-mbps", type=float, default=5, help="per-connection bandwidth of the stand-in")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--fail-parts", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        server = S3StandIn(tmp / "s3", link_mbps=args.link_mbps).start()
+        os.environ.update({"CLOUDFLARE_R2_ACCESS_KEY_ID": "bench", "CLOUDFLARE_R2_SECRET_ACCESS_KEY": "bench",
+                           "R2_BUCKET_NAME": "bench"})
+        r2 = R2Client(endpoint_url=server.endpoint_url, ledger_path=tmp / "ledger.db")
+        r2.client.create_bucket(Bucket=r2.bucket_name)
+        files = synthetic_wavs(tmp / "drop", args.files, args.size_mb)
+        total = sum(p.stat().st_size for p in files)
+        print(f"{len(files)} x {args.size_mb} MB WAVs, stand-in capped at {args.link_mbps:g} MB/s per connection")
+
+        _, serial_s = timed(lambda: [r2.client.upload_file(str(p), r2.bucket_name, f"serial/{p.name}") for p in files])
+        print(f"serial, default config   {format_throughput(total, serial_s)}")
+
+        executor = UploadExecutor(r2, args.workers)
+        log = io.StringIO()
+        with contextlib.redirect_stdout(log):
+            ok, pooled_s = timed(lambda: [f.result() for f in [
+                executor.submit(r2.upload_file, p, f"pooled/{p.name}", "audio/wav") for p in files]])
+        assert all(ok), log.getvalue()
+        print(f"{executor.workers} workers, tuned        {format_throughput(total, pooled_s)}  ({serial_s / pooled_s:.1f}x)")
+        for line in log.getvalue().splitlines()[:3]: print(f"  {line.strip()}")
+
+        server.fail_parts = args.fail_parts
+        with contextlib.redirect_stdout(io.StringIO()):
+            retried = r2.upload_file(files[0], "retry/part-failures.wav", "audio/wav")
+        head = r2.client.head_object(Bucket=r2.bucket_name, Key="retry/part-failures.wav")
+        assert retried and server.fail_parts == 0 and head["ContentLength"] == files[0].stat().st_size
+        print(f"✅ {args.fail_parts} injected part failures retried; object complete ({head['ETag']})")
+
+        # End-to-end: process_file via the executor against a throwaway catalog
+        watch_and_upload.WATCH_FOLDER = tmp / "drop"
+        watch_and_upload.COMPLETED_FOLDER = tmp / "drop" / "Completed"
+        watch_and_upload.CATALOG_MANAGER_ROOT = tmp
+        watch_and_upload.CATALOG_JSON_PATH = tmp / "data" / "catalog.json"
+        watch_and_upload.CATALOG_JSON_PATH.parent.mkdir()
+        watch_and_upload.CATALOG_JSON_PATH.write_text(json.dumps({"songs": []}))
+        with contextlib.redirect_stdout(io.StringIO()):
+            results, e2e_s = timed(lambda: executor.process_all(files))
+        songs = json.loads(watch_and_upload.CATALOG_JSON_PATH.read_text())["songs"]
+        assert all(results) and len(songs) == len(files) and len({s["song_id"] for s in songs}) == len(files)
+        assert len(list(watch_and_upload.COMPLETED_FOLDER.glob("*.wav"))) == len(files)
+        print(f"✅ process_file x{len(files)} concurrently in {e2e_s:.2f}s: {len(songs)} catalog entries, unique IDs")
+        print(f"requests: {dict(sorted(server.requests.items()))}")
+        executor.shutdown()
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
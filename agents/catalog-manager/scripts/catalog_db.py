@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - SQLite Backend
+Optional mirror of catalog.json in data/catalog.db (CATALOG_BACKEND=sqlite)
+so summaries and pitch matching run as indexed SQL instead of Python loops.
+- songs: one row per catalog entry, keyed by catalog position (song_ids are
+  not unique in practice), with the hot fields as columns
+- song_docs: the full song JSON per position, which makes export lossless
+  (kept out of `songs` so aggregate scans stay narrow)
+- splits, deployments, expenses, licenses, sync_tags: normalised child rows
+- pitch_fts: FTS5 over title/moods/themes/keywords/use cases (falls back to
+  sync_tags lookups if this SQLite build lacks FTS5)
+Usage:
+  python3 scripts/catalog_db.py build  [data_dir]      # (re)build catalog.db
+  python3 scripts/catalog_db.py export [data_dir] OUT  # catalog.db -> catalog.json shape
+  python3 scripts/catalog_db.py pitch  [data_dir] "moody night drive"
+"""
+import json
+import re
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, TypedDict
+
+DB_FILE = "catalog.db"
+SCHEMA_VERSION = "1"
+TAG_KINDS = {"moods": "mood", "themes": "theme", "keywords": "keyword", "use_cases": "use_case"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS songs (
+    pos INTEGER PRIMARY KEY, song_id TEXT, title TEXT, title_norm TEXT, act_id TEXT, artist TEXT,
+    status TEXT, legacy_code TEXT, genre TEXT, bpm REAL, musical_key TEXT, instrumental INTEGER,
+    one_stop INTEGER, total_earned REAL, created TEXT);
+CREATE INDEX IF NOT EXISTS songs_song_id ON songs(song_id);
+CREATE INDEX IF NOT EXISTS songs_title ON songs(title_norm);
+CREATE INDEX IF NOT EXISTS songs_code ON songs(legacy_code);
+CREATE INDEX IF NOT EXISTS songs_act ON songs(act_id);
+CREATE INDEX IF NOT EXISTS songs_status ON songs(status);
+CREATE INDEX IF NOT EXISTS songs_earned ON songs(total_earned);
+CREATE TABLE IF NOT EXISTS song_docs (pos INTEGER PRIMARY KEY, doc TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS writers (writer_id TEXT PRIMARY KEY, doc TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS splits (pos INTEGER, writer_id TEXT, percentage REAL, role TEXT);
+CREATE INDEX IF NOT EXISTS splits_pos ON splits(pos);
+CREATE INDEX IF NOT EXISTS splits_writer ON splits(writer_id);
+CREATE TABLE IF NOT EXISTS deployments (pos INTEGER, channel TEXT, target TEXT);
+CREATE INDEX IF NOT EXISTS deployments_pos ON deployments(pos);
+CREATE INDEX IF NOT EXISTS deployments_target ON deployments(channel, target);
+CREATE TABLE IF NOT EXISTS expenses (pos INTEGER, date TEXT, amount REAL, category TEXT);
+CREATE INDEX IF NOT EXISTS expenses_pos ON expenses(pos);
+CREATE TABLE IF NOT EXISTS licenses (
+    pos INTEGER, license_id TEXT, type TEXT, licensee TEXT, territory TEXT,
+    start_date TEXT, end_date TEXT, fee REAL, exclusive INTEGER);
+CREATE INDEX IF NOT EXISTS licenses_pos ON licenses(pos);
+CREATE TABLE IF NOT EXISTS sync_tags (pos INTEGER, kind TEXT, tag TEXT);
+CREATE INDEX IF NOT EXISTS sync_tags_pos ON sync_tags(pos);
+CREATE INDEX IF NOT EXISTS sync_tags_tag ON sync_tags(kind, tag);
+"""
+# Secondary indexes, dropped and recreated around a full rebuild (bulk index builds are cheaper)
+INDEXES = {re.search(r"EXISTS (\w+)", line).group(1): line
+           for line in SCHEMA.splitlines() if line.startswith("CREATE INDEX")}
+CHILD_TABLES = ("song_docs", "splits", "deployments", "expenses", "licenses", "sync_tags")
+INSERTS = {
+    "songs": "INSERT INTO songs VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)",
+    "song_docs": "INSERT INTO song_docs VALUES (?,?)",
+    "splits": "INSERT INTO splits VALUES (?,?,?,?)",
+    "deployments": "INSERT INTO deployments VALUES (?,?,?)",
+    "expenses": "INSERT INTO expenses VALUES (?,?,?,?)",
+    "licenses": "INSERT INTO licenses VALUES (?,?,?,?,?,?,?,?,?)",
+    "sync_tags": "INSERT INTO sync_tags VALUES (?,?,?)",
+    "pitch_fts": "INSERT INTO pitch_fts (rowid, title, moods, themes, keywords, use_cases) VALUES (?,?,?,?,?,?)",
+}
+
+
+class CatalogSummary(TypedDict):
+    total_songs: int
+    by_act: Dict[str, int]
+    by_status: Dict[str, int]
+
+
+class RevenueSummary(TypedDict):
+    total_revenue: float
+    sync_income: float
+    top_earners: List[Dict]
+
+
+class PitchMatch(TypedDict):
+    song_id: str
+    title: str
+    act_id: str
+    score: float
+
+
+def fts5_available() -> bool:
+    try:
+        sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def _num(value) -> Optional[float]:
+    try: return float(value) if value not in (None, "") else None
+    except (TypeError, ValueError): return None
+
+
+def _tags(song: Dict, field: str) -> List[str]:
+    values = (song.get("sync_metadata") or {}).get(field) or []
+    return [str(v).strip().lower() for v in values if str(v).strip()]
+
+
+class CatalogDB:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.fts = fts5_available()
+        if self.fts:
+            self.conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS pitch_fts USING fts5(title, moods, themes, keywords, use_cases)")
+
+    def close(self):
+        self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Meta
+    # ------------------------------------------------------------------
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def source(self) -> Optional[str]:
+        """Signature of the JSON files this mirror was last synced from (see CatalogManager)."""
+        return self.get_meta("source") if self.get_meta("schema") == SCHEMA_VERSION else None
+
+    def set_source(self, signature: str):
+        self.set_meta("source", signature)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def _rows(self, pos: int, song: Dict, out: Dict[str, List[tuple]]):
+        """Collect the rows for one song, per table."""
+        info = song.get("musical_info") or {}
+        sync = song.get("sync_metadata") or {}
+        revenue = song.get("revenue") or {}
+        out["songs"].append(
+            (pos, song.get("song_id"), song.get("title"), str(song.get("title", "")).lower(), song.get("act_id"),
+             song.get("artist"), song.get("status"), str(song.get("legacy_code") or "").upper() or None,
+             info.get("genre"), _num(info.get("bpm")), info.get("key"), int(bool(info.get("instrumental"))),
+             int(bool(sync.get("one_stop"))), _num(revenue.get("total_earned")), (song.get("dates") or {}).get("created")))
+        out["song_docs"].append((pos, json.dumps(song, default=str)))
+        out["splits"].extend((pos, w.get("writer_id"), _num(w.get("percentage")), w.get("role"))
+                             for w in song.get("writers") or [] if isinstance(w, dict))
+        out["deployments"].extend((pos, channel, t if isinstance(t, str) else json.dumps(t, default=str))
+                                  for channel, targets in (song.get("deployments") or {}).items() for t in targets or [])
+        out["expenses"].extend((pos, e.get("date"), _num(e.get("amount")), e.get("category"))
+                               for e in revenue.get("expenses") or [] if isinstance(e, dict))
+        out["licenses"].extend((pos, l.get("license_id"), l.get("type"), l.get("licensee"), l.get("territory"),
+                                l.get("start_date"), l.get("end_date"), _num(l.get("fee")), int(bool(l.get("exclusive"))))
+                               for l in (song.get("rights") or {}).get("licenses") or [] if isinstance(l, dict))
+        tags = {field: _tags(song, field) for field in TAG_KINDS}
+        out["sync_tags"].extend((pos, kind, tag) for field, kind in TAG_KINDS.items() for tag in tags[field])
+        if self.fts:
+            out["pitch_fts"].append((pos, song.get("title", ""), *(" ".join(tags[f]) for f in TAG_KINDS)))
+
+    def _insert_songs(self, songs: Iterable[tuple]):
+        out = {table: [] for table in INSERTS}
+        for pos, song in songs: self._rows(pos, song, out)
+        for table, rows in out.items():
+            if rows: self.conn.executemany(INSERTS[table], rows)
+
+    def _delete_song(self, pos: int):
+        for table in ("songs",) + CHILD_TABLES:
+            self.conn.execute(f"DELETE FROM {table} WHERE pos = ?", (pos,))
+        if self.fts:
+            self.conn.execute("DELETE FROM pitch_fts WHERE rowid = ?", (pos,))
+
+    def rebuild(self, catalog: Dict, writers: Optional[Dict] = None):
+        """Replace the mirror with the given catalog (and writers.json contents, if loaded)."""
+        with self.conn:
+            for table in ("songs", "writers") + CHILD_TABLES:
+                self.conn.execute(f"DELETE FROM {table}")
+            if self.fts:
+                self.conn.execute("DELETE FROM pitch_fts")
+            for name in INDEXES: self.conn.execute(f"DROP INDEX IF EXISTS {name}")
+            self._insert_songs(enumerate(catalog.get("songs", [])))
+            for statement in INDEXES.values(): self.conn.execute(statement)
+            for writer in (writers or {}).get("writers", []):
+                self.conn.execute("INSERT OR REPLACE INTO writers VALUES (?, ?)",
+                                  (writer.get("writer_id") or writer.get("id"), json.dumps(writer, default=str)))
+            self._store_catalog_meta(catalog)
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema', ?)", (SCHEMA_VERSION,))
+
+    def upsert_song(self, pos: int, song: Dict):
+        with self.conn:
+            self._delete_song(pos)
+            self._insert_songs([(pos, song)])
+
+    def _store_catalog_meta(self, catalog: Dict):
+        # Key order is kept (songs as a placeholder) so export reproduces the file exactly
+        shell = {k: (None if k == "songs" else v) for k, v in catalog.items()}
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('catalog', ?)", (json.dumps(shell, default=str),))
+
+    def set_catalog_meta(self, catalog: Dict):
+        with self.conn:
+            self._store_catalog_meta(catalog)
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+    def export_catalog(self) -> Dict:
+        """Rebuild the catalog.json document (songs in catalog order, all fields intact)."""
+        catalog = json.loads(self.get_meta("catalog") or '{"songs": null}')
+        catalog["songs"] = [json.loads(doc) for (doc,) in self.conn.execute("SELECT doc FROM song_docs ORDER BY pos")]
+        return catalog
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def catalog_summary(self) -> CatalogSummary:
+        def counts(column: str, missing: str) -> Dict[str, int]:
+            # Plain GROUP BY stays on the covering index; order by first appearance like the JSON backend
+            rows = self.conn.execute(f"SELECT {column}, COUNT(*), MIN(pos) FROM songs GROUP BY {column}").fetchall()
+            return {(key if key is not None else missing): n for key, n, _ in sorted(rows, key=lambda r: r[2])}
+        return {
+            "total_songs": self.conn.execute("SELECT COUNT(*) FROM songs").fetchone()[0],
+            "by_act": counts("act_id", "Unknown"),
+            "by_status": counts("status", "unknown"),
+        }
+
+    def revenue_summary(self) -> RevenueSummary:
+        total = self.conn.execute("SELECT COALESCE(SUM(total_earned), 0) FROM songs").fetchone()[0]
+        return {"total_revenue": total, "sync_income": 0, "top_earners": []}
+
+    def top_earners(self, limit: int = 10) -> List[Dict]:
+        rows = self.conn.execute(
+            "SELECT song_id, title, act_id, total_earned FROM songs WHERE total_earned > 0 "
+            "ORDER BY total_earned DESC, pos LIMIT ?", (limit,))
+        return [dict(zip(("song_id", "title", "act_id", "total_earned"), r)) for r in rows]
+
+    def expense_totals(self) -> Dict[str, float]:
+        return dict(self.conn.execute(
+            "SELECT COALESCE(category, 'Uncategorized'), SUM(amount) FROM expenses GROUP BY 1 ORDER BY 2 DESC"))
+
+    def license_income(self) -> Dict[str, float]:
+        """Total license fees by license type (sync, mechanical, ...)."""
+        return dict(self.conn.execute(
+            "SELECT COALESCE(type, 'other'), SUM(COALESCE(fee, 0)) FROM licenses GROUP BY 1 ORDER BY 2 DESC"))
+
+    def songs_with_tag(self, tag: str, kind: Optional[str] = None) -> List[str]:
+        sql = "SELECT DISTINCT s.song_id FROM sync_tags t JOIN songs s ON s.pos = t.pos WHERE t.tag = ?"
+        args = [tag.strip().lower()]
+        if kind: sql += " AND t.kind = ?"; args.append(kind)
+        return [r[0] for r in self.conn.execute(sql + " ORDER BY s.pos", args)]
+
+    def pitch_search(self, text: str, act_id: Optional[str] = None, limit: int = 10) -> List[PitchMatch]:
+        """Songs whose title or sync tags best match a free-text brief, best first."""
+        terms = [t for t in re.findall(r"[\w']+", text.lower()) if t]
+        if not terms: return []
+        act_sql, act_args = (" AND s.act_id = ?", [act_id]) if act_id else ("", [])
+        if self.fts:
+            match = " OR ".join('"{}"'.format(t.replace('"', '""')) for t in terms)
+            rows = self.conn.execute(
+                "SELECT s.song_id, s.title, s.act_id, -bm25(pitch_fts) FROM pitch_fts "
+                "JOIN songs s ON s.pos = pitch_fts.rowid WHERE pitch_fts MATCH ?" + act_sql +
+                " ORDER BY bm25(pitch_fts), s.pos LIMIT ?", [match, *act_args, limit])
+        else:
+            marks = ",".join("?" * len(terms))
+            rows = self.conn.execute(
+                f"SELECT s.song_id, s.title, s.act_id, COUNT(*) FROM sync_tags t JOIN songs s ON s.pos = t.pos "
+                f"WHERE t.tag IN ({marks})" + act_sql + " GROUP BY s.pos ORDER BY 4 DESC, s.pos LIMIT ?",
+                [*terms, *act_args, limit])
+        return [{"song_id": r[0], "title": r[1], "act_id": r[2], "score": round(r[3], 4)} for r in rows]
+
+
+def _load_json(path: Path) -> Optional[Dict]:
+    if not path.exists(): return None
+    with open(path, 'r') as f: return json.load(f)
+
+
+def main(argv: Iterable[str]) -> int:
+    from catalog_manager import CatalogManager, DATA_DIR
+    args = list(argv)
+    if not args or args[0] not in ("build", "export", "pitch"):
+        print(__doc__.strip().split("Usage:")[1]); return 1
+    cmd, rest = args[0], args[1:]
+    data_dir = Path(rest.pop(0)) if rest and Path(rest[0]).is_dir() else DATA_DIR
+    if cmd == "build":
+        manager = CatalogManager(data_dir=data_dir, backend="sqlite")
+        manager.db.rebuild(manager.catalog, getattr(manager, "writers", None))
+        manager.db.set_source(manager._source_signature())
+        print(f"✅ {manager.db.catalog_summary()['total_songs']} songs -> {manager.db.path}")
+        return 0
+    db = CatalogDB(data_dir / DB_FILE)
+    if cmd == "export":
+        if not rest: print("Usage: catalog_db.py export [data_dir] OUT"); return 1
+        with open(rest[0], 'w') as f: json.dump(db.export_catalog(), f, indent=2, default=str)
+        print(f"✅ Exported to {rest[0]}")
+        return 0
+    for match in db.pitch_search(" ".join(rest)):
+        print(f"{match['score']:>8.3f}  {match['song_id']}  {match['title']} ({match['act_id']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
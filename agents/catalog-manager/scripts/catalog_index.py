@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Catalog Index
+Hash indexes over catalog["songs"] so CatalogManager lookups are O(1):
+- song_id -> song
+- legacy_code -> songs (covers share their original's code)
+- normalised title -> songs
+- act_id -> songs
+- per-year max RS-YYYY-NNNN sequence (next ID survives deletions)
+Indexes are updated on add/update and rebuilt automatically if the songs
+list is swapped out or changes length behind the manager's back.
+"""
+import re
+from bisect import insort
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+# Sequential IDs only; watch_and_upload.py mints RS-YYYY-MMDDHHMM timestamp IDs
+# which must not push the sequence into the millions
+SONG_ID_RE = re.compile(r"^RS-(\d{4})-(\d{4})$")
+
+
+def normalize_title(title: str) -> str:
+    """Case- and whitespace-insensitive title key."""
+    return " ".join(str(title or "").split()).casefold()
+
+
+def normalize_code(code: str) -> str:
+    return str(code or "").upper().strip()
+
+
+class CatalogIndex:
+    def __init__(self, songs: List[Dict]):
+        self.rebuild(songs)
+
+    # ------------------------------------------------------------------
+    # (Re)building
+    # ------------------------------------------------------------------
+    def rebuild(self, songs: List[Dict]):
+        self._songs = songs
+        self._count = len(songs)
+        self.by_id: Dict[str, Dict] = {}
+        self.by_code: Dict[str, List[Dict]] = defaultdict(list)
+        self.by_title: Dict[str, List[Dict]] = defaultdict(list)
+        self.by_act: Dict[str, List[Dict]] = defaultdict(list)
+        self.year_seq: Dict[str, int] = {}
+        self._pos: Dict[int, int] = {}     # id(song) -> position in songs list
+        self._keys: Dict[int, tuple] = {}  # id(song) -> (song_id, code, title, act) as indexed
+        for pos, song in enumerate(songs):
+            self._pos[id(song)] = pos
+            self._index(song)
+
+    def ensure_fresh(self, songs: List[Dict]):
+        """Rebuild if the manager swapped the list or it changed size externally."""
+        if songs is not self._songs or len(songs) != self._count:
+            self.rebuild(songs)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+    def _insert(self, bucket: List[Dict], song: Dict):
+        # Keep buckets in catalog order so "first match" matches a linear scan
+        if not bucket or self._pos[id(bucket[-1])] < self._pos[id(song)]:
+            bucket.append(song)
+        else:
+            insort(bucket, song, key=lambda s: self._pos[id(s)])
+
+    def _index(self, song: Dict):
+        song_id = song.get("song_id", "")
+        code = normalize_code(song.get("legacy_code", ""))
+        title = normalize_title(song.get("title", ""))
+        act = song.get("act_id", "")
+        self.by_id.setdefault(song_id, song)
+        if code:
+            self._insert(self.by_code[code], song)
+        self._insert(self.by_title[title], song)
+        self._insert(self.by_act[act], song)
+        match = SONG_ID_RE.match(song_id)
+        if match:
+            year, seq = match.group(1), int(match.group(2))
+            if seq > self.year_seq.get(year, 0):
+                self.year_seq[year] = seq
+        self._keys[id(song)] = (song_id, code, title, act)
+
+    def _unindex(self, song: Dict):
+        song_id, code, title, act = self._keys.pop(id(song))
+        if self.by_id.get(song_id) is song:
+            del self.by_id[song_id]
+            # Another song may share the ID; the earliest one takes over
+            for other in self._songs:
+                if other is not song and other.get("song_id") == song_id:
+                    self.by_id[song_id] = other
+                    break
+        for mapping, key in ((self.by_code, code), (self.by_title, title), (self.by_act, act)):
+            bucket = mapping.get(key)
+            if bucket is None:
+                continue
+            bucket[:] = [s for s in bucket if s is not song]
+            if not bucket:
+                del mapping[key]
+
+    def add(self, song: Dict):
+        """Index a song that was just appended to the songs list."""
+        self._pos[id(song)] = self._count
+        self._count += 1
+        self._index(song)
+
+    def reindex(self, song: Dict):
+        """Refresh a song's entries after its fields were updated in place."""
+        if self._keys.get(id(song)) == (
+            song.get("song_id", ""),
+            normalize_code(song.get("legacy_code", "")),
+            normalize_title(song.get("title", "")),
+            song.get("act_id", ""),
+        ):
+            return
+        self._unindex(song)
+        self._index(song)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    def get(self, song_id: str) -> Optional[Dict]:
+        return self.by_id.get(song_id)
+
+    def find_by_title(self, title: str) -> Optional[Dict]:
+        bucket = self.by_title.get(normalize_title(title))
+        return bucket[0] if bucket else None
+
+    def find_by_code(self, code: str) -> Optional[Dict]:
+        bucket = self.by_code.get(normalize_code(code))
+        return bucket[0] if bucket else None
+
+    def position(self, song: Dict) -> int:
+        """Index of the song in the catalog list."""
+        return self._pos[id(song)]
+
+    def songs_for_act(self, act_id: str) -> List[Dict]:
+        return list(self.by_act.get(act_id, []))
+
+    def next_song_id(self, year: str) -> str:
+        """Next RS-YYYY-NNNN ID, one past the highest sequence ever seen for the year."""
+        seq = self.year_seq.get(year, 0) + 1
+        return f"RS-{year}-{seq:04d}"
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Write-Ahead Journal
+Each mutation is appended to data/catalog.journal.jsonl as one JSON line
+({"op", "song_id", "patch", "seq"}) and fsync'd, instead of rewriting catalog.json
+and supervisors.json. On load the journal is replayed over the snapshot.
+Once it grows past JOURNAL_MAX_BYTES or JOURNAL_MAX_OPS the manager compacts:
+snapshots are rewritten atomically (tmp + fsync + rename) and the log reset.
+
+Every snapshot records the highest seq folded into it ("journal_seq"), and
+replay skips records at or below it. That keeps a snapshot written by another
+process (watch_and_upload.py saves catalog.json without resetting the log)
+from having its newer values undone by the records it already contains.
+Supervisor records are checked against supervisors.json's mark, the rest
+against catalog.json's. Records without a seq predate the mark and are
+always applied.
+
+Ops are idempotent "set" operations, so replaying a journal over a snapshot
+that already contains it (crash between snapshot rename and log truncation)
+converges to the same state:
+- add        song_id, patch = full song (upsert by song_id)
+- update     song_id, patch = {top-level key: new value}
+- supervisor patch = full supervisor record (upsert by name, as the manager looks them up)
+- meta       patch = {catalog key: value} for non-song keys (e.g. albums)
+A record without its trailing newline or with invalid JSON is a torn write
+from a crash; replay stops there and truncates it away.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+JOURNAL_FILE = "catalog.journal.jsonl"
+JOURNAL_MAX_BYTES = 2 * 1024 * 1024
+JOURNAL_MAX_OPS = 500
+JOURNAL_OPS = ("add", "update", "supervisor", "meta")
+SEQ_KEY = "journal_seq"
+
+
+def _fsync_dir(path: Path):
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return  # e.g. Windows: directories can't be opened
+    try: os.fsync(fd)
+    except OSError: pass
+    finally: os.close(fd)
+
+
+def atomic_write_json(path: Path, data: Dict):
+    """Write JSON so readers see either the old or the new file, never half of one."""
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=2, default=str)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    _fsync_dir(path.parent)
+
+
+def _first(items: List[Dict], key: str, value) -> Optional[Dict]:
+    return next((item for item in items if item.get(key) == value), None)
+
+
+def apply_record(record: Dict, catalog: Dict, supervisors: Dict):
+    """Apply one journal record to the in-memory documents."""
+    op, patch = record["op"], record.get("patch") or {}
+    if op == "add":
+        songs = catalog.setdefault("songs", [])
+        song = _first(songs, "song_id", record["song_id"])
+        if song is None: songs.append(patch)
+        else: song.clear(); song.update(patch)
+    elif op == "update":
+        song = _first(catalog.setdefault("songs", []), "song_id", record["song_id"])
+        if song is not None: song.update(patch)
+    elif op == "supervisor":
+        people = supervisors.setdefault("supervisors", [])
+        name = str(patch.get("name", "")).lower()
+        person = next((s for s in people if str(s.get("name", "")).lower() == name), None)
+        if person is None: people.append(patch)
+        else: person.clear(); person.update(patch)
+    elif op == "meta":
+        catalog.update({k: v for k, v in patch.items() if k not in ("songs", SEQ_KEY)})
+    else:
+        raise ValueError(f"Unknown journal op: {op}")
+
+
+def replay_records(records: List[Dict], catalog: Dict, supervisors: Dict):
+    """Apply the records not yet folded into their snapshot; return (applied, highest seq seen)."""
+    catalog_mark, supervisors_mark = catalog.get(SEQ_KEY, 0), supervisors.get(SEQ_KEY, 0)
+    last, applied = max(catalog_mark, supervisors_mark), 0
+    for record in records:
+        seq = record.get("seq")
+        if seq is not None:
+            last = max(last, seq)
+            if seq <= (supervisors_mark if record["op"] == "supervisor" else catalog_mark): continue
+        apply_record(record, catalog, supervisors)
+        applied += 1
+    return applied, last
+
+
+def read_journal(path: Path):
+    """Return (records, good_bytes): every complete record and the offset just past the last one."""
+    path = Path(path)
+    if not path.exists(): return [], 0
+    data = path.read_bytes()
+    records, offset = [], 0
+    while offset < len(data):
+        end = data.find(b"\n", offset)
+        if end == -1: break  # torn tail: never got its newline
+        try:
+            record = json.loads(data[offset:end])
+        except ValueError:
+            break
+        if not isinstance(record, dict) or record.get("op") not in JOURNAL_OPS: break
+        records.append(record)
+        offset = end + 1
+    return records, offset
+
+
+class CatalogJournal:
+    def __init__(self, data_dir: Path, max_bytes: int = JOURNAL_MAX_BYTES, max_ops: int = JOURNAL_MAX_OPS):
+        self.data_dir = Path(data_dir)
+        self.path = self.data_dir / JOURNAL_FILE
+        self.max_bytes = max_bytes
+        self.max_ops = max_ops
+        self.ops = 0
+        self.size = 0
+        self.seq = 0
+        self._fd = None
+
+    def replay(self, catalog: Dict, supervisors: Dict) -> int:
+        """Apply journaled ops to freshly loaded snapshots; drop any torn tail. Returns the count applied."""
+        records, good_bytes = read_journal(self.path)
+        applied, self.seq = replay_records(records, catalog, supervisors)
+        if self.path.exists() and self.path.stat().st_size > good_bytes:
+            with open(self.path, 'r+b') as f:
+                f.truncate(good_bytes)
+                os.fsync(f.fileno())
+            print(f"⚠️ Journal: discarded torn record after op {len(records)}")
+        self.ops, self.size = len(records), good_bytes
+        return applied
+
+    def append(self, op: str, song_id: str = None, patch: Dict = None):
+        """Durably append one op; returns once it is on disk."""
+        if op not in JOURNAL_OPS: raise ValueError(f"Unknown journal op: {op}")
+        record = {"op": op, "song_id": song_id, "patch": patch or {}, "seq": self.seq + 1}
+        line = (json.dumps(record, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+        if self._fd is None:
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        written = 0
+        while written < len(line): written += os.write(self._fd, line[written:])
+        os.fsync(self._fd)
+        self.seq += 1
+        self.ops += 1
+        self.size += len(line)
+
+    def should_compact(self) -> bool:
+        return self.ops >= self.max_ops or self.size >= self.max_bytes
+
+    def compact(self, snapshots: Dict[str, Dict]):
+        """Atomically rewrite each snapshot file, then reset the journal."""
+        for filename, data in snapshots.items():
+            data[SEQ_KEY] = self.seq
+            atomic_write_json(self.data_dir / filename, data)
+        # A crash here leaves ops that are already in the snapshot; replay is idempotent
+        if self._fd is not None:
+            os.ftruncate(self._fd, 0)
+            os.fsync(self._fd)
+        elif self.path.exists():
+            with open(self.path, 'r+b') as f:
+                f.truncate(0)
+                os.fsync(f.fileno())
+        self.ops = self.size = 0
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
@@ -18,6 +18,9 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 from collections import defaultdict
+from catalog_index import CatalogIndex
+from catalog_journal import CatalogJournal, JOURNAL_FILE, SEQ_KEY
+from catalog_db import CatalogDB, DB_FILE
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -31,6 +34,8 @@ EXPORTS_DIR = BASE_DIR / "exports"
 DASHBOARDS_DIR = BASE_DIR / "dashboards"
 BACKUPS_DIR = BASE_DIR / "backups"
 PITCH_DECKS_DIR = BASE_DIR / "pitch_decks"
+# "sqlite" also mirrors the catalog into data/catalog.db for indexed summaries/pitch search
+CATALOG_BACKEND = os.environ.get("CATALOG_BACKEND", "json")
 ACT_IDS = { "FROZEN_CLOUD": "FROZEN_CLOUD", "FC": "FROZEN_CLOUD", "PARK_BELLEVUE": "PARK_BELLEVUE", "PB": "PARK_BELLEVUE", "BAJAN_SUN": "BAJAN_SUN", "BS": "BAJAN_SUN" }
 DEFAULT_SPLITS = {
     "FROZEN_CLOUD": [{"writer_id": "W-0001", "percentage": 50}, {"writer_id": "W-0002", "percentage": 50}],
@@ -41,12 +46,16 @@ DEFAULT_SPLITS = {
 # CATALOG MANAGER CLASS
 # ============================================================================
 class CatalogManager:
-    def __init__(self, data_dir: Path = DATA_DIR):
+    def __init__(self, data_dir: Path = DATA_DIR, backend: str = None):
         self.data_dir = Path(data_dir)
+        self.backend = (backend or CATALOG_BACKEND).lower()
+        self.db = None
+        self._pitch_index = None  # built on first brief match
         self.catalog = {"songs": []}
         self.supervisors = {"supervisors": []}
         BACKUPS_DIR.mkdir(parents=True, exist_ok=True)
         PITCH_DECKS_DIR.mkdir(parents=True, exist_ok=True)
+        self.journal = CatalogJournal(self.data_dir)
         self._load_data()
     def _load_data(self):
         files = ["catalog.json", "writers.json", "acts.json", "supervisors.json", "integrations.json"]
@@ -58,6 +67,33 @@ class CatalogManager:
                 with open(p, 'r') as f: setattr(self, attr, json.load(f))
         if not hasattr(self, 'catalog'): self.catalog = {"songs": []}
         if not hasattr(self, 'supervisors'): self.supervisors = {"supervisors": []}
+        replayed = self.journal.replay(self.catalog, self.supervisors)
+        if replayed: print(f"📜 Replayed {replayed} journaled change(s)")
+        self.index = CatalogIndex(self.catalog.setdefault("songs", []))
+        if self.backend == "sqlite": self._open_db()
+    def _source_signature(self) -> str:
+        """Identifies the on-disk JSON state (snapshot + journal) the SQLite mirror reflects."""
+        parts = []
+        for p in (self.data_dir / "catalog.json", self.data_dir / JOURNAL_FILE):
+            st = p.stat() if p.exists() else None
+            parts.append(f"{st.st_mtime_ns}:{st.st_size}" if st else "-")
+        return "|".join(parts)
+    def _open_db(self):
+        self.db = CatalogDB(self.data_dir / DB_FILE)
+        if self.db.source() != self._source_signature():
+            self.db.rebuild(self.catalog, getattr(self, "writers", None))
+            self.db.set_source(self._source_signature())
+    def _sync_db(self, op: str, song_id: str = None, patch: Dict = None):
+        if op in ("add", "update"):
+            song = self.find_song_by_id((patch or {}).get("song_id", song_id))
+            if song: self.db.upsert_song(self.index.position(song), song)
+        elif op == "meta":
+            self.db.set_catalog_meta(self.catalog)
+        self.db.set_source(self._source_signature())
+    def _songs_index(self) -> CatalogIndex:
+        # Callers (e.g. the Streamlit app) may replace self.catalog wholesale
+        self.index.ensure_fresh(self.catalog.setdefault("songs", []))
+        return self.index
     def _backup_data(self):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_path = BACKUPS_DIR / f"catalog_backup_{timestamp}.json"
@@ -66,19 +102,37 @@ class CatalogManager:
         backups = sorted(glob.glob(str(BACKUPS_DIR / "catalog_backup_*.json")))
         while len(backups) > 10: os.remove(backups.pop(0))
         return str(backup_path)
-    def save_data(self):
+    def _journal(self, op: str, song_id: str = None, patch: Dict = None):
+        """Durably record one mutation; compact once the journal is large enough."""
+        self.journal.append(op, song_id, patch)
+        if self.journal.should_compact(): self.compact()
+        if self.db: self._sync_db(op, song_id, patch)
+        if self._pitch_index is not None and op in ("add", "update"):
+            song = self.find_song_by_id((patch or {}).get("song_id", song_id))
+            if song: self._pitch_index.upsert(self.index.position(song), song)
+    def compact(self):
+        """Fold the journal into fresh catalog.json/supervisors.json snapshots (one backup per compaction)."""
         try: self._backup_data()
         except: pass
-        data_map = {"catalog.json": self.catalog, "supervisors.json": self.supervisors}
-        for filename, data in data_map.items():
-            with open(self.data_dir / filename, 'w') as f: json.dump(data, f, indent=2, default=str)
+        self.journal.compact({"catalog.json": self.catalog, "supervisors.json": self.supervisors})
+        if self.db: self.db.set_source(self._source_signature())
         print(f"✅ Data saved to {self.data_dir}")
+    def save_data(self):
+        """Force a full snapshot now (e.g. after editing self.catalog directly)."""
+        self.compact()
+        if self.db:
+            self.db.rebuild(self.catalog, getattr(self, "writers", None))
+            self.db.set_source(self._source_signature())
+    def save_catalog(self):
+        """Journal the catalog's non-song sections (albums etc.) after in-place edits."""
+        self._journal("meta", patch={k: v for k, v in self.catalog.items() if k not in ("songs", SEQ_KEY)})
     # ========================================================================
     # PHASE 5C: THE PITCH ENGINE (Shortcodes)
     # ========================================================================
     def process_shortcode(self, command: str) -> str:
         """
         > Pitch "Song" "Supervisor"
+        > Brief "moody night drive 90-110 bpm instrumental one-stop"
         > Cost "Song" 150 Category
         > Forecast "Song" 1m
         """
@@ -101,6 +155,10 @@ class CatalogManager:
             match = re.search(r'Cost "(.*?)" ([\d\.]+) (.*)', command, re.IGNORECASE)
             if not match: return "Format: > Cost \"Title\" 150 Category"
             return self.add_expense_shortcode(match.group(1), float(match.group(2)), match.group(3))
+        if cmd == "brief":
+            match = re.search(r'Brief "(.*?)"', command, re.IGNORECASE)
+            if not match: return "Format: > Brief \"moody night drive 90-110 bpm instrumental\""
+            return self.format_brief_matches(match.group(1))
         if cmd == "sync": return "Excel Sync Stub Executed."
         if cmd == "backup": return f"Backup: {self._backup_data()}"
         # > FC New / List
@@ -140,12 +198,29 @@ class CatalogManager:
             return f"✅ Added '{title}' to {act_id}{code_msg}"
 
         if action == "list":
-            songs = [s for s in self.catalog['songs'] if s['act_id'] == act_id]
+            songs = self._songs_index().songs_for_act(act_id)
             return self.format_results_table(songs[:10])
         return "Unknown command."
     # ========================================================================
     # PITCH LOGIC
     # ========================================================================
+    def pitch_index(self):
+        """TF-IDF index over sync metadata, built once and kept current by add_song/update_song."""
+        from pitch_index import PitchIndex  # numpy is only needed for brief matching
+        songs = self.catalog.setdefault("songs", [])
+        if self._pitch_index is None: self._pitch_index = PitchIndex(songs)
+        else: self._pitch_index.ensure_fresh(songs)
+        return self._pitch_index
+    def match_brief(self, brief: str, k: int = 5, **filters) -> List[Dict]:
+        """Rank songs for a sync brief. Filters: bpm_min, bpm_max, instrumental, one_stop, act_id."""
+        return self.pitch_index().search(brief, k=k, **filters)
+    def format_brief_matches(self, brief: str, k: int = 5) -> str:
+        from pitch_index import parse_brief
+        text, filters = parse_brief(brief)
+        matches = self.match_brief(text, k=k, **filters)
+        if not matches: return "No songs match that brief."
+        rows = [f"| {m['title']} | {m['act_id'].replace('_', ' ').title()} | {m['score']:.2f} | {m['why'] or '(filters only)'} |" for m in matches]
+        return "\n".join(["| Title | Act | Score | Why |", "|---|---|---|---|"] + rows)
     def execute_pitch_shortcode(self, song_title: str, supervisor_name: str) -> str:
         # 1. Find Song
         song = self.find_song_by_title(song_title)
@@ -166,7 +241,7 @@ class CatalogManager:
         }
         if "history" not in supervisor: supervisor["history"] = []
         supervisor["history"].append(pitch_entry)
-        self.save_data()
+        self._journal("supervisor", patch=supervisor)
         # 4. Generate HTML Page
         html_path = self.generate_pitch_html(song, supervisor)
         # 5. Draft Email
@@ -233,7 +308,11 @@ class CatalogManager:
         filename = Path(output_path).name
         user_path = USER_MAC_ROOT / "dashboards" / filename
         return user_path.as_uri()
+    # With the SQLite mirror, the summaries (and so the dashboard) run as SQL. Song lookups
+    # (> Pitch, > Forecast) stay on CatalogIndex, a dict hit; brief ranking stays on PitchIndex
+    # in both backends so results never depend on the backend (catalog_db.py pitch is the FTS CLI).
     def get_catalog_summary(self) -> Dict:
+        if self.db: return self.db.catalog_summary()
         songs = self.catalog.get("songs", [])
         by_act = {}
         by_status = {}
@@ -244,22 +323,19 @@ class CatalogManager:
             by_status[status] = by_status.get(status, 0) + 1
         return {"total_songs": len(songs), "by_act": by_act, "by_status": by_status}
     def get_revenue_summary(self) -> Dict:
-        total = sum(s.get("revenue", {}).get("total_earned", 0) for s in self.catalog.get("songs", []))
+        if self.db: return self.db.revenue_summary()
+        total = sum(s.get("revenue", {}).get("total_earned") or 0 for s in self.catalog.get("songs", []))
         return {"total_revenue": total, "sync_income": 0, "top_earners": []}
     # ========================================================================
     # HELPERS (Preserved from v5.1)
     # ========================================================================
+    def find_song_by_id(self, song_id: str) -> Optional[Dict]:
+        return self._songs_index().get(song_id)
     def find_song_by_title(self, title: str) -> Optional[Dict]:
-        for s in self.catalog["songs"]:
-            if s["title"].lower() == title.lower(): return s
-        return None
+        return self._songs_index().find_by_title(title)
     def find_song_by_code(self, code: str) -> Optional[Dict]:
         """Find a song by its 4-letter legacy code."""
-        code_upper = code.upper().strip()
-        for s in self.catalog["songs"]:
-            if s.get("legacy_code", "").upper() == code_upper:
-                return s
-        return None
+        return self._songs_index().find_by_code(code)
     def is_code_unique(self, code: str) -> bool:
         """Check if a 4-letter code is unique (not already used)."""
         return self.find_song_by_code(code) is None
@@ -330,8 +406,8 @@ class CatalogManager:
 
         writers = DEFAULT_SPLITS.get(act_id, DEFAULT_SPLITS["FROZEN_CLOUD"])
         year = str(datetime.now().year)
-        count = sum(1 for s in self.catalog["songs"] if s["song_id"].startswith(f"RS-{year}"))
-        song_id = f"RS-{year}-{count + 1:04d}"
+        # Highest sequence seen this year + 1, so deleted songs never free up an ID
+        song_id = self._songs_index().next_song_id(year)
         # Determine artist name (default to act name if not provided)
         if not artist:
             artist_map = {
@@ -362,35 +438,37 @@ class CatalogManager:
             song["is_cover"] = True
             song["cover_of"] = cover_of
         self.catalog["songs"].append(song)
-        self.save_data()
+        self.index.add(song)
+        self._journal("add", song_id, song)
         return song
     def update_song(self, song_id: str, updates: dict) -> bool:
         """Updates an existing song's details (status, deployments, ISRC, ISWC, etc.)."""
-        for song in self.catalog['songs']:
-            if song['song_id'] == song_id:
-                # Handle nested updates for registration info (ISRC, ISWC, etc.)
-                if 'registration' in updates:
-                    if 'registration' not in song:
-                        song['registration'] = {}
-                    song['registration'].update(updates.pop('registration'))
+        song = self.find_song_by_id(song_id)
+        if not song: return False
+        # Handle nested updates for registration info (ISRC, ISWC, etc.)
+        touched = set(updates) | {'dates'}
+        if 'registration' in updates:
+            if 'registration' not in song:
+                song['registration'] = {}
+            song['registration'].update(updates.pop('registration'))
 
-                # Handle nested updates for deployments
-                if 'deployments' in updates:
-                    if 'deployments' not in song:
-                        song['deployments'] = {"distribution": [], "sync_libraries": [], "streaming": []}
-                    song['deployments'].update(updates.pop('deployments'))
+        # Handle nested updates for deployments
+        if 'deployments' in updates:
+            if 'deployments' not in song:
+                song['deployments'] = {"distribution": [], "sync_libraries": [], "streaming": []}
+            song['deployments'].update(updates.pop('deployments'))
 
-                # Apply remaining updates
-                song.update(updates)
+        # Apply remaining updates
+        song.update(updates)
 
-                # Update timestamp
-                if 'dates' not in song:
-                    song['dates'] = {}
-                song['dates']['last_modified'] = datetime.now().isoformat()
+        # Update timestamp
+        if 'dates' not in song:
+            song['dates'] = {}
+        song['dates']['last_modified'] = datetime.now().isoformat()
+        self.index.reindex(song)
 
-                self.save_data()
-                return True
-        return False
+        self._journal("update", song_id, {k: song[k] for k in touched if k in song})
+        return True
 
     def add_expense_shortcode(self, title: str, amount: float, category: str) -> str:
         song = self.find_song_by_title(title)
@@ -398,7 +476,7 @@ class CatalogManager:
         if "revenue" not in song: song["revenue"] = {}
         if "expenses" not in song["revenue"]: song["revenue"]["expenses"] = []
         song["revenue"]["expenses"].append({"date": datetime.now().strftime("%Y-%m-%d"), "amount": amount, "category": category})
-        self.save_data()
+        self._journal("update", song["song_id"], {"revenue": song["revenue"]})
         return f"💸 Logged ${amount} for {title}."
     def simulate_royalties(self, title: str, amount_str: str) -> str:
         song = self.find_song_by_title(title)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Journal Crash-Safety Check
+Runs a scripted edit session against a throwaway data dir, then simulates a
+crash at points inside every journal record (by truncating the log) and
+checks each reload recovers exactly the state after the last complete record.
+Also checks recovery when a crash hits between snapshot and log reset, that
+compaction backs up once per compaction, that a catalog.json saved by
+watch_and_upload.py (which leaves the log alone) is not undone by the next
+replay, and compares bytes written with the old rewrite-everything save_data.
+Usage: python3 scripts/check_catalog_journal.py [--edits 200]
+"""
+import argparse
+import contextlib
+import io
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import catalog_manager
+import watch_and_upload
+from catalog_journal import JOURNAL_FILE, atomic_write_json, read_journal
+from catalog_manager import CatalogManager
+
+SEED_CATALOG = {
+    "songs": [
+        {"song_id": "RS-2026-0001", "title": "Getting Old", "act_id": "FROZEN_CLOUD", "legacy_code": "GETO",
+         "status": "mastered", "revenue": {"expenses": [], "total_earned": 0}, "dates": {}},
+        {"song_id": "RS-2026-0002", "title": "Harbor Lights", "act_id": "PARK_BELLEVUE", "legacy_code": "HARB",
+         "status": "demo", "revenue": {"expenses": [], "total_earned": 0}, "dates": {}},
+    ],
+    "albums": [],
+}
+
+
+def quiet(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def load(data_dir: Path) -> CatalogManager:
+    return quiet(CatalogManager, data_dir=data_dir)
+
+
+def state(manager: CatalogManager):
+    return json.loads(json.dumps([manager.catalog, manager.supervisors], default=str))
+
+
+def edit_session(manager: CatalogManager, edits: int):
+    """Yield the expected state after each journaled mutation."""
+    yield state(manager)
+    for i in range(edits):
+        kind = i % 5
+        if kind == 0:
+            quiet(manager.add_song, f"Session Song {i}", "BAJAN_SUN", status="idea")
+        elif kind == 1:
+            quiet(manager.update_song, "RS-2026-0001", {"status": f"take-{i}", "registration": {"isrc": f"US-RS-{i}"}})
+        elif kind == 2:
+            quiet(manager.add_expense_shortcode, "Harbor Lights", 10.0 + i, "Mixing")
+        elif kind == 3:
+            quiet(manager.execute_pitch_shortcode, "Getting Old", f"Supervisor {i % 3}")
+        else:
+            manager.catalog["albums"].append({"album_id": f"ALB-{i}", "title": f"Album {i}"})
+            quiet(manager.save_catalog)
+        yield state(manager)
+
+
+def crash_offsets(journal: bytes):
+    """Offsets inside and around every record: start, +1, middle, before and after its newline."""
+    offsets, start = set(), 0
+    while start < len(journal):
+        end = journal.index(b"\n", start)
+        offsets.update({start, start + 1, (start + end) // 2, end, end + 1})
+        start = end + 1
+    return sorted(o for o in offsets if o <= len(journal))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check catalog journal crash safety")
+    parser.add_argument("--edits", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        catalog_manager.BACKUPS_DIR = tmp / "backups"
+        catalog_manager.PITCH_DECKS_DIR = tmp / "pitch_decks"
+        base = tmp / "base"
+        base.mkdir()
+        (base / "catalog.json").write_text(json.dumps(SEED_CATALOG, indent=2))
+
+        # 1. Edit session with compaction disabled, so the whole session is in the log
+        work = tmp / "work"
+        shutil.copytree(base, work)
+        manager = load(work)
+        manager.journal.max_ops = manager.journal.max_bytes = float("inf")
+        expected = list(edit_session(manager, args.edits))
+        manager.journal.close()
+        journal = (work / JOURNAL_FILE).read_bytes()
+        assert len(read_journal(work / JOURNAL_FILE)[0]) == args.edits
+        assert load(work).catalog == manager.catalog, "clean replay differs from live state"
+
+        # 2. Crash mid-record: recover the last complete record, then keep journaling
+        offsets = crash_offsets(journal)
+        for offset in offsets:
+            crashed = tmp / "crashed"
+            shutil.rmtree(crashed, ignore_errors=True)
+            shutil.copytree(base, crashed)
+            (crashed / JOURNAL_FILE).write_bytes(journal[:offset])
+            complete = journal[:offset].count(b"\n")
+            recovered = load(crashed)
+            assert state(recovered) == expected[complete], f"wrong state after crash at byte {offset}"
+            if offset in (offsets[len(offsets) // 2], offsets[-2]):
+                quiet(recovered.update_song, "RS-2026-0002", {"status": "after-crash"})
+                recovered.journal.close()
+                again = load(crashed)
+                assert again.find_song_by_id("RS-2026-0002")["status"] == "after-crash"
+                again.journal.close()
+            recovered.journal.close()
+        print(f"✅ Torn-write recovery: {len(offsets)} crash points across {args.edits} records")
+
+        # 3. Crash after snapshot rename but before the log was reset: replay is idempotent
+        atomic_write_json(work / "catalog.json", manager.catalog)
+        atomic_write_json(work / "supervisors.json", manager.supervisors)
+        assert state(load(work)) == expected[-1], "double-applied journal diverged"
+        print("✅ Snapshot-then-crash recovery: journal replay is idempotent")
+
+        # 4. Compaction: one backup per compaction, log bounded
+        compacting = tmp / "compacting"
+        shutil.copytree(base, compacting)
+        manager = load(compacting)
+        manager.journal.max_ops = 50
+        backups, backup = [], manager._backup_data
+        manager._backup_data = lambda: backups.append(quiet(backup))
+        *_, final = edit_session(manager, args.edits)
+        assert len(backups) == args.edits // 50, backups
+        journal_ops = len(read_journal(compacting / JOURNAL_FILE)[0])
+        assert journal_ops == args.edits % 50, journal_ops
+        assert state(load(compacting)) == final, "compacted snapshot + journal differs from live state"
+        print(f"✅ Compaction: {args.edits // 50} compaction(s), {journal_ops} op(s) left in journal, "
+              f"{len(backups)} backup(s) taken")
+
+        # 5. Manager adds a song -> watcher saves catalog.json -> manager reloads
+        shared = tmp / "shared"
+        shutil.copytree(base, shared)
+        watch_and_upload.CATALOG_JSON_PATH = shared / "catalog.json"
+        watch_and_upload.CATALOG_MANAGER_ROOT = tmp
+        manager = load(shared)
+        song_id = quiet(manager.add_song, "Uploaded Later", "BAJAN_SUN", status="idea")["song_id"]
+        quiet(manager.update_song, "RS-2026-0001", {"status": "manager-edit"})
+        manager.journal.close()
+
+        catalog = watch_and_upload.load_catalog()
+        uploaded = next(s for s in catalog["songs"] if s["song_id"] == song_id)
+        uploaded.setdefault("links", {})["r2_path"] = "Bajan_Sun/Singles/Uploaded_Later.wav"
+        uploaded["status"] = "demo"
+        uploaded["audio"] = {"bitrate": 1411, "sample_rate": 44100, "channels": 2, "artwork_sha256": []}
+        next(s for s in catalog["songs"] if s["song_id"] == "RS-2026-0001")["status"] = "watcher-edit"
+        quiet(watch_and_upload.save_catalog, catalog)
+        watcher_state = json.loads(json.dumps(catalog))
+
+        reloaded = load(shared)
+        assert reloaded.catalog == watcher_state, "replay undid the watcher's snapshot"
+        assert reloaded.find_song_by_id(song_id)["links"]["r2_path"] and reloaded.find_song_by_id(song_id)["audio"]
+        # Later manager edits still replay, on top of the watcher's values
+        quiet(reloaded.update_song, song_id, {"status": "pitched"})
+        reloaded.journal.close()
+        shared_journal = (shared / JOURNAL_FILE).read_bytes()
+        after = load(shared)
+        assert after.find_song_by_id(song_id)["status"] == "pitched"
+        assert after.find_song_by_id(song_id)["links"]["r2_path"] == uploaded["links"]["r2_path"]
+        assert after.find_song_by_id("RS-2026-0001")["status"] == "watcher-edit"
+        after.journal.close()
+        # A torn last record falls back to exactly the watcher's snapshot
+        (shared / JOURNAL_FILE).write_bytes(shared_journal[:-5])
+        torn = load(shared)
+        assert torn.catalog == watcher_state, "torn replay over the watcher's snapshot diverged"
+        torn.journal.close()
+        assert watch_and_upload.load_catalog() == watcher_state
+        print("✅ Watcher snapshot: add -> watcher save -> reload keeps r2_path/status/audio; "
+              "later edits and torn records replay on top")
+
+        # 6. Bytes written for the session vs. rewriting both snapshots on every edit
+        snapshot_bytes = sum(len(json.dumps(doc, indent=2, default=str)) for doc in expected[-1])
+        print(f"📉 {args.edits} edits: journal wrote {len(journal):,} bytes; "
+              f"per-edit snapshots would write ~{snapshot_bytes * args.edits:,} bytes on this tiny catalog")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
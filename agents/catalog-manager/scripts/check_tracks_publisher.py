@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - tracks.json Publisher Check
+Drives TracksPublisher with a fake clock against the local S3 stand-in:
+- N rapid song changes inside the quiet window publish exactly once
+- a change that leaves the website's tracks as they were uploads nothing
+- the incrementally assembled document equals a full update_tracks_json rebuild
+- tracks.json.gz carries Content-Encoding: gzip and inflates to tracks.json
+- a publisher seeded from the live tracks.json does not republish on restart
+- songs sharing a song_id (as in the real catalog) are all published and
+  updated individually
+- process_file through the UploadExecutor defers to the publisher
+Usage: python3 scripts/check_tracks_publisher.py [--events 25]
+"""
+import argparse
+import contextlib
+import gzip
+import io
+import json
+import os
+import sys
+import tempfile
+import wave
+from pathlib import Path
+
+import watch_and_upload
+from s3_standin import S3StandIn
+from watch_and_upload import R2Client, TracksPublisher, UploadExecutor, update_tracks_json
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+def song(i: int, **changes) -> dict:
+    entry = {"song_id": f"RM-{i:04d}", "title": f"Track {i}", "artist": "Ridgemont", "album": "Checks",
+             "status": "finished", "links": {"r2_path": f"Ridgemont/Checks/Track {i}.wav"},
+             "musical_info": {"duration_seconds": 180 + i, "genre": "Folk"}, "dates": {"created": "2025-01-02"}}
+    entry.update(changes)
+    return entry
+
+
+def puts(server: S3StandIn) -> int:
+    return server.requests.get("PutObject", 0)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check debounced tracks.json publishing")
+    parser.add_argument("--events", type=int, default=25)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        server = S3StandIn(tmp / "s3").start()
+        os.environ.update({"CLOUDFLARE_R2_ACCESS_KEY_ID": "check", "CLOUDFLARE_R2_SECRET_ACCESS_KEY": "check",
+                           "R2_BUCKET_NAME": "check"})
+        r2 = R2Client(endpoint_url=server.endpoint_url, ledger_path=tmp / "ledger.db")
+        r2.client.create_bucket(Bucket=r2.bucket_name)
+        out = io.StringIO()
+
+        catalog = {"songs": [song(i) for i in range(3)] + [song(3, status="draft")]}
+        clock = FakeClock()
+        publisher = TracksPublisher(r2, quiet_seconds=5, clock=clock)
+        publisher.seed(catalog)
+
+        # A burst of N changes, each inside the window of the one before
+        with contextlib.redirect_stdout(out):
+            for i in range(args.events):
+                clock.advance(1)
+                assert not publisher.poll()
+                new = song(10 + i)
+                catalog["songs"].append(new)
+                publisher.song_changed(new)
+            clock.advance(4.9)
+            assert not publisher.poll()
+            clock.advance(0.2)
+            assert publisher.poll()
+            assert not publisher.poll()
+        assert publisher.publishes == 1 and puts(server) == 2, (publisher.publishes, server.requests)
+        print(f"✅ {args.events} rapid changes -> 1 publish (tracks.json + tracks.json.gz)")
+
+        # gzip variant
+        obj = r2.client.get_object(Bucket=r2.bucket_name, Key="tracks.json.gz")
+        assert obj["ContentEncoding"] == "gzip" and obj["ContentType"] == "application/json"
+        body = obj["Body"].read()
+        plain = r2.client.get_object(Bucket=r2.bucket_name, Key="tracks.json")["Body"].read()
+        assert gzip.decompress(body) == plain
+        print(f"✅ tracks.json.gz: Content-Encoding gzip, {len(body):,} of {len(plain):,} bytes, inflates to tracks.json")
+
+        # Incremental assembly matches the full rebuild
+        published = r2.get_json("tracks.json")
+        with contextlib.redirect_stdout(out):
+            update_tracks_json(r2, catalog)
+        assert published == r2.get_json("tracks.json") and len(published["tracks"]) == 3 + args.events
+        print(f"✅ incremental document == full rebuild ({len(published['tracks'])} tracks)")
+
+        # No-op: status flips between two unpublished states, a re-save of the same song
+        before = puts(server)
+        with contextlib.redirect_stdout(out):
+            publisher.song_changed(song(3, status="demo"))
+            publisher.song_changed(song(0))
+            clock.advance(10)
+            assert not publisher.poll()
+        assert puts(server) == before and publisher.publishes == 1
+        print("✅ changes that leave the tracks unchanged upload nothing")
+
+        # A real edit, then a revert inside the same window: still nothing to publish
+        with contextlib.redirect_stdout(out):
+            publisher.song_changed(song(1, title="Renamed"))
+            publisher.song_changed(song(1))
+            clock.advance(10)
+            assert not publisher.poll()
+            publisher.song_changed(song(2, status="draft"))
+            clock.advance(10)
+            assert publisher.poll()
+        assert puts(server) == before + 2 and len(r2.get_json("tracks.json")["tracks"]) == 2 + args.events
+        print("✅ edit + revert coalesced to nothing; unpublishing a song republishes once")
+
+        # Restart: seeded from the live document, nothing to do
+        catalog["songs"][2]["status"] = "draft"
+        restarted = TracksPublisher(r2, quiet_seconds=5, clock=clock)
+        restarted.seed(catalog, r2.get_json(TracksPublisher.KEY))
+        with contextlib.redirect_stdout(out):
+            assert not restarted.flush()
+        print("✅ restart seeded from the live tracks.json does not republish")
+
+        # Duplicate song_ids: every track is kept, and an edit touches only its own entry
+        shared = {"songs": [song(i, song_id="RS-2026-1272341") for i in range(40, 43)] + [song(43)]}
+        twins = TracksPublisher(r2, quiet_seconds=5, clock=clock)
+        twins.seed(shared)
+        shared["songs"][1]["title"] = "Canzonet"
+        with contextlib.redirect_stdout(out):
+            twins.song_changed(shared["songs"][1])
+            clock.advance(10)
+            assert twins.poll()
+            incremental = r2.get_json("tracks.json")
+            update_tracks_json(r2, shared)
+        assert incremental == r2.get_json("tracks.json") and len(incremental["tracks"]) == 4, incremental
+        assert [t["title"] for t in incremental["tracks"]] == ["Track 40", "Canzonet", "Track 42", "Track 43"]
+        print("✅ three songs sharing a song_id all published; editing one updates only that track")
+
+        # process_file defers to the publisher; the worker thread publishes after the drop goes quiet
+        watch_and_upload.WATCH_FOLDER = drop = tmp / "drop"
+        watch_and_upload.COMPLETED_FOLDER = drop / "Completed"
+        watch_and_upload.CATALOG_MANAGER_ROOT = tmp
+        watch_and_upload.CATALOG_JSON_PATH = catalog_path = tmp / "data" / "catalog.json"
+        catalog_path.parent.mkdir()
+        catalog_path.write_text(json.dumps({"songs": []}))
+        drop.mkdir()
+        files = []
+        for i in range(6):
+            files.append(drop / f"Drop {i}.wav")
+            with wave.open(str(files[-1]), "wb") as w:
+                w.setnchannels(1)
+                w.setsampwidth(2)
+                w.setframerate(8000)
+                w.writeframes(bytes([i]) * 16000)
+        live = TracksPublisher(r2, quiet_seconds=0.3)
+        live.seed({"songs": []}, r2.get_json(TracksPublisher.KEY))
+        live.start()
+        before = puts(server)
+        executor = UploadExecutor(r2, 3, publisher=live)
+        with contextlib.redirect_stdout(out):
+            assert all(executor.process_all(files))
+            executor.shutdown()
+            live.stop()
+        assert puts(server) - before == len(files) + 2 and live.publishes == 1, server.requests
+        assert len(r2.get_json("tracks.json")["tracks"]) == len(files)
+        print(f"✅ process_file x{len(files)} via the executor: no per-file tracks.json, one publish on flush")
+
+        r2.ledger.close()
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
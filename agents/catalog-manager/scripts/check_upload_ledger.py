@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Upload Ledger Check
+Runs process_file against the local S3 stand-in with a throwaway catalog and
+checks the content-hash ledger decisions:
+- a new file is uploaded and recorded, and no HEAD is ever sent
+- the ETag computed locally matches the bucket's (multipart included)
+- a renamed duplicate is skipped and not cataloged twice
+- a changed file under the same name is re-uploaded and updates its song
+- --reconcile adds unknown objects, drops deleted ones, and an unknown object
+  is later matched by ETag + size
+- identical files dropped together upload once
+Usage: python3 scripts/check_upload_ledger.py
+"""
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import wave
+from pathlib import Path
+
+import watch_and_upload
+from s3_standin import S3StandIn
+from watch_and_upload import R2Client, UploadExecutor, process_file
+
+
+def write_wav(path: Path, seed: int, size_mb: int = 11) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    frames = (bytes([seed % 251]) + os.urandom(4095)) * (size_mb * 256)
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(2)
+        w.setsampwidth(2)
+        w.setframerate(44100)
+        w.writeframes(frames)
+    return path
+
+
+def uploads(server: S3StandIn) -> int:
+    return server.requests.get("CreateMultipartUpload", 0)
+
+
+def quietly(fn, *args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args)
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        server = S3StandIn(tmp / "s3").start()
+        os.environ.update({"CLOUDFLARE_R2_ACCESS_KEY_ID": "check", "CLOUDFLARE_R2_SECRET_ACCESS_KEY": "check",
+                           "R2_BUCKET_NAME": "check", "R2_MULTIPART_THRESHOLD_MB": "8", "R2_MULTIPART_CHUNK_MB": "5"})
+        watch_and_upload.WATCH_FOLDER = drop = tmp / "drop"
+        watch_and_upload.COMPLETED_FOLDER = drop / "Completed"
+        watch_and_upload.CATALOG_MANAGER_ROOT = tmp
+        watch_and_upload.CATALOG_JSON_PATH = catalog_path = tmp / "data" / "catalog.json"
+        catalog_path.parent.mkdir()
+        catalog_path.write_text(json.dumps({"songs": []}))
+        songs = lambda: json.loads(catalog_path.read_text())["songs"]
+
+        r2 = R2Client(endpoint_url=server.endpoint_url, ledger_path=tmp / "data" / "ledger.db")
+        r2.client.create_bucket(Bucket=r2.bucket_name)
+        key_a = "Unknown Artist/Unknown Album/Song A.wav"
+
+        # New content: uploaded (multipart) and recorded
+        song_a = write_wav(drop / "Song A.wav", 1)
+        assert quietly(process_file, song_a, r2)
+        entry = r2.ledger.get(key_a)
+        assert entry and entry["sha256"] and uploads(server) == 1 and len(songs()) == 1
+        print(f"✅ new file uploaded and recorded ({entry['etag']})")
+
+        # Local ETag fingerprint agrees with the bucket
+        counts = quietly(r2.reconcile_ledger)
+        assert counts == {"unchanged": 1, "added": 1, "changed": 0, "removed": 0}, counts  # + tracks.json
+        print("✅ reconcile: locally computed multipart ETag matches the bucket")
+
+        # Renamed duplicate: skipped, not cataloged again
+        shutil.copy(watch_and_upload.COMPLETED_FOLDER / "Song A.wav", drop / "Song A (copy).wav")
+        assert quietly(process_file, drop / "Song A (copy).wav", r2)
+        assert uploads(server) == 1 and len(songs()) == 1 and not (drop / "Song A (copy).wav").exists()
+        print("✅ renamed duplicate skipped without upload or new catalog entry")
+
+        # Changed content, same name: re-uploaded, song updated in place
+        old_sha = entry["sha256"]
+        assert quietly(process_file, write_wav(drop / "Song A.wav", 2), r2)
+        assert uploads(server) == 2 and len(songs()) == 1
+        assert r2.ledger.get(key_a)["sha256"] != old_sha
+        assert songs()[0]["events"][-1]["event_type"] == "audio_replaced"
+        print("✅ changed file re-uploaded under its key; catalog entry updated, not duplicated")
+
+        # Reconcile after out-of-band changes; an unknown object is adopted by ETag
+        legacy = write_wav(tmp / "legacy.wav", 3, size_mb=1)
+        r2.client.put_object(Bucket=r2.bucket_name, Key="Legacy/Old Take.wav", Body=legacy.read_bytes())
+        r2.client.delete_object(Bucket=r2.bucket_name, Key=key_a)
+        counts = quietly(r2.reconcile_ledger)
+        assert counts["added"] == 1 and counts["removed"] == 1, counts
+        assert r2.ledger.get("Legacy/Old Take.wav")["sha256"] is None
+        shutil.copy(legacy, drop / "Rediscovered.wav")
+        assert quietly(process_file, drop / "Rediscovered.wav", r2)
+        assert uploads(server) == 2
+        assert r2.ledger.get("Legacy/Old Take.wav")["sha256"]
+        assert songs()[-1]["links"]["r2_path"] == "Legacy/Old Take.wav"
+        print(f"✅ reconcile {counts}; unknown object matched by ETag + size, not re-uploaded")
+
+        # Identical files dropped at once upload once
+        twin = write_wav(drop / "Twin 1.wav", 4)
+        shutil.copy(twin, drop / "Twin 2.wav")
+        executor = UploadExecutor(r2, 2)
+        results = quietly(executor.process_all, [drop / "Twin 1.wav", drop / "Twin 2.wav"])
+        executor.shutdown()
+        assert all(results) and uploads(server) == 3, server.requests
+        assert not r2.ledger._reserved, r2.ledger._reserved
+        print("✅ concurrent identical drops uploaded once; no reservations left behind")
+
+        assert "HeadObject" not in server.requests, server.requests
+        print(f"✅ no HEAD requests; {dict(sorted(server.requests.items()))}")
+        r2.ledger.close()
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Write Completion Check
+Runs UploadHandler under a real watchdog Observer (inotify on Linux, so close
+events) and a PollingObserver (no close events) against simulated copies,
+recording when each file is handed to the executor:
+- a slow chunked write, file held open: not submitted until the last chunk
+- a writer that reopens and appends each chunk: not submitted early either
+- a file that vanishes mid-write is never submitted
+- a small file or an atomic rename is submitted within about a second,
+  instead of after the old fixed 3-6 s of sleeps
+- with polling only, a slow write is still not submitted early and the
+  stat interval backs off while it grows, even when the writer keeps an
+  hour-old mtime on the growing file (as cp -p / rsync -t do)
+- event dispatch returns immediately
+Usage: python3 scripts/check_write_tracker.py
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from watchdog.events import FileCreatedEvent
+from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
+
+import watch_and_upload
+from watch_and_upload import UploadHandler
+from write_tracker import WriteTracker
+
+CHUNK = os.urandom(64 * 1024)
+
+
+class RecordingExecutor:
+    """Stands in for UploadExecutor: records what would be uploaded, and when."""
+    publisher = None
+
+    def __init__(self):
+        self.submitted = {}
+        self.lock = threading.Lock()
+
+    def submit(self, fn, file_path):
+        with self.lock:
+            self.submitted.setdefault(file_path.name, []).append(time.monotonic())
+
+
+def slow_write(path: Path, chunks: int, gap: float, reopen: bool = False, mtime: float = None) -> float:
+    """Write `chunks` chunks `gap` seconds apart; returns when the last one landed.
+    With `mtime`, the file's mtime is set back to it after every chunk."""
+    if mtime is not None:
+        with open(path, "wb") as f:
+            for _ in range(chunks):
+                f.write(CHUNK)
+                f.flush()
+                os.utime(path, (mtime, mtime))
+                time.sleep(gap)
+    elif reopen:
+        for _ in range(chunks):
+            with open(path, "ab") as f:
+                f.write(CHUNK)
+            time.sleep(gap)
+    else:
+        with open(path, "wb") as f:
+            for _ in range(chunks):
+                f.write(CHUNK)
+                f.flush()
+                time.sleep(gap)
+    return time.monotonic()
+
+
+def wait_for(executor: RecordingExecutor, name: str, timeout: float = 10) -> float:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if name in executor.submitted:
+            return executor.submitted[name][0]
+        time.sleep(0.02)
+    raise AssertionError(f"{name} never submitted")
+
+
+def run(observer_cls, folder: Path, close_grace: float, settle: float):
+    watch_and_upload.WATCH_FOLDER = folder
+    folder.mkdir()
+    executor = RecordingExecutor()
+    handler = UploadHandler(None, executor, WriteTracker(None, close_grace=close_grace, settle=settle))
+    handler.tracker.on_ready = handler._submit
+    handler.tracker.start()
+    observer = observer_cls(timeout=0.1) if observer_cls is PollingObserver else observer_cls()
+    observer.schedule(handler, str(folder), recursive=False)
+    observer.start()
+    return executor, handler, observer
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+
+        # --- inotify: close events + polling ---
+        executor, handler, observer = run(Observer, tmp / "events", close_grace=0.5, settle=1.0)
+        folder = tmp / "events"
+
+        done = slow_write(folder / "Held Open.wav", chunks=16, gap=0.25)
+        submitted = wait_for(executor, "Held Open.wav")
+        assert submitted >= done, "submitted before the last chunk"
+        print(f"✅ held-open write over 4s: submitted {submitted - done:.2f}s after the last chunk")
+
+        done = slow_write(folder / "Reopened.wav", chunks=12, gap=0.2, reopen=True)
+        submitted = wait_for(executor, "Reopened.wav")
+        assert submitted >= done, "submitted between appends"
+        print(f"✅ close/reopen/append writer: submitted {submitted - done:.2f}s after the last append")
+
+        path = folder / "Abandoned.wav"
+        with open(path, "wb") as f:
+            f.write(CHUNK)
+            f.flush()
+            time.sleep(0.3)
+        path.unlink()
+
+        start = time.monotonic()
+        (folder / "Small.mp3").write_bytes(CHUNK)
+        small = wait_for(executor, "Small.mp3") - start
+        staged = tmp / "staged.wav"
+        staged.write_bytes(CHUNK * 4)
+        start = time.monotonic()
+        staged.rename(folder / "Renamed.wav")
+        renamed = wait_for(executor, "Renamed.wav") - start
+        assert small < 1.5 and renamed < 1.5, (small, renamed)
+        print(f"✅ small file submitted in {small:.2f}s, atomic rename in {renamed:.2f}s (old sleeps: 3-6s)")
+
+        time.sleep(1.5)
+        assert "Abandoned.wav" not in executor.submitted
+        assert all(len(times) == 1 for times in executor.submitted.values()), executor.submitted
+        print("✅ deleted mid-write never submitted; every file submitted exactly once")
+
+        start = time.perf_counter()
+        for i in range(1000):
+            handler.on_created(FileCreatedEvent(str(folder / f"Burst {i}.wav")))
+        per_event = (time.perf_counter() - start) / 1000
+        assert per_event < 0.005, per_event
+        print(f"✅ event dispatch does not block: {per_event * 1e6:.0f}µs per event")
+        observer.stop()
+        observer.join()
+        handler.stop()
+
+        # --- polling only: no close events ---
+        executor, handler, observer = run(PollingObserver, tmp / "polling", close_grace=0.5, settle=1.0)
+        polls_before = handler.tracker.polls
+        started = time.monotonic()
+        done = slow_write(tmp / "polling" / "Slow.wav", chunks=24, gap=0.25)
+        submitted = wait_for(executor, "Slow.wav")
+        polls = handler.tracker.polls - polls_before
+        assert submitted >= done, "submitted before the last chunk"
+        assert polls < (submitted - started) / 0.25 / 2, polls
+        print(f"✅ polling only, 6s write: submitted {submitted - done:.2f}s after the last chunk "
+              f"with {polls} stats (fixed 0.25s polling: {(submitted - started) / 0.25:.0f})")
+
+        done = slow_write(tmp / "polling" / "Preserved.wav", chunks=12, gap=0.3, mtime=time.time() - 3600)
+        submitted = wait_for(executor, "Preserved.wav")
+        assert submitted >= done, "growing file with an old mtime submitted before the last chunk"
+        print(f"✅ growing file with an hour-old mtime: submitted {submitted - done:.2f}s after the last chunk")
+        observer.stop()
+        observer.join()
+        handler.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
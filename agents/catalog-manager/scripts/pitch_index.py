@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Pitch Index
+Ranks songs against a free-text sync brief ("moody night drive, 90-110 bpm,
+instrumental, one-stop"). Every song is tokenised once into a sparse TF-IDF
+matrix over its moods, themes, keywords, use cases, genre, tempo band and
+key mode; a brief is scored with one sparse mat-vec (gathering only the
+brief's columns of a CSC matrix), filtered by BPM / vocal / one-stop masks,
+and the top K come back with the terms that matched.
+Song rows are L2-normalised term weights and IDF is applied on the brief
+side, so add_song/update_song only touch the changed row: edits go into a
+small delta overlay (the stale base row is masked out) and the base matrix
+is rebuilt once the overlay passes DELTA_REBUILD_FRACTION of the catalog.
+Requires numpy (installed with pandas).
+"""
+import math
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Field weights for a tag word appearing in a song's metadata
+FIELD_WEIGHTS = {"moods": 1.0, "themes": 1.0, "keywords": 0.8, "use_cases": 0.8, "genre": 0.6, "tempo": 0.5, "key": 0.4}
+TEMPO_BANDS = ((90, "slow"), (120, "mid"), (float("inf"), "fast"))
+TEMPO_WORDS = {"slow": "slow", "downtempo": "slow", "ballad": "slow", "midtempo": "mid", "mid": "mid",
+               "fast": "fast", "uptempo": "fast"}
+STOPWORDS = {"a", "an", "and", "or", "the", "for", "with", "of", "to", "in", "on", "at", "some", "something",
+             "track", "tracks", "song", "songs", "music", "cue", "looking", "need", "needs", "we", "our", "that", "feel"}
+DELTA_REBUILD_FRACTION = 0.05
+DELTA_REBUILD_MIN = 64
+
+
+def _stem(word: str) -> str:
+    return word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+
+
+def tokenize(text: str) -> List[str]:
+    return [_stem(w) for w in re.findall(r"[a-z0-9']+", str(text or "").lower()) if w not in STOPWORDS]
+
+
+def tempo_band(bpm) -> Optional[str]:
+    try: bpm = float(bpm)
+    except (TypeError, ValueError): return None
+    return next(band for limit, band in TEMPO_BANDS if bpm < limit) if bpm > 0 else None
+
+
+def is_one_stop(song: Dict) -> bool:
+    """Explicit checklist clearance wins; else one party owning master + publishing; else the metadata flag."""
+    checklist = song.get("sync_checklist") or {}
+    if "one_stop_available" in checklist: return bool(checklist["one_stop_available"])
+    rights = song.get("rights") or {}
+    if rights.get("master_owner") and rights.get("master_owner") == rights.get("publisher"): return True
+    return bool((song.get("sync_metadata") or {}).get("one_stop"))
+
+
+def song_features(song: Dict) -> Dict[str, Tuple[float, Tuple[str, ...]]]:
+    """term -> (L2-normalised weight, fields it came from)."""
+    weights, fields = defaultdict(float), defaultdict(set)
+    sync = song.get("sync_metadata") or {}
+    info = song.get("musical_info") or {}
+    tags = {f: sync.get(f) or [] for f in ("moods", "themes", "keywords", "use_cases")}
+    tags["genre"] = [info.get("genre") or ""]
+    for field, values in tags.items():
+        for value in values:
+            for term in tokenize(value):
+                weights[term] += FIELD_WEIGHTS[field]
+                fields[term].add(field)
+    band = tempo_band(info.get("bpm"))
+    if band:
+        weights[f"tempo:{band}"] += FIELD_WEIGHTS["tempo"]
+        fields[f"tempo:{band}"].add("tempo")
+    key = str(info.get("key") or "").lower()
+    for mode in ("minor", "major"):
+        if mode in key:
+            weights[f"key:{mode}"] += FIELD_WEIGHTS["key"]
+            fields[f"key:{mode}"].add("key")
+    norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+    return {t: (w / norm, tuple(sorted(fields[t]))) for t, w in weights.items()}
+
+
+def brief_terms(text: str) -> List[str]:
+    terms = []
+    for word in tokenize(text):
+        terms.append(word)
+        if word in TEMPO_WORDS: terms.append(f"tempo:{TEMPO_WORDS[word]}")
+        if word in ("minor", "major"): terms.append(f"key:{word}")
+    return terms
+
+
+def parse_brief(text: str) -> Tuple[str, Dict]:
+    """Split filters out of a brief: '90-110 bpm', 'instrumental'/'vocal', 'one-stop'."""
+    filters = {}
+    bpm = re.search(r"(\d{2,3})\s*(?:-|to)\s*(\d{2,3})\s*bpm", text, re.IGNORECASE)
+    if bpm:
+        filters["bpm_min"], filters["bpm_max"] = sorted((float(bpm.group(1)), float(bpm.group(2))))
+        text = text[:bpm.start()] + text[bpm.end():]
+    if re.search(r"\binstrumental\b", text, re.IGNORECASE): filters["instrumental"] = True
+    elif re.search(r"\bvocals?\b", text, re.IGNORECASE): filters["instrumental"] = False
+    if re.search(r"\bone[\s-]?stop\b", text, re.IGNORECASE):
+        filters["one_stop"] = True
+        text = re.sub(r"\bone[\s-]?stop\b", " ", text, flags=re.IGNORECASE)
+    text = re.sub(r"\b(instrumental|vocals?)\b", " ", text, flags=re.IGNORECASE)
+    return " ".join(text.split()), filters
+
+
+class PitchIndex:
+    def __init__(self, songs: List[Dict]):
+        self.rebuild(songs)
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+    def rebuild(self, songs: List[Dict]):
+        self._songs = songs
+        self._count = len(songs)
+        self.rows = [song_features(s) for s in songs]
+        self.vocab: Dict[str, int] = {}
+        self.df: List[int] = []
+        cols, rows, vals = [], [], []
+        for r, feats in enumerate(self.rows):
+            for term, (weight, _) in feats.items():
+                col = self._column(term)
+                self.df[col] += 1
+                cols.append(col); rows.append(r); vals.append(weight)
+        # CSC layout: column j's rows are indices[indptr[j]:indptr[j + 1]]
+        order = np.argsort(np.asarray(cols, dtype=np.int64), kind="stable")
+        self.indices = np.asarray(rows, dtype=np.int64)[order]
+        self.data = np.asarray(vals, dtype=np.float64)[order]
+        self.indptr = np.zeros(len(self.vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(np.asarray(cols, dtype=np.int64), minlength=len(self.vocab)), out=self.indptr[1:])
+        self.base_rows, self.base_cols = len(self.rows), len(self.vocab)
+        self.stale = np.zeros(self.base_rows, dtype=bool)
+        self.delta: Dict[int, Dict] = {}
+        self.bpm = np.array([self._bpm(s) for s in songs], dtype=np.float64)
+        self.instrumental = np.array([bool((s.get("musical_info") or {}).get("instrumental")) for s in songs], dtype=bool)
+        self.has_instrumental = np.array([bool((s.get("sync_checklist") or {}).get("instrumental_available")) for s in songs], dtype=bool)
+        self.one_stop = np.array([is_one_stop(s) for s in songs], dtype=bool)
+        self.acts = np.array([s.get("act_id") for s in songs], dtype=object)
+
+    @staticmethod
+    def _bpm(song: Dict) -> float:
+        try: return float((song.get("musical_info") or {}).get("bpm"))
+        except (TypeError, ValueError): return math.nan
+
+    def _column(self, term: str) -> int:
+        col = self.vocab.get(term)
+        if col is None:
+            col = self.vocab[term] = len(self.vocab)
+            self.df.append(0)
+        return col
+
+    def ensure_fresh(self, songs: List[Dict]):
+        if songs is not self._songs or len(songs) != self._count:
+            self.rebuild(songs)
+
+    def upsert(self, pos: int, song: Dict):
+        """Re-tokenise one song (pos == len(rows) appends) without rebuilding the matrix."""
+        feats = song_features(song)
+        old = self.rows[pos] if pos < len(self.rows) else {}
+        for term in old: self.df[self.vocab[term]] -= 1
+        for term in feats: self.df[self._column(term)] += 1
+        attrs = (self._bpm(song), bool((song.get("musical_info") or {}).get("instrumental")),
+                 bool((song.get("sync_checklist") or {}).get("instrumental_available")), is_one_stop(song), song.get("act_id"))
+        if pos < len(self.rows):
+            self.rows[pos] = feats
+            self.bpm[pos], self.instrumental[pos], self.has_instrumental[pos], self.one_stop[pos], self.acts[pos] = attrs
+        else:
+            self.rows.append(feats)
+            self._count += 1
+            self.bpm, self.instrumental, self.has_instrumental, self.one_stop, self.acts = (
+                np.append(arr, value) for arr, value in zip(
+                    (self.bpm, self.instrumental, self.has_instrumental, self.one_stop, self.acts), attrs))
+            self.acts = self.acts.astype(object)
+        if pos < self.base_rows: self.stale[pos] = True
+        self.delta[pos] = feats
+        if len(self.delta) > max(DELTA_REBUILD_MIN, DELTA_REBUILD_FRACTION * len(self.rows)):
+            self.rebuild(self._songs)
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+    def query_vector(self, text: str) -> Dict[str, float]:
+        n = len(self.rows)
+        q = {}
+        for term in brief_terms(text):
+            col = self.vocab.get(term)
+            if col is not None and self.df[col] > 0:
+                q[term] = q.get(term, 0.0) + math.log((1 + n) / (1 + self.df[col])) + 1.0
+        return q
+
+    def scores(self, q: Dict[str, float]) -> np.ndarray:
+        scores = np.zeros(len(self.rows), dtype=np.float64)
+        for term, weight in q.items():
+            col = self.vocab[term]
+            if col < self.base_cols:
+                lo, hi = self.indptr[col], self.indptr[col + 1]
+                scores[self.indices[lo:hi]] += self.data[lo:hi] * weight
+        if self.delta:
+            scores[:self.base_rows][self.stale] = 0.0
+            for row, feats in self.delta.items():
+                scores[row] = sum(feats[t][0] * w for t, w in q.items() if t in feats)
+        return scores
+
+    def search(self, brief: str, k: int = 5, bpm_min: float = None, bpm_max: float = None,
+               instrumental: Optional[bool] = None, one_stop: Optional[bool] = None, act_id: str = None) -> List[Dict]:
+        """Top-k songs for a brief, best first, each with the matched terms that explain its score."""
+        q = self.query_vector(brief)
+        if not q and brief_terms(brief): return []  # every word is unknown to the catalog
+        scores = self.scores(q)
+        mask = scores > 0 if q else np.ones(len(scores), dtype=bool)  # filters-only brief
+        if bpm_min is not None: mask &= self.bpm >= bpm_min
+        if bpm_max is not None: mask &= self.bpm <= bpm_max
+        if instrumental is True: mask &= self.instrumental | self.has_instrumental
+        if instrumental is False: mask &= ~self.instrumental
+        if one_stop is not None: mask &= self.one_stop == one_stop
+        if act_id: mask &= self.acts == act_id
+        candidates = np.flatnonzero(mask)
+        if len(candidates) > k:
+            keep = np.argpartition(-scores[candidates], k - 1)[:k]
+            candidates = candidates[keep]
+        ranked = sorted(candidates.tolist(), key=lambda r: (-scores[r], r))
+        return [self._explain(r, float(scores[r]), q) for r in ranked]
+
+    def _explain(self, row: int, score: float, q: Dict[str, float]) -> Dict:
+        song, feats = self._songs[row], self.rows[row]
+        matched = sorted(((t, feats[t][0] * w, feats[t][1]) for t, w in q.items() if t in feats), key=lambda m: -m[1])
+        return {
+            "song_id": song.get("song_id"),
+            "title": song.get("title"),
+            "act_id": song.get("act_id"),
+            "score": round(score, 4),
+            "matched": [{"term": t.split(":")[-1], "fields": list(f), "contribution": round(c, 4)} for t, c, f in matched],
+            "why": ", ".join(f"{'/'.join(f)}: {t.split(':')[-1]}" for t, _, f in matched),
+        }
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Local S3 Stand-in
+A minimal S3-compatible HTTP server for exercising R2Client offline with the
+real boto3 stack (path-style addressing). It supports: create bucket, PUT /
+HEAD / GET / DELETE object, multipart create / upload part / complete /
+abort, and ListObjectsV2 with pagination. Objects live on disk under a root
+directory.
+Test knobs: `fail_parts` makes the next N UploadPart requests return 500 (to
+exercise part retries), and `link_mbps` throttles each connection's request
+body to that rate (loopback is otherwise unrealistically fast).
+Usage: python3 scripts/s3_standin.py [--port 9000] [--root /tmp/s3]
+"""
+import argparse
+import hashlib
+import json
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+from xml.sax.saxutils import escape
+
+READ_CHUNK = 256 * 1024
+XMLNS = 'xmlns="http://s3.amazonaws.com/doc/2006-03-01/"'
+
+
+class S3StandIn(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, root: Path, host: str = "127.0.0.1", port: int = 0, link_mbps: float = 0):
+        super().__init__((host, port), _Handler)
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.link_mbps = link_mbps
+        self.fail_parts = 0
+        self.requests: Dict[str, int] = {}
+        self.lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def endpoint_url(self) -> str:
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def start(self) -> "S3StandIn":
+        self._thread = threading.Thread(target=self.serve_forever, name="s3-standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def count(self, op: str):
+        with self.lock: self.requests[op] = self.requests.get(op, 0) + 1
+
+    def take_part_failure(self) -> bool:
+        with self.lock:
+            if self.fail_parts <= 0: return False
+            self.fail_parts -= 1
+            return True
+
+    # Storage: <root>/<bucket>/<quoted key> + "<same>.meta.json"; uploads under <root>/.uploads/<id>/
+    def object_path(self, bucket: str, key: str) -> Path:
+        return self.root / bucket / quote(key, safe="")
+
+    def read_meta(self, bucket: str, key: str) -> Optional[Dict]:
+        meta = self.object_path(bucket, key).with_name(self.object_path(bucket, key).name + ".meta.json")
+        return json.loads(meta.read_text()) if meta.exists() else None
+
+    def write_object(self, bucket: str, key: str, body_path: Path, etag: str, headers: Dict):
+        path = self.object_path(bucket, key)
+        body_path.replace(path)
+        meta = {"etag": etag, "size": path.stat().st_size, "last_modified": datetime.now(timezone.utc).isoformat(),
+                "content_type": headers.get("Content-Type"), "content_encoding": headers.get("Content-Encoding")}
+        if meta["content_encoding"] and "aws-chunked" in meta["content_encoding"]:
+            meta["content_encoding"] = meta["content_encoding"].replace("aws-chunked", "").strip(", ") or None
+        path.with_name(path.name + ".meta.json").write_text(json.dumps(meta))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: S3StandIn
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    # ------------------------------------------------------------------
+    # Plumbing
+    # ------------------------------------------------------------------
+    def _target(self) -> Tuple[str, str, Dict]:
+        url = urlsplit(self.path)
+        parts = url.path.lstrip("/").split("/", 1)
+        bucket = unquote(parts[0])
+        key = unquote(parts[1]) if len(parts) > 1 else ""
+        return bucket, key, {k: v[0] for k, v in parse_qs(url.query, keep_blank_values=True).items()}
+
+    def _send(self, status: int, body: bytes = b"", headers: Dict = None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            if value is not None: self.send_header(name, str(value))
+        if self.command != "HEAD" or "Content-Length" not in (headers or {}):
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body and self.command != "HEAD": self.wfile.write(body)
+
+    def _xml(self, status: int, xml: str):
+        self._send(status, ('<?xml version="1.0" encoding="UTF-8"?>' + xml).encode(), {"Content-Type": "application/xml"})
+
+    def _error(self, status: int, code: str, message: str = ""):
+        self.close_connection = True  # the request body may be unread
+        self._xml(status, f"<Error><Code>{code}</Code><Message>{escape(message)}</Message></Error>")
+
+    def _raw_body(self):
+        """Yield the request body in chunks, honouring the optional per-connection rate limit."""
+        remaining = int(self.headers.get("Content-Length") or 0)
+        rate = self.server.link_mbps * 1024 * 1024
+        start, read = time.perf_counter(), 0
+        while remaining > 0:
+            chunk = self.rfile.read(min(READ_CHUNK, remaining))
+            if not chunk: break
+            remaining -= len(chunk)
+            read += len(chunk)
+            if rate:
+                ahead = read / rate - (time.perf_counter() - start)
+                if ahead > 0: time.sleep(ahead)
+            yield chunk
+
+    def _body_to(self, path: Path) -> str:
+        """Stream the (possibly aws-chunked) body to `path`; returns its hex MD5."""
+        md5 = hashlib.md5()
+        raw = self._raw_body()
+        chunks = _decode_aws_chunked(raw) if "aws-chunked" in (self.headers.get("Content-Encoding") or "") else raw
+        with open(path, "wb") as f:
+            for chunk in chunks:
+                md5.update(chunk)
+                f.write(chunk)
+        for _ in raw: pass  # trailers; keep the connection in step
+        return md5.hexdigest()
+
+    # ------------------------------------------------------------------
+    # Verbs
+    # ------------------------------------------------------------------
+    def do_PUT(self):
+        bucket, key, query = self._target()
+        if not key:
+            list(self._raw_body())
+            (self.server.root / bucket).mkdir(exist_ok=True)
+            self.server.count("CreateBucket")
+            return self._send(200)
+        if not (self.server.root / bucket).is_dir(): return self._error(404, "NoSuchBucket", bucket)
+        if "uploadId" in query:
+            self.server.count("UploadPart")
+            upload_dir = self.server.root / ".uploads" / query["uploadId"]
+            if not upload_dir.is_dir(): return self._error(404, "NoSuchUpload", query["uploadId"])
+            if self.server.take_part_failure():
+                list(self._raw_body())
+                return self._error(500, "InternalError", "injected part failure")
+            part = upload_dir / f"{int(query['partNumber']):05d}"
+            etag = self._body_to(part.with_suffix(".tmp"))
+            part.with_suffix(".tmp").replace(part)
+            return self._send(200, headers={"ETag": f'"{etag}"'})
+        self.server.count("PutObject")
+        tmp = self.server.root / ".uploads" / f"put-{uuid.uuid4().hex}"
+        tmp.parent.mkdir(exist_ok=True)
+        etag = f'"{self._body_to(tmp)}"'
+        self.server.write_object(bucket, key, tmp, etag, dict(self.headers))
+        self._send(200, headers={"ETag": etag})
+
+    def do_POST(self):
+        bucket, key, query = self._target()
+        if "uploads" in query:
+            self.server.count("CreateMultipartUpload")
+            list(self._raw_body())
+            upload_id = uuid.uuid4().hex
+            upload_dir = self.server.root / ".uploads" / upload_id
+            upload_dir.mkdir(parents=True)
+            (upload_dir / "headers.json").write_text(json.dumps(dict(self.headers)))
+            return self._xml(200, f"<InitiateMultipartUploadResult {XMLNS}><Bucket>{escape(bucket)}</Bucket>"
+                                  f"<Key>{escape(key)}</Key><UploadId>{upload_id}</UploadId></InitiateMultipartUploadResult>")
+        if "uploadId" in query:
+            self.server.count("CompleteMultipartUpload")
+            list(self._raw_body())
+            upload_dir = self.server.root / ".uploads" / query["uploadId"]
+            parts = sorted(p for p in upload_dir.iterdir() if p.name.isdigit())
+            digests = hashlib.md5()
+            assembled = upload_dir / "assembled"
+            with open(assembled, "wb") as out:
+                for part in parts:
+                    data = part.read_bytes()
+                    digests.update(hashlib.md5(data).digest())
+                    out.write(data)
+            etag = f'"{digests.hexdigest()}-{len(parts)}"'
+            headers = json.loads((upload_dir / "headers.json").read_text())
+            self.server.write_object(bucket, key, assembled, etag, headers)
+            for leftover in upload_dir.iterdir(): leftover.unlink()
+            upload_dir.rmdir()
+            return self._xml(200, f"<CompleteMultipartUploadResult {XMLNS}><Bucket>{escape(bucket)}</Bucket>"
+                                  f"<Key>{escape(key)}</Key><ETag>{escape(etag)}</ETag></CompleteMultipartUploadResult>")
+        self._error(400, "InvalidRequest", "unsupported POST")
+
+    def do_DELETE(self):
+        bucket, key, query = self._target()
+        if "uploadId" in query:
+            self.server.count("AbortMultipartUpload")
+            upload_dir = self.server.root / ".uploads" / query["uploadId"]
+            if upload_dir.is_dir():
+                for leftover in upload_dir.iterdir(): leftover.unlink()
+                upload_dir.rmdir()
+            return self._send(204)
+        self.server.count("DeleteObject")
+        path = self.server.object_path(bucket, key)
+        for p in (path, path.with_name(path.name + ".meta.json")):
+            if p.exists(): p.unlink()
+        self._send(204)
+
+    def do_HEAD(self):
+        bucket, key, _ = self._target()
+        self.server.count("HeadObject")
+        meta = self.server.read_meta(bucket, key) if key else None
+        if meta is None: return self._send(404 if key else (200 if (self.server.root / bucket).is_dir() else 404))
+        self._send(200, headers=self._object_headers(meta))
+
+    def do_GET(self):
+        bucket, key, query = self._target()
+        if not key: return self._list(bucket, query)
+        self.server.count("GetObject")
+        meta = self.server.read_meta(bucket, key)
+        if meta is None: return self._error(404, "NoSuchKey", key)
+        self._send(200, self.server.object_path(bucket, key).read_bytes(), self._object_headers(meta, with_length=False))
+
+    def _object_headers(self, meta: Dict, with_length: bool = True) -> Dict:
+        headers = {"ETag": meta["etag"], "Content-Type": meta.get("content_type") or "binary/octet-stream",
+                   "Content-Encoding": meta.get("content_encoding"),
+                   "Last-Modified": datetime.fromisoformat(meta["last_modified"]).strftime("%a, %d %b %Y %H:%M:%S GMT")}
+        if with_length: headers["Content-Length"] = meta["size"]
+        return headers
+
+    def _list(self, bucket: str, query: Dict):
+        self.server.count("ListObjectsV2")
+        bucket_dir = self.server.root / bucket
+        if not bucket_dir.is_dir(): return self._error(404, "NoSuchBucket", bucket)
+        prefix = query.get("prefix", "")
+        max_keys = int(query.get("max-keys", 1000))
+        after = query.get("continuation-token") or query.get("start-after") or ""
+        keys = sorted(unquote(p.name) for p in bucket_dir.iterdir() if not p.name.endswith(".meta.json"))
+        keys = [k for k in keys if k.startswith(prefix) and k > after]
+        page, truncated = keys[:max_keys], len(keys) > max_keys
+        contents = []
+        for key in page:
+            meta = self.server.read_meta(bucket, key)
+            contents.append(f"<Contents><Key>{escape(key)}</Key><LastModified>{meta['last_modified'][:19]}.000Z</LastModified>"
+                            f"<ETag>{escape(meta['etag'])}</ETag><Size>{meta['size']}</Size>"
+                            f"<StorageClass>STANDARD</StorageClass></Contents>")
+        token = f"<NextContinuationToken>{escape(page[-1])}</NextContinuationToken>" if truncated else ""
+        self._xml(200, f"<ListBucketResult {XMLNS}><Name>{escape(bucket)}</Name><Prefix>{escape(prefix)}</Prefix>"
+                       f"<KeyCount>{len(page)}</KeyCount><MaxKeys>{max_keys}</MaxKeys>"
+                       f"<IsTruncated>{'true' if truncated else 'false'}</IsTruncated>{token}{''.join(contents)}</ListBucketResult>")
+
+
+def _decode_aws_chunked(raw):
+    """Decode an aws-chunked body ("<hex size>[;ext]\\r\\n<data>\\r\\n ... 0\\r\\n<trailers>\\r\\n")."""
+    buffer, exhausted = b"", False
+
+    def fill(ready):
+        nonlocal buffer, exhausted
+        while not ready() and not exhausted:
+            more = next(raw, None)
+            if more is None: exhausted = True
+            else: buffer += more
+
+    while True:
+        fill(lambda: b"\r\n" in buffer)
+        if b"\r\n" not in buffer: return
+        header, buffer = buffer.split(b"\r\n", 1)
+        size = int(header.split(b";")[0], 16)
+        if size == 0: return
+        fill(lambda: len(buffer) >= size + 2)
+        yield buffer[:size]
+        buffer = buffer[size + 2:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local S3 stand-in")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--root", type=Path, default=Path("/tmp/s3-standin"))
+    parser.add_argument("--link-mbps", type=float, default=0)
+    args = parser.parse_args()
+    server = S3StandIn(args.root, port=args.port, link_mbps=args.link_mbps)
+    print(f"S3 stand-in on {server.endpoint_url} (root {args.root}); set R2_ENDPOINT_URL to use it")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
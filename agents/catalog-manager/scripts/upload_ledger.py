@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Upload Ledger
+Local record of what watch_and_upload.py has put in R2 (data/upload_ledger.db):
+one row per object key with the content SHA-256, ETag, size and upload time.
+process_file decides from the file's content alone, with no HEAD request:
+identical content already in the bucket is skipped whatever it is named, and
+a changed file under an existing key is uploaded again.
+`watch_and_upload.py --reconcile` lists the bucket once and repairs the
+ledger. Objects the ledger never saw are recorded without a hash and matched
+later by ETag + size (MD5, or MD5-of-part-MD5s for multipart uploads), which
+fingerprint() computes in the same pass as the SHA-256.
+"""
+import hashlib
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, TypedDict
+
+LEDGER_FILE = "upload_ledger.db"
+READ_BLOCK = 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS objects (
+    key TEXT PRIMARY KEY, sha256 TEXT, etag TEXT NOT NULL, size INTEGER NOT NULL,
+    uploaded_at TEXT NOT NULL, source TEXT);
+CREATE INDEX IF NOT EXISTS objects_sha256 ON objects(sha256);
+CREATE INDEX IF NOT EXISTS objects_etag ON objects(etag, size);
+"""
+
+
+class Fingerprint(TypedDict):
+    sha256: str
+    size: int
+    etag: str          # what R2 will report for our upload of this file
+    etags: List[str]   # every ETag this content could carry (single PUT or our multipart chunking)
+
+
+class LedgerEntry(TypedDict):
+    key: str
+    sha256: Optional[str]
+    etag: str
+    size: int
+    uploaded_at: str
+    source: Optional[str]
+
+
+def fingerprint(path: Path, chunk_size: int, multipart_threshold: int) -> Fingerprint:
+    """SHA-256, size and expected ETags of a file in one read."""
+    sha, md5 = hashlib.sha256(), hashlib.md5()
+    part_digests, part, part_len, size = [], hashlib.md5(), 0, 0
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(READ_BLOCK)
+            if not block: break
+            sha.update(block)
+            md5.update(block)
+            size += len(block)
+            while block:
+                take = block[:chunk_size - part_len]
+                part.update(take)
+                part_len += len(take)
+                block = block[len(take):]
+                if part_len == chunk_size:
+                    part_digests.append(part.digest())
+                    part, part_len = hashlib.md5(), 0
+    if part_len or not part_digests: part_digests.append(part.digest())
+    single = f'"{md5.hexdigest()}"'
+    multipart = f'"{hashlib.md5(b"".join(part_digests)).hexdigest()}-{len(part_digests)}"'
+    return {"sha256": sha.hexdigest(), "size": size, "etag": multipart if size >= multipart_threshold else single,
+            "etags": [single, multipart]}
+
+
+class UploadLedger:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Shared by the upload worker threads; every statement runs under self.lock
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.RLock()
+        # sha256 -> [gate, holders]; dropped when the last holder releases it
+        self._reserved: Dict[str, list] = {}
+
+    def close(self):
+        self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    def get(self, key: str) -> Optional[LedgerEntry]:
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM objects WHERE key = ?", (key,)).fetchone()
+        return dict(row) if row else None
+
+    def find_content(self, fp: Fingerprint) -> Optional[LedgerEntry]:
+        """An object already holding this content: by hash, else an unhashed (reconciled) object by ETag + size."""
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM objects WHERE sha256 = ? ORDER BY uploaded_at LIMIT 1",
+                                    (fp["sha256"],)).fetchone()
+            if row: return dict(row)
+            marks = ",".join("?" * len(fp["etags"]))
+            row = self.conn.execute(f"SELECT * FROM objects WHERE sha256 IS NULL AND size = ? AND etag IN ({marks}) LIMIT 1",
+                                    (fp["size"], *fp["etags"])).fetchone()
+            if not row: return None
+            with self.conn:
+                self.conn.execute("UPDATE objects SET sha256 = ? WHERE key = ?", (fp["sha256"], row["key"]))
+            return dict(row, sha256=fp["sha256"])
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM objects").fetchone()[0]
+
+    def last_reconciled(self) -> Optional[str]:
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'reconciled_at'").fetchone()
+        return row[0] if row else None
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+    @contextmanager
+    def reserve(self, sha256: str):
+        """Serialize decide-and-upload per content, so identical files dropped together upload once."""
+        with self.lock:
+            entry = self._reserved.setdefault(sha256, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self.lock:
+                entry[1] -= 1
+                if not entry[1]: del self._reserved[sha256]
+
+    def record(self, key: str, fp: Fingerprint, source: str = None):
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO objects VALUES (?,?,?,?,?,?)",
+                              (key, fp["sha256"], fp["etag"], fp["size"], _now(), source))
+
+    def forget(self, key: str):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM objects WHERE key = ?", (key,))
+
+    def reconcile(self, listing: Iterable[Dict]) -> Dict[str, int]:
+        """Make the ledger match a bucket listing (ListObjectsV2 `Contents` entries)."""
+        counts = {"unchanged": 0, "added": 0, "changed": 0, "removed": 0}
+        with self.lock, self.conn:
+            known = {row["key"]: row for row in self.conn.execute("SELECT key, etag, size FROM objects")}
+            for obj in listing:
+                key, etag, size = obj["Key"], obj["ETag"], obj["Size"]
+                row = known.pop(key, None)
+                modified = obj.get("LastModified")
+                uploaded_at = modified.isoformat() if hasattr(modified, "isoformat") else _now()
+                if row is None:
+                    counts["added"] += 1
+                    self.conn.execute("INSERT INTO objects VALUES (?,NULL,?,?,?,NULL)", (key, etag, size, uploaded_at))
+                elif row["etag"] != etag or row["size"] != size:
+                    # Replaced outside this tool: the stored hash no longer describes it
+                    counts["changed"] += 1
+                    self.conn.execute("UPDATE objects SET sha256 = NULL, etag = ?, size = ?, uploaded_at = ? WHERE key = ?",
+                                      (etag, size, uploaded_at, key))
+                else:
+                    counts["unchanged"] += 1
+            counts["removed"] = len(known)
+            self.conn.executemany("DELETE FROM objects WHERE key = ?", [(key,) for key in known])
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('reconciled_at', ?)", (_now(),))
+        return counts
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
@@ -7,6 +7,7 @@ uploads to Cloudflare R2, and updates the catalog.
 
 Usage:
     python watch_and_upload.py
+    python watch_and_upload.py --reconcile   # list the bucket once and repair the upload ledger
 
 Requirements:
     pip install watchdog mutagen boto3 python-dotenv
@@ -16,18 +17,34 @@ Environment Variables (in .env file):
     CLOUDFLARE_R2_ACCESS_KEY_ID=your_access_key
     CLOUDFLARE_R2_SECRET_ACCESS_KEY=your_secret_key
     R2_BUCKET_NAME=ridgemont-studio
+
+Optional upload tuning (defaults in CONFIGURATION below):
+    R2_UPLOAD_WORKERS=4             files processed concurrently
+    R2_MULTIPART_THRESHOLD_MB=16    multipart above this size
+    R2_MULTIPART_CHUNK_MB=8         part size
+    R2_MULTIPART_CONCURRENCY=8      parts in flight per file
+    R2_UPLOAD_MAX_ATTEMPTS=5        attempts per request (failed parts are retried)
+    R2_ENDPOINT_URL=                override the R2 endpoint (e.g. scripts/s3_standin.py)
+    METADATA_WORKERS=4              threads for the startup metadata scan
+    TRACKS_QUIET_SECONDS=5          publish tracks.json once uploads have been quiet this long
+    WRITE_CLOSE_GRACE_SECONDS=0.5   a closed file is complete once unchanged this long
+    WRITE_SETTLE_SECONDS=2          without a close event, once unchanged this long (see write_tracker.py)
 """
 
 import os
 import sys
+import argparse
 import json
 import re
 import shutil
 import time
 import hashlib
+import gzip
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List
 
 # Third-party imports
 try:
@@ -37,6 +54,8 @@ try:
     from mutagen.id3 import ID3
     from mutagen.wave import WAVE
     import boto3
+    from boto3.s3.transfer import TransferConfig
+    from s3transfer.utils import ChunksizeAdjuster
     from botocore.config import Config
     from dotenv import load_dotenv
 except ImportError as e:
@@ -45,6 +64,11 @@ except ImportError as e:
     print("  pip install watchdog mutagen boto3 python-dotenv")
     sys.exit(1)
 
+from catalog_journal import JOURNAL_FILE, SEQ_KEY, atomic_write_json, read_journal, replay_records
+from upload_ledger import LEDGER_FILE, UploadLedger, fingerprint
+from audio_metadata import CACHE_FILE as METADATA_CACHE_FILE, MetadataService, extract as extract_audio_metadata
+from write_tracker import WriteTracker
+
 
 # =============================================================================
 # CONFIGURATION
@@ -55,10 +79,23 @@ WATCH_FOLDER = Path.home() / "Music" / "Ridgemont-Upload"
 COMPLETED_FOLDER = WATCH_FOLDER / "Completed"
 CATALOG_MANAGER_ROOT = Path(__file__).parent.parent
 CATALOG_JSON_PATH = CATALOG_MANAGER_ROOT / "data" / "catalog.json"
+LEDGER_PATH = CATALOG_MANAGER_ROOT / "data" / LEDGER_FILE
+METADATA_CACHE_PATH = CATALOG_MANAGER_ROOT / "data" / METADATA_CACHE_FILE
 
 # Supported file extensions
 SUPPORTED_EXTENSIONS = {'.mp3', '.wav'}
 
+# Upload tuning (overridable in .env, see module docstring)
+UPLOAD_WORKERS = 4
+MULTIPART_THRESHOLD_MB = 16
+MULTIPART_CHUNK_MB = 8
+MULTIPART_CONCURRENCY = 8
+UPLOAD_MAX_ATTEMPTS = 5
+TRACKS_QUIET_SECONDS = 5.0
+
+# Serializes catalog.json read-modify-write between concurrent uploads
+CATALOG_LOCK = threading.Lock()
+
 # Artist name to act_id mapping
 # Add new artists here as needed
 ARTIST_TO_ACT_ID = {
@@ -80,15 +117,16 @@ ARTIST_TO_ACT_ID = {
 class R2Client:
     """Cloudflare R2 storage client using S3-compatible API."""
 
-    def __init__(self):
+    def __init__(self, endpoint_url: str = None, ledger_path: Path = None):
         load_dotenv(CATALOG_MANAGER_ROOT / ".env")
 
         self.account_id = os.getenv("CLOUDFLARE_ACCOUNT_ID")
         self.access_key = os.getenv("CLOUDFLARE_R2_ACCESS_KEY_ID")
         self.secret_key = os.getenv("CLOUDFLARE_R2_SECRET_ACCESS_KEY")
         self.bucket_name = os.getenv("R2_BUCKET_NAME", "ridgemont-studio")
+        endpoint_url = endpoint_url or os.getenv("R2_ENDPOINT_URL")
 
-        if not all([self.account_id, self.access_key, self.secret_key]):
+        if not all([self.account_id or endpoint_url, self.access_key, self.secret_key]):
             raise ValueError(
                 "Missing R2 credentials. Please set these in .env:\n"
                 "  CLOUDFLARE_ACCOUNT_ID\n"
@@ -96,39 +134,56 @@ class R2Client:
                 "  CLOUDFLARE_R2_SECRET_ACCESS_KEY"
             )
 
-        self.endpoint_url = f"https://{self.account_id}.r2.cloudflarestorage.com"
+        self.endpoint_url = endpoint_url or f"https://{self.account_id}.r2.cloudflarestorage.com"
+
+        self.upload_workers = int(os.getenv("R2_UPLOAD_WORKERS", UPLOAD_WORKERS))
+        concurrency = int(os.getenv("R2_MULTIPART_CONCURRENCY", MULTIPART_CONCURRENCY))
+        self.transfer_config = TransferConfig(
+            multipart_threshold=int(os.getenv("R2_MULTIPART_THRESHOLD_MB", MULTIPART_THRESHOLD_MB)) * 1024 * 1024,
+            multipart_chunksize=int(os.getenv("R2_MULTIPART_CHUNK_MB", MULTIPART_CHUNK_MB)) * 1024 * 1024,
+            max_concurrency=concurrency,
+            use_threads=True
+        )
 
         self.client = boto3.client(
             's3',
             endpoint_url=self.endpoint_url,
             aws_access_key_id=self.access_key,
             aws_secret_access_key=self.secret_key,
-            config=Config(signature_version='s3v4'),
+            config=Config(
+                signature_version='s3v4',
+                # Each request (so each multipart part) is retried on 5xx, throttling and timeouts
+                retries={'max_attempts': int(os.getenv("R2_UPLOAD_MAX_ATTEMPTS", UPLOAD_MAX_ATTEMPTS)), 'mode': 'standard'},
+                # One connection per in-flight part across all concurrent files
+                max_pool_connections=max(10, self.upload_workers * concurrency),
+                s3={'addressing_style': 'path'},
+                # R2 rejects the aws-chunked CRC trailers newer botocore sends by default
+                request_checksum_calculation='when_required',
+                response_checksum_validation='when_required'
+            ),
             region_name='auto'
         )
 
-    def file_exists(self, key: str) -> bool:
-        """Check if a file exists in R2."""
-        try:
-            self.client.head_object(Bucket=self.bucket_name, Key=key)
-            return True
-        except:
-            return False
+        # Content hash -> object key record; replaces a HEAD per file (see upload_ledger.py)
+        self.ledger = UploadLedger(ledger_path or LEDGER_PATH)
 
     def upload_file(self, local_path: Path, r2_key: str, content_type: str = None) -> bool:
-        """Upload a file to R2."""
+        """Upload a file to R2 (multipart with concurrent parts above the threshold)."""
         try:
             extra_args = {}
             if content_type:
                 extra_args['ContentType'] = content_type
 
+            start = time.perf_counter()
             self.client.upload_file(
                 str(local_path),
                 self.bucket_name,
                 r2_key,
-                ExtraArgs=extra_args
+                ExtraArgs=extra_args,
+                Config=self.transfer_config
             )
-            print(f"  [R2] Uploaded: {r2_key}")
+            elapsed = time.perf_counter() - start
+            print(f"  [R2] Uploaded: {r2_key} ({format_throughput(local_path.stat().st_size, elapsed)})")
             return True
         except Exception as e:
             print(f"  [R2] Upload failed: {e}")
@@ -150,6 +205,30 @@ class R2Client:
             print(f"  [R2] JSON upload failed: {e}")
             return False
 
+    def list_objects(self, prefix: str = ""):
+        """Yield every object in the bucket (ListObjectsV2 `Contents` entries)."""
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            yield from page.get('Contents', [])
+
+    def reconcile_ledger(self) -> Dict[str, int]:
+        """List the bucket once and make the upload ledger match it."""
+        counts = self.ledger.reconcile(self.list_objects())
+        print(f"  [LEDGER] Reconciled: {counts['unchanged']} unchanged, {counts['added']} added, "
+              f"{counts['changed']} changed, {counts['removed']} removed")
+        return counts
+
+    def upload_bytes(self, body: bytes, r2_key: str, content_type: str, content_encoding: str = None) -> bool:
+        """Upload an in-memory body to R2."""
+        try:
+            extra = {'ContentEncoding': content_encoding} if content_encoding else {}
+            self.client.put_object(Bucket=self.bucket_name, Key=r2_key, Body=body, ContentType=content_type, **extra)
+            print(f"  [R2] Updated: {r2_key} ({len(body):,} bytes{', ' + content_encoding if content_encoding else ''})")
+            return True
+        except Exception as e:
+            print(f"  [R2] Upload failed for {r2_key}: {e}")
+            return False
+
     def get_json(self, r2_key: str) -> Optional[dict]:
         """Download and parse JSON from R2."""
         try:
@@ -163,67 +242,9 @@ class R2Client:
 # METADATA EXTRACTION
 # =============================================================================
 
-def extract_metadata(file_path: Path) -> Dict[str, Any]:
-    """Extract metadata from audio file using ID3 tags."""
-
-    metadata = {
-        "title": file_path.stem,  # Default to filename
-        "artist": "Unknown Artist",
-        "album": "Unknown Album",
-        "year": None,
-        "genre": None,
-        "duration_seconds": None,
-        "bpm": None,
-    }
-
-    try:
-        if file_path.suffix.lower() == '.mp3':
-            audio = MP3(file_path)
-            metadata["duration_seconds"] = int(audio.info.length) if audio.info.length else None
-
-            if audio.tags:
-                # Title
-                if 'TIT2' in audio.tags:
-                    metadata["title"] = str(audio.tags['TIT2'])
-
-                # Artist
-                if 'TPE1' in audio.tags:
-                    metadata["artist"] = str(audio.tags['TPE1'])
-                elif 'TPE2' in audio.tags:
-                    metadata["artist"] = str(audio.tags['TPE2'])
-
-                # Album
-                if 'TALB' in audio.tags:
-                    metadata["album"] = str(audio.tags['TALB'])
-
-                # Year
-                if 'TDRC' in audio.tags:
-                    year_str = str(audio.tags['TDRC'])
-                    if year_str and len(year_str) >= 4:
-                        metadata["year"] = int(year_str[:4])
-                elif 'TYER' in audio.tags:
-                    metadata["year"] = int(str(audio.tags['TYER']))
-
-                # Genre
-                if 'TCON' in audio.tags:
-                    metadata["genre"] = str(audio.tags['TCON'])
-
-                # BPM
-                if 'TBPM' in audio.tags:
-                    try:
-                        metadata["bpm"] = int(float(str(audio.tags['TBPM'])))
-                    except:
-                        pass
-
-        elif file_path.suffix.lower() == '.wav':
-            audio = WAVE(file_path)
-            metadata["duration_seconds"] = int(audio.info.length) if audio.info.length else None
-            # WAV files typically don't have rich metadata
-
-    except Exception as e:
-        print(f"  [WARNING] Could not extract metadata: {e}")
-
-    return metadata
+def extract_metadata(file_path: Path, metadata_service: MetadataService = None) -> Dict[str, Any]:
+    """Extract metadata from audio file using ID3 tags (see audio_metadata.py), cached when a service is given."""
+    return metadata_service.get(file_path) if metadata_service else extract_audio_metadata(file_path)
 
 
 def sanitize_filename(name: str) -> str:
@@ -246,11 +267,15 @@ def get_act_id(artist_name: str) -> str:
     return act_id or "UNKNOWN"
 
 
-def generate_song_id() -> str:
+def generate_song_id(existing_ids: Iterable[str] = ()) -> str:
     """Generate a unique song ID in format RS-YYYY-NNNN."""
     year = datetime.now().year
     # Use timestamp-based number for uniqueness
     num = int(datetime.now().strftime("%m%d%H%M"))
+    # Files uploaded in the same minute would otherwise share an ID
+    taken = set(existing_ids)
+    while f"RS-{year}-{num:04d}" in taken:
+        num += 1
     return f"RS-{year}-{num:04d}"
 
 
@@ -259,11 +284,18 @@ def generate_song_id() -> str:
 # =============================================================================
 
 def load_catalog() -> Dict[str, Any]:
-    """Load the catalog.json file."""
+    """Load the catalog.json file, plus any edits CatalogManager has journaled but not compacted yet."""
+    catalog = {"songs": [], "writers": [], "contacts": [], "opportunities": []}
     if CATALOG_JSON_PATH.exists():
         with open(CATALOG_JSON_PATH, 'r') as f:
-            return json.load(f)
-    return {"songs": [], "writers": [], "contacts": [], "opportunities": []}
+            catalog = json.load(f)
+    # Read-only: the manager may be mid-append, so never repair the log from here
+    records, _ = read_journal(CATALOG_JSON_PATH.parent / JOURNAL_FILE)
+    _, last_seq = replay_records(records, catalog, {"supervisors": []})
+    # save_catalog() writes these records into catalog.json: mark them folded in
+    # so the next replay does not apply them over newer values
+    catalog[SEQ_KEY] = last_seq
+    return catalog
 
 
 def save_catalog(catalog: Dict[str, Any]) -> None:
@@ -276,17 +308,34 @@ def save_catalog(catalog: Dict[str, Any]) -> None:
         backup_path = backup_dir / f"catalog_backup_{timestamp}.json"
         shutil.copy(CATALOG_JSON_PATH, backup_path)
 
-    with open(CATALOG_JSON_PATH, 'w') as f:
-        json.dump(catalog, f, indent=2)
+    atomic_write_json(CATALOG_JSON_PATH, catalog)
     print(f"  [CATALOG] Saved: {CATALOG_JSON_PATH}")
 
 
-def create_song_entry(metadata: Dict[str, Any], r2_path: str) -> Dict[str, Any]:
+def audio_info(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """The song's "audio" block: stream properties and artwork hashes of the uploaded file."""
+    return {
+        "bitrate": metadata.get("bitrate"),
+        "sample_rate": metadata.get("sample_rate"),
+        "channels": metadata.get("channels"),
+        "artwork_sha256": metadata.get("artwork", []),
+    }
+
+
+def r2_key_for(metadata: Dict[str, Any], suffix: str) -> str:
+    """Artist/Album/Title.ext, as files are laid out in R2."""
+    artist_folder = sanitize_filename(metadata['artist'])
+    album_folder = sanitize_filename(metadata['album'])
+    filename = sanitize_filename(metadata['title']) + suffix.lower()
+    return f"{artist_folder}/{album_folder}/{filename}"
+
+
+def create_song_entry(metadata: Dict[str, Any], r2_path: str, existing_ids: Iterable[str] = ()) -> Dict[str, Any]:
     """Create a new song entry for the catalog."""
     now = datetime.now().isoformat()
 
     return {
-        "song_id": generate_song_id(),
+        "song_id": generate_song_id(existing_ids),
         "title": metadata["title"],
         "alt_titles": [],
         "act_id": get_act_id(metadata["artist"]),
@@ -303,6 +352,7 @@ def create_song_entry(metadata: Dict[str, Any], r2_path: str) -> Dict[str, Any]:
             "duration_seconds": metadata.get("duration_seconds"),
             "instrumental": False
         },
+        "audio": audio_info(metadata),
         "sync_metadata": {
             "moods": [],
             "themes": [],
@@ -372,24 +422,28 @@ def create_song_entry(metadata: Dict[str, Any], r2_path: str) -> Dict[str, Any]:
 # TRACKS.JSON FOR WEBSITE
 # =============================================================================
 
+def track_entry(song: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The website's view of a song, or None if it is not published (unfinished or not in R2)."""
+    r2_path = song.get("links", {}).get("r2_path")
+    if not (r2_path and song.get("status") in ["finished", "released"]):
+        return None
+    return {
+        "id": song["song_id"],
+        "file": r2_path,
+        "title": song["title"],
+        "artist": song.get("artist", "Unknown"),
+        "album": song.get("album", "Unknown Album"),
+        "duration": format_duration(song.get("musical_info", {}).get("duration_seconds")),
+        "year": song.get("dates", {}).get("created", "")[:4] if song.get("dates", {}).get("created") else None,
+        "genre": song.get("musical_info", {}).get("genre", "")
+    }
+
+
 def update_tracks_json(r2_client: R2Client, catalog: Dict[str, Any]) -> None:
     """Update the tracks.json file in R2 for the website."""
 
     # Get all finished songs with R2 paths
-    tracks = []
-    for song in catalog.get("songs", []):
-        r2_path = song.get("links", {}).get("r2_path")
-        if r2_path and song.get("status") in ["finished", "released"]:
-            tracks.append({
-                "id": song["song_id"],
-                "file": r2_path,
-                "title": song["title"],
-                "artist": song.get("artist", "Unknown"),
-                "album": song.get("album", "Unknown Album"),
-                "duration": format_duration(song.get("musical_info", {}).get("duration_seconds")),
-                "year": song.get("dates", {}).get("created", "")[:4] if song.get("dates", {}).get("created") else None,
-                "genre": song.get("musical_info", {}).get("genre", "")
-            })
+    tracks = [t for t in (track_entry(song) for song in catalog.get("songs", [])) if t]
 
     tracks_data = {
         "lastUpdated": datetime.now().strftime("%Y-%m-%d"),
@@ -399,6 +453,129 @@ def update_tracks_json(r2_client: R2Client, catalog: Dict[str, Any]) -> None:
     r2_client.upload_json(tracks_data, "tracks.json")
 
 
+class TracksPublisher:
+    """
+    Debounced, incremental tracks.json publishing.
+
+    song_changed() only re-serializes that song's track and (re)arms a quiet
+    window; once no change has arrived for `quiet_seconds` the document is
+    assembled from the cached per-track JSON and uploaded, as tracks.json and
+    as tracks.json.gz (Content-Encoding: gzip). A document whose tracks hash
+    to what was last published is not uploaded at all. A 40-file drop
+    therefore publishes once, after the last file.
+
+    The clock is injectable; with start() a worker thread calls poll() when
+    the window closes, otherwise callers poll() themselves.
+    """
+
+    KEY = "tracks.json"
+
+    def __init__(self, r2_client: R2Client, quiet_seconds: float = None, clock=time.monotonic):
+        self.r2_client = r2_client
+        self.quiet_seconds = float(os.getenv("TRACKS_QUIET_SECONDS", TRACKS_QUIET_SECONDS)) if quiet_seconds is None else quiet_seconds
+        self.clock = clock
+        self.lock = threading.Lock()
+        # r2_path -> compact track JSON (None: unpublished), catalog order. Keyed by R2 path, not
+        # song_id: IDs repeat in the real catalog, and only songs with an R2 path are ever published
+        self._fragments: Dict[str, Optional[str]] = {}
+        self._deadline: Optional[float] = None
+        self.published_hash: Optional[str] = None
+        self.publishes = 0
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _key(song: Dict[str, Any]) -> Optional[str]:
+        return song.get("links", {}).get("r2_path")
+
+    @staticmethod
+    def _fragment(song: Dict[str, Any]) -> Optional[str]:
+        track = track_entry(song)
+        return json.dumps(track, separators=(",", ":"), ensure_ascii=False) if track else None
+
+    def seed(self, catalog: Dict[str, Any], published: Optional[dict] = None) -> None:
+        """Index the whole catalog once; `published` (the live tracks.json) avoids a redundant first upload."""
+        with self.lock:
+            self._fragments = {self._key(s): self._fragment(s) for s in catalog.get("songs", []) if self._key(s)}
+            if published is not None:
+                self.published_hash = self._hash([json.dumps(t, separators=(",", ":"), ensure_ascii=False)
+                                                  for t in published.get("tracks", [])])
+
+    def song_changed(self, song: Dict[str, Any]) -> None:
+        key = self._key(song)
+        if not key:
+            return  # not in R2, so never on the website
+        with self.lock:
+            self._fragments[key] = self._fragment(song)
+            self._deadline = self.clock() + self.quiet_seconds
+        self._wake.set()
+
+    @staticmethod
+    def _hash(fragments: List[str]) -> str:
+        return hashlib.sha256("\n".join(fragments).encode("utf-8")).hexdigest()
+
+    def poll(self) -> bool:
+        """Publish if the quiet window has closed; returns True if anything was uploaded."""
+        with self.lock:
+            if self._deadline is None or self.clock() < self._deadline:
+                return False
+        return self.flush()
+
+    def flush(self) -> bool:
+        """Publish pending changes now (skipped when the tracks are unchanged)."""
+        with self.lock:
+            self._deadline = None
+            fragments = [f for f in self._fragments.values() if f]
+            content_hash = self._hash(fragments)
+            if content_hash == self.published_hash:
+                return False
+        body = ('{"lastUpdated":"' + datetime.now().strftime("%Y-%m-%d") + '","tracks":[' + ",".join(fragments) + "]}").encode("utf-8")
+        ok = self.r2_client.upload_bytes(body, self.KEY, "application/json")
+        # mtime=0 keeps the gzip bytes identical for identical content
+        ok = ok and self.r2_client.upload_bytes(gzip.compress(body, mtime=0), self.KEY + ".gz", "application/json", "gzip")
+        if ok:
+            with self.lock:
+                self.published_hash = content_hash
+                self.publishes += 1
+        else:
+            with self.lock:
+                # Try again after another quiet window
+                self._deadline = self._deadline or self.clock() + self.quiet_seconds
+        return ok
+
+    # ------------------------------------------------------------------
+    # Worker thread
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="tracks-publisher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the worker and publish anything still pending."""
+        self._stopping = True
+        self._wake.set()
+        if self._thread:
+            self._thread.join()
+        if self._deadline is not None:
+            self.flush()
+
+    def _run(self) -> None:
+        while not self._stopping:
+            with self.lock:
+                wait = None if self._deadline is None else max(0.0, self._deadline - self.clock())
+            self._wake.wait(wait)
+            self._wake.clear()
+            if not self._stopping:
+                self.poll()
+
+
+def format_throughput(size_bytes: int, seconds: float) -> str:
+    """Format a transfer as size, time and MB/s."""
+    mb = size_bytes / (1024 * 1024)
+    return f"{mb:.1f} MB in {seconds:.2f}s, {mb / seconds if seconds > 0 else 0:.1f} MB/s"
+
+
 def format_duration(seconds: Optional[int]) -> str:
     """Format duration in seconds to M:SS format."""
     if not seconds:
@@ -412,8 +589,14 @@ def format_duration(seconds: Optional[int]) -> str:
 # FILE PROCESSOR
 # =============================================================================
 
-def process_file(file_path: Path, r2_client: R2Client) -> bool:
-    """Process a single audio file: extract, upload, catalog, cleanup."""
+def process_file(file_path: Path, r2_client: R2Client, publisher: "TracksPublisher" = None,
+                 metadata_service: MetadataService = None) -> bool:
+    """Process a single audio file: extract, upload, catalog, cleanup.
+
+    With a publisher, tracks.json is republished once the drop goes quiet
+    instead of being rebuilt and uploaded for this file. With a metadata
+    service, tags already parsed (e.g. by the startup scan) are reused.
+    """
 
     print(f"\n{'='*60}")
     print(f"Processing: {file_path.name}")
@@ -421,7 +604,7 @@ def process_file(file_path: Path, r2_client: R2Client) -> bool:
 
     # 1. Extract metadata
     print("\n[1/5] Extracting metadata...")
-    metadata = extract_metadata(file_path)
+    metadata = extract_metadata(file_path, metadata_service)
     print(f"  Title:    {metadata['title']}")
     print(f"  Artist:   {metadata['artist']}")
     print(f"  Album:    {metadata['album']}")
@@ -431,40 +614,63 @@ def process_file(file_path: Path, r2_client: R2Client) -> bool:
 
     # 2. Build R2 path
     print("\n[2/5] Building R2 path...")
-    artist_folder = sanitize_filename(metadata['artist'])
-    album_folder = sanitize_filename(metadata['album'])
-    filename = sanitize_filename(metadata['title']) + file_path.suffix.lower()
-
-    r2_key = f"{artist_folder}/{album_folder}/{filename}"
-
-    # Handle duplicates
-    if r2_client.file_exists(r2_key):
-        timestamp = datetime.now().strftime("%Y%m%d")
-        base_name = sanitize_filename(metadata['title'])
-        filename = f"{base_name}-{timestamp}{file_path.suffix.lower()}"
-        r2_key = f"{artist_folder}/{album_folder}/{filename}"
-        print(f"  [DUPLICATE] Renamed to: {filename}")
-
+    r2_key = r2_key_for(metadata, file_path.suffix)
     print(f"  R2 Path: {r2_key}")
 
-    # 3. Upload to R2
+    # 3. Upload to R2 (decided by content hash against the ledger, no HEAD)
     print("\n[3/5] Uploading to R2...")
-    content_type = 'audio/mpeg' if file_path.suffix.lower() == '.mp3' else 'audio/wav'
-    if not r2_client.upload_file(file_path, r2_key, content_type):
-        print("  [ERROR] Upload failed!")
-        return False
+    transfer = r2_client.transfer_config
+    # Part size as s3transfer will actually use it (>= 5 MiB), so the expected ETag matches R2's
+    chunk_size = ChunksizeAdjuster().adjust_chunksize(transfer.multipart_chunksize, file_path.stat().st_size)
+    fp = fingerprint(file_path, chunk_size, transfer.multipart_threshold)
+    replaced = False
+    with r2_client.ledger.reserve(fp["sha256"]):
+        existing = r2_client.ledger.find_content(fp)
+        if existing:
+            # Same bytes already in the bucket (possibly under another name): reuse that object
+            r2_key = existing["key"]
+            print(f"  [DUPLICATE] Identical content already at: {r2_key} (upload skipped)")
+        else:
+            replaced = r2_client.ledger.get(r2_key) is not None
+            if replaced:
+                print("  [CHANGED] New content for an existing key, re-uploading")
+            content_type = 'audio/mpeg' if file_path.suffix.lower() == '.mp3' else 'audio/wav'
+            if not r2_client.upload_file(file_path, r2_key, content_type):
+                print("  [ERROR] Upload failed!")
+                return False
+            r2_client.ledger.record(r2_key, fp, source=file_path.name)
 
     # 4. Update catalog
     print("\n[4/5] Updating catalog...")
-    catalog = load_catalog()
-    song_entry = create_song_entry(metadata, r2_key)
-    catalog["songs"].append(song_entry)
-    save_catalog(catalog)
-    print(f"  Song ID: {song_entry['song_id']}")
-    print(f"  Act ID:  {song_entry['act_id']}")
-
-    # Update tracks.json for website
-    update_tracks_json(r2_client, catalog)
+    with CATALOG_LOCK:
+        catalog = load_catalog()
+        song_entry = next((s for s in catalog["songs"] if s.get("links", {}).get("r2_path") == r2_key), None)
+        catalog_changed = song_entry is None or replaced
+        if song_entry is None:
+            song_entry = create_song_entry(metadata, r2_key, (s.get("song_id") for s in catalog["songs"]))
+            catalog["songs"].append(song_entry)
+        elif replaced:
+            now = datetime.now().isoformat()
+            song_entry.setdefault("musical_info", {})["duration_seconds"] = metadata.get("duration_seconds")
+            song_entry["audio"] = audio_info(metadata)
+            song_entry.setdefault("dates", {})["last_modified"] = now
+            song_entry.setdefault("events", []).append({
+                "timestamp": now,
+                "event_type": "audio_replaced",
+                "description": f"New audio uploaded via watch_and_upload.py ({file_path.name})",
+                "user": "System"
+            })
+        else:
+            print(f"  Already cataloged as {song_entry['song_id']}")
+        if catalog_changed:
+            save_catalog(catalog)
+            # Update tracks.json for website
+            if publisher:
+                publisher.song_changed(song_entry)
+            else:
+                update_tracks_json(r2_client, catalog)
+        print(f"  Song ID: {song_entry['song_id']}")
+        print(f"  Act ID:  {song_entry['act_id']}")
 
     # 5. Move to Completed folder
     print("\n[5/5] Moving to Completed...")
@@ -477,64 +683,170 @@ def process_file(file_path: Path, r2_client: R2Client) -> bool:
         completed_path = COMPLETED_FOLDER / f"{file_path.stem}_{timestamp}{file_path.suffix}"
 
     shutil.move(str(file_path), str(completed_path))
+    if metadata_service:
+        metadata_service.moved(file_path, completed_path)
     print(f"  Moved to: {completed_path}")
 
     print(f"\n[SUCCESS] {metadata['title']} uploaded successfully!")
     return True
 
 
+def backfill_catalog(metadata_service: MetadataService, publisher: TracksPublisher = None) -> int:
+    """
+    Scan the watch and Completed folders (priming the metadata cache for
+    files still waiting) and fill in duration and audio details for
+    cataloged songs that lack them, matched by their R2 path. Returns the
+    number of songs updated.
+    """
+    waiting = metadata_service.scan(WATCH_FOLDER)
+    completed = metadata_service.scan(COMPLETED_FOLDER)
+    print(f"Metadata: {len(waiting)} waiting, {len(completed)} completed file(s) scanned "
+          f"({metadata_service.hits} cached, {metadata_service.misses} parsed)")
+
+    by_key = {r2_key_for(metadata, path.suffix): metadata for path, metadata in completed.items()}
+    updated = []
+    with CATALOG_LOCK:
+        catalog = load_catalog()
+        for song in catalog["songs"]:
+            metadata = by_key.get(song.get("links", {}).get("r2_path"))
+            if not metadata:
+                continue
+            musical_info = song.setdefault("musical_info", {})
+            changed = False
+            if musical_info.get("duration_seconds") is None and metadata.get("duration_seconds") is not None:
+                musical_info["duration_seconds"] = metadata["duration_seconds"]
+                changed = True
+            if "audio" not in song:
+                song["audio"] = audio_info(metadata)
+                changed = True
+            if changed:
+                updated.append(song)
+        if updated:
+            save_catalog(catalog)
+    for song in updated:
+        if publisher:
+            publisher.song_changed(song)
+    if updated:
+        print(f"Backfilled audio details for {len(updated)} song(s)")
+    return len(updated)
+
+
 # =============================================================================
-# FOLDER WATCHER
+# UPLOAD EXECUTOR
 # =============================================================================
 
-class UploadHandler(FileSystemEventHandler):
-    """Watches for new audio files and processes them."""
+class UploadExecutor:
+    """Processes several files at once on a bounded thread pool."""
 
-    def __init__(self, r2_client: R2Client):
+    def __init__(self, r2_client: R2Client, workers: int = None, publisher: TracksPublisher = None,
+                 metadata_service: MetadataService = None):
         self.r2_client = r2_client
-        self.processing = set()  # Track files being processed
+        self.publisher = publisher
+        self.metadata_service = metadata_service
+        self.workers = workers or r2_client.upload_workers
+        self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="upload")
 
-    def on_created(self, event):
-        if event.is_directory:
-            return
+    def submit(self, fn, *args) -> Future:
+        """Run fn(*args) on the pool; exceptions are logged rather than lost."""
+        return self.pool.submit(self._run, fn, *args)
 
-        file_path = Path(event.src_path)
+    def process_all(self, file_paths: Iterable[Path]) -> List[bool]:
+        """Process files concurrently; returns per-file success in input order."""
+        futures = [self.submit(process_file, file_path, self.r2_client, self.publisher, self.metadata_service) for file_path in file_paths]
+        return [f.result() for f in futures]
 
-        # Skip non-audio files
-        if file_path.suffix.lower() not in SUPPORTED_EXTENSIONS:
-            return
+    def shutdown(self, wait: bool = True) -> None:
+        self.pool.shutdown(wait=wait)
 
-        # Skip files in Completed folder
-        if "Completed" in str(file_path):
-            return
+    @staticmethod
+    def _run(fn, *args):
+        try:
+            return fn(*args)
+        except Exception as e:
+            name = next((a.name for a in args if isinstance(a, Path)), fn.__name__)
+            print(f"\n[ERROR] Failed to process {name}: {e}")
+            return False
 
-        # Skip if already processing
-        if str(file_path) in self.processing:
-            return
 
-        self.processing.add(str(file_path))
+# =============================================================================
+# FOLDER WATCHER
+# =============================================================================
 
-        try:
-            # Wait a moment for file to finish writing
-            time.sleep(2)
+class UploadHandler(FileSystemEventHandler):
+    """
+    Watches for new audio files and hands them to the upload executor.
 
-            # Verify file still exists and is complete
-            if not file_path.exists():
+    Events are only forwarded to a WriteTracker, so watchdog's dispatch
+    thread never waits; the tracker submits each file once it has finished
+    copying.
+    """
+
+    def __init__(self, r2_client: R2Client, executor: UploadExecutor, tracker: WriteTracker = None):
+        self.r2_client = r2_client
+        self.executor = executor
+        self.processing = set()  # Files submitted and not yet finished
+        self.lock = threading.Lock()
+        self.tracker = tracker or WriteTracker(self._submit).start()
+
+    def _wanted(self, path: str) -> bool:
+        file_path = Path(path)
+        # Only audio, and never the Completed folder
+        return file_path.suffix.lower() in SUPPORTED_EXTENSIONS and "Completed" not in str(file_path)
+
+    def track(self, file_path: Path):
+        """Queue a file for upload once it is complete (also used for files found at startup)."""
+        with self.lock:
+            if str(file_path) in self.processing:
                 return
+        self.tracker.written(file_path)
 
-            # Check file is not still being written
-            initial_size = file_path.stat().st_size
-            time.sleep(1)
-            if file_path.exists() and file_path.stat().st_size != initial_size:
-                time.sleep(3)  # Wait longer if still changing
+    def on_created(self, event):
+        if not event.is_directory and self._wanted(event.src_path):
+            self.track(Path(event.src_path))
+
+    def on_modified(self, event):
+        if not event.is_directory and self._wanted(event.src_path):
+            self.track(Path(event.src_path))
+
+    def on_closed(self, event):
+        if not event.is_directory and self._wanted(event.src_path):
+            self.tracker.closed(Path(event.src_path))
+
+    def on_moved(self, event):
+        if self._wanted(event.src_path):
+            self.tracker.forget(Path(event.src_path))
+        # A rename into the folder is complete as it lands
+        if not event.is_directory and self._wanted(event.dest_path) and Path(event.dest_path).parent == WATCH_FOLDER:
+            self.track(Path(event.dest_path))
+            self.tracker.closed(Path(event.dest_path))
+
+    def on_deleted(self, event):
+        if self._wanted(event.src_path):
+            self.tracker.forget(Path(event.src_path))
+
+    def stop(self):
+        self.tracker.stop()
+
+    def _submit(self, file_path: Path):
+        with self.lock:
+            if str(file_path) in self.processing:
+                return
+            self.processing.add(str(file_path))
+        self.executor.submit(self._process, file_path)
 
-            process_file(file_path, self.r2_client)
+    def _process(self, file_path: Path) -> bool:
+        try:
+            if not file_path.exists():
+                return False
+            return process_file(file_path, self.r2_client, self.executor.publisher, self.executor.metadata_service)
 
         except Exception as e:
             print(f"\n[ERROR] Failed to process {file_path.name}: {e}")
+            return False
 
         finally:
-            self.processing.discard(str(file_path))
+            with self.lock:
+                self.processing.discard(str(file_path))
 
 
 def watch_folder(r2_client: R2Client) -> None:
@@ -553,20 +865,31 @@ def watch_folder(r2_client: R2Client) -> None:
     print(f"\nDrop .mp3 or .wav files into the watch folder to upload.")
     print("Press Ctrl+C to stop.\n")
 
-    # Process any existing files first
-    existing_files = list(WATCH_FOLDER.glob("*.mp3")) + list(WATCH_FOLDER.glob("*.wav"))
-    if existing_files:
-        print(f"Found {len(existing_files)} existing file(s) to process...\n")
-        for file_path in existing_files:
-            if "Completed" not in str(file_path):
-                process_file(file_path, r2_client)
+    # First run: seed the ledger from the bucket so existing objects are not overwritten
+    if r2_client.ledger.last_reconciled() is None:
+        r2_client.reconcile_ledger()
+
+    publisher = TracksPublisher(r2_client)
+    publisher.seed(load_catalog(), r2_client.get_json(TracksPublisher.KEY))
+    publisher.start()
+    metadata_service = MetadataService(METADATA_CACHE_PATH)
+    backfill_catalog(metadata_service, publisher)
+    executor = UploadExecutor(r2_client, publisher=publisher, metadata_service=metadata_service)
+    print(f"Uploading up to {executor.workers} file(s) at once.\n")
 
     # Start watching
-    event_handler = UploadHandler(r2_client)
+    event_handler = UploadHandler(r2_client, executor)
     observer = Observer()
     observer.schedule(event_handler, str(WATCH_FOLDER), recursive=False)
     observer.start()
 
+    # Existing files go through the tracker too, in case a copy was still running
+    existing_files = list(WATCH_FOLDER.glob("*.mp3")) + list(WATCH_FOLDER.glob("*.wav"))
+    if existing_files:
+        print(f"Found {len(existing_files)} existing file(s) to process...\n")
+        for f in existing_files:
+            event_handler.track(f)
+
     try:
         while True:
             time.sleep(1)
@@ -575,6 +898,10 @@ def watch_folder(r2_client: R2Client) -> None:
         observer.stop()
 
     observer.join()
+    event_handler.stop()
+    executor.shutdown()
+    publisher.stop()
+    metadata_service.close()
     print("Goodbye!")
 
 
@@ -584,6 +911,10 @@ def watch_folder(r2_client: R2Client) -> None:
 
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="Watch a folder and upload audio to R2")
+    parser.add_argument("--reconcile", action="store_true",
+                        help="list the bucket once, repair the upload ledger and exit")
+    args = parser.parse_args()
 
     # Verify .env exists
     env_path = CATALOG_MANAGER_ROOT / ".env"
@@ -604,6 +935,10 @@ def main():
         print(f"ERROR: {e}")
         sys.exit(1)
 
+    if args.reconcile:
+        r2_client.reconcile_ledger()
+        return
+
     # Start watching
     watch_folder(r2_client)
 
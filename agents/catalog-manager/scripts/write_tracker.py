@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Write Completion Tracker
+Decides when a file dropped into the watch folder has finished copying, so
+watch_and_upload.py never uploads half a WAV and small files are not held
+back by fixed sleeps.
+Filesystem events are only queued (watchdog's dispatch thread never waits);
+one worker thread owns all pending files:
+- a close-after-write (inotify IN_CLOSE_WRITE, watchdog on_closed) or a
+  rename into the folder marks the file done once it has stayed unchanged
+  for `close_grace` seconds (a writer that reopens to append resets this)
+- otherwise (no close events on this platform, or writes still arriving)
+  size + mtime are polled at exponentially growing intervals, and the file
+  is done once it has not been seen to change for `settle` seconds (the
+  mtime's age is not trusted: copy tools may preserve it)
+Files that vanish while pending are dropped.
+"""
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+CLOSE_GRACE_SECONDS = 0.5
+SETTLE_SECONDS = 2.0
+POLL_MIN_SECONDS = 0.25
+POLL_MAX_SECONDS = 2.0
+
+
+class _Pending:
+    __slots__ = ("signature", "changed_at", "interval", "next_check", "closed_at", "closed_signature")
+
+    def __init__(self, signature: Tuple[int, int], now: float, interval: float):
+        self.signature = signature
+        self.changed_at = now
+        self.interval = interval
+        self.next_check = now + interval
+        self.closed_at: Optional[float] = None
+        self.closed_signature: Optional[Tuple[int, int]] = None
+
+
+def _signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class WriteTracker:
+    def __init__(self, on_ready: Callable[[Path], None], close_grace: float = None, settle: float = None,
+                 poll_min: float = POLL_MIN_SECONDS, poll_max: float = POLL_MAX_SECONDS):
+        self.on_ready = on_ready
+        self.close_grace = float(os.getenv("WRITE_CLOSE_GRACE_SECONDS", CLOSE_GRACE_SECONDS)) if close_grace is None else close_grace
+        self.settle = float(os.getenv("WRITE_SETTLE_SECONDS", SETTLE_SECONDS)) if settle is None else settle
+        self.poll_min, self.poll_max = poll_min, poll_max
+        self.events: "queue.Queue[Tuple[str, Optional[Path]]]" = queue.Queue()
+        self.pending: Dict[Path, _Pending] = {}
+        self.polls = 0
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Called from the watchdog thread: enqueue only
+    # ------------------------------------------------------------------
+    def written(self, path: Path):
+        """The file was created or written to."""
+        self.events.put(("written", Path(path)))
+
+    def closed(self, path: Path):
+        """The writer closed the file (or it was renamed into place)."""
+        self.events.put(("closed", Path(path)))
+
+    def forget(self, path: Path):
+        """The file was deleted or moved away."""
+        self.events.put(("forget", Path(path)))
+
+    # ------------------------------------------------------------------
+    # Worker thread
+    # ------------------------------------------------------------------
+    def start(self) -> "WriteTracker":
+        self._thread = threading.Thread(target=self._run, name="write-tracker", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.events.put(("stop", None))
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            now = time.monotonic()
+            due = min((p.next_check for p in self.pending.values()), default=None)
+            try:
+                kind, path = self.events.get(timeout=None if due is None else max(0.0, due - now))
+            except queue.Empty:
+                kind, path = None, None
+            if kind == "stop":
+                return
+            if kind:
+                self._handle(kind, path, time.monotonic())
+            self._check_due(time.monotonic())
+
+    def _handle(self, kind: str, path: Path, now: float):
+        if kind == "forget":
+            self.pending.pop(path, None)
+            return
+        signature = _signature(path)
+        if signature is None:
+            self.pending.pop(path, None)
+            return
+        entry = self.pending.get(path)
+        if entry is None:
+            entry = self.pending[path] = _Pending(signature, now, self.poll_min)
+        if kind == "closed":
+            entry.closed_at, entry.closed_signature = now, signature
+            entry.next_check = min(entry.next_check, now + self.close_grace)
+        elif entry.closed_at is not None and signature != entry.closed_signature:
+            # Reopened and written again after the close: back to polling
+            entry.closed_at = entry.closed_signature = None
+
+    def _check_due(self, now: float):
+        for path, entry in list(self.pending.items()):
+            if entry.next_check > now:
+                continue
+            self.polls += 1
+            signature = _signature(path)
+            if signature is None:
+                del self.pending[path]
+                continue
+            if entry.closed_at is not None:
+                if signature == entry.closed_signature and now - entry.closed_at >= self.close_grace:
+                    self._ready(path)
+                    continue
+                if signature != entry.closed_signature:
+                    entry.closed_at = entry.closed_signature = None
+            if signature != entry.signature:
+                entry.signature, entry.changed_at = signature, now
+            # Only our own observations count: mtime can be preserved by the copy tool or come from
+            # a share whose clock is behind, and would make a growing file look long finished
+            quiet_for = now - entry.changed_at
+            if quiet_for >= self.settle:
+                self._ready(path)
+                continue
+            if entry.changed_at == now:
+                # Still growing: back off, a long copy does not need frequent stats
+                entry.interval = min(entry.interval * 2, self.poll_max)
+                entry.next_check = now + entry.interval
+            else:
+                entry.next_check = now + max(self.settle - quiet_for, self.poll_min)
+            if entry.closed_at is not None:
+                entry.next_check = min(entry.next_check, entry.closed_at + self.close_grace)
+
+    def _ready(self, path: Path):
+        del self.pending[path]
+        try:
+            self.on_ready(path)
+        except Exception as e:
+            print(f"\n[ERROR] Could not queue {path.name}: {e}")
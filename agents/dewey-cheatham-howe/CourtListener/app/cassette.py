@@ -0,0 +1,258 @@
+"""Cassette-style record/replay transports for CourtListener HTTP traffic.
+
+Recording wraps the real transport and appends normalised request/response
+pairs to a gzip-compressed JSONL cassette, with credentials scrubbed from the
+stored headers. Replaying serves those pairs deterministically, in recorded
+order per request, with optional synthetic latency, so tool performance can be
+benchmarked reproducibly without a token or network access.
+
+Select a mode with ``HTTP_CASSETTE_MODE`` (``off``, ``record`` or ``replay``)
+and a file with ``HTTP_CASSETTE_PATH``.
+"""
+
+import asyncio
+import base64
+from collections import defaultdict
+from collections.abc import Iterable
+import gzip
+import hashlib
+import json
+from pathlib import Path
+import random
+from typing import Any
+
+import httpx
+from loguru import logger
+
+# Headers never written to a cassette
+SCRUBBED_HEADERS = frozenset(
+    {"authorization", "cookie", "set-cookie", "proxy-authorization", "x-api-key"}
+)
+# Headers describing the wire encoding, which no longer applies to stored bodies
+WIRE_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+
+CASSETTE_MODES = ("off", "record", "replay")
+
+
+class CassetteMissError(httpx.TransportError):
+    """Raised when a replayed request has no recorded interaction."""
+
+
+def normalize_url(url: httpx.URL) -> str:
+    """Return the URL with query parameters sorted for stable matching."""
+    params = sorted(url.params.multi_items())
+    return str(url.copy_with(params=params)) if params else str(url)
+
+
+def request_key(method: str, url: str, body: bytes) -> str:
+    """Build the lookup key for a request.
+
+    Args:
+        method: HTTP method.
+        url: Normalised URL.
+        body: Raw request body.
+
+    Returns:
+        A key combining method, URL and a digest of the body.
+
+    """
+    digest = hashlib.sha256(body).hexdigest()[:16] if body else "-"
+    return f"{method.upper()} {url} {digest}"
+
+
+def _scrub(headers: Iterable[tuple[str, str]], drop: frozenset[str]) -> dict[str, str]:
+    """Copy headers, lower-casing names and dropping those in ``drop``."""
+    return {k.lower(): v for k, v in headers if k.lower() not in drop}
+
+
+def _encode_body(body: bytes) -> dict[str, str]:
+    """Encode a body as UTF-8 text when possible, otherwise base64."""
+    try:
+        return {"body": body.decode("utf-8"), "encoding": "utf-8"}
+    except UnicodeDecodeError:
+        return {"body": base64.b64encode(body).decode("ascii"), "encoding": "base64"}
+
+
+def _decode_body(data: dict[str, Any]) -> bytes:
+    """Decode a body stored by ``_encode_body``."""
+    body = data.get("body", "")
+    if data.get("encoding") == "base64":
+        return base64.b64decode(body)
+    return body.encode("utf-8")
+
+
+def make_interaction(
+    request: httpx.Request, status_code: int, headers: Any, content: bytes
+) -> dict[str, Any]:
+    """Build a normalised, scrubbed cassette record.
+
+    Args:
+        request: The request that was sent.
+        status_code: Response status code.
+        headers: Response headers.
+        content: Decoded response body.
+
+    Returns:
+        A JSON-serialisable interaction record.
+
+    """
+    body = request.content
+    url = normalize_url(request.url)
+    return {
+        "key": request_key(request.method, url, body),
+        "request": {
+            "method": request.method,
+            "url": url,
+            "headers": _scrub(request.headers.multi_items(), SCRUBBED_HEADERS),
+            **_encode_body(body),
+        },
+        "response": {
+            "status": status_code,
+            "headers": _scrub(
+                httpx.Headers(headers).multi_items(), SCRUBBED_HEADERS | WIRE_HEADERS
+            ),
+            **_encode_body(content),
+        },
+    }
+
+
+def write_cassette(path: str | Path, interactions: Iterable[dict[str, Any]]) -> None:
+    """Append interactions to a gzip-compressed JSONL cassette.
+
+    Args:
+        path: Cassette file path.
+        interactions: Records built by ``make_interaction``.
+
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(path, "at", encoding="utf-8") as f:
+        for interaction in interactions:
+            f.write(json.dumps(interaction, sort_keys=True) + "\n")
+
+
+def read_cassette(path: str | Path) -> list[dict[str, Any]]:
+    """Read every interaction from a cassette.
+
+    Args:
+        path: Cassette file path.
+
+    Returns:
+        Interactions in recorded order.
+
+    """
+    with gzip.open(Path(path), "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper that records every exchange to a cassette."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, path: str | Path) -> None:
+        """Wrap a transport and record to ``path``.
+
+        Args:
+            transport: The transport that actually sends requests.
+            path: Cassette file to append to.
+
+        """
+        self._transport = transport
+        self.path = Path(path)
+        logger.info(f"Recording HTTP traffic to cassette {self.path}")
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send the request, record the exchange and return a buffered response."""
+        response = await self._transport.handle_async_request(request)
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+        interaction = make_interaction(
+            request, response.status_code, response.headers, content
+        )
+        write_cassette(self.path, [interaction])
+        return httpx.Response(
+            response.status_code,
+            headers=_scrub(response.headers.multi_items(), WIRE_HEADERS),
+            content=content,
+            request=request,
+        )
+
+    async def aclose(self) -> None:
+        """Close the wrapped transport."""
+        await self._transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Transport serving recorded interactions without touching the network.
+
+    Repeated requests with the same key receive the recorded responses in
+    order, cycling once exhausted, so replay is deterministic.
+    """
+
+    def __init__(
+        self,
+        interactions: Iterable[dict[str, Any]],
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        """Index interactions for replay.
+
+        Args:
+            interactions: Records built by ``make_interaction``.
+            latency_ms: Synthetic latency added to every response.
+            jitter_ms: Maximum extra latency, drawn from a seeded RNG.
+            seed: Seed for the jitter RNG.
+
+        """
+        self._responses: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for interaction in interactions:
+            self._responses[interaction["key"]].append(interaction["response"])
+        self._cursor: dict[str, int] = defaultdict(int)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self._rng = random.Random(seed)
+
+    @classmethod
+    def from_file(cls, path: str | Path, **kwargs: Any) -> "ReplayTransport":
+        """Load a replay transport from a cassette file.
+
+        Args:
+            path: Cassette file path.
+            **kwargs: Passed to the constructor (latency, jitter, seed).
+
+        Returns:
+            A ReplayTransport serving the cassette.
+
+        """
+        interactions = read_cassette(path)
+        logger.info(f"Replaying {len(interactions)} HTTP interactions from {path}")
+        return cls(interactions, **kwargs)
+
+    def __len__(self) -> int:
+        """Return the number of distinct recorded requests."""
+        return len(self._responses)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Serve the next recorded response for the request."""
+        key = request_key(request.method, normalize_url(request.url), request.content)
+        responses = self._responses.get(key)
+        if not responses:
+            raise CassetteMissError(f"No recorded interaction for {key}", request=request)
+        index = self._cursor[key] % len(responses)
+        self._cursor[key] += 1
+        recorded = responses[index]
+
+        delay = self.latency_ms
+        if self.jitter_ms:
+            delay += self._rng.uniform(0, self.jitter_ms)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+
+        return httpx.Response(
+            recorded["status"],
+            headers=recorded.get("headers", {}),
+            content=_decode_body(recorded),
+            request=request,
+        )
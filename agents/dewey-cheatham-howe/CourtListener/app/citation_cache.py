@@ -0,0 +1,247 @@
+"""Memoised citeurl parse results for CourtListener MCP Server.
+
+Agents tend to verify and parse the same handful of citations many times per
+session. This module keeps a bounded LRU of structured citeurl parse results,
+keyed by the stripped citation text plus the matching mode, so repeated tool
+calls skip citeurl entirely. The cache can optionally be persisted to a local
+SQLite file so warm restarts also skip compiling the citation templates.
+"""
+
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import lru_cache
+import json
+from pathlib import Path
+import sqlite3
+import threading
+from typing import Any
+
+from loguru import logger
+
+from app.config import config
+
+# A parse result is either a structured citation dict or None (not recognised)
+ParseResult = dict[str, Any] | None
+
+
+def normalize_citation_key(citation: str) -> str:
+    """Normalise citation text for use as a cache key.
+
+    Only the ends are stripped, matching the text that is actually parsed.
+    citeurl's strict mode rejects lowercase reporters and repeated inner
+    whitespace, and both modes return the matched text as written, so
+    spellings that differ in case or spacing must not share an entry.
+
+    Args:
+        citation: The raw citation string.
+
+    Returns:
+        The normalised cache key.
+
+    """
+    return citation.strip()
+
+
+def _copy_result(result: ParseResult) -> ParseResult:
+    """Return a copy of a parse result that callers may safely mutate."""
+    if result is None:
+        return None
+    return {**result, "tokens": dict(result.get("tokens") or {})}
+
+
+class CitationParseCache:
+    """Bounded LRU cache of citeurl parse results with optional SQLite backing.
+
+    Attributes:
+        maxsize: Maximum number of entries held in memory.
+        path: Path to the SQLite file, or None for a memory-only cache.
+        hits: Number of lookups served from memory or disk.
+        misses: Number of lookups that required a fresh parse.
+        disk_hits: Subset of hits served from the SQLite file.
+
+    """
+
+    def __init__(self, maxsize: int = 4096, path: str | Path | None = None) -> None:
+        """Initialise the cache.
+
+        Args:
+            maxsize: Maximum number of entries held in memory.
+            path: Optional SQLite file used to persist entries across restarts.
+
+        """
+        self.maxsize = max(1, maxsize)
+        self.path = Path(path) if path else None
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._entries: OrderedDict[tuple[str, bool], ParseResult] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        if self.path is not None:
+            self._db = self._open_db(self.path)
+
+    @staticmethod
+    def _open_db(path: Path) -> sqlite3.Connection | None:
+        """Open (and create if needed) the SQLite persistence file.
+
+        Args:
+            path: Location of the SQLite file.
+
+        Returns:
+            An open connection, or None if the file could not be opened.
+
+        """
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(path), check_same_thread=False)
+            # citation_parse held case-folded keys, which mixed up spellings
+            db.execute("DROP TABLE IF EXISTS citation_parse")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS citation_parse_v2 ("
+                "key TEXT NOT NULL, broad INTEGER NOT NULL, result TEXT, "
+                "PRIMARY KEY (key, broad))"
+            )
+            db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Citation cache persistence disabled ({path}): {e}")
+            return None
+        logger.info(f"Citation parse cache persisted to {path}")
+        return db
+
+    def __len__(self) -> int:
+        """Return the number of entries held in memory."""
+        return len(self._entries)
+
+    def get_or_parse(
+        self,
+        citation: str,
+        broad: bool,
+        parse: Callable[[str, bool], ParseResult],
+    ) -> ParseResult:
+        """Return the cached parse result for a citation, parsing on a miss.
+
+        Exceptions raised by ``parse`` propagate and are not cached, so the
+        caller's fallback handling still applies.
+
+        Args:
+            citation: The citation text to parse.
+            broad: Whether broad matching is used.
+            parse: Function performing the real parse for a miss.
+
+        Returns:
+            A copy of the structured parse result, or None if not recognised.
+
+        """
+        key = (normalize_citation_key(citation), broad)
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _copy_result(self._entries[key])
+
+            found, result = self._load(key)
+            if found:
+                self.hits += 1
+                self.disk_hits += 1
+                self._insert(key, result)
+                return _copy_result(result)
+
+            self.misses += 1
+
+        result = parse(citation.strip(), broad)
+
+        with self._lock:
+            self._insert(key, result)
+            self._store(key, result)
+        return _copy_result(result)
+
+    def _insert(self, key: tuple[str, bool], result: ParseResult) -> None:
+        """Insert an entry in memory, evicting the least recently used."""
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _load(self, key: tuple[str, bool]) -> tuple[bool, ParseResult]:
+        """Look up an entry in the SQLite file.
+
+        Returns:
+            Tuple of (found, result).
+
+        """
+        if self._db is None:
+            return False, None
+        try:
+            row = self._db.execute(
+                "SELECT result FROM citation_parse_v2 WHERE key = ? AND broad = ?",
+                (key[0], int(key[1])),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Citation cache read failed: {e}")
+            return False, None
+        if row is None:
+            return False, None
+        return True, json.loads(row[0]) if row[0] is not None else None
+
+    def _store(self, key: tuple[str, bool], result: ParseResult) -> None:
+        """Write an entry to the SQLite file, if persistence is enabled."""
+        if self._db is None:
+            return
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO citation_parse_v2 (key, broad, result) "
+                "VALUES (?, ?, ?)",
+                (key[0], int(key[1]), json.dumps(result) if result is not None else None),
+            )
+            self._db.commit()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"Citation cache write failed: {e}")
+
+    def clear(self) -> None:
+        """Drop all in-memory entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.disk_hits = 0
+
+    def close(self) -> None:
+        """Close the SQLite connection, if any."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> dict[str, Any]:
+        """Return cache statistics for the status tool.
+
+        Returns:
+            Dictionary with size, capacity, hit/miss counters and hit rate.
+
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "persistent": self._db is not None,
+            }
+
+
+@lru_cache(maxsize=1)
+def get_citation_cache() -> CitationParseCache:
+    """Get or create the shared citation parse cache.
+
+    Returns:
+        CitationParseCache: The singleton cache configured from ``Config``.
+
+    """
+    return CitationParseCache(
+        maxsize=config.citation_cache_size,
+        path=config.citation_cache_path,
+    )
@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 """Configuration management for CourtListener MCP Server."""
 
+import asyncio
+import atexit
+import importlib.util
 import os
-from collections.abc import AsyncIterator
+from collections.abc import AsyncGenerator, AsyncIterator
 from contextlib import asynccontextmanager
 from typing import TYPE_CHECKING
 
@@ -10,6 +13,9 @@ import httpx
 from loguru import logger
 from pydantic_settings import BaseSettings
 
+from app.cassette import CASSETTE_MODES, RecordingTransport, ReplayTransport
+from app.metrics import MetricsTransport
+
 if TYPE_CHECKING:
     from fastmcp import Context
 
@@ -33,7 +39,34 @@ class Config(BaseSettings):
     # CourtListener API
     courtlistener_base_url: str = "https://www.courtlistener.com/api/rest/v4/"
     courtlistener_api_key: str | None = None
-    courtlistener_timeout: int = 30
+    courtlistener_timeout: int = 30  # Default read/write/pool timeout (seconds)
+    courtlistener_connect_timeout: float = 10.0
+    # Per-endpoint read timeout overrides, e.g. '{"citation-lookup": 60}'
+    courtlistener_endpoint_timeouts: dict[str, float] = {}
+
+    # HTTP connection pool
+    http_max_connections: int = 10
+    http_max_keepalive_connections: int = 5
+    http_keepalive_expiry: float = 5.0  # Seconds an idle connection is kept
+    http2: bool = False  # Requires the optional 'h2' package
+
+    # Citation parse cache
+    citation_cache_size: int = 4096
+    citation_cache_path: str | None = None  # SQLite file; None keeps it in memory
+
+    # Background system sampling for the status tool
+    status_sample_interval: float = 5.0  # Seconds between samples
+    status_sample_window: int = 60  # Samples kept for min/avg/max
+
+    # Metrics
+    metrics_enabled: bool = True
+    metrics_path: str = "/metrics"  # Prometheus route for HTTP/SSE transports
+
+    # HTTP record/replay (see app/cassette.py)
+    http_cassette_mode: str = "off"  # Options: off, record, replay
+    http_cassette_path: str = "tests/cassettes/courtlistener.jsonl.gz"
+    http_replay_latency_ms: float = 0.0  # Synthetic latency added on replay
+    http_replay_jitter_ms: float = 0.0  # Extra random latency (seeded) on replay
 
     model_config = {
         "env_file": ".env",
@@ -106,12 +139,168 @@ def is_debug_enabled() -> bool:
     )
 
 
+def get_timeout(endpoint: str | None = None, multiplier: float = 1.0) -> httpx.Timeout:
+    """Build the timeout for a CourtListener endpoint.
+
+    The connect timeout is fixed by ``courtlistener_connect_timeout``; the read
+    timeout comes from ``courtlistener_endpoint_timeouts`` for the endpoint,
+    falling back to ``courtlistener_timeout``.
+
+    Args:
+        endpoint: API endpoint name (e.g. 'search', 'citation-lookup').
+        multiplier: Factor applied to the read timeout (e.g. for batch requests).
+
+    Returns:
+        An httpx.Timeout with split connect/read/write/pool values.
+
+    """
+    default = float(config.courtlistener_timeout)
+    read = config.courtlistener_endpoint_timeouts.get(endpoint or "", default)
+    return httpx.Timeout(
+        default,
+        connect=config.courtlistener_connect_timeout,
+        read=read * multiplier,
+    )
+
+
+def _http2_enabled() -> bool:
+    """Check whether HTTP/2 is requested and the 'h2' package is available."""
+    if not config.http2:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP2 requested but 'h2' is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create an HTTP client for CourtListener API requests.
+
+    Requests are sent through ``MetricsTransport`` so upstream latency, status
+    codes and payload sizes are recorded in the metrics registry. When
+    ``http_cassette_mode`` is ``record`` or ``replay``, traffic is recorded to
+    or served from the configured cassette.
+
+    Returns:
+        A new httpx.AsyncClient; the caller is responsible for closing it.
+
+    Raises:
+        ValueError: If ``http_cassette_mode`` is not a known mode.
+
+    """
+    mode = config.http_cassette_mode.lower()
+    if mode not in CASSETTE_MODES:
+        raise ValueError(
+            f"Invalid http_cassette_mode: {config.http_cassette_mode}. "
+            f"Must be one of {list(CASSETTE_MODES)}"
+        )
+
+    transport: httpx.AsyncBaseTransport
+    if mode == "replay":
+        transport = ReplayTransport.from_file(
+            config.http_cassette_path,
+            latency_ms=config.http_replay_latency_ms,
+            jitter_ms=config.http_replay_jitter_ms,
+        )
+    else:
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=config.http_max_connections,
+                max_keepalive_connections=config.http_max_keepalive_connections,
+                keepalive_expiry=config.http_keepalive_expiry,
+            ),
+            http2=_http2_enabled(),
+        )
+        if mode == "record":
+            transport = RecordingTransport(transport, config.http_cassette_path)
+    return httpx.AsyncClient(
+        timeout=get_timeout(),
+        transport=MetricsTransport(transport, config.courtlistener_base_url),
+    )
+
+
+# Client used when no lifespan client is available, created on first use
+_fallback_client: httpx.AsyncClient | None = None
+_fallback_loop: asyncio.AbstractEventLoop | None = None
+_fallback_guard: AsyncGenerator[None] | None = None
+
+
+async def _close_with_loop(client: httpx.AsyncClient) -> AsyncGenerator[None]:
+    """Keep ``client`` open until the event loop shuts down its async generators.
+
+    ``asyncio.run()`` and pytest-asyncio finalise live async generators before
+    closing the loop, so the fallback client is closed on the loop that owns its
+    connections even when no lifespan ever runs.
+
+    Args:
+        client: The fallback client to close.
+
+    """
+    try:
+        yield
+    finally:
+        if not client.is_closed:
+            logger.debug("Closing fallback HTTP client with its event loop")
+            await client.aclose()
+
+
+async def _get_fallback_client() -> httpx.AsyncClient:
+    """Return the module-level fallback client, creating it lazily.
+
+    A new client is created if none exists, the previous one was closed, or it
+    belongs to a different event loop (its connections cannot be reused there).
+    Each client is closed when its event loop shuts down.
+
+    Returns:
+        The shared fallback httpx.AsyncClient.
+
+    """
+    global _fallback_client, _fallback_loop, _fallback_guard
+    loop = asyncio.get_running_loop()
+    if (
+        _fallback_client is None
+        or _fallback_client.is_closed
+        or _fallback_loop is not loop
+    ):
+        logger.debug("Creating fallback HTTP client (lifespan client unavailable)")
+        _fallback_client = create_http_client()
+        _fallback_loop = loop
+        _fallback_guard = _close_with_loop(_fallback_client)
+        await anext(_fallback_guard)
+    return _fallback_client
+
+
+async def close_fallback_client() -> None:
+    """Close the module-level fallback client, if it was ever created."""
+    global _fallback_client, _fallback_loop, _fallback_guard
+    if _fallback_client is not None and not _fallback_client.is_closed:
+        logger.info("Closing fallback HTTP client")
+        await _fallback_client.aclose()
+    if _fallback_guard is not None:
+        await _fallback_guard.aclose()
+    _fallback_client = None
+    _fallback_loop = None
+    _fallback_guard = None
+
+
+@atexit.register
+def _close_fallback_client_at_exit() -> None:
+    """Close a fallback client whose event loop was never shut down."""
+    loop = _fallback_loop
+    if _fallback_client is None or _fallback_client.is_closed or loop is None:
+        return
+    if not loop.is_closed() and not loop.is_running():
+        loop.run_until_complete(close_fallback_client())
+
+
 @asynccontextmanager
 async def get_http_client(ctx: "Context") -> AsyncIterator[httpx.AsyncClient]:
     """Get an HTTP client as an async context manager.
 
     If the lifespan context is available, yields the shared client (without closing it).
-    Otherwise, creates a temporary client that is properly closed after use.
+    Otherwise, yields a lazily created module-level client that is reused across
+    calls (preserving keep-alive). It is closed by ``close_fallback_client`` at
+    lifespan shutdown, or when its event loop shuts down if there is no lifespan.
 
     Args:
         ctx: The FastMCP context containing the lifespan context.
@@ -129,13 +318,5 @@ async def get_http_client(ctx: "Context") -> AsyncIterator[httpx.AsyncClient]:
             yield client
             return
 
-    # Fallback: create a temporary client and ensure it's closed
-    logger.debug("Creating fallback HTTP client (lifespan client unavailable or closed)")
-    client = httpx.AsyncClient(
-        timeout=config.courtlistener_timeout,
-        limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
-    )
-    try:
-        yield client
-    finally:
-        await client.aclose()
+    # Fallback: reuse the module-level client (closed with its event loop)
+    yield await _get_fallback_client()
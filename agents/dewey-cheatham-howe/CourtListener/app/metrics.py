@@ -0,0 +1,421 @@
+"""In-process metrics registry for CourtListener MCP Server.
+
+Provides counters, gauges and HDR-style (log-linear bucketed) histograms that
+aggregate per-tool latency, upstream CourtListener status codes, latencies and
+payload sizes, plus in-flight gauges. Metrics are recorded by the
+``track_tool`` decorator on tool functions and by ``MetricsTransport`` on the
+shared HTTP client, and can be rendered in the Prometheus text exposition
+format for the ``/metrics`` route on the HTTP/SSE transports.
+"""
+
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+import functools
+import inspect
+import threading
+import time
+from typing import Any, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Label sets are stored as sorted tuples of (name, value) pairs
+Labels = tuple[tuple[str, str], ...]
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _labels(labels: dict[str, str]) -> Labels:
+    """Convert a label dict into a hashable, ordered key."""
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value for the Prometheus text format."""
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label_value(value: str) -> str:
+    """Escape a label value per the Prometheus text format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: tuple[str, str] | None = None) -> str:
+    """Render a label set (plus an optional extra label) as ``{k="v",...}``."""
+    pairs = list(labels)
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    body = ",".join(f'{k}="{_escape_label_value(v)}"' for k, v in pairs)
+    return "{" + body + "}"
+
+
+def log_linear_bounds(
+    min_value: float, max_value: float, sub_buckets: int
+) -> list[float]:
+    """Compute HDR-style bucket upper bounds.
+
+    Each power-of-two range above ``min_value`` is split into ``sub_buckets``
+    linear sub-buckets, giving a bounded relative error across many orders of
+    magnitude with a small, fixed number of buckets.
+
+    Args:
+        min_value: Upper bound of the first bucket.
+        max_value: Smallest value the last finite bucket must cover.
+        sub_buckets: Linear sub-buckets per power of two.
+
+    Returns:
+        Sorted list of finite bucket upper bounds.
+
+    """
+    if min_value <= 0 or max_value <= min_value or sub_buckets < 1:
+        raise ValueError("Require 0 < min_value < max_value and sub_buckets >= 1")
+    bounds = [min_value]
+    base = min_value
+    while bounds[-1] < max_value:
+        for k in range(1, sub_buckets + 1):
+            bounds.append(float(f"{base * (1 + k / sub_buckets):.6g}"))
+        base *= 2
+    return bounds
+
+
+class Histogram:
+    """A log-linear bucketed histogram.
+
+    Attributes:
+        bounds: Finite bucket upper bounds (an implicit ``+Inf`` bucket follows).
+        counts: Per-bucket (non-cumulative) observation counts.
+        total: Sum of all observed values.
+        count: Number of observations.
+
+    """
+
+    def __init__(self, bounds: list[float]) -> None:
+        """Initialise an empty histogram with the given bucket bounds."""
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def bucket_index(self, value: float) -> int:
+        """Return the index of the bucket a value falls into (``le`` semantics)."""
+        return bisect_left(self.bounds, value)
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        self.counts[self.bucket_index(value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self) -> Iterator[tuple[float, int]]:
+        """Yield ``(upper_bound, cumulative_count)`` pairs ending with ``+Inf``."""
+        running = 0
+        for bound, bucket_count in zip(
+            [*self.bounds, float("inf")], self.counts, strict=True
+        ):
+            running += bucket_count
+            yield bound, running
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket containing it.
+
+        Args:
+            q: Quantile in [0, 1].
+
+        Returns:
+            The estimated value, or 0.0 if the histogram is empty.
+
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        for bound, running in self.cumulative():
+            if running >= rank:
+                return bound if bound != float("inf") else self.bounds[-1]
+        return self.bounds[-1]
+
+
+# Seconds: 100 µs .. ~1 min with ~12% relative error
+LATENCY_BOUNDS = log_linear_bounds(0.0001, 60.0, 4)
+# Bytes: 64 B .. ~64 MB
+SIZE_BOUNDS = log_linear_bounds(64, 64 * 1024 * 1024, 2)
+
+
+class MetricsRegistry:
+    """Thread-safe registry of named counters, gauges and histograms."""
+
+    def __init__(self, namespace: str = "courtlistener") -> None:
+        """Initialise an empty registry.
+
+        Args:
+            namespace: Prefix applied to every metric name on exposition.
+
+        """
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        # name -> (type, help text)
+        self._meta: dict[str, tuple[str, str]] = {}
+        self._counters: dict[str, dict[Labels, float]] = {}
+        self._gauges: dict[str, dict[Labels, float]] = {}
+        self._histograms: dict[str, dict[Labels, Histogram]] = {}
+        self._histogram_bounds: dict[str, list[float]] = {}
+
+    def _declare(self, name: str, kind: str, help_text: str) -> None:
+        existing = self._meta.get(name)
+        if existing is not None and existing[0] != kind:
+            raise ValueError(f"Metric {name} already registered as {existing[0]}")
+        self._meta.setdefault(name, (kind, help_text))
+
+    def inc(
+        self, name: str, labels: dict[str, str], value: float = 1.0, help_text: str = ""
+    ) -> None:
+        """Increment a counter."""
+        key = _labels(labels)
+        with self._lock:
+            self._declare(name, "counter", help_text)
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def add_gauge(
+        self, name: str, labels: dict[str, str], delta: float, help_text: str = ""
+    ) -> None:
+        """Adjust a gauge by ``delta``."""
+        key = _labels(labels)
+        with self._lock:
+            self._declare(name, "gauge", help_text)
+            series = self._gauges.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + delta
+
+    def observe(
+        self,
+        name: str,
+        labels: dict[str, str],
+        value: float,
+        bounds: list[float] = LATENCY_BOUNDS,
+        help_text: str = "",
+    ) -> None:
+        """Record an observation in a histogram."""
+        key = _labels(labels)
+        with self._lock:
+            self._declare(name, "histogram", help_text)
+            self._histogram_bounds.setdefault(name, bounds)
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self._histogram_bounds[name])
+            histogram.observe(value)
+
+    def get_counter(self, name: str, labels: dict[str, str]) -> float:
+        """Return the current value of a counter series (0 if unset)."""
+        with self._lock:
+            return self._counters.get(name, {}).get(_labels(labels), 0.0)
+
+    def get_gauge(self, name: str, labels: dict[str, str]) -> float:
+        """Return the current value of a gauge series (0 if unset)."""
+        with self._lock:
+            return self._gauges.get(name, {}).get(_labels(labels), 0.0)
+
+    def get_histogram(self, name: str, labels: dict[str, str]) -> Histogram | None:
+        """Return a histogram series, or None if nothing was observed."""
+        with self._lock:
+            return self._histograms.get(name, {}).get(_labels(labels))
+
+    def reset(self) -> None:
+        """Drop every recorded series."""
+        with self._lock:
+            self._meta.clear()
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+            self._histogram_bounds.clear()
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format.
+
+        Returns:
+            The exposition text, terminated by a newline.
+
+        """
+        lines: list[str] = []
+        with self._lock:
+            for name in sorted(self._meta):
+                kind, help_text = self._meta[name]
+                full_name = f"{self.namespace}_{name}"
+                if help_text:
+                    lines.append(f"# HELP {full_name} {help_text}")
+                lines.append(f"# TYPE {full_name} {kind}")
+                if kind == "histogram":
+                    for labels, histogram in sorted(self._histograms[name].items()):
+                        for bound, running in histogram.cumulative():
+                            le = ("le", _format_value(bound))
+                            lines.append(
+                                f"{full_name}_bucket{_format_labels(labels, le)} {running}"
+                            )
+                        label_text = _format_labels(labels)
+                        lines.append(
+                            f"{full_name}_sum{label_text} {_format_value(histogram.total)}"
+                        )
+                        lines.append(f"{full_name}_count{label_text} {histogram.count}")
+                else:
+                    series = self._counters if kind == "counter" else self._gauges
+                    for labels, value in sorted(series[name].items()):
+                        lines.append(
+                            f"{full_name}{_format_labels(labels)} {_format_value(value)}"
+                        )
+        return "\n".join(lines) + "\n"
+
+
+# Global registry instance
+registry = MetricsRegistry()
+
+
+@contextmanager
+def _track(tool: str) -> Iterator[None]:
+    """Record in-flight, outcome and latency metrics around a tool call."""
+    labels = {"tool": tool}
+    registry.add_gauge("tool_in_flight", labels, 1, "Tool calls currently executing.")
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        registry.observe(
+            "tool_duration_seconds",
+            labels,
+            time.perf_counter() - start,
+            help_text="Tool call latency in seconds.",
+        )
+        registry.inc(
+            "tool_calls_total",
+            {"tool": tool, "outcome": outcome},
+            help_text="Tool calls by outcome.",
+        )
+        registry.add_gauge("tool_in_flight", labels, -1)
+
+
+def track_tool(prefix: str | None = None) -> Callable[[F], F]:
+    """Decorate a tool function to record per-tool metrics.
+
+    Apply below the ``@server.tool()`` decorator so FastMCP registers the
+    wrapped function; the original signature is preserved for schema
+    generation and context injection.
+
+    Args:
+        prefix: The prefix the tool's server is imported under (e.g. "search"),
+            so the metric label matches the exposed tool name.
+
+    Returns:
+        A decorator wrapping sync or async tool functions.
+
+    """
+
+    def decorator(func: F) -> F:
+        tool = f"{prefix}_{func.__name__}" if prefix else func.__name__
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with _track(tool):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+            with _track(tool):
+                return func(*args, **kwargs)
+
+        return sync_wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def endpoint_label(url: httpx.URL, base_path: str = "/") -> str:
+    """Derive a low-cardinality endpoint label from a request URL.
+
+    Strips the API base path and keeps the first path segment, so
+    ``/api/rest/v4/opinions/123/`` becomes ``opinions``.
+
+    Args:
+        url: The request URL.
+        base_path: Path prefix of the API base URL.
+
+    Returns:
+        The endpoint label.
+
+    """
+    path = url.path
+    if path.startswith(base_path):
+        path = path[len(base_path) :]
+    segment = path.strip("/").split("/", 1)[0]
+    return segment or "root"
+
+
+class MetricsTransport(httpx.AsyncBaseTransport):
+    """HTTP transport wrapper recording upstream request metrics.
+
+    Records per-endpoint latency, status codes, response sizes and in-flight
+    requests. Wrapping the transport (rather than using event hooks) also
+    captures requests that fail with transport errors such as timeouts.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, base_url: str = "") -> None:
+        """Wrap an existing transport.
+
+        Args:
+            transport: The transport that actually sends requests.
+            base_url: API base URL whose path is stripped from endpoint labels.
+
+        """
+        self._transport = transport
+        self._base_path = urlsplit(base_url).path or "/"
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request through the wrapped transport, recording metrics."""
+        endpoint = endpoint_label(request.url, self._base_path)
+        labels = {"endpoint": endpoint}
+        registry.add_gauge(
+            "upstream_in_flight", labels, 1, "Upstream requests currently in flight."
+        )
+        start = time.perf_counter()
+        status = "error"
+        try:
+            response = await self._transport.handle_async_request(request)
+            status = str(response.status_code)
+            size = response.headers.get("content-length")
+            if size is not None and size.isdigit():
+                registry.observe(
+                    "upstream_response_bytes",
+                    labels,
+                    int(size),
+                    bounds=SIZE_BOUNDS,
+                    help_text="Upstream response payload size in bytes.",
+                )
+            return response
+        finally:
+            registry.observe(
+                "upstream_duration_seconds",
+                labels,
+                time.perf_counter() - start,
+                help_text="Upstream request latency (to response headers) in seconds.",
+            )
+            registry.inc(
+                "upstream_requests_total",
+                {"endpoint": endpoint, "method": request.method, "status": status},
+                help_text="Upstream requests by endpoint, method and status code.",
+            )
+            registry.add_gauge("upstream_in_flight", labels, -1)
+
+    async def aclose(self) -> None:
+        """Close the wrapped transport."""
+        await self._transport.aclose()
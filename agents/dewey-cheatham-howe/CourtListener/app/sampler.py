@@ -0,0 +1,209 @@
+"""Background system sampling for CourtListener MCP Server.
+
+The status tool used to call ``psutil`` inline, including a blocking
+``cpu_percent(interval=0.1)`` that stalled the event loop on every health
+probe. This module samples CPU, memory, disk, open connections and process
+stats on an interval from a background task into a ring buffer, so the status
+tool only has to read the latest snapshot.
+"""
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from functools import lru_cache
+import time
+from typing import Any
+
+from loguru import logger
+import psutil
+
+from app.config import config
+
+
+@dataclass(frozen=True)
+class SystemSnapshot:
+    """A single sample of process and host metrics.
+
+    Attributes:
+        timestamp: Unix time the sample was taken.
+        cpu_percent: Process CPU usage since the previous sample.
+        memory_mb: Process resident set size in megabytes.
+        system_memory_percent: Host memory usage percentage.
+        disk_percent: Usage percentage of the root filesystem.
+        open_connections: Number of open network connections of the process.
+        num_threads: Number of threads in the process.
+        num_fds: Number of open file descriptors (0 where unsupported).
+
+    """
+
+    timestamp: float
+    cpu_percent: float
+    memory_mb: float
+    system_memory_percent: float
+    disk_percent: float
+    open_connections: int
+    num_threads: int
+    num_fds: int
+
+
+# Snapshot fields summarised as min/avg/max over the window
+WINDOW_FIELDS = (
+    "cpu_percent",
+    "memory_mb",
+    "system_memory_percent",
+    "disk_percent",
+    "open_connections",
+    "num_threads",
+)
+
+
+class SystemSampler:
+    """Periodically samples system metrics into a fixed-size ring buffer.
+
+    Attributes:
+        interval: Seconds between samples.
+        window: Maximum number of snapshots kept.
+        process_start: Process creation time as an aware UTC datetime.
+
+    """
+
+    def __init__(self, interval: float = 5.0, window: int = 60) -> None:
+        """Initialise the sampler.
+
+        Args:
+            interval: Seconds between samples.
+            window: Number of snapshots kept in the ring buffer.
+
+        """
+        self.interval = interval
+        self.window = max(1, window)
+        self._process = psutil.Process()
+        self.process_start = datetime.fromtimestamp(
+            self._process.create_time(), tz=UTC
+        )
+        self._snapshots: deque[SystemSnapshot] = deque(maxlen=self.window)
+        self._task: asyncio.Task[None] | None = None
+        # Prime the CPU counter so the first real sample is meaningful
+        self._process.cpu_percent(interval=None)
+
+    def sample(self) -> SystemSnapshot:
+        """Take one non-blocking sample and append it to the ring buffer.
+
+        Returns:
+            The new snapshot.
+
+        """
+        process = self._process
+        with process.oneshot():
+            cpu = process.cpu_percent(interval=None)
+            rss = process.memory_info().rss
+            threads = process.num_threads()
+            try:
+                fds = process.num_fds()
+            except (AttributeError, psutil.Error):
+                fds = 0
+        try:
+            connections = len(process.net_connections())
+        except psutil.Error:
+            connections = 0
+
+        snapshot = SystemSnapshot(
+            timestamp=time.time(),
+            cpu_percent=round(cpu, 1),
+            memory_mb=round(rss / 1024 / 1024, 1),
+            system_memory_percent=psutil.virtual_memory().percent,
+            disk_percent=psutil.disk_usage("/").percent,
+            open_connections=connections,
+            num_threads=threads,
+            num_fds=fds,
+        )
+        self._snapshots.append(snapshot)
+        return snapshot
+
+    def latest(self) -> SystemSnapshot | None:
+        """Return the most recent snapshot, or None if nothing was sampled yet."""
+        return self._snapshots[-1] if self._snapshots else None
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Summarise the ring buffer as min/avg/max per metric.
+
+        Returns:
+            Mapping of metric name to its min, avg and max over the window.
+
+        """
+        snapshots = list(self._snapshots)
+        if not snapshots:
+            return {}
+        result: dict[str, dict[str, float]] = {}
+        for field in WINDOW_FIELDS:
+            values = [getattr(s, field) for s in snapshots]
+            result[field] = {
+                "min": min(values),
+                "avg": round(sum(values) / len(values), 1),
+                "max": max(values),
+            }
+        return result
+
+    def report(self) -> dict[str, Any]:
+        """Return sampling metadata and the window summary for the status tool.
+
+        Returns:
+            Dictionary with the latest snapshot's age, sample count, interval
+            and the min/avg/max window summary.
+
+        """
+        latest = self.latest()
+        return {
+            "age_seconds": round(time.time() - latest.timestamp, 3) if latest else None,
+            "samples": len(self._snapshots),
+            "interval_seconds": self.interval,
+            "window": self.summary(),
+        }
+
+    @property
+    def running(self) -> bool:
+        """Whether the background sampling task is active."""
+        return self._task is not None and not self._task.done()
+
+    async def _run(self) -> None:
+        """Sample forever, off the event loop, until cancelled."""
+        while True:
+            try:
+                await asyncio.to_thread(self.sample)
+            except Exception as e:
+                logger.warning(f"System sampling failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start the background sampling task on the running event loop."""
+        if self.running:
+            return
+        logger.info(f"Starting system sampler (interval={self.interval}s)")
+        self._task = asyncio.create_task(self._run(), name="system-sampler")
+
+    async def stop(self) -> None:
+        """Cancel the background sampling task and wait for it to finish."""
+        if self._task is None:
+            return
+        logger.info("Stopping system sampler")
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+@lru_cache(maxsize=1)
+def get_system_sampler() -> SystemSampler:
+    """Get or create the shared system sampler.
+
+    Returns:
+        SystemSampler: The singleton sampler configured from ``Config``.
+
+    """
+    return SystemSampler(
+        interval=config.status_sample_interval,
+        window=config.status_sample_window,
+    )
@@ -7,6 +7,7 @@ from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from functools import lru_cache
 from pathlib import Path
 import sys
 from typing import Any, Literal
@@ -14,10 +15,14 @@ from typing import Any, Literal
 from fastmcp import FastMCP
 import httpx
 from loguru import logger
-import psutil
+from starlette.requests import Request
+from starlette.responses import Response
 
 from app import __version__
-from app.config import config
+from app.citation_cache import get_citation_cache
+from app.config import close_fallback_client, config, create_http_client
+from app.metrics import PROMETHEUS_CONTENT_TYPE, registry, track_tool
+from app.sampler import get_system_sampler
 from app.tools import citation_server, get_server, search_server
 
 
@@ -40,8 +45,9 @@ class AppContext:
 async def app_lifespan(server: FastMCP[Any]) -> AsyncIterator[AppContext]:
     """Manage application lifecycle and shared resources.
 
-    This context manager initializes shared resources (like the HTTP client)
-    on startup and ensures proper cleanup on shutdown.
+    This context manager initializes shared resources (like the HTTP client
+    and the background system sampler) on startup and ensures proper cleanup
+    on shutdown.
 
     Args:
         server: The FastMCP server instance.
@@ -51,15 +57,16 @@ async def app_lifespan(server: FastMCP[Any]) -> AsyncIterator[AppContext]:
 
     """
     logger.info("Initializing shared HTTP client")
-    client = httpx.AsyncClient(
-        timeout=config.courtlistener_timeout,
-        limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
-    )
+    client = create_http_client()
+    sampler = get_system_sampler()
+    sampler.start()
     try:
         yield AppContext(http_client=client)
     finally:
+        await sampler.stop()
         logger.info("Closing shared HTTP client")
         await client.aclose()
+        await close_fallback_client()
 
 # Valid transport types
 TransportType = Literal["stdio", "http", "sse"]
@@ -81,9 +88,12 @@ def get_version() -> str:
     return __version__
 
 
+@lru_cache(maxsize=1)
 def is_docker() -> bool:
     """Check if running inside a Docker container.
 
+    The result is cached since it cannot change for the life of the process.
+
     Returns:
         True if running inside Docker, False otherwise.
 
@@ -109,19 +119,25 @@ mcp: FastMCP[Any] = FastMCP(
 
 
 @mcp.tool()
+@track_tool()
 def status() -> dict[str, Any]:
     """Check the status of the CourtListener MCP server.
 
+    System metrics are read from the background sampler's latest snapshot, so
+    this tool never blocks the event loop on psutil.
+
     Returns:
         A dictionary containing server status, system metrics, and service information.
 
     """
     logger.info("Status check requested")
 
-    # Get system info using psutil
-    process = psutil.Process()
-    process_start = datetime.fromtimestamp(process.create_time(), tz=UTC)
-    uptime_seconds = (datetime.now(UTC) - process_start).total_seconds()
+    sampler = get_system_sampler()
+    snapshot = sampler.latest()
+    if snapshot is None:
+        # Sampler not started yet (e.g. no lifespan); take one non-blocking sample
+        snapshot = sampler.sample()
+    uptime_seconds = (datetime.now(UTC) - sampler.process_start).total_seconds()
 
     # Format uptime as human readable
     hours, remainder = divmod(int(uptime_seconds), 3600)
@@ -157,13 +173,38 @@ def status() -> dict[str, Any]:
         },
         "system": {
             "process_uptime": uptime,
-            "memory_mb": round(process.memory_info().rss / 1024 / 1024, 1),
-            "cpu_percent": round(process.cpu_percent(interval=0.1), 1),
+            "memory_mb": snapshot.memory_mb,
+            "cpu_percent": snapshot.cpu_percent,
+            "system_memory_percent": snapshot.system_memory_percent,
+            "disk_percent": snapshot.disk_percent,
+            "open_connections": snapshot.open_connections,
+            "num_threads": snapshot.num_threads,
+            "num_fds": snapshot.num_fds,
+            "sampler": sampler.report(),
         },
         "server": server_info,
+        "citation_cache": get_citation_cache().stats(),
     }
 
 
+if config.metrics_enabled:
+
+    @mcp.custom_route(config.metrics_path, methods=["GET"])
+    async def metrics(request: Request) -> Response:
+        """Expose the metrics registry in Prometheus text format (HTTP/SSE only).
+
+        Args:
+            request: The incoming Starlette request.
+
+        Returns:
+            A plain-text response in the Prometheus exposition format.
+
+        """
+        return Response(
+            registry.render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE
+        )
+
+
 async def setup() -> None:
     """Set up the server by importing subservers."""
     logger.info("Setting up CourtListener MCP server")
@@ -17,7 +17,9 @@ import httpx
 from loguru import logger
 from pydantic import Field
 
-from app.config import config, get_auth_headers, get_http_client
+from app.citation_cache import get_citation_cache
+from app.config import config, get_auth_headers, get_http_client, get_timeout
+from app.metrics import track_tool
 
 # Create the citation server
 citation_server: FastMCP[Any] = FastMCP(
@@ -32,6 +34,7 @@ citation_server: FastMCP[Any] = FastMCP(
 
 
 @citation_server.tool()
+@track_tool("citation")
 async def lookup_citation(
     citation: Annotated[
         str,
@@ -71,6 +74,7 @@ async def lookup_citation(
                 f"{config.courtlistener_base_url}citation-lookup/",
                 headers=headers,
                 data={"text": citation},
+                timeout=get_timeout("citation-lookup"),
             )
             response.raise_for_status()
             data = response.json()
@@ -97,6 +101,7 @@ async def lookup_citation(
 
 
 @citation_server.tool()
+@track_tool("citation")
 async def batch_lookup_citations(
     citations: Annotated[
         list[str],
@@ -138,7 +143,8 @@ async def batch_lookup_citations(
                 f"{config.courtlistener_base_url}citation-lookup/",
                 headers=headers,
                 data={"text": citation_text},
-                timeout=config.courtlistener_timeout * 2,  # Longer timeout for batch requests
+                # Longer read timeout for batch requests
+                timeout=get_timeout("citation-lookup", multiplier=2),
             )
             response.raise_for_status()
             data = response.json()
@@ -165,6 +171,7 @@ async def batch_lookup_citations(
 
 
 @citation_server.tool()
+@track_tool("citation")
 async def verify_citation_format(
     citation: Annotated[
         str,
@@ -208,23 +215,24 @@ async def verify_citation_format(
         }
 
     try:
-        citator = get_citator()
-
-        # Try broad matching first
-        parsed_broad = citeurl_cite(citation_stripped, broad=True, citator=citator)
-        # Try strict matching
-        parsed_strict = citeurl_cite(citation_stripped, broad=False, citator=citator)
+        # Try strict matching first; broad matching is only needed as a fallback
+        parsed_strict = parse_citation_cached(citation_stripped, broad=False)
+        parsed_broad = (
+            None
+            if parsed_strict
+            else parse_citation_cached(citation_stripped, broad=True)
+        )
 
         if parsed_strict:
             # Citation is valid in strict mode
             result = {
                 "valid": True,
                 "format": "Recognized legal citation",
-                "template": str(parsed_strict.template),
+                "template": parsed_strict["template"],
                 "matching_mode": "strict",
                 "citation": citation,
-                "normalized": parsed_strict.text,
-                "tokens": parsed_strict.tokens,
+                "normalized": parsed_strict["text"],
+                "tokens": parsed_strict["tokens"],
                 "issues": [],
             }
         elif parsed_broad:
@@ -232,11 +240,11 @@ async def verify_citation_format(
             result = {
                 "valid": True,
                 "format": "Recognized legal citation (broad matching)",
-                "template": str(parsed_broad.template),
+                "template": parsed_broad["template"],
                 "matching_mode": "broad",
                 "citation": citation,
-                "normalized": parsed_broad.text,
-                "tokens": parsed_broad.tokens,
+                "normalized": parsed_broad["text"],
+                "tokens": parsed_broad["tokens"],
                 "issues": [
                     "Citation recognized only with broad matching - may be informal format"
                 ],
@@ -320,7 +328,46 @@ def _get_citator_singleton() -> Citator:
     return citator
 
 
+def _parse_with_citeurl(citation: str, broad: bool) -> dict[str, Any] | None:
+    """Parse a citation with citeurl into a plain, cacheable dictionary.
+
+    Args:
+        citation: The citation string to parse.
+        broad: Whether to use broad matching.
+
+    Returns:
+        dict[str, Any] | None: Structured parse result, or None if not recognised.
+
+    """
+    parsed = citeurl_cite(citation, broad=broad, citator=get_citator())
+    if not parsed:
+        return None
+    return {
+        "text": parsed.text,
+        "tokens": dict(parsed.tokens),
+        "template": str(parsed.template),
+        "URL": getattr(parsed, "URL", None),
+        "canonical_name": getattr(parsed, "name", None),
+    }
+
+
+def parse_citation_cached(citation: str, broad: bool = True) -> dict[str, Any] | None:
+    """Parse a citation with citeurl, memoised by stripped citation text.
+
+    Args:
+        citation: The citation string to parse.
+        broad: Whether to use broad matching.
+
+    Returns:
+        dict[str, Any] | None: Structured parse result with text, tokens, template,
+            URL and canonical_name keys, or None if not recognised.
+
+    """
+    return get_citation_cache().get_or_parse(citation, broad, _parse_with_citeurl)
+
+
 @citation_server.tool()
+@track_tool("citation")
 async def parse_citation_with_citeurl(
     citation: Annotated[
         str,
@@ -358,8 +405,7 @@ async def parse_citation_with_citeurl(
     await ctx.info(f"Parsing citation with citeurl: {citation}")
 
     try:
-        citator = get_citator()
-        parsed_citation = citeurl_cite(citation, broad=broad, citator=citator)
+        parsed_citation = parse_citation_cached(citation, broad=broad)
 
         if not parsed_citation:
             return {
@@ -372,16 +418,10 @@ async def parse_citation_with_citeurl(
         result = {
             "success": True,
             "citation": citation,
-            "parsed": {
-                "text": parsed_citation.text,
-                "tokens": parsed_citation.tokens,
-                "template": str(parsed_citation.template),
-                "URL": getattr(parsed_citation, "URL", None),
-                "canonical_name": getattr(parsed_citation, "name", None),
-            },
+            "parsed": parsed_citation,
         }
 
-        await ctx.info(f"Successfully parsed citation: {parsed_citation.text}")
+        await ctx.info(f"Successfully parsed citation: {parsed_citation['text']}")
         return result
 
     except Exception as e:
@@ -390,6 +430,7 @@ async def parse_citation_with_citeurl(
 
 
 @citation_server.tool()
+@track_tool("citation")
 async def extract_citations_from_text(
     text: Annotated[
         str,
@@ -446,6 +487,7 @@ async def extract_citations_from_text(
 
 
 @citation_server.tool()
+@track_tool("citation")
 async def enhanced_citation_lookup(
     citation: Annotated[
         str,
@@ -491,18 +533,10 @@ async def enhanced_citation_lookup(
 
     # First, parse with citeurl
     try:
-        citator = get_citator()
-        parsed = citeurl_cite(citation, broad=True, citator=citator)
+        parsed = parse_citation_cached(citation, broad=True)
 
         if parsed:
-            result["citeurl_analysis"] = {
-                "success": True,
-                "text": parsed.text,
-                "tokens": parsed.tokens,
-                "template": str(parsed.template),
-                "URL": getattr(parsed, "URL", None),
-                "canonical_name": getattr(parsed, "name", None),
-            }
+            result["citeurl_analysis"] = {"success": True, **parsed}
         else:
             result["citeurl_analysis"] = {
                 "success": False,
@@ -523,6 +557,7 @@ async def enhanced_citation_lookup(
                     f"{config.courtlistener_base_url}citation-lookup/",
                     headers=headers,
                     data={"text": citation},
+                    timeout=get_timeout("citation-lookup"),
                 )
                 if response.status_code == 200:
                     result["courtlistener_data"] = {
@@ -6,7 +6,8 @@ from fastmcp import Context, FastMCP
 import httpx
 from pydantic import Field
 
-from app.config import config, get_auth_headers, get_http_client
+from app.config import config, get_auth_headers, get_http_client, get_timeout
+from app.metrics import track_tool
 
 # Create the get server
 get_server: FastMCP[Any] = FastMCP(
@@ -50,6 +51,7 @@ async def _fetch_resource(
             response = await http_client.get(
                 f"{config.courtlistener_base_url}{endpoint}/{resource_id}/",
                 headers=headers,
+                timeout=get_timeout(endpoint),
             )
             response.raise_for_status()
             await ctx.info(f"Successfully retrieved {resource_type} {resource_id}")
@@ -64,6 +66,7 @@ async def _fetch_resource(
 
 
 @get_server.tool()
+@track_tool("get")
 async def opinion(
     opinion_id: Annotated[str, Field(description="The opinion ID to retrieve")],
     ctx: Context,
@@ -73,6 +76,7 @@ async def opinion(
 
 
 @get_server.tool()
+@track_tool("get")
 async def docket(
     docket_id: Annotated[str, Field(description="The docket ID to retrieve")],
     ctx: Context,
@@ -82,6 +86,7 @@ async def docket(
 
 
 @get_server.tool()
+@track_tool("get")
 async def audio(
     audio_id: Annotated[str, Field(description="The audio recording ID to retrieve")],
     ctx: Context,
@@ -91,6 +96,7 @@ async def audio(
 
 
 @get_server.tool()
+@track_tool("get")
 async def cluster(
     cluster_id: Annotated[str, Field(description="The opinion cluster ID to retrieve")],
     ctx: Context,
@@ -100,6 +106,7 @@ async def cluster(
 
 
 @get_server.tool()
+@track_tool("get")
 async def person(
     person_id: Annotated[str, Field(description="The person (judge) ID to retrieve")],
     ctx: Context,
@@ -109,6 +116,7 @@ async def person(
 
 
 @get_server.tool()
+@track_tool("get")
 async def court(
     court_id: Annotated[
         str, Field(description="The court ID to retrieve (e.g., 'scotus', 'ca9')")
@@ -6,7 +6,8 @@ from fastmcp import Context, FastMCP
 import httpx
 from pydantic import Field
 
-from app.config import config, get_auth_headers, get_http_client
+from app.config import config, get_auth_headers, get_http_client, get_timeout
+from app.metrics import track_tool
 
 # Create the search server
 search_server: FastMCP[Any] = FastMCP(
@@ -73,6 +74,7 @@ async def _search_courtlistener(
                 f"{config.courtlistener_base_url}search/",
                 params=params,
                 headers=headers,
+                timeout=get_timeout("search"),
             )
             response.raise_for_status()
             data = response.json()
@@ -89,6 +91,7 @@ async def _search_courtlistener(
 
 
 @search_server.tool()
+@track_tool("search")
 async def opinions(
     q: Annotated[str, Field(description="Search query for full text of opinions")],
     ctx: Context,
@@ -138,6 +141,7 @@ async def opinions(
 
 
 @search_server.tool()
+@track_tool("search")
 async def dockets(
     q: Annotated[str, Field(description="Search query for docket text")],
     ctx: Context,
@@ -183,6 +187,7 @@ async def dockets(
 
 
 @search_server.tool()
+@track_tool("search")
 async def dockets_with_documents(
     q: Annotated[str, Field(description="Search query for federal cases")],
     ctx: Context,
@@ -231,6 +236,7 @@ async def dockets_with_documents(
 
 
 @search_server.tool()
+@track_tool("search")
 async def recap_documents(
     q: Annotated[str, Field(description="Search query for RECAP filing documents")],
     ctx: Context,
@@ -284,6 +290,7 @@ async def recap_documents(
 
 
 @search_server.tool()
+@track_tool("search")
 async def audio(
     q: Annotated[str, Field(description="Search query for oral argument audio")],
     ctx: Context,
@@ -327,6 +334,7 @@ async def audio(
 
 
 @search_server.tool()
+@track_tool("search")
 async def people(
     q: Annotated[
         str, Field(description="Search query for judges and legal professionals")
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""Replay benchmark for CourtListener MCP tools.
+
+Drives N concurrent tool invocations through FastMCP against a replayed
+cassette and reports p50/p95/p99 latencies, so performance work on the tools
+can be measured without a token or network access.
+
+Usage:
+    uv run python tests/benchmark_replay.py -n 1000 -c 50 --latency-ms 20
+    uv run python tests/benchmark_replay.py --cassette tests/cassettes/live.jsonl.gz \\
+        --workload tests/cassettes/live_workload.json
+
+Without ``--cassette`` a synthetic cassette matching the default workload is
+generated in a temporary directory.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+from pathlib import Path
+import sys
+import tempfile
+import time
+from typing import Any
+
+from fastmcp import Client
+import httpx
+
+from app.cassette import make_interaction, write_cassette
+from app.config import config
+from app.server import ensure_setup_async, mcp
+
+API_BASE = "https://www.courtlistener.com/api/rest/v4/"
+
+# (tool name, arguments) pairs invoked round-robin
+DEFAULT_WORKLOAD: list[dict[str, Any]] = [
+    {"tool": "search_opinions", "arguments": {"q": "miranda", "limit": 5}},
+    {"tool": "get_court", "arguments": {"court_id": "scotus"}},
+    {"tool": "get_opinion", "arguments": {"opinion_id": "123456"}},
+    {"tool": "citation_lookup_citation", "arguments": {"citation": "384 U.S. 436"}},
+    {"tool": "citation_verify_citation_format", "arguments": {"citation": "410 U.S. 113"}},
+]
+
+
+def synthetic_interactions() -> list[dict[str, Any]]:
+    """Build cassette records answering every request in ``DEFAULT_WORKLOAD``.
+
+    Returns:
+        Interaction records for the synthetic cassette.
+
+    """
+    opinion = {
+        "id": 123456,
+        "caseName": "Miranda v. Arizona",
+        "court": "scotus",
+        "dateFiled": "1966-06-13",
+        "citation": ["384 U.S. 436"],
+        "plain_text": "The opinion text. " * 200,
+    }
+    exchanges = [
+        (
+            httpx.Request(
+                "GET",
+                f"{API_BASE}search/",
+                params={"q": "miranda", "order_by": "score desc", "type": "o", "hit": 5},
+            ),
+            {"count": 1, "next": None, "previous": None, "results": [opinion]},
+        ),
+        (
+            httpx.Request("GET", f"{API_BASE}courts/scotus/"),
+            {"id": "scotus", "full_name": "Supreme Court of the United States"},
+        ),
+        (httpx.Request("GET", f"{API_BASE}opinions/123456/"), opinion),
+        (
+            httpx.Request(
+                "POST", f"{API_BASE}citation-lookup/", data={"text": "384 U.S. 436"}
+            ),
+            [{"citation": "384 U.S. 436", "status": 200, "clusters": [opinion]}],
+        ),
+    ]
+    return [
+        make_interaction(
+            request,
+            200,
+            {"content-type": "application/json"},
+            json.dumps(payload).encode("utf-8"),
+        )
+        for request, payload in exchanges
+    ]
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Return the nearest-rank percentile of pre-sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(q / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+async def run_benchmark(
+    cassette: str | Path,
+    requests: int = 500,
+    concurrency: int = 50,
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    workload: list[dict[str, Any]] | None = None,
+) -> dict[str, Any]:
+    """Run tool invocations concurrently against a replayed cassette.
+
+    Args:
+        cassette: Cassette file to replay.
+        requests: Total number of tool invocations.
+        concurrency: Maximum invocations in flight at once.
+        latency_ms: Synthetic upstream latency per replayed response.
+        jitter_ms: Maximum extra random (seeded) upstream latency.
+        workload: Tool calls to cycle through; defaults to ``DEFAULT_WORKLOAD``.
+
+    Returns:
+        Summary with throughput, error count and p50/p95/p99 latencies in ms.
+
+    """
+    workload = workload or DEFAULT_WORKLOAD
+    os.environ.setdefault("COURT_LISTENER_API_KEY", "replay")
+    config.http_cassette_mode = "replay"
+    config.http_cassette_path = str(cassette)
+    config.http_replay_latency_ms = latency_ms
+    config.http_replay_jitter_ms = jitter_ms
+
+    await ensure_setup_async()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async with Client(mcp) as client:
+
+        async def invoke(i: int) -> None:
+            nonlocal errors
+            call = workload[i % len(workload)]
+            async with semaphore:
+                start = time.perf_counter()
+                result = await client.call_tool(
+                    call["tool"], call["arguments"], raise_on_error=False
+                )
+                latencies.append((time.perf_counter() - start) * 1000)
+                if result.is_error:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(invoke(i) for i in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments.
+
+    Returns:
+        Parsed arguments namespace.
+
+    """
+    parser = argparse.ArgumentParser(description="CourtListener MCP replay benchmark")
+    parser.add_argument("--cassette", type=Path, default=None, help="Cassette to replay")
+    parser.add_argument(
+        "--workload", type=Path, default=None, help="JSON list of {tool, arguments}"
+    )
+    parser.add_argument("-n", "--requests", type=int, default=500)
+    parser.add_argument("-c", "--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    return parser.parse_args()
+
+
+async def main() -> int:
+    """Run the benchmark from the command line.
+
+    Returns:
+        Process exit code (non-zero if any invocation failed).
+
+    """
+    args = parse_args()
+    workload = json.loads(args.workload.read_text()) if args.workload else None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cassette = args.cassette
+        if cassette is None:
+            cassette = Path(tmp) / "synthetic.jsonl.gz"
+            write_cassette(cassette, synthetic_interactions())
+        summary = await run_benchmark(
+            cassette,
+            requests=args.requests,
+            concurrency=args.concurrency,
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            workload=workload,
+        )
+
+    print(json.dumps(summary, indent=2))
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
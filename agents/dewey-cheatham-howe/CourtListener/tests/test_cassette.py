@@ -0,0 +1,129 @@
+"""Tests for the record/replay cassette transports."""
+
+from pathlib import Path
+import time
+
+import httpx
+import pytest
+import respx
+
+from app.cassette import (
+    CassetteMissError,
+    RecordingTransport,
+    ReplayTransport,
+    normalize_url,
+    read_cassette,
+    write_cassette,
+)
+from app.config import config
+from benchmark_replay import run_benchmark, synthetic_interactions
+
+API_BASE = "https://www.courtlistener.com/api/rest/v4/"
+
+
+def test_normalize_url_sorts_query_params() -> None:
+    """Test that query parameter order does not affect matching."""
+    a = httpx.URL(f"{API_BASE}search/?type=o&q=miranda")
+    b = httpx.URL(f"{API_BASE}search/?q=miranda&type=o")
+    assert normalize_url(a) == normalize_url(b)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_recording_scrubs_token_and_replays(tmp_path: Path) -> None:
+    """Test that recording scrubs credentials and replay reproduces responses."""
+    cassette = tmp_path / "cassette.jsonl.gz"
+    respx.get(f"{API_BASE}courts/scotus/").mock(
+        return_value=httpx.Response(
+            200, json={"id": "scotus"}, headers={"set-cookie": "session=secret"}
+        )
+    )
+    respx.post(f"{API_BASE}citation-lookup/").mock(
+        return_value=httpx.Response(200, json=[{"citation": "384 U.S. 436"}])
+    )
+
+    recorder = RecordingTransport(httpx.AsyncHTTPTransport(), cassette)
+    headers = {"Authorization": "Token super-secret"}
+    async with httpx.AsyncClient(transport=recorder) as client:
+        recorded = await client.get(f"{API_BASE}courts/scotus/", headers=headers)
+        await client.post(
+            f"{API_BASE}citation-lookup/", headers=headers, data={"text": "384 U.S. 436"}
+        )
+    assert recorded.json() == {"id": "scotus"}
+
+    assert "super-secret" not in cassette.read_bytes().decode("latin-1")
+    interactions = read_cassette(cassette)
+    assert len(interactions) == 2
+    assert "authorization" not in interactions[0]["request"]["headers"]
+    assert "set-cookie" not in interactions[0]["response"]["headers"]
+
+    async with httpx.AsyncClient(
+        transport=ReplayTransport.from_file(cassette)
+    ) as client:
+        replayed = await client.get(f"{API_BASE}courts/scotus/")
+        lookup = await client.post(
+            f"{API_BASE}citation-lookup/", data={"text": "384 U.S. 436"}
+        )
+    assert replayed.status_code == 200
+    assert replayed.json() == {"id": "scotus"}
+    assert lookup.json() == [{"citation": "384 U.S. 436"}]
+
+
+@pytest.mark.asyncio
+async def test_replay_is_deterministic_and_cycles() -> None:
+    """Test that repeated requests get recorded responses in order."""
+    first, second = synthetic_interactions()[1], synthetic_interactions()[1]
+    second = {
+        **second,
+        "response": {**second["response"], "status": 503, "body": "{}"},
+    }
+    transport = ReplayTransport([first, second])
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        statuses = [
+            (await client.get(f"{API_BASE}courts/scotus/")).status_code
+            for _ in range(4)
+        ]
+    assert statuses == [200, 503, 200, 503]
+
+
+@pytest.mark.asyncio
+async def test_replay_miss_raises() -> None:
+    """Test that unrecorded requests fail loudly rather than hitting the network."""
+    transport = ReplayTransport(synthetic_interactions())
+    async with httpx.AsyncClient(transport=transport) as client:
+        with pytest.raises(CassetteMissError):
+            await client.get(f"{API_BASE}courts/ca9/")
+
+
+@pytest.mark.asyncio
+async def test_replay_synthetic_latency() -> None:
+    """Test that configured latency is applied to replayed responses."""
+    transport = ReplayTransport(synthetic_interactions(), latency_ms=20)
+    async with httpx.AsyncClient(transport=transport) as client:
+        start = time.perf_counter()
+        await client.get(f"{API_BASE}courts/scotus/")
+        assert time.perf_counter() - start >= 0.019
+
+
+@pytest.mark.asyncio
+async def test_benchmark_harness(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the benchmark drives tools against replayed data."""
+    # Restore the cassette settings the harness overrides once the test ends
+    for name in (
+        "http_cassette_mode",
+        "http_cassette_path",
+        "http_replay_latency_ms",
+        "http_replay_jitter_ms",
+    ):
+        monkeypatch.setattr(config, name, getattr(config, name))
+
+    cassette = tmp_path / "synthetic.jsonl.gz"
+    write_cassette(cassette, synthetic_interactions())
+    summary = await run_benchmark(cassette, requests=25, concurrency=5)
+
+    assert summary["errors"] == 0
+    assert summary["requests"] == 25
+    assert 0 < summary["p50_ms"] <= summary["p95_ms"] <= summary["p99_ms"]
@@ -0,0 +1,187 @@
+"""Tests for the memoised citation parse cache."""
+
+from pathlib import Path
+import time
+from typing import Any
+
+from fastmcp import Client
+from loguru import logger
+import pytest
+
+from app.citation_cache import CitationParseCache, normalize_citation_key
+from app.tools.citation import _parse_with_citeurl
+
+
+class CountingParser:
+    """Fake parse function that records how often it is called."""
+
+    def __init__(self) -> None:
+        """Initialise the call counter."""
+        self.calls = 0
+
+    def __call__(self, citation: str, broad: bool) -> dict[str, Any] | None:
+        """Return a fake parse result, or None for unrecognised input."""
+        self.calls += 1
+        if "xyz" in citation:
+            return None
+        return {"text": citation, "tokens": {"volume": "410"}, "template": "U.S."}
+
+
+def test_normalize_citation_key() -> None:
+    """Test that cache keys only strip surrounding whitespace."""
+    assert normalize_citation_key("  410 U.S. 113\n") == "410 U.S. 113"
+    assert normalize_citation_key("410 u.s. 113") != normalize_citation_key(
+        "410 U.S. 113"
+    )
+    assert normalize_citation_key("410  U.S. 113") != "410 U.S. 113"
+
+
+def test_cache_hits_and_misses() -> None:
+    """Test that repeated lookups are served from the cache."""
+    cache = CitationParseCache(maxsize=8)
+    parser = CountingParser()
+
+    first = cache.get_or_parse("410 U.S. 113", True, parser)
+    second = cache.get_or_parse(" 410 U.S. 113 ", True, parser)
+
+    assert first == second
+    assert parser.calls == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+    # Broad and strict modes are cached separately
+    cache.get_or_parse("410 U.S. 113", False, parser)
+    assert parser.calls == 2
+
+
+def test_cache_keeps_spellings_apart() -> None:
+    """Test that a lowercase spelling cached first does not shadow the real one."""
+    cache = CitationParseCache(maxsize=8)
+
+    # citeurl's strict mode rejects the lowercase reporter
+    assert cache.get_or_parse("410 u.s. 113", False, _parse_with_citeurl) is None
+    strict = cache.get_or_parse("410 U.S. 113", False, _parse_with_citeurl)
+    assert strict is not None
+    assert strict["text"] == "410 U.S. 113"
+
+    lower = cache.get_or_parse("410 u.s. 113", True, _parse_with_citeurl)
+    upper = cache.get_or_parse("410 U.S. 113", True, _parse_with_citeurl)
+    assert lower is not None and lower["text"] == "410 u.s. 113"
+    assert upper is not None and upper["text"] == "410 U.S. 113"
+
+
+def test_cache_stores_unrecognised_citations() -> None:
+    """Test that negative parse results are cached too."""
+    cache = CitationParseCache(maxsize=8)
+    parser = CountingParser()
+
+    assert cache.get_or_parse("not a citation xyz", True, parser) is None
+    assert cache.get_or_parse("not a citation xyz", True, parser) is None
+    assert parser.calls == 1
+
+
+def test_cache_returns_copies() -> None:
+    """Test that mutating a returned result does not corrupt the cache."""
+    cache = CitationParseCache(maxsize=8)
+    parser = CountingParser()
+
+    result = cache.get_or_parse("410 U.S. 113", True, parser)
+    assert result is not None
+    result["tokens"]["volume"] = "999"
+
+    again = cache.get_or_parse("410 U.S. 113", True, parser)
+    assert again is not None
+    assert again["tokens"]["volume"] == "410"
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    """Test LRU eviction once the cache is full."""
+    cache = CitationParseCache(maxsize=2)
+    parser = CountingParser()
+
+    cache.get_or_parse("1 U.S. 1", True, parser)
+    cache.get_or_parse("2 U.S. 2", True, parser)
+    cache.get_or_parse("1 U.S. 1", True, parser)  # refresh entry 1
+    cache.get_or_parse("3 U.S. 3", True, parser)  # evicts entry 2
+
+    assert len(cache) == 2
+    cache.get_or_parse("1 U.S. 1", True, parser)
+    assert parser.calls == 3
+    cache.get_or_parse("2 U.S. 2", True, parser)
+    assert parser.calls == 4
+
+
+def test_cache_does_not_store_exceptions() -> None:
+    """Test that parse errors propagate and are retried next time."""
+    cache = CitationParseCache(maxsize=8)
+
+    def failing_parser(citation: str, broad: bool) -> dict[str, Any] | None:
+        raise RuntimeError("template compilation failed")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_parse("410 U.S. 113", True, failing_parser)
+    assert len(cache) == 0
+
+
+def test_cache_persists_to_sqlite(tmp_path: Path) -> None:
+    """Test that a new cache instance is warmed from the SQLite file."""
+    db_path = tmp_path / "citations.sqlite3"
+    parser = CountingParser()
+
+    cache = CitationParseCache(maxsize=8, path=db_path)
+    cache.get_or_parse("410 U.S. 113", True, parser)
+    cache.get_or_parse("not a citation xyz", True, parser)
+    cache.close()
+
+    warm = CitationParseCache(maxsize=8, path=db_path)
+    assert warm.get_or_parse("410 U.S. 113", True, parser) is not None
+    assert warm.get_or_parse("not a citation xyz", True, parser) is None
+    assert parser.calls == 2
+    assert warm.stats()["disk_hits"] == 2
+    assert warm.stats()["persistent"] is True
+    warm.close()
+
+
+@pytest.mark.asyncio
+async def test_status_reports_citation_cache(client: Client[Any]) -> None:
+    """Test that the status tool exposes the cache counters."""
+    async with client:
+        await client.call_tool(
+            "citation_verify_citation_format", {"citation": "410 U.S. 113"}
+        )
+        await client.call_tool(
+            "citation_verify_citation_format", {"citation": "410 U.S. 113"}
+        )
+        result = await client.call_tool("status", {})
+
+        assert not result.is_error
+        cache_stats = result.data["citation_cache"]
+        assert cache_stats["hits"] >= 1
+        assert "misses" in cache_stats
+        assert "hit_rate" in cache_stats
+
+
+@pytest.mark.slow
+def test_repeated_verification_benchmark() -> None:
+    """Microbenchmark 10k repeated verifications against a warm cache."""
+    citations = ["410 U.S. 113", "384 U.S. 436", "123 F.3d 456", "42 USC § 1988"]
+    cache = CitationParseCache(maxsize=64)
+
+    start = time.perf_counter()
+    for citation in citations:
+        cache.get_or_parse(citation, False, _parse_with_citeurl)
+        cache.get_or_parse(citation, True, _parse_with_citeurl)
+    cold = time.perf_counter() - start
+
+    iterations = 10_000
+    start = time.perf_counter()
+    for i in range(iterations):
+        cache.get_or_parse(citations[i % len(citations)], False, _parse_with_citeurl)
+    warm = time.perf_counter() - start
+
+    logger.info(
+        f"Citation cache: cold {cold * 1000:.1f} ms for {len(citations) * 2} parses, "
+        f"warm {iterations / warm:,.0f} verifications/s"
+    )
+    assert cache.stats()["hits"] == iterations
+    assert warm / iterations < cold / (len(citations) * 2)
@@ -0,0 +1,134 @@
+"""Tests for HTTP client configuration and the shared fallback client."""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+import httpx
+import pytest
+
+from app import config as config_module
+from app.config import (
+    close_fallback_client,
+    config,
+    create_http_client,
+    get_http_client,
+    get_timeout,
+)
+
+
+def make_context_without_lifespan() -> Any:
+    """Build a stand-in for a FastMCP Context with no lifespan client."""
+    return SimpleNamespace(request_context=SimpleNamespace(lifespan_context=None))
+
+
+@pytest.mark.asyncio
+async def test_fallback_client_constructed_once(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that 100 calls without a context share one lazily created client."""
+    constructed: list[httpx.AsyncClient] = []
+
+    class CountingClient(httpx.AsyncClient):
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            super().__init__(*args, **kwargs)
+            constructed.append(self)
+
+    monkeypatch.setattr(config_module.httpx, "AsyncClient", CountingClient)
+    await close_fallback_client()
+
+    ctx = make_context_without_lifespan()
+    seen = set()
+    for _ in range(100):
+        async with get_http_client(ctx) as client:
+            seen.add(id(client))
+            assert not client.is_closed
+
+    assert len(constructed) == 1
+    assert len(seen) == 1
+
+    await close_fallback_client()
+    assert constructed[0].is_closed
+
+
+def test_fallback_client_closed_without_lifespan() -> None:
+    """Test that the fallback client is closed when a script's event loop ends."""
+
+    async def fetch_client() -> httpx.AsyncClient:
+        async with get_http_client(make_context_without_lifespan()) as client:
+            return client
+
+    first = asyncio.run(fetch_client())
+    assert first.is_closed
+
+    # A later loop gets a fresh client, also closed when that loop ends
+    second = asyncio.run(fetch_client())
+    assert second is not first
+    assert second.is_closed
+
+
+@pytest.mark.asyncio
+async def test_lifespan_client_preferred() -> None:
+    """Test that the lifespan client is used when available."""
+    shared = httpx.AsyncClient()
+    ctx = SimpleNamespace(
+        request_context=SimpleNamespace(
+            lifespan_context=SimpleNamespace(http_client=shared)
+        )
+    )
+    async with get_http_client(ctx) as client:
+        assert client is shared
+    await shared.aclose()
+
+
+def test_split_and_per_endpoint_timeouts(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test connect/read split and per-endpoint read timeout overrides."""
+    monkeypatch.setattr(config, "courtlistener_timeout", 30)
+    monkeypatch.setattr(config, "courtlistener_connect_timeout", 5.0)
+    monkeypatch.setattr(
+        config, "courtlistener_endpoint_timeouts", {"citation-lookup": 60.0}
+    )
+
+    default = get_timeout()
+    assert default.connect == 5.0
+    assert default.read == 30.0
+
+    lookup = get_timeout("citation-lookup")
+    assert lookup.read == 60.0
+    assert lookup.connect == 5.0
+
+    batch = get_timeout("citation-lookup", multiplier=2)
+    assert batch.read == 120.0
+
+
+@pytest.mark.asyncio
+async def test_pool_limits_from_config(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that pool limits and keep-alive expiry are taken from Config."""
+    monkeypatch.setattr(config, "http_max_connections", 42)
+    monkeypatch.setattr(config, "http_max_keepalive_connections", 7)
+    monkeypatch.setattr(config, "http_keepalive_expiry", 12.5)
+    monkeypatch.setattr(config, "http2", False)
+
+    client = create_http_client()
+    try:
+        pool = client._transport._transport._pool  # type: ignore[attr-defined]
+        assert pool._max_connections == 42
+        assert pool._max_keepalive_connections == 7
+        assert pool._keepalive_expiry == 12.5
+        assert pool._http2 is False
+    finally:
+        await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_http2_falls_back_without_h2(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that requesting HTTP/2 without 'h2' installed degrades to HTTP/1.1."""
+    monkeypatch.setattr(config, "http2", True)
+    monkeypatch.setattr(config_module.importlib.util, "find_spec", lambda name: None)
+
+    client = create_http_client()
+    try:
+        pool = client._transport._transport._pool  # type: ignore[attr-defined]
+        assert pool._http2 is False
+    finally:
+        await client.aclose()
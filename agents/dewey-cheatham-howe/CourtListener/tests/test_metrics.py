@@ -0,0 +1,182 @@
+"""Tests for the in-process metrics registry and Prometheus exposition."""
+
+from typing import Any
+
+from fastmcp import Client
+import httpx
+import pytest
+import respx
+
+from app.metrics import (
+    Histogram,
+    MetricsRegistry,
+    endpoint_label,
+    log_linear_bounds,
+    registry,
+)
+from app.server import mcp
+
+
+def test_log_linear_bounds() -> None:
+    """Test that bounds split each power of two into linear sub-buckets."""
+    bounds = log_linear_bounds(1.0, 8.0, 4)
+    assert bounds == [1.0, 1.25, 1.5, 1.75, 2.0, 2.5, 3.0, 3.5, 4.0, 5.0, 6.0, 7.0, 8.0]
+
+
+def test_log_linear_bounds_invalid() -> None:
+    """Test that invalid bucket parameters are rejected."""
+    with pytest.raises(ValueError):
+        log_linear_bounds(0, 10, 4)
+    with pytest.raises(ValueError):
+        log_linear_bounds(1, 10, 0)
+
+
+def test_histogram_bucketing() -> None:
+    """Test that observations land in the bucket whose bound is >= the value."""
+    histogram = Histogram(log_linear_bounds(1.0, 8.0, 4))
+
+    assert histogram.bucket_index(0.5) == 0
+    assert histogram.bucket_index(1.0) == 0  # le semantics: bound is inclusive
+    assert histogram.bucket_index(1.1) == 1
+    assert histogram.bucket_index(2.0) == 4
+    assert histogram.bucket_index(2.1) == 5
+    assert histogram.bucket_index(100.0) == len(histogram.bounds)  # +Inf
+
+    for value in (0.5, 1.1, 1.2, 2.1, 100.0):
+        histogram.observe(value)
+
+    cumulative = dict(histogram.cumulative())
+    assert cumulative[1.0] == 1
+    assert cumulative[1.25] == 3
+    assert cumulative[2.5] == 4
+    assert cumulative[float("inf")] == 5
+    assert histogram.count == 5
+    assert histogram.total == pytest.approx(104.9)
+
+
+def test_histogram_quantile() -> None:
+    """Test quantile estimation from bucket upper bounds."""
+    histogram = Histogram(log_linear_bounds(1.0, 8.0, 4))
+    assert histogram.quantile(0.5) == 0.0
+
+    for value in [1.1] * 90 + [6.5] * 10:
+        histogram.observe(value)
+
+    assert histogram.quantile(0.5) == 1.25
+    assert histogram.quantile(0.95) == 7.0
+
+
+def test_prometheus_exposition_format() -> None:
+    """Test HELP/TYPE lines, label escaping and histogram series."""
+    metrics = MetricsRegistry(namespace="test")
+    metrics.inc("calls_total", {"tool": 'say "hi"'}, help_text="Calls.")
+    metrics.inc("calls_total", {"tool": 'say "hi"'})
+    metrics.add_gauge("in_flight", {"tool": "a"}, 1, "In flight.")
+    metrics.observe(
+        "duration_seconds", {"tool": "a"}, 1.1, bounds=[1.0, 2.0], help_text="Latency."
+    )
+    metrics.observe("duration_seconds", {"tool": "a"}, 3.0)
+
+    text = metrics.render_prometheus()
+    lines = text.splitlines()
+
+    assert text.endswith("\n")
+    assert "# HELP test_calls_total Calls." in lines
+    assert "# TYPE test_calls_total counter" in lines
+    assert 'test_calls_total{tool="say \\"hi\\""} 2' in lines
+    assert "# TYPE test_in_flight gauge" in lines
+    assert 'test_in_flight{tool="a"} 1' in lines
+    assert "# TYPE test_duration_seconds histogram" in lines
+    assert 'test_duration_seconds_bucket{tool="a",le="1"} 0' in lines
+    assert 'test_duration_seconds_bucket{tool="a",le="2"} 1' in lines
+    assert 'test_duration_seconds_bucket{tool="a",le="+Inf"} 2' in lines
+    assert 'test_duration_seconds_sum{tool="a"} 4.1' in lines
+    assert 'test_duration_seconds_count{tool="a"} 2' in lines
+
+
+def test_metric_type_conflict() -> None:
+    """Test that a name cannot be reused with a different metric type."""
+    metrics = MetricsRegistry()
+    metrics.inc("things", {})
+    with pytest.raises(ValueError):
+        metrics.add_gauge("things", {}, 1)
+
+
+def test_endpoint_label() -> None:
+    """Test that endpoint labels drop the base path and resource IDs."""
+    base = "/api/rest/v4/"
+    url = httpx.URL("https://www.courtlistener.com/api/rest/v4/opinions/123/")
+    assert endpoint_label(url, base) == "opinions"
+    url = httpx.URL("https://www.courtlistener.com/api/rest/v4/citation-lookup/")
+    assert endpoint_label(url, base) == "citation-lookup"
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_tool_and_upstream_metrics_recorded(client: Client[Any]) -> None:
+    """Test that tool calls and upstream requests are recorded."""
+    registry.reset()
+    respx.get("https://www.courtlistener.com/api/rest/v4/courts/scotus/").mock(
+        return_value=httpx.Response(200, json={"id": "scotus"})
+    )
+
+    async with client:
+        result = await client.call_tool("get_court", {"court_id": "scotus"})
+        assert not result.is_error
+
+    assert registry.get_counter(
+        "tool_calls_total", {"tool": "get_court", "outcome": "ok"}
+    ) == 1
+    assert registry.get_gauge("tool_in_flight", {"tool": "get_court"}) == 0
+    histogram = registry.get_histogram("tool_duration_seconds", {"tool": "get_court"})
+    assert histogram is not None and histogram.count == 1
+
+    assert registry.get_counter(
+        "upstream_requests_total",
+        {"endpoint": "courts", "method": "GET", "status": "200"},
+    ) == 1
+    assert registry.get_gauge("upstream_in_flight", {"endpoint": "courts"}) == 0
+    assert registry.get_histogram("upstream_response_bytes", {"endpoint": "courts"})
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_upstream_transport_errors_recorded(client: Client[Any]) -> None:
+    """Test that failed upstream requests are counted and not left in flight."""
+    registry.reset()
+    respx.get("https://www.courtlistener.com/api/rest/v4/search/").mock(
+        side_effect=httpx.ConnectError("Connection refused")
+    )
+
+    async with client:
+        result = await client.call_tool(
+            "search_opinions", {"q": "test"}, raise_on_error=False
+        )
+        assert result.is_error
+
+    assert registry.get_counter(
+        "tool_calls_total", {"tool": "search_opinions", "outcome": "error"}
+    ) == 1
+    assert registry.get_counter(
+        "upstream_requests_total",
+        {"endpoint": "search", "method": "GET", "status": "error"},
+    ) == 1
+    assert registry.get_gauge("upstream_in_flight", {"endpoint": "search"}) == 0
+
+
+@pytest.mark.asyncio
+async def test_metrics_route(client: Client[Any]) -> None:
+    """Test that the HTTP app serves the registry in Prometheus format."""
+    registry.reset()
+    async with client:
+        await client.call_tool("status", {})
+
+    transport = httpx.ASGITransport(app=mcp.http_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        response = await http.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'courtlistener_tool_calls_total{outcome="ok",tool="status"} 1' in (
+        response.text.splitlines()
+    )
@@ -0,0 +1,115 @@
+"""Tests for the background system sampler and the non-blocking status tool."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock
+
+import psutil
+import pytest
+
+from app import sampler as sampler_module, server
+from app.sampler import SystemSampler
+
+
+def make_fake_psutil(cpu_values: list[float]) -> Any:
+    """Build a fake psutil module whose cpu_percent blocks if given an interval.
+
+    Args:
+        cpu_values: Successive values returned by ``Process.cpu_percent``.
+
+    Returns:
+        An object standing in for the psutil module.
+
+    """
+    values = iter(cpu_values)
+
+    def cpu_percent(interval: float | None = None) -> float:
+        if interval:
+            time.sleep(interval)
+        return next(values, 0.0)
+
+    process = MagicMock()
+    process.create_time.return_value = time.time() - 3661
+    process.cpu_percent.side_effect = cpu_percent
+    process.memory_info.return_value = SimpleNamespace(rss=100 * 1024 * 1024)
+    process.num_threads.return_value = 4
+    process.num_fds.return_value = 12
+    process.net_connections.return_value = [object(), object()]
+
+    return SimpleNamespace(
+        Process=lambda: process,
+        Error=psutil.Error,
+        virtual_memory=lambda: SimpleNamespace(percent=42.0),
+        disk_usage=lambda path: SimpleNamespace(percent=55.5),
+    )
+
+
+@pytest.fixture
+def fake_sampler(monkeypatch: pytest.MonkeyPatch) -> SystemSampler:
+    """Create a sampler backed by a fake psutil and install it for the server.
+
+    Returns:
+        The sampler instance used by the status tool.
+
+    """
+    monkeypatch.setattr(
+        sampler_module, "psutil", make_fake_psutil([0.0, 10.0, 30.0, 20.0])
+    )
+    instance = SystemSampler(interval=0.01, window=3)
+    monkeypatch.setattr(server, "get_system_sampler", lambda: instance)
+    return instance
+
+
+def test_sampler_ring_buffer_summary(fake_sampler: SystemSampler) -> None:
+    """Test that the ring buffer keeps the last N samples and summarises them."""
+    assert fake_sampler.latest() is None
+    assert fake_sampler.summary() == {}
+
+    for _ in range(3):
+        fake_sampler.sample()
+
+    snapshot = fake_sampler.latest()
+    assert snapshot is not None
+    assert snapshot.cpu_percent == 20.0
+    assert snapshot.memory_mb == 100.0
+    assert snapshot.open_connections == 2
+    assert snapshot.num_fds == 12
+
+    summary = fake_sampler.summary()
+    assert summary["cpu_percent"] == {"min": 10.0, "avg": 20.0, "max": 30.0}
+    assert summary["system_memory_percent"]["max"] == 42.0
+
+    fake_sampler.sample()
+    assert fake_sampler.report()["samples"] == 3
+
+
+def test_status_returns_under_one_millisecond(fake_sampler: SystemSampler) -> None:
+    """Test that status only reads the latest snapshot and never blocks."""
+    fake_sampler.sample()
+    server.status.fn()  # warm up imports and cached lookups
+
+    iterations = 50
+    start = time.perf_counter()
+    for _ in range(iterations):
+        data = server.status.fn()
+    elapsed = (time.perf_counter() - start) / iterations
+
+    assert elapsed < 0.001
+    assert data["system"]["cpu_percent"] == 10.0
+    assert data["system"]["memory_mb"] == 100.0
+    assert data["system"]["process_uptime"].startswith("01:01:")
+    assert data["system"]["sampler"]["window"]["cpu_percent"]["max"] == 10.0
+
+
+@pytest.mark.asyncio
+async def test_sampler_background_task(fake_sampler: SystemSampler) -> None:
+    """Test that the background task fills the buffer and stops cleanly."""
+    fake_sampler.start()
+    assert fake_sampler.running
+    await asyncio.sleep(0.05)
+    await fake_sampler.stop()
+
+    assert not fake_sampler.running
+    assert fake_sampler.report()["samples"] >= 2
@@ -1,8 +1,9 @@
 import streamlit as st
 import pandas as pd
-import json
 from pathlib import Path
 
+import catalog_data
+
 # ============================================================================
 # DATA ACCESS - Reads from local data folder
 # ============================================================================
@@ -30,17 +31,16 @@ ACTS = {
     },
 }
 
-def load_catalog(act_id=None):
-    """Load catalog, optionally filtered to a specific act."""
-    catalog_path = DATA_DIR / "catalog.json"
-    if catalog_path.exists():
-        with open(catalog_path, 'r') as f:
-            full_catalog = json.load(f)
-            songs = full_catalog.get("songs", [])
-            if act_id and act_id != "ALL":
-                songs = [s for s in songs if s.get("act_id") == act_id]
-            return songs
-    return []
+def load_catalog():
+    """Load the catalog (cached per catalog.json version)."""
+    return catalog_data.load_catalog(DATA_DIR / "catalog.json")
+
+
+def with_act_names(df):
+    """`df` with an "Act" column in front (a new frame; cached frames are never modified)."""
+    names = {act_id: info['name'] for act_id, info in ACTS.items()}
+    act_names = df['act_id'].map(lambda a: names.get(a, a)).astype("object").fillna('-')
+    return pd.concat([act_names.rename("Act"), df], axis=1)
 
 # ============================================================================
 # PAGE CONFIG
@@ -68,7 +68,9 @@ selected_label = st.sidebar.selectbox("Select Act", list(act_options.keys()))
 selected_act = act_options[selected_label]
 
 # Load songs for selected act
-songs = load_catalog(selected_act)
+catalog = load_catalog()
+view = catalog.view(selected_act)
+songs = view.songs
 
 # Display act info
 if selected_act != "ALL" and selected_act in ACTS:
@@ -92,9 +94,9 @@ if page == "Dashboard":
 
     # Metrics
     total_songs = len(songs)
-    released_songs = sum(1 for s in songs if s.get('status') == 'released')
-    mastered_songs = sum(1 for s in songs if s.get('status') == 'mastered')
-    total_revenue = sum(s.get('revenue', {}).get('total_earned', 0) for s in songs)
+    released_songs = view.status_counts.get('Released', 0)
+    mastered_songs = view.status_counts.get('Mastered', 0)
+    total_revenue = view.total_revenue
 
     col1, col2, col3, col4 = st.columns(4)
     col1.metric("Total Songs", total_songs)
@@ -106,33 +108,27 @@ if page == "Dashboard":
 
     # Status Breakdown
     st.subheader("Status Breakdown")
-    status_counts = {}
-    for s in songs:
-        status = s.get('status', 'unknown').title()
-        status_counts[status] = status_counts.get(status, 0) + 1
+    status_counts = view.status_counts
 
     if status_counts:
         cols = st.columns(min(len(status_counts), 6))
-        for i, (status, count) in enumerate(sorted(status_counts.items())):
+        for i, (status, count) in enumerate(status_counts.items()):
             cols[i % len(cols)].metric(status, count)
 
     st.markdown("---")
 
     # Recent Songs
     st.subheader("Recent Songs")
-    if songs:
-        recent = songs[-10:]
-        table_data = []
-        for s in recent:
-            row = {
-                "Title": s['title'],
-                "Artist": s.get('artist', '-'),
-                "Status": s.get('status', '-').title(),
-            }
-            if selected_act == "ALL":
-                row["Act"] = ACTS.get(s.get('act_id', ''), {}).get('name', s.get('act_id', '-'))
-            table_data.append(row)
-        st.dataframe(pd.DataFrame(table_data), use_container_width=True)
+    if len(songs):
+        recent = songs.tail(10)
+        table = pd.DataFrame({
+            "Title": recent['title'],
+            "Artist": recent['artist'].astype("object").fillna('-'),
+            "Status": recent['status'].astype("object").fillna('-').str.title(),
+        })
+        if selected_act == "ALL":
+            table["Act"] = with_act_names(recent)["Act"]
+        st.dataframe(table.reset_index(drop=True), use_container_width=True)
     else:
         st.info("No songs in catalog yet.")
 
@@ -142,9 +138,9 @@ if page == "Dashboard":
 elif page == "All Songs":
     st.header("Complete Catalog")
 
-    if songs:
+    if len(songs):
         # Filters
-        artist_options = ["All"] + sorted(set(s.get('artist', '') for s in songs if s.get('artist')))
+        artist_options = ["All"] + view.artists
 
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -152,17 +148,15 @@ elif page == "All Songs":
         with col2:
             status_filter = st.selectbox("Filter by Status", ["All", "idea", "demo", "mixing", "mastered", "copyright", "released"])
         with col3:
-            search = st.text_input("Search by Title or Code")
-
-        # Apply filters
-        filtered = songs
-        if artist_filter != "All":
-            filtered = [s for s in filtered if s.get('artist') == artist_filter]
-        if status_filter != "All":
-            filtered = [s for s in filtered if s.get('status') == status_filter]
-        if search:
-            search_lower = search.lower()
-            filtered = [s for s in filtered if search_lower in s.get('title', '').lower() or search_lower in s.get('legacy_code', '').lower()]
+            search = st.text_input("Search by Title, Code, Artist or Keyword")
+
+        # Apply filters (precomputed bitsets; search results come back ranked)
+        mask = catalog.index.filter(
+            act_id=None if selected_act == "ALL" else selected_act,
+            artist=None if artist_filter == "All" else artist_filter,
+            status=None if status_filter == "All" else status_filter,
+        )
+        filtered = catalog.songs.iloc[catalog.index.search(search, mask)]
 
         st.write(f"**Showing {len(filtered)} of {len(songs)} songs**")
 
@@ -175,17 +169,12 @@ elif page == "All Songs":
             col_names = ['Song ID', 'Code', 'Title', 'Artist', 'Status']
 
         # Add Act column when showing all acts
+        df = filtered[display_cols]
         if selected_act == "ALL":
-            for s in filtered:
-                s['_act_name'] = ACTS.get(s.get('act_id', ''), {}).get('name', s.get('act_id', '-'))
-            display_cols.insert(0, '_act_name')
+            df = with_act_names(filtered[['act_id'] + display_cols]).drop(columns='act_id')
             col_names.insert(0, 'Act')
 
-        df = pd.DataFrame(filtered)
-        available_cols = [c for c in display_cols if c in df.columns]
-        display_df = df[available_cols]
-        col_labels = [col_names[display_cols.index(c)] for c in available_cols]
-        display_df.columns = col_labels
+        display_df = df.set_axis(col_names, axis=1).reset_index(drop=True)
         st.dataframe(display_df, use_container_width=True, height=500)
     else:
         st.info("No songs match filters")
@@ -197,7 +186,7 @@ elif page == "Deployment Status":
     st.header("Deployment Status")
     st.caption("View where songs are distributed and streaming")
 
-    if not songs:
+    if not len(songs):
         st.info("No songs in catalog yet.")
     else:
         ALL_DISTRIBUTORS = ["DistroKid", "TuneCore", "CD Baby", "Amuse", "AWAL", "Ditto"]
@@ -205,9 +194,9 @@ elif page == "Deployment Status":
         ALL_STREAMING = ["Spotify", "Apple Music", "Amazon", "YouTube", "Tidal", "Deezer", "Pandora"]
 
         # Summary metrics
-        songs_with_distribution = sum(1 for s in songs if s.get('deployments', {}).get('distribution'))
-        songs_with_sync = sum(1 for s in songs if s.get('deployments', {}).get('sync_libraries'))
-        songs_with_streaming = sum(1 for s in songs if s.get('deployments', {}).get('streaming'))
+        songs_with_distribution = view.deployment_counts['distribution']
+        songs_with_sync = view.deployment_counts['sync_libraries']
+        songs_with_streaming = view.deployment_counts['streaming']
 
         col1, col2, col3 = st.columns(3)
         col1.metric("On Distributors", songs_with_distribution)
@@ -219,41 +208,23 @@ elif page == "Deployment Status":
         # Deployment table
         st.subheader("All Songs - Deployment Details")
 
-        table_data = []
-        for s in songs:
-            deps = s.get('deployments', {})
-            dist_list = deps.get('distribution', [])
-            sync_list = deps.get('sync_libraries', [])
-            stream_list = deps.get('streaming', [])
-
-            def format_with_checks(platforms):
-                if not platforms:
-                    return "—"
-                return " ".join([f"✅ {p}" for p in platforms])
-
-            row = {
-                "Title": s['title'],
-                "Status": s.get('status', '-').title(),
-                "Distribution": format_with_checks(dist_list),
-                "Sync Libraries": format_with_checks(sync_list),
-                "Streaming": format_with_checks(stream_list),
-            }
-            if selected_act == "ALL":
-                row["Act"] = ACTS.get(s.get('act_id', ''), {}).get('name', '-')
-            table_data.append(row)
-
-        st.dataframe(pd.DataFrame(table_data), use_container_width=True, height=400)
+        table = pd.DataFrame({
+            "Title": songs['title'],
+            "Status": songs['status'].astype("object").fillna('-').str.title(),
+            "Distribution": songs['distribution_display'],
+            "Sync Libraries": songs['sync_libraries_display'],
+            "Streaming": songs['streaming_display'],
+        })
+        if selected_act == "ALL":
+            table["Act"] = with_act_names(songs)["Act"]
+
+        st.dataframe(table.reset_index(drop=True), use_container_width=True, height=400)
 
         # Platform Coverage
         st.markdown("---")
         st.subheader("Platform Coverage")
 
-        platform_counts = {}
-        for s in songs:
-            deps = s.get('deployments', {})
-            all_plats = deps.get('distribution', []) + deps.get('sync_libraries', []) + deps.get('streaming', [])
-            for p in all_plats:
-                platform_counts[p] = platform_counts.get(p, 0) + 1
+        platform_counts = view.platform_counts
 
         col1, col2, col3 = st.columns(3)
 
@@ -287,11 +258,8 @@ elif page == "Deployment Status":
 elif page == "Financials":
     st.header("Revenue Summary")
 
-    total_revenue = sum(s.get('revenue', {}).get('total_earned', 0) for s in songs)
-    total_expenses = sum(
-        sum(e.get('amount', 0) for e in s.get('revenue', {}).get('expenses', []))
-        for s in songs
-    )
+    total_revenue = view.total_revenue
+    total_expenses = view.total_expenses
     net_revenue = total_revenue - total_expenses
 
     col1, col2, col3 = st.columns(3)
@@ -302,24 +270,9 @@ elif page == "Financials":
     st.markdown("---")
     st.subheader("Revenue by Song")
 
-    songs_with_revenue = [
-        {
-            'title': s['title'],
-            'artist': s.get('artist', 'Unknown'),
-            'revenue': s.get('revenue', {}).get('total_earned', 0),
-            'expenses': sum(e.get('amount', 0) for e in s.get('revenue', {}).get('expenses', []))
-        }
-        for s in songs
-    ]
-
-    songs_with_revenue.sort(key=lambda x: x['revenue'], reverse=True)
-
-    if songs_with_revenue:
-        df = pd.DataFrame(songs_with_revenue)
-        df.columns = ['Title', 'Artist', 'Revenue', 'Expenses']
-        df['Revenue'] = df['Revenue'].apply(lambda x: f"${x:,.2f}")
-        df['Expenses'] = df['Expenses'].apply(lambda x: f"${x:,.2f}")
-        st.dataframe(df, use_container_width=True, height=400)
+    # Sorted by revenue and formatted once per catalog version
+    if len(view.revenue_table):
+        st.dataframe(view.revenue_table, use_container_width=True, height=400)
     else:
         st.info("No revenue data yet")
 
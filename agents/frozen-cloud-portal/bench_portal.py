@@ -0,0 +1,173 @@
+"""
+Portal rerun benchmark.
+
+Writes a synthetic catalog (20k songs by default) next to a copy of the app
+and drives it with Streamlit's AppTest: every page for all acts and for one
+act, then filter changes and a typed search on All Songs. Each interaction
+is one rerun. The same script is timed with the catalog cache warm and with
+the cache cleared before every rerun (parsing catalog.json each time, as the
+portal used to); --compare times another version of app.py the same way.
+
+Usage: python bench_portal.py [--songs 20000] [--compare old_app.py]
+"""
+
+import argparse
+import json
+import logging
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+HERE = Path(__file__).parent
+ACT_ARTISTS = {
+    "FROZEN_CLOUD": ["Frozen Cloud", "Frozen Cloud Trio"],
+    "PARK_BELLEVUE": ["Park Bellevue", "The Bellevue Strings"],
+    "BAJAN_SUN": ["Bajan Sun", "Bajan Sun Steel Band"],
+}
+STATUSES = ["idea", "demo", "mixing", "mastered", "copyright", "released"]
+WORDS = ("road down night river blue cloud summer heart old getting home light rain city dream fire "
+         "gold island morning slow wild broken sun dance sea love lost train wind winter").split()
+PLATFORMS = {
+    "distribution": ["DistroKid", "TuneCore", "CD Baby", "Amuse", "AWAL", "Ditto"],
+    "sync_libraries": ["Songtradr", "Music Gateway", "Pond5", "Disco", "Taxi", "Musicbed", "Artlist"],
+    "streaming": ["Spotify", "Apple Music", "Amazon", "YouTube", "Tidal", "Deezer", "Pandora"],
+}
+
+
+def synthetic_catalog(count: int, seed: int = 7, words=WORDS) -> dict:
+    """A catalog.json-shaped dict with `count` songs spread over the three acts, titled from `words`."""
+    rng = random.Random(seed)
+    songs = []
+    for i in range(count):
+        act_id = rng.choice(list(ACT_ARTISTS))
+        title = " ".join(rng.choice(words) for _ in range(rng.randint(1, 4))).title()
+        status = rng.choice(STATUSES)
+        songs.append({
+            "song_id": f"RS-{2000 + i % 26}-{i:05d}",
+            "title": title,
+            "act_id": act_id,
+            "artist": rng.choice(ACT_ARTISTS[act_id]),
+            "legacy_code": "".join(rng.choice("ABCDEFGHIJKLMNOPRSTW") for _ in range(4)) + str(i % 100),
+            "status": status,
+            "copyright_number": f"PAu{rng.randint(1000000, 9999999)}" if status in ("copyright", "released") else None,
+            "sync_metadata": {"moods": rng.sample(["upbeat", "fun", "dark", "calm", "epic"], 2),
+                              "keywords": rng.sample(words, 3)},
+            "revenue": {"total_earned": round(rng.random() * 5000, 2) if status == "released" else 0,
+                        "expenses": [{"amount": round(rng.random() * 200, 2)} for _ in range(rng.randint(0, 2))]},
+            "deployments": {kind: rng.sample(names, rng.randint(0, 2)) for kind, names in PLATFORMS.items()},
+            "events": [{"timestamp": "2026-01-24T19:00:42", "event_type": "created",
+                        "description": f"Imported from Excel (legacy code: {i})", "user": "System Import"}],
+        })
+    return {"songs": songs, "albums": []}
+
+
+def make_app_dir(root: Path, app_file: Path, catalog: dict) -> Path:
+    root.mkdir(parents=True)
+    shutil.copy(app_file, root / "app.py")
+    if (app_file.parent / "catalog_data.py").exists():
+        shutil.copy(app_file.parent / "catalog_data.py", root / "catalog_data.py")
+    (root / "data").mkdir()
+    (root / "data" / "catalog.json").write_text(json.dumps(catalog, indent=2))
+    return root / "app.py"
+
+
+def interactions(act_label: str):
+    """(name, action) pairs; each action changes one widget and is followed by a rerun."""
+    steps = []
+    for act in ("All Acts", act_label):
+        steps.append((f"{act}: select act", lambda at, a=act: at.sidebar.selectbox[0].set_value(a)))
+        for page in ("Dashboard", "All Songs", "Deployment Status", "Financials"):
+            steps.append((f"{act}: {page}", lambda at, p=page: at.sidebar.radio[0].set_value(p)))
+    steps.append(("All Songs page", lambda at: at.sidebar.radio[0].set_value("All Songs")))
+    steps.append(("status = released", lambda at: at.main.selectbox[1].set_value("released")))
+    for typed in ("r", "ri", "riv", "rive", "river"):
+        steps.append((f"search '{typed}'", lambda at, t=typed: at.text_input[0].input(t)))
+    steps.append(("status = All", lambda at: at.main.selectbox[1].set_value("All")))
+    return steps
+
+
+def rendered(at: AppTest) -> tuple:
+    """What a rerun showed: metric values and every table's columns and rows."""
+    tables = []
+    for df in at.dataframe:
+        value = df.value.reset_index(drop=True)
+        tables.append((list(value.columns), value.astype(str).values.tolist()))
+    return [m.value for m in at.metric], tables
+
+
+def replay(app_path: Path, clear_cache: bool) -> tuple:
+    import catalog_data
+    catalog_data._load.clear()
+    at = AppTest.from_file(str(app_path), default_timeout=300)
+    timings, outputs = [], []
+    start = time.perf_counter()
+    at.run()
+    timings.append(("first run", time.perf_counter() - start))
+    outputs.append(rendered(at))
+    for name, action in interactions("❄️ Frozen Cloud Music"):
+        if clear_cache:
+            catalog_data._load.clear()
+        action(at)
+        start = time.perf_counter()
+        at.run()
+        assert not at.exception, (name, at.exception)
+        timings.append((name, time.perf_counter() - start))
+        outputs.append(rendered(at))
+    return timings, outputs
+
+
+def summary(label: str, timings: list):
+    reruns = [t for _, t in timings[1:]]
+    reruns.sort()
+    p95 = reruns[min(len(reruns) - 1, int(len(reruns) * 0.95))]
+    print(f"{label:<34} first {timings[0][1] * 1000:7.0f} ms   rerun median {statistics.median(reruns) * 1000:6.0f} ms"
+          f"   p95 {p95 * 1000:6.0f} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Time portal reruns with Streamlit AppTest")
+    parser.add_argument("--songs", type=int, default=20000)
+    parser.add_argument("--compare", type=Path, help="another app.py to time on the same catalog")
+    parser.add_argument("--verbose", action="store_true", help="print every interaction")
+    args = parser.parse_args()
+
+    catalog = synthetic_catalog(args.songs)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        app = make_app_dir(tmp / "current", HERE / "app.py", catalog)
+        size = (app.parent / "data" / "catalog.json").stat().st_size / 1e6
+        print(f"{args.songs} songs, catalog.json {size:.1f} MB")
+        sys.path.insert(0, str(app.parent))
+
+        # Quiet the per-rerun use_container_width notice and cache clears made outside a script run
+        for name in ("streamlit.deprecation_util", "streamlit.runtime.scriptrunner_utils.script_run_context"):
+            logging.getLogger(name).disabled = True
+        runs = [("cache warm", *replay(app, clear_cache=False)),
+                ("cache cleared every rerun", *replay(app, clear_cache=True))]
+        if args.compare:
+            runs.append((args.compare.name, *replay(make_app_dir(tmp / "compare", args.compare, catalog), False)))
+        for label, timings, _ in runs:
+            summary(label, timings)
+            if args.verbose:
+                for name, t in timings:
+                    print(f"    {name:<40} {t * 1000:7.0f} ms")
+        if args.compare:
+            # Searches are ranked and also match artists and keywords, so only reruns before the first must agree
+            compared = 0
+            for (name, _), ours, theirs in zip(runs[0][1], runs[0][2], runs[-1][2]):
+                if name.startswith("search"):
+                    break
+                assert ours == theirs, f"{name}: output differs from {args.compare.name}"
+                compared += 1
+            print(f"✅ {compared} reruns without a search show the same metrics and tables as {args.compare.name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Search benchmark for the All Songs filter.
+
+Builds a synthetic catalog (50k songs by default, titles drawn from a few
+thousand words), then replays typed queries one keystroke at a time: song
+titles, legacy codes, artist names and misspelled titles, some combined with
+an artist or status filter. Each keystroke is timed three ways: the original
+list-comprehension substring filter, the pandas masks the page used before
+the index, and SearchIndex.filter + search. Checks that the index returns
+every song the substring filter did and ranks exact titles first.
+
+Usage: python bench_search.py [--songs 50000] [--queries 300]
+"""
+
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+from bench_portal import WORDS, synthetic_catalog
+from catalog_data import build_catalog
+
+SYLLABLES = ("ka lo mi ra ven tor el sun dar is on bel ma ri cor ta ne vo li sa "
+             "fen dor ga lu pe mor wyn the ash ern").split()
+
+
+def vocabulary(rng: random.Random, size: int) -> list:
+    words = set(WORDS)
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))))
+    return sorted(words)
+
+
+def misspell(rng: random.Random, text: str) -> str:
+    """Swap two adjacent letters of the longest word."""
+    words = text.split()
+    i = max(range(len(words)), key=lambda k: len(words[k]))
+    w = words[i]
+    if len(w) >= 4:
+        j = rng.randint(1, len(w) - 3)
+        words[i] = w[:j] + w[j + 1] + w[j] + w[j + 2:]
+    return " ".join(words)
+
+
+def typed_queries(rng: random.Random, songs: list, count: int) -> list:
+    """(keystrokes, artist, status, kind, row): each query typed one character at a time, with optional filters."""
+    queries = []
+    artists = sorted({s["artist"] for s in songs})
+    for i in range(count):
+        row = rng.randrange(len(songs))
+        song = songs[row]
+        kind = ("title", "code", "artist", "typo")[i % 4]
+        text = {"title": song["title"], "code": song["legacy_code"], "artist": song["artist"],
+                "typo": misspell(rng, song["title"])}[kind]
+        artist = rng.choice(artists) if i % 3 == 1 else None
+        status = song["status"] if i % 5 == 2 else None
+        queries.append(([text[:n] for n in range(1, len(text) + 1)], artist, status, kind, row))
+    return queries
+
+
+def old_filter(songs, artist, status, search):
+    """All Songs before any caching: list comprehensions over the song dicts."""
+    filtered = songs
+    if artist:
+        filtered = [s for s in filtered if s.get('artist') == artist]
+    if status:
+        filtered = [s for s in filtered if s.get('status') == status]
+    search_lower = search.lower()
+    return [s for s in filtered if search_lower in s.get('title', '').lower()
+            or search_lower in s.get('legacy_code', '').lower()]
+
+
+def pandas_filter(df, artist, status, search):
+    """All Songs with the cached DataFrame but no index: a substring mask per keystroke."""
+    mask = np.ones(len(df), dtype=bool)
+    if artist:
+        mask &= (df['artist'] == artist).to_numpy()
+    if status:
+        mask &= (df['status'] == status).to_numpy()
+    search_lower = search.lower()
+    mask &= (df['title'].str.lower().str.contains(search_lower, regex=False)
+             | df['legacy_code'].str.lower().str.contains(search_lower, regex=False)).to_numpy()
+    return np.flatnonzero(mask)
+
+
+def percentiles(samples: list) -> str:
+    ms = np.array(samples) * 1000
+    return f"p50 {np.percentile(ms, 50):7.2f} ms   p95 {np.percentile(ms, 95):7.2f} ms   max {ms.max():7.2f} ms"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay typed searches against the portal search index")
+    parser.add_argument("--songs", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--vocabulary", type=int, default=3000)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    songs = synthetic_catalog(args.songs, words=vocabulary(rng, args.vocabulary))["songs"]
+    start = time.perf_counter()
+    catalog = build_catalog(songs)
+    build_s = time.perf_counter() - start
+    index, df = catalog.index, catalog.songs
+    print(f"{args.songs} songs, {len(index.vocab)} distinct tokens; catalog + index built in {build_s:.2f} s")
+
+    queries = typed_queries(rng, songs, args.queries)
+    timings = {"list comprehension": [], "pandas masks": [], "SearchIndex": []}
+    position = {id(s): i for i, s in enumerate(songs)}
+    for keystrokes, artist, status, kind, _ in queries:
+        for text in keystrokes:
+            start = time.perf_counter()
+            old = old_filter(songs, artist, status, text)
+            timings["list comprehension"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            pandas_filter(df, artist, status, text)
+            timings["pandas masks"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            rows = index.search(text, index.filter(artist=artist, status=status))
+            timings["SearchIndex"].append(time.perf_counter() - start)
+
+            missing = {position[id(s)] for s in old} - set(rows.tolist())
+            assert not missing, (text, artist, status, df.title.iloc[sorted(missing)[:3]].tolist())
+        if kind == "title" and not artist and len(rows):
+            assert df.title.iloc[rows[0]].lower() == keystrokes[-1].lower(), (keystrokes[-1], df.title.iloc[rows[0]])
+
+    keystrokes = len(timings["SearchIndex"])
+    print(f"{len(queries)} typed queries, {keystrokes} keystrokes")
+    for name, samples in timings.items():
+        print(f"  {name:<20} {percentiles(samples)}")
+    print("✅ every song the substring filter found is in the index results; full titles rank an exact match first")
+
+    # Misspelt titles (no filters): where does the intended song land?
+    typos = [(q[0][-1], q[4]) for q in queries if q[3] == "typo" and q[0][-1].lower() != songs[q[4]]["title"].lower()]
+    ranks = []
+    for text, row in typos:
+        hits = index.search(text).tolist()
+        ranks.append(hits.index(row) if row in hits else None)
+    found = [r for r in ranks if r is not None]
+    top10 = sum(r < 10 for r in found)
+    print(f"✅ misspelt titles: intended song found for {len(found)}/{len(typos)}, in the top 10 for {top10} "
+          "(trigram fallback)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
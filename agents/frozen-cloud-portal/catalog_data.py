@@ -0,0 +1,144 @@
+"""
+Catalog data for the portal.
+
+catalog.json is parsed once per file version (mtime + size) into a single
+pandas DataFrame, one row per song in catalog order, with categorical act,
+artist and status columns. Per-act slices, the numbers the Dashboard,
+Deployment Status and Financials pages show and the All Songs search index
+(search_index.py) are built at the same time, so a Streamlit rerun only
+filters views of cached frames. The cached frames are shared between
+sessions: pages must not modify them in place.
+"""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from search_index import SearchIndex
+
+ALL_ACTS = "ALL"
+DEPLOYMENT_KINDS = ("distribution", "sync_libraries", "streaming")
+
+SONG_COLUMNS = ["song_id", "legacy_code", "title", "artist", "act_id", "status", "copyright_number",
+                "keywords", "revenue", "expenses", "distribution", "sync_libraries", "streaming"]
+CATEGORICAL_COLUMNS = ["artist", "act_id", "status"]
+
+
+@dataclass
+class ActView:
+    """One act's songs (or all of them) plus the aggregates the pages display."""
+    songs: pd.DataFrame
+    artists: list = field(default_factory=list)
+    status_counts: dict = field(default_factory=dict)
+    deployment_counts: dict = field(default_factory=dict)
+    platform_counts: dict = field(default_factory=dict)
+    total_revenue: float = 0.0
+    total_expenses: float = 0.0
+    revenue_table: pd.DataFrame = None
+
+    def __len__(self):
+        return len(self.songs)
+
+
+@dataclass
+class Catalog:
+    version: tuple
+    songs: pd.DataFrame
+    views: dict
+    index: SearchIndex
+
+    def view(self, act_id=ALL_ACTS) -> ActView:
+        if not act_id or act_id == ALL_ACTS:
+            return self.views[ALL_ACTS]
+        return self.views.get(act_id) or _act_view(self.songs.iloc[0:0])
+
+
+def _format_platforms(platforms):
+    if not platforms:
+        return "—"
+    return " ".join(f"✅ {p}" for p in platforms)
+
+
+def _song_row(s):
+    revenue = s.get('revenue') or {}
+    deps = s.get('deployments') or {}
+    return {
+        "song_id": s.get('song_id'),
+        "legacy_code": s.get('legacy_code') or "",
+        "title": s.get('title') or "",
+        "artist": s.get('artist') or None,
+        "act_id": s.get('act_id') or None,
+        "status": s.get('status') or None,
+        "copyright_number": s.get('copyright_number'),
+        "keywords": tuple((s.get('sync_metadata') or {}).get('keywords') or ()),
+        "revenue": float(revenue.get('total_earned') or 0),
+        "expenses": float(sum(e.get('amount', 0) for e in revenue.get('expenses', []))),
+        # Deployment lists stay as tuples for the platform counts
+        **{kind: tuple(deps.get(kind) or ()) for kind in DEPLOYMENT_KINDS},
+    }
+
+
+def songs_frame(songs: list) -> pd.DataFrame:
+    """Normalise catalog songs into one DataFrame (catalog order, categorical act/artist/status)."""
+    df = pd.DataFrame([_song_row(s) for s in songs], columns=SONG_COLUMNS)
+    for col in CATEGORICAL_COLUMNS:
+        df[col] = df[col].astype("category")
+    for kind in DEPLOYMENT_KINDS:
+        df[f"{kind}_display"] = df[kind].map(_format_platforms)
+    return df
+
+
+def _act_view(df: pd.DataFrame) -> ActView:
+    status_counts = df["status"].astype("object").fillna("unknown").str.title().value_counts()
+    platform_counts = {}
+    for kind in DEPLOYMENT_KINDS:
+        for platforms in df[kind]:
+            for p in platforms:
+                platform_counts[p] = platform_counts.get(p, 0) + 1
+
+    revenue_table = df[["title", "artist", "revenue", "expenses"]].sort_values(
+        "revenue", ascending=False, kind="stable")
+    revenue_table = pd.DataFrame({
+        "Title": revenue_table["title"],
+        "Artist": revenue_table["artist"].astype("object").fillna("Unknown"),
+        "Revenue": revenue_table["revenue"].map(lambda x: f"${x:,.2f}"),
+        "Expenses": revenue_table["expenses"].map(lambda x: f"${x:,.2f}"),
+    }).reset_index(drop=True)
+
+    return ActView(
+        songs=df,
+        artists=sorted(df["artist"].dropna().unique().tolist()),
+        status_counts=dict(sorted(status_counts.items())),
+        deployment_counts={kind: int(df[kind].map(bool).sum()) for kind in DEPLOYMENT_KINDS},
+        platform_counts=platform_counts,
+        total_revenue=float(df["revenue"].sum()),
+        total_expenses=float(df["expenses"].sum()),
+        revenue_table=revenue_table,
+    )
+
+
+def build_catalog(songs: list, version=()) -> Catalog:
+    df = songs_frame(songs)
+    views = {ALL_ACTS: _act_view(df)}
+    for act_id, rows in df.groupby("act_id", observed=True, sort=False).indices.items():
+        views[act_id] = _act_view(df.iloc[rows])
+    return Catalog(version=version, songs=df, views=views, index=SearchIndex(df))
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _load(path: str, mtime_ns: int, size: int) -> Catalog:
+    with open(path, 'r') as f:
+        songs = json.load(f).get("songs", [])
+    return build_catalog(songs, version=(mtime_ns, size))
+
+
+def load_catalog(path: Path) -> Catalog:
+    """The parsed catalog for the current version of `path` (reparsed only when it changes)."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return build_catalog([])
+    return _load(str(path), stat.st_mtime_ns, stat.st_size)
@@ -0,0 +1,189 @@
+"""
+Search index for the portal's song filter.
+
+Built once per catalog version (catalog_data builds it with the DataFrame).
+Titles, legacy codes, artists and sync keywords are normalised (lowercase,
+accents stripped, punctuation as spaces) and split into tokens. The sorted
+vocabulary maps each token to a posting list of (row, field weight).
+
+Every word of a query has to match some token of the song:
+  exact token        score 3 x field weight
+  token prefix       score 2 x field weight   (contiguous range of the sorted vocabulary)
+  token substring    score 1 x field weight   (1-3 character grams of each token)
+  trigram fuzzy      up to 1 x field weight   (only for words that match nothing else)
+Songs are ranked by total score, with an exact title or code match first;
+ties go to the shorter title, then catalog order. Act, artist and status
+filters are precomputed boolean row masks (one bitset per value) that are
+ANDed before ranking.
+"""
+
+import re
+import unicodedata
+from bisect import bisect_left
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+FIELD_WEIGHTS = {"title": 3.0, "legacy_code": 3.0, "artist": 1.0, "keywords": 1.0}
+FILTER_COLUMNS = ("act_id", "artist", "status")
+FUZZY_MIN_DICE = 0.4
+EXACT_BONUS = 100.0
+SHORT_WORD_CACHE = 64  # one- and two-character words match most of the catalog; every search starts with one
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize(text) -> str:
+    """Lowercase, accents stripped, runs of punctuation/whitespace as single spaces."""
+    if not isinstance(text, str):
+        return ""
+    text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def _padded_trigrams(token: str) -> set:
+    padded = f" {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    def __init__(self, songs: pd.DataFrame):
+        self.size = len(songs)
+
+        # token -> {row: best field weight}
+        postings = {}
+        exact = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            if field not in songs:
+                continue
+            for row, value in enumerate(songs[field].tolist()):
+                texts = value if isinstance(value, (list, tuple)) else (value,)
+                for text in texts:
+                    norm = normalize(text)
+                    if not norm:
+                        continue
+                    if field in ("title", "legacy_code"):
+                        exact.setdefault(norm, []).append(row)
+                    for token in norm.split():
+                        rows = postings.setdefault(token, {})
+                        if rows.get(row, 0) < weight:
+                            rows[row] = weight
+
+        self.vocab = sorted(postings)
+        self.token_ids = {token: i for i, token in enumerate(self.vocab)}
+        self.exact = {norm: np.array(rows, dtype=np.int64) for norm, rows in exact.items()}
+        titles = songs["title"].tolist() if "title" in songs else [""] * self.size
+        self.title_lengths = np.array([len(normalize(t)) for t in titles], dtype=np.int64)
+
+        # Flat posting arrays: token i owns rows[offsets[i]:offsets[i + 1]]
+        lengths = np.array([len(postings[t]) for t in self.vocab], dtype=np.int64)
+        self.offsets = np.concatenate([[0], np.cumsum(lengths)])
+        self.post_rows = np.fromiter((r for t in self.vocab for r in postings[t]), dtype=np.int64,
+                                     count=int(self.offsets[-1]))
+        self.post_weights = np.fromiter((w for t in self.vocab for w in postings[t].values()), dtype=np.float32,
+                                        count=int(self.offsets[-1]))
+
+        # Substrings up to 3 characters -> token ids containing them; padded trigrams for fuzzy matching
+        grams, fuzzy = {}, {}
+        for i, token in enumerate(self.vocab):
+            for n in (1, 2, 3):
+                for gram in {token[j:j + n] for j in range(len(token) - n + 1)}:
+                    grams.setdefault(gram, []).append(i)
+            for gram in _padded_trigrams(token):
+                fuzzy.setdefault(gram, []).append(i)
+        self.grams = {g: np.array(ids, dtype=np.int64) for g, ids in grams.items()}
+        self.fuzzy_grams = {g: np.array(ids, dtype=np.int64) for g, ids in fuzzy.items()}
+        self.fuzzy_sizes = np.array([len(_padded_trigrams(t)) for t in self.vocab], dtype=np.int64)
+
+        # One row mask per filter value
+        self.masks = {}
+        for column in FILTER_COLUMNS:
+            if column in songs:
+                values = songs[column].astype("category")
+                codes = values.cat.codes.to_numpy()
+                self.masks[column] = {value: codes == code for code, value in enumerate(values.cat.categories)}
+
+        self._short_word_scores = lru_cache(maxsize=SHORT_WORD_CACHE)(self._word_scores)
+
+    def filter(self, **values) -> np.ndarray:
+        """Rows matching every given filter, e.g. filter(artist="Bajan Sun", status="released"); None means any."""
+        mask = np.ones(self.size, dtype=bool)
+        for column, value in values.items():
+            if value is None:
+                continue
+            value_mask = self.masks.get(column, {}).get(value)
+            if value_mask is None:
+                return np.zeros(self.size, dtype=bool)
+            mask &= value_mask
+        return mask
+
+    def _matching_tokens(self, word: str):
+        """(token ids, match scores) for one query word."""
+        if len(word) <= 3:
+            candidates = self.grams.get(word, np.empty(0, dtype=np.int64))
+        else:
+            trigram_ids = [self.grams.get(word[i:i + 3]) for i in range(len(word) - 2)]
+            if any(ids is None for ids in trigram_ids):
+                candidates = np.empty(0, dtype=np.int64)
+            else:
+                trigram_ids.sort(key=len)
+                candidates = trigram_ids[0]
+                for ids in trigram_ids[1:]:
+                    candidates = np.intersect1d(candidates, ids, assume_unique=True)
+                candidates = np.array([t for t in candidates if word in self.vocab[t]], dtype=np.int64)
+
+        if len(candidates):
+            lo = bisect_left(self.vocab, word)
+            hi = bisect_left(self.vocab, word + "\uffff")
+            scores = np.where((candidates >= lo) & (candidates < hi), 2.0, 1.0)
+            scores[candidates == self.token_ids.get(word, -1)] = 3.0
+            return candidates, scores
+        if len(word) < 3:
+            return candidates, np.empty(0)
+
+        # Nothing contains the word: tokens sharing enough padded trigrams (Dice coefficient)
+        word_grams = _padded_trigrams(word)
+        lists = [self.fuzzy_grams[g] for g in word_grams if g in self.fuzzy_grams]
+        if not lists:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        ids, shared = np.unique(np.concatenate(lists), return_counts=True)
+        dice = 2.0 * shared / (len(word_grams) + self.fuzzy_sizes[ids])
+        keep = dice >= FUZZY_MIN_DICE
+        return ids[keep], dice[keep]
+
+    def _word_scores(self, word: str) -> np.ndarray:
+        """Per row: the best score any of the row's tokens gets for `word` (0 = no match)."""
+        scores = np.zeros(self.size, dtype=np.float32)
+        tokens, token_scores = self._matching_tokens(word)
+        if not len(tokens):
+            scores.flags.writeable = False
+            return scores
+        starts, ends = self.offsets[tokens], self.offsets[tokens + 1]
+        lengths = ends - starts
+        # Gather all posting slices at once: index = start of its token + position within the slice
+        flat = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths) + np.arange(lengths.sum())
+        values = self.post_weights[flat] * np.repeat(token_scores.astype(np.float32), lengths)
+        np.maximum.at(scores, self.post_rows[flat], values)
+        scores.flags.writeable = False  # may be shared through the short-word cache
+        return scores
+
+    def search(self, query: str, mask: np.ndarray = None) -> np.ndarray:
+        """Row positions matching `query` (and `mask`), best first. A query with no words returns the mask's rows in order."""
+        rows = np.flatnonzero(mask) if mask is not None else np.arange(self.size)
+        norm = normalize(query)
+        if not norm:
+            return rows
+        total = np.zeros(self.size)
+        matched = mask.copy() if mask is not None else np.ones(self.size, dtype=bool)
+        for word in dict.fromkeys(norm.split()):
+            word_scores = self._short_word_scores(word) if len(word) <= 2 else self._word_scores(word)
+            matched &= word_scores > 0
+            if not matched.any():
+                return np.empty(0, dtype=np.int64)
+            total += word_scores
+        exact_rows = self.exact.get(norm)
+        if exact_rows is not None:
+            total[exact_rows] += EXACT_BONUS
+        rows = np.flatnonzero(matched)
+        return rows[np.lexsort((rows, self.title_lengths[rows], -total[rows]))]
@@ -0,0 +1,163 @@
+"""
+Golden checks for midi_arranger.
+
+- arrangements/getting_old.yaml renders byte-identical to
+  Tests/golden/Getting_Old_73bpm.mid (the file the hand-written
+  generate_getting_old.py produced), and note-for-note identical when both
+  files are read back. The golden lives where neither midi_arranger.py nor
+  generate_getting_old.py writes, so rendering can never update it
+- the same arrangement as JSON renders the same bytes
+- strum spread, stroke direction, velocity ramps and humanisation behave as
+  documented, and a seeded arrangement always renders the same file
+- malformed arrangements list every problem instead of raising mid-compile,
+  and one bad file in a folder is one failed row, not a failed batch
+
+Usage: python check_arranger_golden.py
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import midi_arranger
+
+HERE = Path(__file__).parent
+GOLDEN = HERE / "Tests" / "golden" / "Getting_Old_73bpm.mid"
+ARRANGEMENT = HERE / "arrangements" / "getting_old.yaml"
+
+
+def _varlen(data, pos):
+    value = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value = (value << 7) | (byte & 0x7F)
+        if byte < 0x80:
+            return value, pos
+
+
+def read_notes(path):
+    """(track, channel, pitch, start tick, duration ticks, velocity) for every note in a MIDI file, sorted."""
+    data = Path(path).read_bytes()
+    assert data[:4] == b"MThd", f"{path}: not a MIDI file"
+    n_tracks = int.from_bytes(data[10:12], "big")
+    pos, notes = 14, []
+    for track in range(n_tracks):
+        assert data[pos:pos + 4] == b"MTrk"
+        end = pos + 8 + int.from_bytes(data[pos + 4:pos + 8], "big")
+        pos += 8
+        tick, status, sounding = 0, None, {}
+        while pos < end:
+            delta, pos = _varlen(data, pos)
+            tick += delta
+            if data[pos] >= 0x80:
+                status = data[pos]
+                pos += 1
+            if status == 0xFF:                      # meta: type, length, data
+                length, pos = _varlen(data, pos + 1)
+                pos += length
+                continue
+            if status in (0xF0, 0xF7):              # sysex: length, data
+                length, pos = _varlen(data, pos)
+                pos += length
+                continue
+            kind, channel = status & 0xF0, status & 0x0F
+            if kind in (0xC0, 0xD0):
+                pos += 1
+                continue
+            a, b = data[pos], data[pos + 1]
+            pos += 2
+            if kind == 0x90 and b > 0:
+                sounding.setdefault((channel, a), []).append((tick, b))
+            elif kind in (0x80, 0x90):
+                start, velocity = sounding[(channel, a)].pop(0)
+                notes.append((track, channel, a, start, tick - start, velocity))
+        pos = end
+    return sorted(notes)
+
+
+def render_bytes(arrangement, tmp, name="out.mid"):
+    compiled = midi_arranger.compile_arrangement(arrangement)
+    return compiled, Path(midi_arranger.write_midi(compiled, Path(tmp) / name)).read_bytes()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        arrangement = midi_arranger.load_arrangement(ARRANGEMENT)
+        compiled, rendered = render_bytes(arrangement, tmp)
+        assert rendered == GOLDEN.read_bytes(), f"getting_old.yaml no longer renders {GOLDEN}"
+        print(f"✅ getting_old.yaml renders byte-identical to {GOLDEN.relative_to(HERE)} ({len(rendered)} bytes)")
+
+        ours, golden = read_notes(Path(tmp) / "out.mid"), read_notes(GOLDEN)
+        assert ours == golden and len(golden) == 361
+        bars = sorted({n[3] // (960 * 4) for n in golden})
+        assert bars == list(range(60)), "every one of the 60 bars has notes"
+        print(f"✅ {len(golden)} notes identical (pitch, start, length, velocity) across {len(bars)} bars")
+
+        json_path = Path(tmp) / "getting_old.json"
+        json_path.write_text(json.dumps(arrangement))
+        _, from_json = render_bytes(midi_arranger.load_arrangement(json_path), tmp, "json.mid")
+        assert from_json == rendered
+        print("✅ the JSON form of the arrangement renders the same bytes")
+
+        # Strumming: two strokes per chord, 20 ms between strings, ramps, humanisation
+        strummed = json.loads(json.dumps(arrangement))
+        track = strummed["tracks"][0]
+        track["strum"] = {"every": 2, "pattern": ["down", "up"], "spread_ms": 20, "velocity_slope": 4}
+        track["sustain"] = 0.9
+        plain = midi_arranger.compile_arrangement(strummed).tracks[0]
+        g_notes = len(arrangement["voicings"]["open"]["G"])
+        first = slice(0, g_notes)                    # bar 1, beat 1: G downstroke
+        second = slice(g_notes, 2 * g_notes)         # bar 1, beat 3: G upstroke
+        spread = 20 * 73 / 60000
+        assert abs(plain.start[first][1] - spread) < 1e-9 and plain.start[first].argmin() == 0
+        assert plain.start[second].argmin() == g_notes - 1 and abs(plain.start[second][0] - (2 + (g_notes - 1) * spread)) < 1e-9
+        assert list(plain.velocity[first]) == [85 + 4 * i for i in range(g_notes)]
+        assert list(plain.velocity[second]) == [85 - 4 * (g_notes - 1 - i) for i in range(g_notes)]
+        assert abs(plain.start[first][-1] + plain.duration[first][-1] - 1.8) < 1e-9
+        print("✅ strum: 20 ms between strings, downstrokes low to high with rising velocity, upstrokes reversed")
+
+        track["humanize"] = {"timing_ms": 8, "velocity": 6, "seed": 11}
+        human = midi_arranger.compile_arrangement(strummed).tracks[0]
+        drift_ms = abs(human.start - plain.start).max() / (73 / 60000)
+        assert 0 < drift_ms <= 8 + 1e-6 and abs(human.velocity - plain.velocity).max() <= 6
+        _, once = render_bytes(strummed, tmp, "a.mid")
+        _, again = render_bytes(strummed, tmp, "b.mid")
+        assert once == again
+        print(f"✅ humanise: timing within ±8 ms (max {drift_ms:.1f}), velocity within ±6, same seed gives the same file")
+
+        try:
+            midi_arranger.compile_arrangement({**arrangement, "form": ["verse", "chorus"],
+                                               "tracks": [{"voicings": "jazz"}]})
+        except midi_arranger.ArrangementError as e:
+            assert len(e.errors) == 2, e.errors
+            print(f"✅ bad arrangements report every problem: {'; '.join(e.errors)}")
+        else:
+            raise AssertionError("expected ArrangementError")
+
+        malformed = {**arrangement, "beats_per_bar": "x",
+                     "tracks": ["o", {**arrangement["tracks"][0], "program_changes": [{"bar": 9}]}]}
+        try:
+            midi_arranger.compile_arrangement(malformed)
+        except midi_arranger.ArrangementError as e:
+            assert len(e.errors) == 3, e.errors
+            assert [m.split()[0] for m in e.errors] == ["beats_per_bar", "tracks[0]:", "tracks[1]:"], e.errors
+            print(f"✅ malformed tracks, program changes and beats_per_bar are collected: {'; '.join(e.errors)}")
+        else:
+            raise AssertionError("expected ArrangementError")
+
+        folder = Path(tmp) / "folder"
+        folder.mkdir()
+        (folder / "getting_old.yaml").write_text(ARRANGEMENT.read_text())
+        (folder / "broken.yaml").write_text("tracks: [o]\n")
+        (folder / "odd.json").write_text(json.dumps({**arrangement, "tracks": [{**arrangement["tracks"][0], "sustain": "x"}]}))
+        rows = {Path(r[0]).name: r for r in midi_arranger.render_directory(folder, tmp, jobs=2)}
+        assert rows["getting_old.yaml"][3] is None and rows["getting_old.yaml"][2] == 361, rows
+        assert rows["broken.yaml"][3] and rows["odd.json"][3] and rows["odd.json"][1] is None, rows
+        print("✅ a folder with bad files renders the good one and reports one failed row per bad file")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,391 @@
+"""
+Declarative MIDI arrangement engine.
+
+A song is a YAML (or JSON) arrangement instead of a generate_[song].py script:
+
+    title: Getting Old
+    tempo: 73
+    beats_per_bar: 4
+    output: Getting_Old_73bpm.mid        # default: [title]_[tempo]bpm.mid
+    voicings:                            # named voicing sets: chord -> MIDI notes, low to high
+      open: {G: [43, 47, 50, 55, 59, 67], D: [50, 54, 57, 62]}
+    progressions:                        # reusable lines of [chord, beats]
+      line_a: [[G, 4], [D, 4]]
+    sections:                            # progression names or inline [chord, beats] pairs
+      verse: [line_a, line_a, [G, 2], [D, 2]]
+    form: [verse, verse]
+    tracks:
+      - voicings: open
+        program: 25                      # General MIDI program at bar 1
+        program_changes: [{bar: 9, program: 24}]
+        channel: 0
+        velocity: 85
+        sustain: 1.0                     # note length as a fraction of the strike
+        strum:
+          every: 1                       # beats between strikes (default: once per chord)
+          pattern: [down, up]            # stroke directions, cycled within each chord
+          spread_ms: 20                  # delay between strings
+          velocity_slope: 3              # per string: downstrokes ramp up, upstrokes down
+        humanize: {timing_ms: 8, velocity: 6, seed: 1}
+
+compile_arrangement() expands the form and turns every track into note arrays
+(pitch, start, duration, velocity) with numpy; write_midi() writes them with
+midiutil. Humanisation is seeded, so an arrangement always renders the same
+file. render_directory() renders a folder of arrangements in parallel.
+
+Usage:
+    python midi_arranger.py arrangements/getting_old.yaml
+    python midi_arranger.py arrangements/ --output-dir renders/ --jobs 4
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+from midiutil import MIDIFile
+
+HERE = Path(__file__).parent
+ARRANGEMENT_SUFFIXES = (".yaml", ".yml", ".json")
+DRUM_CHANNEL = 9
+STROKES = ("down", "up")
+
+
+class ArrangementError(ValueError):
+    """An arrangement that cannot be compiled (every problem found is listed in .errors)."""
+
+    def __init__(self, errors, source=None):
+        prefix = f"{source}: " if source else ""
+        super().__init__(prefix + "; ".join(errors))
+        self.errors = errors
+
+
+@dataclass
+class TrackNotes:
+    """One compiled track: parallel note arrays in insertion order."""
+    program: int
+    channel: int
+    name: str = None
+    program_changes: list = field(default_factory=list)   # (beat, program)
+    pitch: np.ndarray = None
+    start: np.ndarray = None
+    duration: np.ndarray = None
+    velocity: np.ndarray = None
+
+    def __len__(self):
+        return len(self.pitch)
+
+
+@dataclass
+class CompiledArrangement:
+    title: str
+    tempo: float
+    beats_per_bar: int
+    output: str
+    time_signature: tuple = None
+    sections: list = field(default_factory=list)   # (label, first bar, last bar), 1-based
+    tracks: list = field(default_factory=list)
+
+    @property
+    def bars(self):
+        return self.sections[-1][2] if self.sections else 0
+
+    @property
+    def note_count(self):
+        return sum(len(t) for t in self.tracks)
+
+
+# ─── Loading ───
+
+def load_arrangement(path):
+    """Parse a .yaml/.yml/.json arrangement file into a dict."""
+    path = Path(path)
+    with open(path, "r", encoding="utf-8") as f:
+        if path.suffix == ".json":
+            return json.load(f)
+        import yaml  # only needed for YAML arrangements
+        return yaml.safe_load(f)
+
+
+def _slug(title):
+    return re.sub(r"[^a-z0-9]+", "_", str(title).lower()).strip("_") or "arrangement"
+
+
+# ─── Compiling ───
+
+def _expand_form(arr, errors):
+    """The chord timeline: (chord names, beats per chord, section spans in chords)."""
+    progressions = arr.get("progressions") or {}
+    sections = arr.get("sections") or {}
+    chords, beats, spans = [], [], []
+    for name in arr.get("form") or []:
+        items = sections.get(name)
+        if items is None:
+            errors.append(f"form: unknown section {name!r}")
+            continue
+        first = len(chords)
+        for item in items:
+            pairs = progressions.get(item) if isinstance(item, str) else [item]
+            if pairs is None:
+                errors.append(f"section {name!r}: unknown progression {item!r}")
+                continue
+            for pair in pairs:
+                if (not isinstance(pair, (list, tuple)) or len(pair) != 2
+                        or not isinstance(pair[1], (int, float)) or pair[1] <= 0):
+                    errors.append(f"section {name!r}: expected [chord, beats > 0], got {pair!r}")
+                    continue
+                chords.append(str(pair[0]))
+                beats.append(float(pair[1]))
+        spans.append((name, first, len(chords)))
+    if not chords and not errors:
+        errors.append("form: no chords to play")
+    return chords, np.array(beats, dtype=np.float64), spans
+
+
+def _section_labels(spans, bar_starts, beats_per_bar):
+    """("Verse 1", first bar, last bar) per form entry; repeated sections are numbered."""
+    totals = {}
+    for name, _, _ in spans:
+        totals[name] = totals.get(name, 0) + 1
+    seen, labels = {}, []
+    for name, first, last in spans:
+        seen[name] = seen.get(name, 0) + 1
+        label = str(name).replace("_", " ").title()
+        if totals[name] > 1:
+            label = f"{label} {seen[name]}"
+        start_beat = bar_starts[first] if first < len(bar_starts) else bar_starts[-1]
+        end_beat = bar_starts[last] if last < len(bar_starts) else bar_starts[-1]
+        labels.append((label, int(start_beat // beats_per_bar) + 1, int(np.ceil(end_beat / beats_per_bar))))
+    return labels
+
+
+def _compile_track(track, index, chords, chord_starts, chord_beats, voicing_sets, tempo, beats_per_bar, errors):
+    where = f"tracks[{index}]"
+    program_changes = []
+    for change in track.get("program_changes") or []:
+        bar = change.get("bar", 1) if isinstance(change, dict) else None
+        program = change.get("program") if isinstance(change, dict) else None
+        if not isinstance(bar, int) or bar < 1 or not isinstance(program, int) or not 0 <= program <= 127:
+            errors.append(f"{where}: program change must be {{bar: >= 1, program: 0-127}}, got {change!r}")
+            return None
+        program_changes.append(((bar - 1) * beats_per_bar, program))
+    voicings = voicing_sets.get(track.get("voicings"))
+    if voicings is None:
+        errors.append(f"{where}: unknown voicing set {track.get('voicings')!r}")
+        return None
+    missing = sorted(set(chords) - set(voicings))
+    if missing:
+        errors.append(f"{where}: voicing set {track.get('voicings')!r} has no {', '.join(missing)}")
+        return None
+
+    strum = track.get("strum") or {}
+    pattern = [str(s).lower() for s in strum.get("pattern", ["down"])]
+    if not pattern or any(s not in STROKES for s in pattern):
+        errors.append(f"{where}: strum pattern must be a list of {' / '.join(STROKES)}")
+        return None
+    channel = track.get("channel", index if index < DRUM_CHANNEL else index + 1)
+
+    # Voicing table: one row per chord name, padded with -1
+    names = sorted(voicings)
+    width = max(len(voicings[n]) for n in names)
+    table = np.full((len(names), width), -1, dtype=np.int16)
+    for row, name in enumerate(names):
+        table[row, :len(voicings[name])] = voicings[name]
+    row_of = {name: row for row, name in enumerate(names)}
+    chord_rows = np.array([row_of[c] for c in chords], dtype=np.int64)
+
+    # Strikes: one per `every` beats within each chord (default: one per chord)
+    every = float(strum.get("every") or 0)
+    counts = np.ceil(chord_beats / every - 1e-9).astype(np.int64) if every > 0 else np.ones(len(chords), np.int64)
+    strike_chord = np.repeat(np.arange(len(chords)), counts)
+    within = np.arange(len(strike_chord)) - np.repeat(np.cumsum(counts) - counts, counts)
+    if every > 0:
+        strike_start = chord_starts[strike_chord] + within * every
+        chord_end = chord_starts[strike_chord] + chord_beats[strike_chord]
+        strike_len = np.minimum(every, chord_end - strike_start)
+    else:
+        strike_start = chord_starts[strike_chord]
+        strike_len = chord_beats[strike_chord]
+    is_up = np.array([s == "up" for s in pattern])[within % len(pattern)]
+
+    # Notes: every string of every strike, in voicing order (low to high)
+    pitches = table[chord_rows[strike_chord]]
+    sounding = pitches >= 0
+    strings = sounding.sum(axis=1, keepdims=True)
+    column = np.arange(width)[None, :]
+    order = np.where(is_up[:, None], strings - 1 - column, column)   # position in the stroke
+
+    beats_per_ms = tempo / 60000.0
+    offset = order * float(strum.get("spread_ms", 0)) * beats_per_ms
+    start = strike_start[:, None] + offset
+    duration = strike_len[:, None] * float(track.get("sustain", 1.0)) - offset
+    slope = float(strum.get("velocity_slope", 0))
+    velocity = float(track.get("velocity", 100)) + np.where(is_up[:, None], -slope, slope) * order
+
+    humanize = track.get("humanize") or {}
+    timing_ms, jitter = float(humanize.get("timing_ms", 0)), int(humanize.get("velocity", 0))
+    if timing_ms or jitter:
+        rng = np.random.default_rng(humanize.get("seed", index))
+        if timing_ms:
+            start = start + rng.uniform(-timing_ms, timing_ms, start.shape) * beats_per_ms
+        if jitter:
+            velocity = velocity + rng.integers(-jitter, jitter + 1, velocity.shape)
+
+    start = np.maximum(start[sounding], 0.0)
+    duration = np.maximum(duration[sounding], 1.0 / 960)
+    return TrackNotes(
+        program=int(track.get("program", 25)),
+        channel=int(channel),
+        name=track.get("name"),
+        program_changes=program_changes,
+        pitch=pitches[sounding].astype(np.int64),
+        start=start,
+        duration=duration,
+        velocity=np.clip(np.rint(velocity[sounding]), 1, 127).astype(np.int64),
+    )
+
+
+def compile_arrangement(arr, source=None):
+    """Expand an arrangement dict into per-track note arrays. Raises ArrangementError."""
+    errors = []
+    if not isinstance(arr, dict):
+        raise ArrangementError(["expected a mapping at the top level"], source)
+    tempo = arr.get("tempo")
+    if not isinstance(tempo, (int, float)) or tempo <= 0:
+        errors.append(f"tempo must be a positive number, got {tempo!r}")
+        tempo = 120
+    beats_per_bar = arr.get("beats_per_bar", 4)
+    if not isinstance(beats_per_bar, int) or beats_per_bar <= 0:
+        errors.append(f"beats_per_bar must be a positive whole number, got {beats_per_bar!r}")
+        beats_per_bar = 4
+    chords, chord_beats, spans = _expand_form(arr, errors)
+    chord_starts = np.concatenate([[0.0], np.cumsum(chord_beats)])
+
+    voicing_sets = arr.get("voicings") or {}
+    tracks = []
+    for index, track in enumerate(arr.get("tracks") or []):
+        if not isinstance(track, dict):
+            errors.append(f"tracks[{index}]: expected a mapping, got {track!r}")
+        elif chords:
+            compiled = _compile_track(track, index, chords, chord_starts[:-1], chord_beats,
+                                      voicing_sets, tempo, beats_per_bar, errors)
+            if compiled is not None:
+                tracks.append(compiled)
+    if not arr.get("tracks"):
+        errors.append("tracks: at least one track is required")
+    if errors:
+        raise ArrangementError(errors, source)
+
+    title = arr.get("title") or "Untitled"
+    time_signature = arr.get("time_signature")
+    return CompiledArrangement(
+        title=title,
+        tempo=tempo,
+        beats_per_bar=beats_per_bar,
+        output=arr.get("output") or f"{_slug(title)}_{tempo:g}bpm.mid",
+        time_signature=tuple(time_signature) if time_signature else None,
+        sections=_section_labels(spans, chord_starts, beats_per_bar),
+        tracks=tracks,
+    )
+
+
+# ─── Writing ───
+
+def write_midi(compiled, output):
+    """Write a compiled arrangement as a format 1 MIDI file; returns the path."""
+    midi = MIDIFile(len(compiled.tracks))
+    midi.addTempo(0, 0, compiled.tempo)
+    if compiled.time_signature:
+        numerator, denominator = compiled.time_signature
+        midi.addTimeSignature(0, 0, numerator, int(np.log2(denominator)), 24)
+    for i, track in enumerate(compiled.tracks):
+        if track.name:
+            midi.addTrackName(i, 0, track.name)
+        midi.addProgramChange(i, track.channel, 0, track.program)
+        for beat, program in track.program_changes:
+            midi.addProgramChange(i, track.channel, beat, program)
+        for pitch, start, duration, velocity in zip(track.pitch.tolist(), track.start.tolist(),
+                                                    track.duration.tolist(), track.velocity.tolist()):
+            midi.addNote(i, track.channel, pitch, start, duration, velocity)
+    with open(output, "wb") as f:
+        midi.writeFile(f)
+    return output
+
+
+def render(path, output_dir=None):
+    """Load, compile and write one arrangement file; returns the compiled arrangement and output path."""
+    path = Path(path)
+    compiled = compile_arrangement(load_arrangement(path), source=path.name)
+    output = Path(output_dir or HERE) / compiled.output
+    write_midi(compiled, output)
+    return compiled, output
+
+
+def _render_job(job):
+    path, output_dir = job
+    try:
+        compiled, output = render(path, output_dir)
+        return str(path), str(output), compiled.note_count, None
+    except Exception as e:   # one bad file is one failed row, not a failed batch
+        message = str(e) if isinstance(e, (ArrangementError, OSError)) else f"{type(e).__name__}: {e}"
+        return str(path), None, 0, message
+
+
+def render_directory(directory, output_dir=None, jobs=None):
+    """Render every arrangement in a directory, in parallel; returns (path, output, notes, error) per file."""
+    paths = sorted(p for p in Path(directory).iterdir() if p.suffix in ARRANGEMENT_SUFFIXES)
+    work = [(p, output_dir) for p in paths]
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(work) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(work))) as pool:
+            return list(pool.map(_render_job, work, chunksize=max(1, len(work) // (jobs * 8))))
+    return [_render_job(job) for job in work]
+
+
+def describe(compiled):
+    """Structure summary lines: sections with their bars, total length."""
+    lines = [f"  {label}: bars {first}-{last}" for label, first, last in compiled.sections]
+    seconds = compiled.bars * compiled.beats_per_bar * 60 / compiled.tempo
+    lines.append(f"\nTotal: {compiled.bars} bars ({int(seconds // 60)}:{int(seconds % 60):02d})")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render MIDI from declarative arrangements")
+    parser.add_argument("source", type=Path, help="Arrangement file, or a directory of them")
+    parser.add_argument("--output-dir", "-o", type=Path, default=None,
+                        help="Where to write the .mid files (default: this folder)")
+    parser.add_argument("--jobs", "-j", type=int, default=None,
+                        help="Worker processes for a directory (default: one per CPU)")
+    args = parser.parse_args()
+    if args.output_dir:
+        args.output_dir.mkdir(parents=True, exist_ok=True)
+
+    if args.source.is_dir():
+        results = render_directory(args.source, args.output_dir, args.jobs)
+        failed = [r for r in results if r[3]]
+        for path, output, notes, error in results:
+            print(f"  ✗ {path}: {error}" if error else f"  ✓ {output} ({notes} notes)")
+        print(f"\n{len(results) - len(failed)} rendered, {len(failed)} failed")
+        return 1 if failed else 0
+
+    try:
+        compiled, output = render(args.source, args.output_dir)
+    except ArrangementError as e:
+        print(f"Errors in {args.source}:")
+        for error in e.errors:
+            print(f"  ✗ {error}")
+        return 1
+    print(f"'{compiled.title}' at {compiled.tempo:g} BPM, {compiled.note_count} notes")
+    print("\n".join(describe(compiled)))
+    print(f"\nSaved: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
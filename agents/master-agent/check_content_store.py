@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Master Agent — Content Store Check
+Runs daily_monitor's scan / detect_changes / save_contents cycle over a
+synthetic Cowork root and checks the content store:
+- MODIFIED text files get a unified diff against the stored previous version
+- large rewrites are capped; binary and unread files get no diff
+- identical files (in one agent or across agents) share one blob, and
+  unchanged files are not stored again
+- gc keeps only blobs referenced by the newest CONTENT_STORE_KEEP snapshots
+Usage: python3 check_content_store.py
+"""
+
+import contextlib
+import hashlib
+import io
+import os
+import sys
+import tempfile
+
+import daily_monitor
+from content_store import ContentStore, unified_diff
+
+
+def write(path: str, text: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def run_cycle() -> tuple[list[dict], dict]:
+    """One monitor run without the API call or email: scan, detect, save."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        previous = daily_monitor.load_previous_snapshot()
+        agents = daily_monitor.scan_all_agents(previous)
+        changes = daily_monitor.detect_changes(agents, previous, ContentStore(daily_monitor.CONTENT_STORE))
+        daily_monitor.save_snapshot(agents)
+        stats = daily_monitor.save_contents(agents)
+    return changes, stats
+
+
+def blob_count(store_dir: str) -> int:
+    return sum(len(files) for _, _, files in os.walk(os.path.join(store_dir, "blobs")))
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "Cowork")
+        daily_monitor.COWORK_ROOT = root
+        master = os.path.join(tmp, "Master Agent")
+        daily_monitor.SNAPSHOT_DB = os.path.join(master, "data", "scan_snapshot.db")
+        daily_monitor.SNAPSHOT_FILE = os.path.join(master, "data", "last_audit.json")
+        daily_monitor.CONTENT_STORE = store_dir = os.path.join(master, "data", "content_store")
+        daily_monitor.CONTENT_STORE_KEEP = 2
+
+        shared = "# Shared checklist\n" + "".join(f"- item {i}\n" for i in range(50))
+        rules = "# Rules\n" + "".join(f"{i}. Keep output under {i * 10} words.\n" for i in range(1, 80))
+        write(os.path.join(root, "Alpha", "RULES.md"), rules)
+        write(os.path.join(root, "Alpha", "checklist.md"), shared)
+        write(os.path.join(root, "Beta", "docs", "checklist.md"), shared)
+        write(os.path.join(root, "Beta", "copy of checklist.md"), shared)
+        write(os.path.join(root, "Beta", "plan.md"), "draft 1\n")
+        with open(os.path.join(root, "Beta", "cover.png"), "wb") as f:
+            f.write(os.urandom(4096))
+
+        changes, stats = run_cycle()
+        assert {c["type"] for c in changes} == {"NEW_AGENT", "ADDED"} and not any("diff" in c for c in changes)
+        # RULES.md, one checklist blob for three copies, plan.md; no blob for the PNG
+        assert stats["blobs_written"] == 3 and blob_count(store_dir) == 3, stats
+        raw = len(rules) + len(shared) + len("draft 1\n")
+        stored = sum(os.path.getsize(os.path.join(d, f)) for d, _, fs in os.walk(store_dir + "/blobs") for f in fs)
+        print(f"✅ first run: 3 blobs for 5 text files (identical copies deduplicated), "
+              f"{stored} bytes compressed from {raw}")
+
+        # An edit: diff against the stored version
+        write(os.path.join(root, "Alpha", "RULES.md"),
+              rules.replace("5. Keep output under 50 words.", "5. Keep output under 75 words.") + "80. Cite sources.\n")
+        write(os.path.join(root, "Beta", "plan.md"), "draft 2\n")
+        with open(os.path.join(root, "Beta", "cover.png"), "wb") as f:
+            f.write(os.urandom(4096))
+        changes, stats = run_cycle()
+        by_file = {c["file"]: c for c in changes}
+        diff = by_file["RULES.md"]["diff"]
+        assert "-5. Keep output under 50 words." in diff and "+5. Keep output under 75 words." in diff
+        assert "+80. Cite sources." in diff and diff.startswith("--- a/RULES.md\n+++ b/RULES.md")
+        assert "diff" not in by_file["cover.png"] and by_file["plan.md"]["diff"].endswith("-draft 1\n+draft 2")
+        assert stats["blobs_written"] == 2, stats  # only the two new versions
+        print(f"✅ MODIFIED text files carry unified diffs ({len(diff.splitlines())} lines for RULES.md); "
+              "binary changes do not")
+
+        # Caps
+        old = "".join(f"line {i}\n" for i in range(5000))
+        new = "".join(f"LINE {i}\n" for i in range(5000))
+        capped = unified_diff(old, new, "big.md", max_lines=50)
+        assert len(capped.splitlines()) == 51 and capped.splitlines()[-1].startswith("... (")
+        assert len(unified_diff(old, new, "big.md", max_bytes=2000)) <= 2000 + 40
+        print(f"✅ large rewrite capped: {capped.splitlines()[-1]}")
+
+        # GC: a third run with keep=2 drops what only the first snapshot referenced
+        write(os.path.join(root, "Beta", "plan.md"), "draft 3\n")
+        changes, stats = run_cycle()
+        store = ContentStore(store_dir)
+        assert store.get(daily_monitor.hash_and_read(os.path.join(root, "Beta", "plan.md"), True)[0]) == "draft 3\n"
+        hashes = {text: hashlib.md5(text.encode()).hexdigest()
+                  for text in ("draft 1\n", "draft 2\n", "draft 3\n")}
+        assert not store.has(hashes["draft 1\n"]) and store.has(hashes["draft 2\n"]) and store.has(hashes["draft 3\n"])
+        assert store.has(hashlib.md5(shared.encode()).hexdigest())
+        assert len(os.listdir(os.path.join(store_dir, "snapshots"))) == 2
+        assert stats["blobs_removed"] == 2, stats  # draft 1 and the first RULES.md
+        print(f"✅ gc with keep=2: {stats}; versions only the oldest snapshot used are gone")
+
+        # The previous version survives for the next diff
+        changes, _ = run_cycle()
+        assert changes == []
+        write(os.path.join(root, "Beta", "plan.md"), "draft 4\n")
+        changes, _ = run_cycle()
+        assert changes[0]["diff"].endswith("-draft 3\n+draft 4")
+        print("✅ unchanged runs keep the latest versions; the next edit still diffs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Master Agent — Prompt Packer Check
+Runs daily_monitor's scan, change detection and analyze_with_claude offline
+on a synthetic Cowork root, with the API call replaced by a stub that keeps
+the prompt, and checks the packing:
+- the prompt stays within the section budgets
+- a changed file survives however much unchanged boilerplate there is, and
+  is sent as a diff when one is available instead of its full body
+- rules files come before other files; unchanged ones are read lazily
+- JSON is compact (no indentation) and omissions are reported
+Usage: python3 check_prompt_packer.py
+"""
+
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+import daily_monitor
+from prompt_packer import PromptBudget, estimate_tokens, fit_text, pack_prompt
+
+
+class StubClient:
+    """Stands in for anthropic.Anthropic: records the request, returns a canned report."""
+    def __init__(self):
+        self.requests = []
+        self.messages = self
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs)
+        return SimpleNamespace(content=[SimpleNamespace(text="# Stub audit report")])
+
+
+def write(path: str, text: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "Cowork")
+        daily_monitor.COWORK_ROOT = root
+        daily_monitor.MASTER_AGENT_DIR = master = os.path.join(tmp, "Master Agent")
+        daily_monitor.SNAPSHOT_DB = os.path.join(master, "data", "scan_snapshot.db")
+        daily_monitor.SNAPSHOT_FILE = os.path.join(master, "data", "last_audit.json")
+        write(os.path.join(master, "data", "evaluation_criteria.md"), "# Criteria\n" + "Score clarity. " * 2000)
+        write(os.path.join(master, "data", "audit_template.md"), "# Template\n## Summary\n## Scores\n")
+
+        for a in range(6):
+            agent = os.path.join(root, f"Agent {a}")
+            write(os.path.join(agent, "RULES.md"), f"# Agent {a} rules\nRULE-MARKER-{a}\n" + "Always be precise. " * 300)
+            for i in range(200):
+                write(os.path.join(agent, "notes", f"boilerplate_{i:03d}.md"), "Unchanged boilerplate text. " * 200)
+        tracked = os.path.join(root, "Agent 3", "workflows", "pipeline.md")
+        write(tracked, "# Pipeline\n" + "".join(f"step {i}: render\n" for i in range(400)))
+
+        quiet, stdout = open(os.devnull, "w"), sys.stdout
+        sys.stdout = quiet
+        agents = daily_monitor.scan_all_agents()
+        daily_monitor.save_snapshot(agents)
+        previous = daily_monitor.load_previous_snapshot()
+        # One real change among ~1200 unchanged files
+        write(tracked, "# Pipeline\n" + "".join(f"step {i}: render\n" for i in range(400)).replace(
+            "step 200: render", "step 200: CHANGED-MARKER upscale") + "TAIL-MARKER\n")
+        agents = daily_monitor.scan_all_agents(previous)
+        changes = daily_monitor.detect_changes(agents, previous)
+        sys.stdout = stdout
+        assert [c["type"] for c in changes] == ["MODIFIED"]
+        rules = [f for a in agents for f in a["files"] if f["relative_path"] == "RULES.md"]
+        assert rules and all(f["content"] is None for f in rules)
+
+        registry = {"agents": [{"name": f"Agent {a}", "folder_name": f"Agent {a}", "status": "active",
+                                "notes": "n" * 400} for a in range(6)]}
+        registry["agents"].append({"name": "Agent 9", "folder_name": "Agent 9", "status": "new"})
+
+        client = StubClient()
+        sys.stdout = quiet
+        report = daily_monitor.analyze_with_claude(agents, changes, registry, client=client)
+        sys.stdout = stdout
+        prompt = client.requests[0]["messages"][0]["content"]
+        assert report == "# Stub audit report" and client.requests[0]["model"] == daily_monitor.CLAUDE_MODEL
+
+        budget = PromptBudget()
+        limit = (budget.registry + budget.changes + budget.key_files + budget.other_files + budget.criteria
+                 + budget.template + 1500)  # + instructions and the agents overview
+        tokens = estimate_tokens(prompt)
+        assert tokens <= limit, (tokens, limit)
+        print(f"✅ prompt ~{tokens} tokens for {sum(a['total_files'] for a in agents)} files (limit {limit})")
+
+        changes_block = prompt[prompt.index("## Changes"):prompt.index("## Agents")]
+        assert "workflows/pipeline.md" in changes_block and "step 0: render" in changes_block
+        print("✅ the changed file leads the prompt despite ~1200 unchanged files")
+
+        assert all(f"RULE-MARKER-{a}" in prompt for a in range(6))
+        assert prompt.index("RULE-MARKER-0") < prompt.index("boilerplate_")
+        assert "lower-priority item(s) omitted to fit the other files budget" in prompt
+        print("✅ every agent's (unchanged, lazily read) RULES.md included; boilerplate omitted and reported")
+
+        blocks = prompt.split("```json")[1:]
+        assert all("\n  " not in block.split("```")[0] for block in blocks) and '": ' not in prompt.split("## Evaluation")[0]
+        print("✅ compact JSON, no indentation")
+
+        assert prompt.index('"Agent 9"') < prompt.index('"Agent 0"')
+        print("✅ new agents lead the registry section")
+
+        # A diff replaces the body of a MODIFIED file
+        diff = "--- a/workflows/pipeline.md\n+++ b/workflows/pipeline.md\n@@ -201 +201 @@\n-step 200: render\n+step 200: CHANGED-MARKER upscale\n"
+        with_diff = [dict(changes[0], diff=diff)]
+        prompt, packed = pack_prompt(agents, with_diff, registry, "", "", today="2026-01-01")
+        assert "CHANGED-MARKER" in prompt and "TAIL-MARKER" not in prompt and "step 399" not in prompt
+        print(f"✅ MODIFIED file sent as its diff ({packed['changes']['tokens']} tokens), not its body")
+
+        # Budgets hold per section, and the long change is cut at its excerpt cap
+        tight = PromptBudget(changes=150, key_files=300, other_files=100, registry=100)
+        prompt, packed = pack_prompt(agents, changes, registry, "", "", budget=tight)
+        for name, cap in (("changes", 150), ("key files", 300), ("other files", 100), ("registry", 100)):
+            assert packed[name]["tokens"] <= cap, (name, packed[name])
+        assert "...(truncated)" in prompt and packed["changes"]["items"] == 1
+        assert fit_text("alpha beta gamma", 2) == "alpha "
+        print(f"✅ tight budgets respected: { {k: v['tokens'] for k, v in packed.items() if k != 'total'} }")
+        quiet.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
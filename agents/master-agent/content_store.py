@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Master Agent — Content Store
+Keeps the previous version of every scanned text file so the monitor can
+report *what* changed, not just that a hash did. Layout under
+data/content_store/:
+  blobs/<ab>/<md5>.z        zlib-compressed file content, one blob per distinct
+                            content (named by the scan's MD5, so identical files
+                            in different agents share a blob)
+  snapshots/<timestamp>.txt the blob hashes one saved scan referenced
+gc(keep) deletes the manifests beyond the newest `keep` and every blob none
+of the remaining manifests mention. unified_diff() produces the capped diffs
+that detect_changes attaches to MODIFIED files.
+"""
+
+import difflib
+import os
+import tempfile
+import zlib
+from datetime import datetime
+from typing import Iterable, Optional
+
+CONTENT_STORE_DIR = "content_store"
+DIFF_MAX_LINES = 200
+DIFF_MAX_BYTES = 20_000
+
+
+class ContentStore:
+    def __init__(self, root: str):
+        self.root = root
+        self.blob_dir = os.path.join(root, "blobs")
+        self.manifest_dir = os.path.join(root, "snapshots")
+        os.makedirs(self.blob_dir, exist_ok=True)
+        os.makedirs(self.manifest_dir, exist_ok=True)
+        self._known: Optional[set] = None
+        self.writes = 0
+
+    def _blob_path(self, file_hash: str) -> str:
+        return os.path.join(self.blob_dir, file_hash[:2], file_hash + ".z")
+
+    def known(self) -> set:
+        """Hashes with a blob (one directory listing, then kept up to date in memory)."""
+        if self._known is None:
+            self._known = {name[:-2] for sub in os.scandir(self.blob_dir) if sub.is_dir()
+                           for name in os.listdir(sub.path) if name.endswith(".z")}
+        return self._known
+
+    def has(self, file_hash: str) -> bool:
+        return file_hash in self.known()
+
+    def put(self, file_hash: str, text: str) -> bool:
+        """Store `text` under its hash unless already present; returns True if a blob was written."""
+        if self.has(file_hash):
+            return False
+        path = self._blob_path(file_hash)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(zlib.compress(text.encode("utf-8"), 6))
+        os.replace(tmp, path)
+        self.known().add(file_hash)
+        self.writes += 1
+        return True
+
+    def get(self, file_hash: str) -> Optional[str]:
+        try:
+            with open(self._blob_path(file_hash), "rb") as f:
+                return zlib.decompress(f.read()).decode("utf-8")
+        except (OSError, zlib.error):
+            return None
+
+    def record_snapshot(self, hashes: Iterable[str]) -> str:
+        """Write the manifest of blobs the snapshot just saved refers to."""
+        name = datetime.now().strftime("%Y%m%dT%H%M%S%f") + ".txt"
+        path = os.path.join(self.manifest_dir, name)
+        with open(path, "w") as f:
+            f.write("\n".join(sorted(set(hashes))))
+        return path
+
+    def gc(self, keep: int) -> dict:
+        """Keep the newest `keep` manifests and the blobs they reference; delete the rest."""
+        manifests = sorted(n for n in os.listdir(self.manifest_dir) if n.endswith(".txt"))
+        kept = manifests[-keep:] if keep > 0 else []
+        expired = manifests[:len(manifests) - len(kept)]
+        referenced = set()
+        for name in kept:
+            with open(os.path.join(self.manifest_dir, name)) as f:
+                referenced.update(line for line in f.read().splitlines() if line)
+        for name in expired:
+            os.remove(os.path.join(self.manifest_dir, name))
+        removed = 0
+        for file_hash in list(self.known()):
+            if file_hash not in referenced:
+                try:
+                    os.remove(self._blob_path(file_hash))
+                except OSError:
+                    pass
+                self.known().discard(file_hash)
+                removed += 1
+        return {"snapshots_removed": len(expired), "blobs_removed": removed, "blobs_kept": len(self.known())}
+
+
+def unified_diff(old: str, new: str, path: str, max_lines: int = DIFF_MAX_LINES,
+                 max_bytes: int = DIFF_MAX_BYTES) -> str:
+    """A unified diff of two versions of `path`, cut to `max_lines` / `max_bytes` with a note of what was left out."""
+    lines = list(difflib.unified_diff(old.splitlines(), new.splitlines(), f"a/{path}", f"b/{path}", lineterm=""))
+    out, size = [], 0
+    for line in lines:
+        if len(out) >= max_lines or size + len(line) + 1 > max_bytes:
+            break
+        out.append(line)
+        size += len(line) + 1
+    if len(out) < len(lines):
+        out.append(f"... ({len(lines) - len(out)} more diff lines)")
+    return "\n".join(out)
@@ -16,11 +16,17 @@ import json
 import hashlib
 import smtplib
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Optional
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
+from content_store import CONTENT_STORE_DIR, ContentStore, unified_diff
+from prompt_packer import pack_prompt
+from scan_snapshot import SNAPSHOT_DB_FILE, ScanSnapshot
+
 # ============================================================
 # CONFIG — Update these values for your environment
 # ============================================================
@@ -51,6 +57,19 @@ IGNORE_PATTERNS = {".DS_Store", "__pycache__", ".git", "node_modules", ".env"}
 # Max file size to read (in bytes) — skip very large files
 MAX_FILE_SIZE = 500_000  # 500KB
 
+# Text files whose content is read for analysis
+TEXT_EXTENSIONS = {
+    ".md", ".txt", ".json", ".yaml", ".yml", ".py",
+    ".js", ".csv", ".xml", ".html", ".css", ".toml",
+    ".cfg", ".ini", ".sh", ".bat", ".rules"
+}
+
+# Threads hashing/reading changed files (unchanged files are not opened at all)
+SCAN_WORKERS = int(os.environ.get("SCAN_WORKERS", "8"))
+
+# Snapshots whose text-file versions stay in the content store (for diffs)
+CONTENT_STORE_KEEP = int(os.environ.get("CONTENT_STORE_KEEP", "7"))
+
 
 # ============================================================
 # AUTO-DISCOVERY & REGISTRY MANAGEMENT
@@ -194,8 +213,43 @@ def get_file_hash(filepath: str) -> str:
         return "unreadable"
 
 
-def scan_agent_folder(agent_path: str) -> dict:
-    """Scan an agent folder and return its structure and file metadata."""
+def is_text_file(relative_path: str, size: int) -> bool:
+    return os.path.splitext(relative_path)[1].lower() in TEXT_EXTENSIONS and size < MAX_FILE_SIZE
+
+
+def hash_and_read(filepath: str, read_text: bool) -> tuple[str, Optional[str]]:
+    """MD5 of a file and, for text files, its content - from a single read."""
+    try:
+        with open(filepath, "rb") as f:
+            if read_text:
+                data = f.read()
+                text = data.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+                return hashlib.md5(data).hexdigest(), text
+            hasher = hashlib.md5()
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                hasher.update(chunk)
+            return hasher.hexdigest(), None
+    except (OSError, PermissionError):
+        return "unreadable", "[Could not read file]" if read_text else None
+
+
+def read_file_content(agent_path: str, relative_path: str) -> Optional[str]:
+    """Content of an unchanged text file, read only when the analysis actually needs it."""
+    try:
+        with open(os.path.join(agent_path, relative_path), "r", encoding="utf-8", errors="replace") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def scan_agent_folder(agent_path: str, previous: dict = None, pool: ThreadPoolExecutor = None) -> dict:
+    """
+    Scan an agent folder and return its structure and file metadata.
+
+    Files whose (size, mtime_ns, inode) match the previous snapshot keep their
+    hash and are not opened ("changed": False, "content": None); the rest are
+    hashed and, if text, read in the same pass on `pool`.
+    """
     agent_data = {
         "path": agent_path,
         "name": os.path.basename(agent_path),
@@ -203,6 +257,8 @@ def scan_agent_folder(agent_path: str) -> dict:
         "total_files": 0,
         "total_size_bytes": 0,
     }
+    previous = previous or {}
+    pending = []
 
     for root, dirs, files in os.walk(agent_path):
         # Skip ignored directories
@@ -217,56 +273,63 @@ def scan_agent_folder(agent_path: str) -> dict:
 
             try:
                 stat = os.stat(filepath)
-                file_info = {
-                    "relative_path": relative_path,
-                    "size_bytes": stat.st_size,
-                    "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                    "hash": get_file_hash(filepath),
-                    "content": None,
-                }
-
-                # Read file content if it's small enough and text-based
-                text_extensions = {
-                    ".md", ".txt", ".json", ".yaml", ".yml", ".py",
-                    ".js", ".csv", ".xml", ".html", ".css", ".toml",
-                    ".cfg", ".ini", ".sh", ".bat", ".rules"
-                }
-                ext = os.path.splitext(filename)[1].lower()
-                if ext in text_extensions and stat.st_size < MAX_FILE_SIZE:
-                    try:
-                        with open(filepath, "r", encoding="utf-8", errors="replace") as f:
-                            file_info["content"] = f.read()
-                    except (OSError, UnicodeDecodeError):
-                        file_info["content"] = "[Could not read file]"
-
-                agent_data["files"].append(file_info)
-                agent_data["total_files"] += 1
-                agent_data["total_size_bytes"] += stat.st_size
-
             except OSError:
                 continue
 
+            file_info = {
+                "relative_path": relative_path,
+                "size_bytes": stat.st_size,
+                "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                "mtime_ns": stat.st_mtime_ns,
+                "inode": stat.st_ino,
+                "hash": None,
+                "content": None,
+                "changed": True,
+            }
+            prev = previous.get(relative_path)
+            if (prev and prev.get("size") == stat.st_size and prev.get("mtime_ns") == stat.st_mtime_ns
+                    and prev.get("inode") == stat.st_ino):
+                file_info["hash"] = prev["hash"]
+                file_info["changed"] = False
+            else:
+                read_text = is_text_file(filename, stat.st_size)
+                if pool:
+                    pending.append((file_info, pool.submit(hash_and_read, filepath, read_text)))
+                else:
+                    file_info["hash"], file_info["content"] = hash_and_read(filepath, read_text)
+
+            agent_data["files"].append(file_info)
+            agent_data["total_files"] += 1
+            agent_data["total_size_bytes"] += stat.st_size
+
+    for file_info, job in pending:
+        file_info["hash"], file_info["content"] = job.result()
+
     return agent_data
 
 
-def scan_all_agents() -> list[dict]:
-    """Scan all agent folders in the Cowork root directory."""
+def scan_all_agents(previous: dict = None) -> list[dict]:
+    """Scan all agent folders in the Cowork root directory, incrementally against `previous`."""
     agents = []
+    previous = previous or {}
 
     if not os.path.exists(COWORK_ROOT):
         print(f"ERROR: Cowork root not found: {COWORK_ROOT}")
         return agents
 
-    for item in sorted(os.listdir(COWORK_ROOT)):
-        item_path = os.path.join(COWORK_ROOT, item)
-        if (
-            os.path.isdir(item_path)
-            and item not in EXCLUDED_FOLDERS
-            and item not in IGNORE_PATTERNS
-            and not item.startswith(".")
-        ):
-            print(f"  Scanning: {item}")
-            agents.append(scan_agent_folder(item_path))
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS, thread_name_prefix="scan") as pool:
+        for item in sorted(os.listdir(COWORK_ROOT)):
+            item_path = os.path.join(COWORK_ROOT, item)
+            if (
+                os.path.isdir(item_path)
+                and item not in EXCLUDED_FOLDERS
+                and item not in IGNORE_PATTERNS
+                and not item.startswith(".")
+            ):
+                agent = scan_agent_folder(item_path, previous.get(item), pool)
+                changed = sum(f["changed"] for f in agent["files"])
+                print(f"  Scanning: {item} ({agent['total_files']} files, {changed} new or changed)")
+                agents.append(agent)
 
     return agents
 
@@ -275,40 +338,68 @@ def scan_all_agents() -> list[dict]:
 # CHANGE DETECTION
 # ============================================================
 
+SNAPSHOT_DB = os.path.join(MASTER_AGENT_DIR, "data", SNAPSHOT_DB_FILE)
+# Written by earlier versions; read once if the SQLite snapshot does not exist yet
 SNAPSHOT_FILE = os.path.join(MASTER_AGENT_DIR, "data", "last_audit.json")
+CONTENT_STORE = os.path.join(MASTER_AGENT_DIR, "data", CONTENT_STORE_DIR)
 
 
 def load_previous_snapshot() -> dict:
     """Load the previous audit snapshot for comparison."""
-    if os.path.exists(SNAPSHOT_FILE):
-        try:
-            with open(SNAPSHOT_FILE, "r") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, OSError):
-            pass
-    return {}
+    store = ScanSnapshot(SNAPSHOT_DB, legacy_json=SNAPSHOT_FILE)
+    try:
+        return store.load()
+    finally:
+        store.close()
 
 
 def save_snapshot(agents: list[dict]):
     """Save current scan as snapshot for next comparison."""
-    snapshot = {}
-    for agent in agents:
-        agent_files = {}
-        for f in agent["files"]:
-            agent_files[f["relative_path"]] = {
-                "hash": f["hash"],
-                "size": f["size_bytes"],
-                "modified": f["modified"],
-            }
-        snapshot[agent["name"]] = agent_files
+    store = ScanSnapshot(SNAPSHOT_DB)
+    try:
+        store.save(agents)
+    finally:
+        store.close()
 
-    os.makedirs(os.path.dirname(SNAPSHOT_FILE), exist_ok=True)
-    with open(SNAPSHOT_FILE, "w") as f:
-        json.dump(snapshot, f, indent=2)
 
+def store_contents(agents: list[dict], store: ContentStore) -> list[str]:
+    """
+    Put every text file's current version in the content store and return
+    their hashes. Files read by this scan are stored from memory; unchanged
+    files are only read if their version is missing (e.g. the first run).
+    """
+    hashes = []
+    for agent in agents:
+        for f in agent["files"]:
+            if not is_text_file(f["relative_path"], f["size_bytes"]) or f["hash"] == "unreadable":
+                continue
+            if not store.has(f["hash"]):
+                content = f["content"]
+                if content is None:
+                    content = read_file_content(agent["path"], f["relative_path"])
+                if content is None:
+                    continue
+                store.put(f["hash"], content)
+            hashes.append(f["hash"])
+    return hashes
+
+
+def save_contents(agents: list[dict]) -> dict:
+    """Store this scan's text files, record them against the snapshot and drop versions no longer needed."""
+    store = ContentStore(CONTENT_STORE)
+    store.record_snapshot(store_contents(agents, store))
+    stats = store.gc(CONTENT_STORE_KEEP)
+    stats["blobs_written"] = store.writes
+    return stats
+
+
+def detect_changes(agents: list[dict], previous: dict, store: ContentStore = None) -> list[dict]:
+    """
+    Compare current scan against previous snapshot to detect changes.
 
-def detect_changes(agents: list[dict], previous: dict) -> list[dict]:
-    """Compare current scan against previous snapshot to detect changes."""
+    With a content store, MODIFIED text files whose previous version was
+    stored carry a unified "diff" (capped, see content_store.py).
+    """
     changes = []
 
     for agent in agents:
@@ -340,12 +431,16 @@ def detect_changes(agents: list[dict], previous: dict) -> list[dict]:
         for path in curr_files:
             if path in prev_files:
                 if curr_files[path]["hash"] != prev_files[path]["hash"]:
-                    changes.append({
+                    change = {
                         "agent": agent_name,
                         "file": path,
                         "type": "MODIFIED",
                         "details": f"Hash changed (modified: {curr_files[path]['modified']})",
-                    })
+                    }
+                    old = store.get(prev_files[path]["hash"]) if store else None
+                    if old is not None and curr_files[path]["content"] is not None:
+                        change["diff"] = unified_diff(old, curr_files[path]["content"], path)
+                    changes.append(change)
 
     # New agents
     curr_agent_names = {a["name"] for a in agents}
@@ -372,17 +467,24 @@ def detect_changes(agents: list[dict], previous: dict) -> list[dict]:
 # CLAUDE API ANALYSIS
 # ============================================================
 
-def analyze_with_claude(agents: list[dict], changes: list[dict], registry: dict) -> str:
-    """Send agent data to Claude API for analysis and get audit report."""
-    try:
-        import anthropic
-    except ImportError:
-        return "ERROR: anthropic package not installed. Run: pip3 install anthropic"
+def analyze_with_claude(agents: list[dict], changes: list[dict], registry: dict, client=None) -> str:
+    """
+    Send agent data to Claude API for analysis and get audit report.
+
+    The prompt is packed to per-section token budgets by prompt_packer. Pass
+    `client` (anything with messages.create) to run without the anthropic
+    package or an API key, e.g. a stub in tests.
+    """
+    if client is None:
+        try:
+            import anthropic
+        except ImportError:
+            return "ERROR: anthropic package not installed. Run: pip3 install anthropic"
 
-    if not ANTHROPIC_API_KEY:
-        return "ERROR: ANTHROPIC_API_KEY environment variable not set."
+        if not ANTHROPIC_API_KEY:
+            return "ERROR: ANTHROPIC_API_KEY environment variable not set."
 
-    client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+        client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
 
     # Load evaluation criteria and audit template
     eval_criteria_path = os.path.join(MASTER_AGENT_DIR, "data", "evaluation_criteria.md")
@@ -402,74 +504,16 @@ def analyze_with_claude(agents: list[dict], changes: list[dict], registry: dict)
     except OSError:
         audit_template = "(Audit template not found)"
 
-    # Build the analysis prompt
-    # Summarize agents to stay within token limits
-    agent_summaries = []
-    for agent in agents:
-        summary = {
-            "name": agent["name"],
-            "total_files": agent["total_files"],
-            "total_size_bytes": agent["total_size_bytes"],
-            "files": [],
-        }
-        for f in agent["files"]:
-            file_entry = {
-                "path": f["relative_path"],
-                "size": f["size_bytes"],
-                "modified": f["modified"],
-            }
-            # Include content for rules/config files, truncate others
-            if f["content"]:
-                if any(keyword in f["relative_path"].lower() for keyword in
-                       ["rules", "readme", "config", "skill", "instructions"]):
-                    file_entry["content"] = f["content"][:5000]
-                else:
-                    file_entry["content"] = f["content"][:1000] + "\n...(truncated)"
-            summary["files"].append(file_entry)
-        agent_summaries.append(summary)
-
-    # Identify new and removed agents for the prompt
-    new_agents = [a["name"] for a in registry.get("agents", []) if a.get("status") == "new"]
-    removed_agents = [a["name"] for a in registry.get("agents", []) if a.get("status") == "removed"]
-
-    new_agents_note = ""
-    if new_agents:
-        new_agents_note = f"\n\n## ⚠️ NEWLY DISCOVERED AGENTS (give extra attention)\nThese agents were just auto-discovered and need initial evaluation: {', '.join(new_agents)}\nFor each new agent, analyze its rules and files to determine its purpose, suggest related agents, and flag any potential overlaps with existing agents."
-    if removed_agents:
-        new_agents_note += f"\n\n## ⚠️ REMOVED AGENTS\nThese agents no longer exist on disk: {', '.join(removed_agents)}\nNote any dependencies that may be broken."
-
-    prompt = f"""You are the Master Agent — an orchestrator evaluating John's Cowork agent ecosystem.
-
-Today's date: {datetime.now().strftime('%Y-%m-%d')}
-{new_agents_note}
+    def read_content(agent: dict, f: dict) -> Optional[str]:
+        # Unchanged since the last scan, so not read yet
+        if not is_text_file(f["relative_path"], f["size_bytes"]):
+            return None
+        return read_file_content(agent["path"], f["relative_path"])
 
-## Agent Registry
-```json
-{json.dumps(registry, indent=2)[:3000]}
-```
-
-## Current Agent Scan Data
-```json
-{json.dumps(agent_summaries, indent=2)[:15000]}
-```
-
-## Changes Since Last Audit
-```json
-{json.dumps(changes, indent=2)[:3000]}
-```
-
-## Evaluation Criteria
-{eval_criteria[:3000]}
-
-## Your Task
-Generate a comprehensive daily audit report following this template structure:
-{audit_template[:2000]}
-
-Fill in ALL sections with specific, actionable analysis. Score each agent. Identify merge/split candidates.
-Be direct and specific — John wants concrete recommendations, not vague observations.
-
-If this is the first audit (no changes detected because no previous snapshot), note that and focus on
-the structural analysis of each agent based on their rules and file organization."""
+    prompt, packed = pack_prompt(agents, changes, registry, eval_criteria, audit_template, read_content)
+    print("  Prompt: ~{} tokens ({})".format(packed["total"]["tokens"], ", ".join(
+        f"{name} {s['tokens']}" + (f" / {s['omitted']} omitted" if s["omitted"] else "")
+        for name, s in packed.items() if name != "total")))
 
     try:
         message = client.messages.create(
@@ -527,16 +571,16 @@ def main():
     registry_path = os.path.join(MASTER_AGENT_DIR, "data", "agent_registry.json")
     registry = auto_update_registry(registry_path)
 
-    # Step 2: Scan all agent folders
+    # Step 2: Scan all agent folders (only files changed since the last snapshot are read)
     print("Step 2: Scanning agent folders...")
-    agents = scan_all_agents()
+    previous_snapshot = load_previous_snapshot()
+    agents = scan_all_agents(previous_snapshot)
     print(f"  Found {len(agents)} agent folders\n")
 
-    # Step 3: Detect changes
+    # Step 3: Detect changes (with diffs against the stored previous versions)
     print("Step 3: Detecting changes since last audit...")
-    previous_snapshot = load_previous_snapshot()
-    changes = detect_changes(agents, previous_snapshot)
-    print(f"  Detected {len(changes)} changes\n")
+    changes = detect_changes(agents, previous_snapshot, ContentStore(CONTENT_STORE))
+    print(f"  Detected {len(changes)} changes ({sum('diff' in c for c in changes)} with diffs)\n")
 
     # Step 4: Analyze with Claude
     print("Step 4: Sending data to Claude for analysis...")
@@ -555,7 +599,10 @@ def main():
     # Step 6: Save snapshot for next run
     print("Step 6: Saving snapshot for change detection...")
     save_snapshot(agents)
-    print(f"  Snapshot saved: {SNAPSHOT_FILE}\n")
+    print(f"  Snapshot saved: {SNAPSHOT_DB}")
+    stored = save_contents(agents)
+    print(f"  Content store: {stored['blobs_written']} new version(s), {stored['blobs_kept']} kept, "
+          f"{stored['blobs_removed']} collected\n")
 
     # Step 7: Send email
     print("Step 7: Sending email report...")
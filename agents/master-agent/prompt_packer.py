@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Master Agent — Prompt Packer
+Builds the daily monitor's analysis prompt within a token budget. Content is
+ranked before anything is cut:
+  1. changes since the last audit (with a diff, or the head of new files)
+  2. rules / readme / config / skill / instruction files
+  3. every other file (path, size, modified and a short excerpt)
+Each section has its own budget (PromptBudget), measured with a local token
+estimate (estimate_tokens), and is filled item by item in that order, so
+what is dropped is the least relevant material rather than whatever follows
+a fixed character offset. JSON is emitted without indentation, and a section
+that runs out of budget says how many items it left out.
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Optional
+
+KEY_FILE_KEYWORDS = ("rules", "readme", "config", "skill", "instructions")
+CHANGE_ORDER = {"NEW_AGENT": 0, "REMOVED_AGENT": 1, "MODIFIED": 2, "ADDED": 3, "DELETED": 4}
+
+_TOKEN_RE = re.compile(r"\w{1,4}|[^\w\s]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough BPE token count: words split into pieces of up to 4 characters, plus punctuation."""
+    return len(_TOKEN_RE.findall(text))
+
+
+def compact(value) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def fit_text(text: str, max_tokens: int) -> str:
+    """The longest prefix of `text` within `max_tokens` (cut at a token boundary)."""
+    if max_tokens <= 0:
+        return ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    for i, match in enumerate(_TOKEN_RE.finditer(text)):
+        if i == max_tokens:
+            return text[:match.start()]
+    return text
+
+
+def is_key_file(relative_path: str) -> bool:
+    return any(keyword in relative_path.lower() for keyword in KEY_FILE_KEYWORDS)
+
+
+@dataclass
+class PromptBudget:
+    """Per-section token budgets (the prompt's fixed instructions come on top)."""
+    registry: int = 1500
+    changes: int = 5000
+    key_files: int = 6000
+    other_files: int = 2000
+    criteria: int = 1200
+    template: int = 800
+    change_excerpt: int = 600      # per change: diff or head of a new file
+    key_file_excerpt: int = 1500   # per rules/config file, less when many agents share the section
+    other_file_excerpt: int = 60   # per other text file
+
+
+@dataclass
+class Section:
+    name: str
+    budget: int
+    items: list = field(default_factory=list)
+    used: int = 0
+    omitted: int = 0
+
+    def add(self, item: dict, text_key: Optional[str] = None) -> bool:
+        """Append `item` if it fits; a long `text_key` field is trimmed to the remaining budget first."""
+        cost = estimate_tokens(compact(item)) + 1
+        left = self.budget - self.used
+        if cost > left and text_key and item.get(text_key):
+            text = item[text_key]
+            overhead = estimate_tokens(compact(dict(item, **{text_key: ""}))) + 8
+            # JSON escaping (\n, quotes) makes the encoded text cost more than the raw estimate
+            ratio = (cost - overhead) / max(1, estimate_tokens(text))
+            room = int((left - overhead) / max(ratio, 1.0))
+            while room > 20 and cost > left:
+                trimmed = dict(item, **{text_key: fit_text(text, room) + "\n...(truncated)"})
+                cost = estimate_tokens(compact(trimmed)) + 1
+                room = room * 3 // 4
+            if cost <= left:
+                item = trimmed
+        if cost > left:
+            self.omitted += 1
+            return False
+        self.items.append(item)
+        self.used += cost
+        return True
+
+    def render(self) -> str:
+        body = "[" + ",".join(compact(item) for item in self.items) + "]"
+        if self.omitted:
+            body += f"\n({self.omitted} lower-priority item(s) omitted to fit the {self.name} budget)"
+        return body
+
+
+def pack_prompt(agents: list[dict], changes: list[dict], registry: dict, eval_criteria: str, audit_template: str,
+                read_content: Callable[[dict, dict], Optional[str]] = None, budget: PromptBudget = None,
+                today: str = None) -> tuple[str, dict]:
+    """
+    The analysis prompt and a per-section report {section: {"tokens", "items", "omitted"}}.
+
+    `agents` are scan_agent_folder results; a file's "content" may be None if
+    it was not read during the scan, in which case read_content(agent, file)
+    is asked for it (only for files that make it into the prompt). A change
+    may carry a "diff" (MODIFIED text files), which is sent instead of the body.
+    """
+    budget = budget or PromptBudget()
+    today = today or datetime.now().strftime('%Y-%m-%d')
+    files_by_key = {(a["name"], f["relative_path"]): (a, f) for a in agents for f in a["files"]}
+
+    def content_of(agent: dict, f: dict) -> Optional[str]:
+        if f.get("content") is not None:
+            return f["content"]
+        return read_content(agent, f) if read_content else None
+
+    # 1. Changes: agent-level first, then modifications, additions, deletions
+    changes_section = Section("changes", budget.changes)
+    changed_keys = set()
+    for change in sorted(changes, key=lambda c: (CHANGE_ORDER.get(c["type"], 9), c["agent"], c["file"])):
+        item = {k: change[k] for k in ("agent", "file", "type", "details") if k in change}
+        changed_keys.add((change["agent"], change["file"]))
+        excerpt = None
+        if change.get("diff"):
+            excerpt = ("diff", change["diff"])
+        elif change["type"] in ("ADDED", "MODIFIED") and (change["agent"], change["file"]) in files_by_key:
+            body = content_of(*files_by_key[(change["agent"], change["file"])])
+            if body:
+                excerpt = ("content", body)
+        if excerpt:
+            key, text = excerpt
+            item[key] = fit_text(text, budget.change_excerpt)
+            if len(item[key]) < len(text):
+                item[key] += "\n...(truncated)"
+        changes_section.add(item, text_key=excerpt[0] if excerpt else None)
+
+    # 2. Rules/config files, 3. everything else (changed files already went out with their change)
+    key_section = Section("key files", budget.key_files)
+    other_section = Section("other files", budget.other_files)
+    agents_overview = []
+    key_files, other_files = [], []
+    for agent in agents:
+        agents_overview.append({"name": agent["name"], "files": agent["total_files"], "bytes": agent["total_size_bytes"]})
+        for f in agent["files"]:
+            (key_files if is_key_file(f["relative_path"]) else other_files).append((agent, f))
+
+    # Shallow paths first: an agent's top-level RULES.md/README.md outrank nested ones
+    key_files.sort(key=lambda af: (af[1]["relative_path"].count("/"), af[0]["name"], af[1]["relative_path"]))
+    # Every top-level rules/readme file gets a fair share before nested ones are considered
+    top_level = sum(1 for _, f in key_files if "/" not in f["relative_path"])
+    key_excerpt = max(200, min(budget.key_file_excerpt, budget.key_files * 9 // (10 * max(1, top_level))))
+    for agent, f in key_files:
+        if key_section.used >= key_section.budget:
+            key_section.omitted += 1  # full: do not read the file at all
+            continue
+        item = {"agent": agent["name"], "path": f["relative_path"], "size": f["size_bytes"]}
+        if (agent["name"], f["relative_path"]) in changed_keys:
+            item["note"] = "changed, see Changes"
+        else:
+            body = content_of(agent, f)
+            if body:
+                item["content"] = fit_text(body, key_excerpt)
+        key_section.add(item, text_key="content")
+
+    # Recently modified first
+    other_files.sort(key=lambda af: af[1]["modified"], reverse=True)
+    for agent, f in other_files:
+        item = {"agent": agent["name"], "path": f["relative_path"], "size": f["size_bytes"],
+                "modified": f["modified"][:10]}
+        if f.get("content"):
+            item["excerpt"] = fit_text(f["content"], budget.other_file_excerpt)
+        other_section.add(item)
+
+    registry_section = Section("registry", budget.registry)
+    # New and removed agents lead so they survive the budget
+    for entry in sorted(registry.get("agents", []), key=lambda a: a.get("status") not in ("new", "removed")):
+        registry_section.add({k: v for k, v in entry.items() if v not in ("", [], None)}, text_key="notes")
+
+    criteria = fit_text(eval_criteria, budget.criteria)
+    template = fit_text(audit_template, budget.template)
+
+    new_agents = [a["name"] for a in registry.get("agents", []) if a.get("status") == "new"]
+    removed_agents = [a["name"] for a in registry.get("agents", []) if a.get("status") == "removed"]
+    new_agents_note = ""
+    if new_agents:
+        new_agents_note = f"\n\n## ⚠️ NEWLY DISCOVERED AGENTS (give extra attention)\nThese agents were just auto-discovered and need initial evaluation: {', '.join(new_agents)}\nFor each new agent, analyze its rules and files to determine its purpose, suggest related agents, and flag any potential overlaps with existing agents."
+    if removed_agents:
+        new_agents_note += f"\n\n## ⚠️ REMOVED AGENTS\nThese agents no longer exist on disk: {', '.join(removed_agents)}\nNote any dependencies that may be broken."
+
+    prompt = f"""You are the Master Agent — an orchestrator evaluating John's Cowork agent ecosystem.
+
+Today's date: {today}
+{new_agents_note}
+
+## Agent Registry
+```json
+{registry_section.render()}
+```
+
+## Changes Since Last Audit
+Highest priority. MODIFIED text files carry a unified diff, new files the start of their content.
+```json
+{changes_section.render()}
+```
+
+## Agents
+```json
+{compact(agents_overview)}
+```
+
+## Rules, README and Config Files
+```json
+{key_section.render()}
+```
+
+## Other Files (most recently modified first)
+```json
+{other_section.render()}
+```
+
+## Evaluation Criteria
+{criteria}
+
+## Your Task
+Generate a comprehensive daily audit report following this template structure:
+{template}
+
+Fill in ALL sections with specific, actionable analysis. Score each agent. Identify merge/split candidates.
+Be direct and specific — John wants concrete recommendations, not vague observations.
+
+If this is the first audit (no changes detected because no previous snapshot), note that and focus on
+the structural analysis of each agent based on their rules and file organization."""
+
+    report = {s.name: {"tokens": s.used, "items": len(s.items), "omitted": s.omitted}
+              for s in (registry_section, changes_section, key_section, other_section)}
+    report["total"] = {"tokens": estimate_tokens(prompt)}
+    return prompt, report
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Master Agent — Scan Snapshot Store
+The daily monitor's record of every scanned file (data/scan_snapshot.db):
+agent, relative path, size, mtime (ns), inode and MD5 (16 raw bytes). One
+SQLite row per file replaces the indented last_audit.json, and the stat
+columns let the next scan reuse a file's hash without reading it when
+(size, mtime_ns, inode) are unchanged. An older last_audit.json is still
+read once, so the first incremental run reports changes against it.
+"""
+
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Optional
+
+SNAPSHOT_DB_FILE = "scan_snapshot.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    agent TEXT NOT NULL, path TEXT NOT NULL, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL,
+    inode INTEGER, hash BLOB NOT NULL, PRIMARY KEY (agent, path)) WITHOUT ROWID;
+"""
+
+
+def _pack_hash(file_hash: str):
+    """Store MD5 hex digests as 16 raw bytes (markers like "unreadable" stay text)."""
+    try:
+        return bytes.fromhex(file_hash) if len(file_hash) == 32 else file_hash
+    except ValueError:
+        return file_hash
+
+
+def _unpack_hash(value) -> str:
+    return value.hex() if isinstance(value, bytes) else value
+
+
+class ScanSnapshot:
+    def __init__(self, db_path: str, legacy_json: str = None):
+        self.db_path = db_path
+        self.legacy_json = legacy_json
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def saved_at(self) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'saved_at'").fetchone()
+        return row[0] if row else None
+
+    def load(self) -> dict:
+        """{agent: {relative_path: {"hash", "size", "modified", "mtime_ns", "inode"}}} from the last save."""
+        if self.saved_at() is None:
+            return self._load_legacy()
+        snapshot = {}
+        for agent, path, size, mtime_ns, inode, file_hash in self.conn.execute(
+                "SELECT agent, path, size, mtime_ns, inode, hash FROM files"):
+            snapshot.setdefault(agent, {})[path] = {
+                "hash": _unpack_hash(file_hash), "size": size, "mtime_ns": mtime_ns, "inode": inode,
+                "modified": datetime.fromtimestamp(mtime_ns / 1e9).isoformat()}
+        for (agent,) in self.conn.execute("SELECT value FROM meta WHERE key LIKE 'agent:%'").fetchall():
+            snapshot.setdefault(agent, {})  # agents with no files still count as known
+        return snapshot
+
+    def _load_legacy(self) -> dict:
+        """The JSON snapshot written by earlier versions (hash/size/modified only, so every file is re-hashed once)."""
+        if not self.legacy_json or not os.path.exists(self.legacy_json):
+            return {}
+        try:
+            with open(self.legacy_json, "r") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return {}
+        return {agent: files for agent, files in data.items()
+                if isinstance(files, dict) and all(isinstance(v, dict) and "hash" in v for v in files.values())}
+
+    def save(self, agents: list[dict]):
+        """Replace the snapshot with this scan, in one transaction."""
+        rows = [(agent["name"], f["relative_path"], f["size_bytes"], f["mtime_ns"], f.get("inode"),
+                 _pack_hash(f["hash"])) for agent in agents for f in agent["files"]]
+        with self.conn:
+            self.conn.execute("DELETE FROM files")
+            self.conn.execute("DELETE FROM meta WHERE key LIKE 'agent:%'")
+            self.conn.executemany("INSERT INTO files VALUES (?,?,?,?,?,?)", rows)
+            self.conn.executemany("INSERT INTO meta VALUES (?, ?)", [(f"agent:{a['name']}", a["name"]) for a in agents])
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('saved_at', ?)", (datetime.now().isoformat(),))
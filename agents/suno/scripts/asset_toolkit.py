@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Suno v5.0 Asset Toolkit
+Loads the eight JSON assets once and merges, writes and validates them.
+
+Merging keys every tag by (phrase, subgenre_id, engine) in one set, so adding
+m entries to n tags is O(n + m) instead of a scan of all tags per entry.
+save_json() writes a temporary file in the same directory, fsyncs it, renames
+it over the target and fsyncs the directory: a crash leaves the old file or
+the new one, never a truncated one.
+
+validate() reports every problem in one pass:
+    structure       missing fields, wrong types, duplicate ids (prompt_bundle)
+    rule_order      constraint rules in the order the generator applies them
+    role            primary genres are engines (or regional containers),
+                    container genres are regional containers
+    reference       tags, instruments -> subgenre ids; presets -> subgenre names;
+                    aliases -> genre/subgenre/modifier names; subgenres,
+                    modifiers, constraints -> genre ids; constraint tokens -> modifiers
+    duplicate       tags repeating a (phrase, subgenre_id, engine) key (warning)
+    alias_collision an alias mapping to several canonicals (warning)
+    role_count      the expected 14 engines and 2 regional containers (warning)
+Ids and names are collected into sets first, so each check is one lookup per
+reference.
+
+Usage:
+    python asset_toolkit.py validate [--json]
+    python asset_toolkit.py merge ../assets/groove_enhancements.json [--dry-run] [--json]
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+import prompt_bundle
+from prompt_bundle import ASSET_FILES
+
+ASSETS_DIR = Path(__file__).parent.parent / "assets"
+
+RULE_ORDER = ['container_requires_subgenre', 'engine_only_primary', 'modifier_not_standalone']
+EXPECTED_ROLE_COUNTS = {'engine': 14, 'regional_container': 2}
+
+# ----------------------------
+# Loading and writing
+# ----------------------------
+def load_assets(assets_dir: Path = ASSETS_DIR) -> Dict[str, Any]:
+    """All eight assets, parsed once (missing files as empty lists, constraints as None)."""
+    return prompt_bundle.parse_assets(prompt_bundle.read_assets(assets_dir))
+
+def _fsync_dir(directory: Path) -> None:
+    if os.name != 'posix':
+        return  # directories cannot be opened for fsync on Windows; the rename is already durable there
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def write_atomic(path: Path, payload: bytes) -> None:
+    """Replace `path` with `payload` durably: temp file, fsync, rename, fsync the directory."""
+    import tempfile
+
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp, path.stat().st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(tmp, 0o644)  # mkstemp creates 0600
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    _fsync_dir(path.parent)
+
+def save_json(path: Path, data: Any) -> None:
+    """Save JSON (2-space indent, UTF-8, trailing newline) atomically."""
+    write_atomic(path, (json.dumps(data, indent=2, ensure_ascii=False) + "\n").encode('utf-8'))
+
+# ----------------------------
+# Merging
+# ----------------------------
+def tag_key(tag: Dict[str, Any]) -> Tuple[Any, Any, Any]:
+    """The identity of a tag: two tags with the same key are duplicates."""
+    return (tag.get('phrase'), tag.get('subgenre_id'), tag.get('engine'))
+
+def enhancement_entries(enhancements: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """('general' | 'subgenre', tag entry) for each descriptor of a groove enhancements file."""
+    for entry in enhancements.get('general_groove_descriptors', []):
+        # The 'global' flag is enhancement-file metadata; merged general tags have no subgenre
+        tag = {k: v for k, v in entry.items() if k != 'global'}
+        tag['subgenre_id'] = None
+        yield 'general', tag
+    for entry in enhancements.get('subgenre_specific_groove_descriptors', []):
+        yield 'subgenre', entry
+
+def merge_tags(tags: List[Dict[str, Any]], entries: Iterable[Any]) -> Iterator[Tuple[Any, bool]]:
+    """
+    Append each entry whose key is not in `tags` yet (including entries added
+    earlier in the same merge). Yields (entry, added) in order; entries may
+    be tag dicts or (label, tag dict) pairs as from enhancement_entries().
+    """
+    keys = {tag_key(t) for t in tags}
+    for entry in entries:
+        tag = entry[1] if isinstance(entry, tuple) else entry
+        key = tag_key(tag)
+        added = key not in keys
+        if added:
+            keys.add(key)
+            tags.append(tag)
+        yield entry, added
+
+# ----------------------------
+# Validation
+# ----------------------------
+def _norm(name: Any) -> str:
+    return " ".join(name.lower().split()) if isinstance(name, str) else ""
+
+def _records(assets: Dict[str, Any], key: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """(index, record) for the well-formed records of a list asset; structure checks report the rest."""
+    records = assets.get(key)
+    if isinstance(records, list):
+        for i, record in enumerate(records):
+            if isinstance(record, dict):
+                yield i, record
+
+def _in(value: Any, ids: set) -> bool:
+    try:
+        return value in ids
+    except TypeError:  # an unhashable id (a list or object) cannot match anything
+        return False
+
+def index_ids(assets: Dict[str, Any]) -> Dict[str, Any]:
+    """Id and name sets every reference is checked against."""
+    ids = {}
+    ids['genres_by_id'] = {g.get('genre_id'): g for _, g in _records(assets, 'genres')}
+    ids['subgenre_ids'] = {sg.get('subgenre_id') for _, sg in _records(assets, 'subgenres')}
+    ids['subgenre_names'] = {_norm(sg.get('name')) for _, sg in _records(assets, 'subgenres')}
+    ids['modifier_names'] = {_norm(m.get('name')) for _, m in _records(assets, 'modifiers')}
+    ids['canonical_names'] = ({_norm(g.get('name')) for g in ids['genres_by_id'].values()}
+                              | ids['subgenre_names'] | ids['modifier_names'])
+    return ids
+
+class Report:
+    """Errors and warnings collected by validate()."""
+    def __init__(self):
+        self.errors: List[Dict[str, Any]] = []
+        self.warnings: List[Dict[str, Any]] = []
+
+    def _issue(self, check: str, key: str, index, message: str) -> Dict[str, Any]:
+        return {'check': check, 'file': ASSET_FILES[key], 'index': index, 'message': message}
+
+    def error(self, check: str, key: str, index, message: str) -> None:
+        self.errors.append(self._issue(check, key, index, message))
+
+    def warning(self, check: str, key: str, index, message: str) -> None:
+        self.warnings.append(self._issue(check, key, index, message))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'ok': not self.errors, 'errors': self.errors, 'warnings': self.warnings}
+
+def check_tags(report: Report, tags: List[Dict[str, Any]], ids: Dict[str, Any], start: int = 0) -> None:
+    """Tag references and duplicate keys; `start` offsets the reported indexes (for a merged tail)."""
+    subgenre_ids = ids['subgenre_ids']
+    keys = set()
+    for i, tag in enumerate(tags, start):
+        if not isinstance(tag, dict):
+            continue
+        sid = tag.get('subgenre_id')
+        if sid is not None and not _in(sid, subgenre_ids):
+            report.error('reference', 'tags', i, f"Tag '{tag.get('phrase')}' references unknown subgenre_id: {sid}")
+        key = tag_key(tag)
+        try:
+            duplicate = key in keys
+            keys.add(key)
+        except TypeError:
+            continue
+        if duplicate:
+            report.warning('duplicate', 'tags', i,
+                           f"Duplicate tag: phrase={key[0]!r} subgenre_id={key[1]!r} engine={key[2]!r}")
+
+def validate(assets: Dict[str, Any]) -> Report:
+    """Every structural, referential and schema problem in the assets."""
+    report = Report()
+    for key, i, problem in prompt_bundle.structure_problems(assets):
+        report.error('structure', key, i, problem)
+
+    ids = index_ids(assets)
+    genres_by_id = ids['genres_by_id']
+
+    # Constraint rules, in the order the generator applies them
+    constraints = assets.get('constraints')
+    rules = constraints.get('rules', []) if isinstance(constraints, dict) else []
+    rules = [r for r in rules if isinstance(r, dict)] if isinstance(rules, list) else []
+    rule_ids = [r.get('id') for r in rules]
+    if constraints is not None and rule_ids != RULE_ORDER:
+        report.error('rule_order', 'constraints', None,
+                     f"Constraint rule order incorrect. Expected: {RULE_ORDER}, Got: {rule_ids}")
+    for i, rule in enumerate(rules):
+        for gid in rule.get('applies_to_genre_ids', []):
+            if not _in(gid, genres_by_id):
+                report.error('reference', 'constraints', i, f"Rule '{rule.get('id')}' references unknown genre_id: {gid}")
+        for token in rule.get('applies_to_tokens', []):
+            if _norm(token) not in ids['modifier_names']:
+                report.error('reference', 'constraints', i, f"Rule '{rule.get('id')}' token '{token}' is not a modifier")
+
+    # Subgenres -> genres, with the role each reference requires
+    for i, sg in _records(assets, 'subgenres'):
+        pid = sg.get('primary_genre_id')
+        if pid:
+            genre = genres_by_id.get(pid) if _in(pid, genres_by_id) else None
+            if not genre:
+                report.error('reference', 'subgenres', i, f"Subgenre '{sg.get('name')}' references unknown genre_id: {pid}")
+            elif genre.get('role') not in ('engine', 'regional_container'):
+                # Pure regional subgenres (Salsa, Bachata, ...) have their container as primary
+                report.error('role', 'subgenres', i, f"Subgenre '{sg.get('name')}' primary_genre_id={pid} "
+                                                     f"has role={genre.get('role')}, expected 'engine'")
+        cid = sg.get('container_genre_id')
+        if cid:
+            genre = genres_by_id.get(cid) if _in(cid, genres_by_id) else None
+            if not genre:
+                report.error('reference', 'subgenres', i,
+                             f"Subgenre '{sg.get('name')}' references unknown container_genre_id: {cid}")
+            elif genre.get('role') != 'regional_container':
+                report.error('role', 'subgenres', i, f"Subgenre '{sg.get('name')}' container_genre_id={cid} "
+                                                     f"has role={genre.get('role')}, expected 'regional_container'")
+
+    if isinstance(assets.get('tags'), list):
+        check_tags(report, assets['tags'], ids)
+
+    for i, inst in _records(assets, 'instruments'):
+        sid = inst.get('subgenre_id')
+        if sid and not _in(sid, ids['subgenre_ids']):
+            report.error('reference', 'instruments', i,
+                         f"Instrument '{inst.get('instrument_name')}' references unknown subgenre_id: {sid}")
+
+    for i, preset in _records(assets, 'presets'):
+        name = preset.get('subgenre')
+        if name and _norm(name) not in ids['subgenre_names']:
+            report.error('reference', 'presets', i, f"Preset '{preset.get('name')}' references unknown subgenre: {name}")
+
+    # Aliases -> canonical names; an alias shared by several canonicals resolves to whichever loads last
+    alias_to_canonical = {}
+    for i, entry in _records(assets, 'aliases'):
+        canonical = entry.get('canonical')
+        if canonical and _norm(canonical) not in ids['canonical_names']:
+            report.error('reference', 'aliases', i,
+                         f"Alias canonical '{canonical}' is not a genre, subgenre or modifier name")
+        for a in entry.get('aliases', []):
+            if isinstance(a, str):
+                alias_to_canonical.setdefault(a.lower(), []).append(canonical)
+    for alias, canonicals in alias_to_canonical.items():
+        if len(canonicals) > 1:
+            report.warning('alias_collision', 'aliases', None,
+                           f"Alias collision: '{alias}' maps to multiple canonicals: {canonicals}")
+
+    for i, modifier in _records(assets, 'modifiers'):
+        for gid in modifier.get('pairs_with_genre_ids', []):
+            if not _in(gid, genres_by_id):
+                report.error('reference', 'modifiers', i,
+                             f"Modifier '{modifier.get('name')}' pairs with unknown genre_id: {gid}")
+
+    counts = role_counts(assets)
+    for role, expected in EXPECTED_ROLE_COUNTS.items():
+        if counts.get(role, 0) != expected:
+            label = 'engine' if role == 'engine' else 'container'
+            report.warning('role_count', 'genres', None, f"Expected {expected} {label} genres, found {counts.get(role, 0)}")
+    return report
+
+def role_counts(assets: Dict[str, Any]) -> Dict[str, int]:
+    counts = {}
+    for _, genre in _records(assets, 'genres'):
+        counts[genre.get('role')] = counts.get(genre.get('role'), 0) + 1
+    return counts
+
+def format_issue(issue: Dict[str, Any]) -> str:
+    index = '' if issue['index'] is None else f"[{issue['index']}]"
+    return f"{issue['file']}{index}: {issue['message']}"
+
+def print_report(report: Report) -> None:
+    """The human-readable summary validate_schema.py has always printed."""
+    print(f"\n{'=' * 50}")
+    print("Validation complete")
+    print(f"  Errors: {len(report.errors)}")
+    print(f"  Warnings: {len(report.warnings)}")
+    if report.warnings:
+        print("\nWarnings:")
+        for w in report.warnings:
+            print(f"  ⚠️  {format_issue(w)}")
+    if report.errors:
+        print("\nErrors:")
+        for e in report.errors:
+            print(f"  ❌ {format_issue(e)}")
+    else:
+        print("\n✅ All checks passed")
+
+# ----------------------------
+# CLI
+# ----------------------------
+def main() -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Validate and merge the Suno prompt assets')
+    parser.add_argument('--assets', type=Path, default=ASSETS_DIR, help='Assets directory')
+    commands = parser.add_subparsers(dest='command', required=True)
+    check = commands.add_parser('validate', help='Check every asset file and cross-file reference')
+    check.add_argument('--json', action='store_true', help='Print the report as JSON')
+    merge = commands.add_parser('merge', help='Merge a groove enhancements file into subgenre_tags.json')
+    merge.add_argument('enhancements', type=Path)
+    merge.add_argument('--dry-run', action='store_true', help='Report what would be added without writing')
+    merge.add_argument('--json', action='store_true', help='Print the result as JSON')
+    args = parser.parse_args()
+
+    assets = load_assets(args.assets)
+    if args.command == 'validate':
+        report = validate(assets)
+        if args.json:
+            print(json.dumps({**report.to_dict(), 'counts': {k: len(v or []) for k, v in assets.items()
+                                                             if k != 'constraints'}}, indent=2))
+        else:
+            counts = role_counts(assets)
+            print(f"Genre roles: {counts.get('engine', 0)} engines, {counts.get('regional_container', 0)} containers")
+            print_report(report)
+        return 1 if report.errors else 0
+
+    with open(args.enhancements, 'r', encoding='utf-8') as f:
+        enhancements = json.load(f)
+    tags = assets['tags']
+    start = len(tags)
+    results = list(merge_tags(tags, enhancement_entries(enhancements)))
+    # New tags must reference real subgenres; problems already in the file are validate's business
+    report = Report()
+    check_tags(report, tags[start:], index_ids(assets), start)
+    added = sum(1 for _, ok in results if ok)
+    written = not args.dry_run and not report.errors and added > 0
+    if written:
+        save_json(args.assets / ASSET_FILES['tags'], tags)
+    if args.json:
+        print(json.dumps({'added': added, 'skipped': len(results) - added, 'tags': len(tags),
+                          'written': written, 'errors': report.errors}, indent=2))
+    else:
+        for (kind, tag), ok in results:
+            where = 'global' if kind == 'general' else tag.get('subgenre_id')
+            print(f"  {'+ Added' if ok else '○ Skipped (duplicate)'} [{where}] {tag.get('phrase')}")
+        for e in report.errors:
+            print(f"  ❌ {format_issue(e)}")
+        print(f"{added} added, {len(results) - added} duplicate(s) skipped, {len(tags)} tags"
+              f"{'' if written else ' (not written)'}")
+    return 1 if report.errors else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Suno v5.0 Prompt Generator - Asset Toolkit Benchmark
+Runs the asset toolkit against a synthetic subgenre_tags.json with 200k tags
+(the real genres, subgenres and other assets, tags spread over the real
+subgenre ids):
+
+    merge      the enhancement merge with the key set vs merge_groove_enhancements'
+               per-entry scan (check_duplicates), same result required
+    validate   a full one-pass validation; every injected fault must be reported
+    save       atomic save_json vs the old open('w') + json.dump, and what a
+               SIGKILL in the middle of each write leaves on disk
+
+Usage:
+    python bench_asset_toolkit.py [--tags 200000] [--entries 2000]
+"""
+
+import argparse
+import copy
+import json
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import asset_toolkit
+import merge_groove_enhancements
+from prompt_bundle import ASSET_FILES
+
+SCRIPTS_DIR = Path(__file__).parent
+ENGINES = ['Groove', 'Harmony', 'Production']
+WORDS = ("tight loose swung straight driving laid-back punchy warm dusty glossy wide dry wet "
+         "syncopated halftime shuffling rolling bright dark analog tape gated lush sparse").split()
+
+# ----------------------------
+# Synthetic data
+# ----------------------------
+def synthetic_tags(count, subgenre_ids, rng):
+    tags = []
+    for i in range(count):
+        tags.append({
+            'subgenre_id': rng.choice(subgenre_ids) if rng.random() > 0.02 else None,
+            'engine': rng.choice(ENGINES),
+            'tag_type': 'descriptor',
+            'tag_category': 'feel',
+            'phrase': f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}",
+            'weight': rng.randint(1, 5),
+            'notes': '',
+        })
+    return tags
+
+def synthetic_enhancements(tags, count, subgenre_ids, rng):
+    """Half new phrases, half copies of existing tags (which the merge must skip)."""
+    general, specific = [], []
+    for i in range(count):
+        if i % 2:
+            entry = dict(rng.choice(tags))
+        else:
+            entry = {'subgenre_id': rng.choice(subgenre_ids), 'engine': 'Groove', 'tag_type': 'descriptor',
+                     'tag_category': 'feel', 'phrase': f"new groove {i}", 'weight': 3, 'notes': ''}
+        if entry['subgenre_id'] is None or i % 5 == 0:
+            entry = {**entry, 'global': True}
+            general.append(entry)
+        else:
+            specific.append(entry)
+    return {'metadata': {}, 'general_groove_descriptors': general, 'subgenre_specific_groove_descriptors': specific}
+
+def old_merge(tags, enhancements):
+    """merge_enhancements()' loop with check_duplicates, without the printing."""
+    for kind, entry in asset_toolkit.enhancement_entries(enhancements):
+        if not merge_groove_enhancements.check_duplicates(tags, entry):
+            tags.append(entry)
+    return tags
+
+def new_merge(tags, enhancements):
+    for _ in asset_toolkit.merge_tags(tags, asset_toolkit.enhancement_entries(enhancements)):
+        pass
+    return tags
+
+def old_save(path, data):
+    """merge_groove_enhancements.save_json before it became atomic."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+# ----------------------------
+# Crash test
+# ----------------------------
+WRITER = """
+import json, sys
+sys.path.insert(0, {scripts!r})
+import asset_toolkit
+data = json.load(open(sys.argv[2]))
+print('ready', flush=True)
+sys.stdin.readline()
+if sys.argv[1] == 'old':
+    with open(sys.argv[3], 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write('\\n')
+else:
+    asset_toolkit.save_json(sys.argv[3], data)
+"""
+
+def crash_outcome(mode, source, target, delay):
+    """What `target` holds after the writer is SIGKILLed `delay` seconds into a save."""
+    original = target.read_bytes()
+    proc = subprocess.Popen([sys.executable, '-c', WRITER.format(scripts=str(SCRIPTS_DIR)), mode, str(source), str(target)],
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    proc.stdout.readline()
+    proc.stdin.write("go\n")
+    proc.stdin.flush()
+    time.sleep(delay)
+    proc.send_signal(signal.SIGKILL)
+    proc.wait()
+    content = target.read_bytes()
+    if content == original:
+        return 'old'
+    try:
+        json.loads(content)
+        return 'new'
+    except ValueError:
+        return 'TRUNCATED'
+    finally:
+        target.write_bytes(original)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Suno asset toolkit on a synthetic tag file')
+    parser.add_argument('--tags', type=int, default=200_000)
+    parser.add_argument('--entries', type=int, default=2000, help='Enhancement entries to merge')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    assets = asset_toolkit.load_assets()
+    subgenre_ids = [sg['subgenre_id'] for sg in assets['subgenres']]
+    tags = synthetic_tags(args.tags, subgenre_ids, rng)
+    enhancements = synthetic_enhancements(tags, args.entries, subgenre_ids, rng)
+    print(f"{len(tags)} synthetic tags, {args.entries} enhancement entries")
+
+    # Merge
+    merged, new_time = timed(new_merge, copy.deepcopy(tags), enhancements)
+    expected, old_time = timed(old_merge, copy.deepcopy(tags), enhancements)
+    assert merged == expected, "key-set merge differs from check_duplicates"
+    print(f"\nmerge     check_duplicates scan {old_time:8.2f} s   key set {new_time * 1000:7.1f} ms   "
+          f"({old_time / new_time:.0f}x, {len(merged) - len(tags)} added, identical result)")
+
+    # Validate: 50 tags with unknown subgenres plus a bad instrument, preset and alias
+    broken = dict(assets, tags=merged)
+    faults = 0
+    for i in rng.sample(range(len(merged)), 50):
+        merged[i] = {**merged[i], 'subgenre_id': f"SG9{i:06d}"}
+        faults += 1
+    broken['instruments'] = [*assets['instruments'], {'subgenre_id': 'SG_MISSING', 'instrument_name': 'Kazoo'}]
+    broken['presets'] = [*assets['presets'], {'name': 'Broken', 'subgenre': 'Nope Wave'}]
+    broken['aliases'] = [*assets['aliases'], {'canonical': 'Nowhere', 'aliases': []}]
+    faults += 3
+    report, validate_time = timed(asset_toolkit.validate, broken)
+    found = sum(1 for e in report.errors if e['check'] == 'reference')
+    assert found == faults, (found, faults)
+    print(f"validate  {validate_time * 1000:7.1f} ms for {len(merged)} tags + 7 other files: "
+          f"{len(report.errors)} errors ({found}/{faults} injected references found), {len(report.warnings)} warnings")
+
+    # Save and crash safety
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        target, source = tmp / ASSET_FILES['tags'], tmp / 'source.json'
+        _, old_time = timed(old_save, target, merged)
+        reference = target.read_bytes()
+        _, new_time = timed(asset_toolkit.save_json, target, merged)
+        assert target.read_bytes() == reference, "save_json output differs from the old format"
+        print(f"save      {len(reference) / 1e6:.1f} MB   open+json.dump {old_time * 1000:6.0f} ms   "
+              f"atomic+fsync {new_time * 1000:6.0f} ms   (same bytes)")
+
+        source.write_text(json.dumps(merged[: len(merged) // 2]))
+        for mode in ('old', 'new'):
+            outcomes = [crash_outcome(mode, source, target, delay) for delay in (0.02, 0.05, 0.1, 0.2, 0.5, 3.0)]
+            label = 'open+json.dump' if mode == 'old' else 'atomic save_json'
+            print(f"SIGKILL during {label:<16} file left as: {', '.join(outcomes)}")
+            if mode == 'new':
+                assert 'TRUNCATED' not in outcomes
+    print("\n✅ Merge results identical, all injected faults reported, atomic saves never truncated")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Suno v5.0 Prompt Generator - Batch Throughput Benchmark
+Generates a catalog sweep (every subgenre x seeds 1-10) three ways: one
+process per prompt (sampled and extrapolated), one --batch process, and a
+--serve process driven over stdin/stdout both pipelined and one request at a
+time.
+
+Usage:
+    python bench_batch.py [--sample 60]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPT = Path(__file__).parent / "generate_prompt.py"
+ASSETS_DIR = Path(__file__).parent.parent / "assets"
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare per-process, batch and server prompt throughput')
+    parser.add_argument('--sample', type=int, default=60, help='single-call processes to time')
+    args = parser.parse_args()
+
+    subgenres = [sg['name'] for sg in json.loads((ASSETS_DIR / 'subgenres.json').read_text())]
+    requests = [{'subgenre': name, 'seed': seed, 'instrumental': seed % 2 == 0}
+                for name in subgenres for seed in range(1, 11)]
+    print(f"{len(requests)} requests ({len(subgenres)} subgenres x seeds 1-10)")
+
+    step = max(1, len(requests) // args.sample)
+    sample = requests[::step][:args.sample]
+    start = time.perf_counter()
+    for r in sample:
+        argv = [sys.executable, str(SCRIPT), '--subgenre', r['subgenre'], '--seed', str(r['seed']), '--json']
+        subprocess.run(argv + ['--instrumental'] * r['instrumental'], capture_output=True)
+    per_process = (time.perf_counter() - start) / len(sample)
+    rows = [("process per prompt", per_process * len(requests), f"extrapolated from {len(sample)}")]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        batch_file = Path(tmp) / "sweep.jsonl"
+        batch_file.write_text("".join(json.dumps(r) + "\n" for r in requests))
+        start = time.perf_counter()
+        # Exit status 1: some subgenres fail the engine-role constraint, exactly as in single-call mode
+        subprocess.run([sys.executable, str(SCRIPT), '--batch', str(batch_file), '-o', str(Path(tmp) / "out.jsonl")],
+                       capture_output=True)
+        rows.append(("--batch (one process)", time.perf_counter() - start, "including startup"))
+        results = [json.loads(line)['result'] for line in (Path(tmp) / "out.jsonl").read_text().splitlines()]
+        assert len(results) == len(requests)
+        print(f"  ({sum('error' in r for r in results)} requests are rejected by constraints.json in every mode)")
+
+    messages = "".join(json.dumps({'jsonrpc': '2.0', 'id': i, 'method': 'generate', 'params': r}) + "\n"
+                       for i, r in enumerate(requests))
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, str(SCRIPT), '--serve'], input=messages, capture_output=True, text=True,
+                         check=True).stdout
+    rows.append(("--serve, pipelined", time.perf_counter() - start, "including startup"))
+    assert len(out.splitlines()) == len(requests)
+
+    server = subprocess.Popen([sys.executable, str(SCRIPT), '--serve'], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                              text=True, bufsize=1)
+    server.stdin.write(json.dumps({'jsonrpc': '2.0', 'id': 0, 'method': 'list_presets'}) + "\n")
+    server.stdout.readline()  # started and loaded
+    start = time.perf_counter()
+    for i, r in enumerate(requests):
+        server.stdin.write(json.dumps({'jsonrpc': '2.0', 'id': i, 'method': 'generate', 'params': r}) + "\n")
+        assert json.loads(server.stdout.readline())['id'] == i
+    rows.append(("--serve, request/response", time.perf_counter() - start, "warm server, one in flight"))
+    server.stdin.close()
+    server.wait()
+
+    for name, seconds, note in rows:
+        print(f"  {name:<26} {seconds:7.2f} s  {len(requests) / seconds:8.0f} prompts/s  ({note})")
+    print(f"  batch speedup over a process per prompt: {rows[0][1] / rows[1][1]:.0f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Suno v5.0 Prompt Generator - Cold Start Benchmark
+Times a full CLI invocation (new process per prompt) with the compiled data
+bundle against building from JSON (SUNO_PROMPT_BUNDLE=off, the old path),
+times the data load alone in-process, and checks that both paths print the
+same prompts and that a changed or corrupt asset file is never served from
+a stale bundle.
+
+Usage:
+    python bench_cold_start.py [--runs 40]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import prompt_bundle
+from generate_prompt import ASSETS_DIR, build_data
+
+SCRIPT = Path(__file__).parent / "generate_prompt.py"
+
+def cli_ms(variants, runs):
+    """{name: (median, min)} wall time of fresh processes; variants are interleaved so machine noise hits all alike."""
+    times = {name: [] for name in variants}
+    for _ in range(runs):
+        for name, (args, env) in variants.items():
+            start = time.perf_counter()
+            subprocess.run([sys.executable, *args], capture_output=True, env=env, check=True)
+            times[name].append((time.perf_counter() - start) * 1000)
+    return {name: (statistics.median(t), min(t)) for name, t in times.items()}
+
+def in_process_ms(fn, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark generator cold start with and without the bundle')
+    parser.add_argument('--runs', type=int, default=40)
+    args = parser.parse_args()
+
+    prompt_bundle.compile_bundle(ASSETS_DIR, build_data)
+    json_env = dict(os.environ, SUNO_PROMPT_BUNDLE='off')
+    presets = json.loads((ASSETS_DIR / 'presets.json').read_text())
+
+    cli = [str(SCRIPT), '--preset', presets[0]['name'], '--json']
+    results = cli_ms({'bare interpreter': (['-c', 'pass'], None),
+                      'JSON + build_indexes': (cli, json_env),
+                      'compiled bundle': (cli, None)}, args.runs)
+    print(f"CLI, one prompt per process ({args.runs} runs each, interleaved)")
+    for name, (median, fastest) in results.items():
+        print(f"  {name:<22} median {median:6.1f} ms   min {fastest:6.1f} ms")
+
+    from_json = in_process_ms(lambda: build_data(prompt_bundle.parse_assets(prompt_bundle.read_assets(ASSETS_DIR))), args.runs)
+    from_bundle = in_process_ms(lambda: prompt_bundle.load(ASSETS_DIR, build_data), args.runs)
+    print("Data load in-process")
+    print(f"  JSON + build_indexes   {from_json:6.1f} ms")
+    print(f"  bundle (hash + unpickle) {from_bundle:4.1f} ms  ({from_json / from_bundle:.1f}x)")
+
+    for p in presets:
+        for seed in ('1', '7'):
+            cmd = [str(SCRIPT), '--preset', p['name'], '--seed', seed, '--json']
+            a = subprocess.run([sys.executable, *cmd], capture_output=True, text=True, env=json_env).stdout
+            b = subprocess.run([sys.executable, *cmd], capture_output=True, text=True).stdout
+            assert a == b and a, (p['name'], seed)
+    print(f"✅ identical CLI output with and without the bundle ({len(presets)} presets x 2 seeds)")
+
+    # A copy of the assets: edit one tag, then corrupt the bundle
+    with tempfile.TemporaryDirectory() as tmp:
+        assets = Path(tmp) / "assets"
+        shutil.copytree(ASSETS_DIR, assets, ignore=shutil.ignore_patterns('backup*'))
+        data = prompt_bundle.load(assets, build_data)
+        tags = json.loads((assets / 'subgenre_tags.json').read_text())
+        tags[0]['phrase'] = 'bench edited phrase'
+        (assets / 'subgenre_tags.json').write_text(json.dumps(tags, indent=2))
+        data = prompt_bundle.load(assets, build_data)
+        assert data['tags'][0]['phrase'] == 'bench edited phrase'
+        assert prompt_bundle.read_bundle(assets / prompt_bundle.BUNDLE_FILE,
+                                         prompt_bundle.bundle_key(prompt_bundle.read_assets(assets), build_data))
+        (assets / prompt_bundle.BUNDLE_FILE).write_bytes(b'not a pickle')
+        assert prompt_bundle.load(assets, build_data)['tags'][0]['phrase'] == 'bench edited phrase'
+        (assets / 'subgenres.json').write_text(json.dumps([{'name': 'No Id'}]))
+        try:
+            prompt_bundle.compile_bundle(assets, build_data)
+            raise AssertionError("invalid assets compiled")
+        except prompt_bundle.BundleError as e:
+            assert any('missing subgenre_id, primary_genre_id' in err for err in e.errors), e.errors
+    print("✅ edited asset rebuilds the bundle; corrupt bundle falls back to JSON; invalid assets are refused")
+
+if __name__ == '__main__':
+    main()
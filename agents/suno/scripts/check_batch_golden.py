@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Suno v5.0 Prompt Generator - Batch/Server Golden Check
+Runs every preset with seeds 1-10 (plus subgenre requests with vocal,
+detail and drum options, and a few invalid requests) through single-call
+mode, one process each, and checks that batch mode (JSONL and CSV input)
+and server mode return byte-identical results: json.dumps(result, indent=2)
+equals what `generate_prompt.py --json` printed, and error results carry
+the message single-call mode printed after "Error: ".
+
+Usage:
+    python check_batch_golden.py
+"""
+
+import csv
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SCRIPT = Path(__file__).parent / "generate_prompt.py"
+ASSETS_DIR = Path(__file__).parent.parent / "assets"
+
+CLI_FLAGS = {'subgenre': '--subgenre', 'preset': '--preset', 'bpm': '--bpm', 'momentum': '--momentum',
+             'vocal_mode': '--vocal-mode', 'vocal_delivery': '--vocal-delivery', 'drum_source': '--drum-source',
+             'seed': '--seed', 'detail': '--detail'}
+CSV_FIELDS = ['id', 'subgenre', 'preset', 'bpm', 'momentum', 'instrumental', 'vocals', 'vocal_mode',
+              'vocal_delivery', 'drum_source', 'seed', 'detail']
+
+def golden_requests():
+    presets = json.loads((ASSETS_DIR / 'presets.json').read_text())
+    requests = [{'preset': p['name'], 'seed': seed} for p in presets for seed in range(1, 11)]
+    for subgenre in ('Synth Pop', 'Modern Trap', 'Salsa', 'Delta Blues'):
+        requests += [
+            {'subgenre': subgenre, 'seed': 3},
+            {'subgenre': subgenre, 'instrumental': True, 'bpm': 92, 'seed': 7},
+            {'subgenre': subgenre, 'vocals': True, 'vocal_mode': 'Rap', 'vocal_delivery': 'Raspy', 'seed': 10},
+            {'subgenre': subgenre, 'detail': 3, 'drum_source': '808', 'momentum': 'Laid-back', 'seed': 5},
+            {'subgenre': subgenre, 'detail': 1, 'seed': 2},
+        ]
+    requests += [{'subgenre': 'Not A Genre'}, {'preset': 'Missing Preset'},
+                 {'subgenre': 'Synth Pop', 'vocals': True, 'instrumental': True}]
+    for i, r in enumerate(requests):
+        r['id'] = f"r{i}"
+    return requests
+
+def single_call(request) -> str:
+    argv = [sys.executable, str(SCRIPT), '--json']
+    for key, flag in CLI_FLAGS.items():
+        if key in request:
+            argv += [flag, str(request[key])]
+    argv += ['--instrumental'] * bool(request.get('instrumental')) + ['--vocals'] * bool(request.get('vocals'))
+    return subprocess.run(argv, capture_output=True, text=True, check=True).stdout
+
+def as_single_call(result) -> str:
+    if 'error' in result:
+        return f"Error: {result['error']}\n"
+    return json.dumps(result, indent=2) + "\n"
+
+def main():
+    requests = golden_requests()
+    golden = {r['id']: single_call(r) for r in requests}
+    print(f"{len(golden)} single-call outputs ({sum(o.startswith('Error') for o in golden.values())} errors)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl = Path(tmp) / "requests.jsonl"
+        jsonl.write_text("".join(json.dumps(r) + "\n" for r in requests))
+        with open(Path(tmp) / "requests.csv", 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows({k: ('true' if v is True else v) for k, v in r.items()} for r in requests)
+
+        for source in ("requests.jsonl", "requests.csv"):
+            out = Path(tmp) / "results.jsonl"
+            subprocess.run([sys.executable, str(SCRIPT), '--batch', str(Path(tmp) / source), '-o', str(out)],
+                           capture_output=True, check=False)
+            lines = [json.loads(line) for line in out.read_text().splitlines()]
+            assert [line['id'] for line in lines] == [r['id'] for r in requests]
+            for line in lines:
+                assert as_single_call(line['result']) == golden[line['id']], (source, line['id'])
+            print(f"✅ batch mode ({source}): {len(lines)} results byte-identical to single-call mode")
+
+    messages = [{'jsonrpc': '2.0', 'id': r['id'], 'method': 'generate',
+                 'params': {k: v for k, v in r.items() if k != 'id'}} for r in requests]
+    messages.append({'jsonrpc': '2.0', 'method': 'reload'})  # notification: no response
+    messages.append({'jsonrpc': '2.0', 'id': 'bad', 'method': 'nope'})
+    server = subprocess.run([sys.executable, str(SCRIPT), '--serve'], capture_output=True, text=True, check=True,
+                            input="".join(json.dumps(m) + "\n" for m in messages) + "{not json\n")
+    responses = [json.loads(line) for line in server.stdout.splitlines()]
+    assert len(responses) == len(requests) + 2
+    for response in responses[:len(requests)]:
+        result = response.get('result') or {'error': response['error']['message']}
+        assert as_single_call(result) == golden[response['id']], response['id']
+    assert responses[-2]['error']['code'] == -32601 and responses[-1]['error']['code'] == -32700
+    print(f"✅ server mode: {len(requests)} JSON-RPC results byte-identical; unknown method and bad JSON answered")
+
+if __name__ == '__main__':
+    main()
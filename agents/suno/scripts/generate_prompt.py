@@ -7,16 +7,21 @@ Usage:
     python generate_prompt.py --subgenre "Synth Pop" --bpm 120 --instrumental
     python generate_prompt.py --subgenre "Modern Trap" --vocals --vocal-mode "Rap" --seed 3
     python generate_prompt.py --preset "80s Synth Pop"
+    python generate_prompt.py --batch album.jsonl -o prompts.jsonl   # see prompt_batch.py
+    python generate_prompt.py --serve                                # JSON-RPC on stdin/stdout
 """
 
 import json
 import argparse
 import os
 import re
+import sys
 from pathlib import Path
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
+import prompt_bundle
+
 # ----------------------------
 # Errors
 # ----------------------------
@@ -60,19 +65,12 @@ def load_json(filename):
         return json.load(f)
 
 def load_data():
-    """Load all data files and build indexes."""
-    data = {
-        'genres': load_json('genres.json') or [],
-        'subgenres': load_json('subgenres.json') or [],
-        'tags': load_json('subgenre_tags.json') or [],
-        'instruments': load_json('instruments.json') or [],
-        'presets': load_json('presets.json') or [],
-        'aliases': load_json('aliases.json') or [],
-        'constraints': load_json('constraints.json'),
-        'modifiers': load_json('modifiers.json') or []
-    }
+    """Load all data files and build indexes (from the compiled bundle when it matches the assets)."""
+    return prompt_bundle.load(ASSETS_DIR, build_data)
 
-    # Build indexes
+def build_data(assets: Dict[str, Any]) -> Dict[str, Any]:
+    """Parsed assets (keys as in prompt_bundle.ASSET_FILES) plus their indexes."""
+    data = dict(assets)
     data['idx'] = build_indexes(data)
     return data
 
@@ -100,6 +98,27 @@ def build_indexes(data: Dict[str, Any]) -> Dict[str, Any]:
         if sid:
             idx['tags_by_subgenre'].setdefault(sid, []).append(t)
 
+    # Tags by engine (lowercase) per subgenre, globals first as in get_tags_for_subgenre
+    idx['global_tags_by_engine'] = {}
+    for t in idx['global_tags']:
+        idx['global_tags_by_engine'].setdefault(t.get('engine', '').lower(), []).append(t)
+    idx['tags_by_engine'] = {}
+    for sid, tags in idx['tags_by_subgenre'].items():
+        by_engine = {engine: list(globals_) for engine, globals_ in idx['global_tags_by_engine'].items()}
+        for t in tags:
+            by_engine.setdefault(t.get('engine', '').lower(), []).append(t)
+        idx['tags_by_engine'][sid] = by_engine
+
+    # Instruments by subgenre (asset order)
+    idx['instruments_by_subgenre'] = {}
+    for i in data['instruments']:
+        idx['instruments_by_subgenre'].setdefault(i['subgenre_id'], []).append(i)
+
+    # Presets by lowercase name (first wins, like the old linear scan)
+    idx['presets_by_name_norm'] = {}
+    for p in data['presets']:
+        idx['presets_by_name_norm'].setdefault(p['name'].lower(), p)
+
     # Alias map: alias_norm -> canonical string
     idx['alias_map'] = {}
     for entry in data['aliases']:
@@ -132,12 +151,8 @@ def find_subgenre(data, name):
     return data['idx']['subgenres_by_name_norm'].get(_norm_token(name))
 
 def find_preset(data, name):
-    """Find preset by name."""
-    name_lower = name.lower()
-    for p in data['presets']:
-        if p['name'].lower() == name_lower:
-            return p
-    return None
+    """Find preset by name (case-insensitive)."""
+    return data['idx']['presets_by_name_norm'].get(name.lower())
 
 def resolve_alias(data: Dict[str, Any], token: str) -> str:
     """Resolve alias to canonical (case-insensitive)."""
@@ -205,6 +220,13 @@ def validate_constraints(
 # ----------------------------
 def get_tags_for_subgenre(data, subgenre_id, engine=None):
     """Get all tags for a subgenre (including globals), optionally filtered by engine."""
+    if engine:
+        engine = engine.lower()
+        by_engine = data['idx']['tags_by_engine'].get(subgenre_id)
+        if by_engine is None:
+            return list(data['idx']['global_tags_by_engine'].get(engine, []))
+        return list(by_engine.get(engine, []))
+
     tags = []
 
     # Add global tags
@@ -213,9 +235,6 @@ def get_tags_for_subgenre(data, subgenre_id, engine=None):
     # Add subgenre-specific tags
     tags.extend(data['idx']['tags_by_subgenre'].get(subgenre_id, []))
 
-    if engine:
-        tags = [t for t in tags if t.get('engine', '').lower() == engine.lower()]
-
     return tags
 
 def filter_tags_by_vocal_intent(tags: List[Dict[str, Any]], vocal_intent: VocalIntent) -> List[Dict[str, Any]]:
@@ -239,7 +258,7 @@ def filter_tags_by_vocal_intent(tags: List[Dict[str, Any]], vocal_intent: VocalI
 
 def get_instruments_for_subgenre(data, subgenre_id):
     """Get all instruments for a subgenre."""
-    return [i for i in data['instruments'] if i['subgenre_id'] == subgenre_id]
+    return list(data['idx']['instruments_by_subgenre'].get(subgenre_id, []))
 
 # ----------------------------
 # Selection
@@ -362,12 +381,9 @@ def generate_prompt(
     tokens.append(f"{bpm} BPM")
 
     # Get tags by engine, filtered by vocal intent
-    all_tags = get_tags_for_subgenre(data, subgenre['subgenre_id'])
-    all_tags = filter_tags_by_vocal_intent(all_tags, vocal_intent)
-
-    groove_tags = [t for t in all_tags if t.get('engine', '').lower() == 'groove']
-    harmony_tags = [t for t in all_tags if t.get('engine', '').lower() == 'harmony']
-    production_tags = [t for t in all_tags if t.get('engine', '').lower() == 'production']
+    groove_tags = filter_tags_by_vocal_intent(get_tags_for_subgenre(data, subgenre['subgenre_id'], 'groove'), vocal_intent)
+    harmony_tags = filter_tags_by_vocal_intent(get_tags_for_subgenre(data, subgenre['subgenre_id'], 'harmony'), vocal_intent)
+    production_tags = filter_tags_by_vocal_intent(get_tags_for_subgenre(data, subgenre['subgenre_id'], 'production'), vocal_intent)
 
     # Select tags based on seed and detail level
     tag_count = {1: 1, 2: 2, 3: 3}.get(detail_level, 2)
@@ -457,7 +473,86 @@ def generate_from_preset(data, preset_name, seed_override=None):
         detail_level=preset.get('detaillevel', 2)
     )
 
-def main():
+# ----------------------------
+# Requests (single-call, batch and server modes)
+# ----------------------------
+REQUEST_DEFAULTS = {
+    'subgenre': None,
+    'preset': None,
+    'bpm': None,
+    'momentum': None,
+    'instrumental': False,
+    'vocals': False,
+    'vocal_mode': None,
+    'vocal_delivery': None,
+    'drum_source': None,
+    'seed': 1,
+    'detail': 2,
+}
+REQUEST_ALIASES = {'detail_level': 'detail', 'vocal-mode': 'vocal_mode', 'vocal-delivery': 'vocal_delivery',
+                   'drum-source': 'drum_source'}
+
+def _request_bool(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'y')
+    return bool(value)
+
+def request_args(request: Dict[str, Any]) -> argparse.Namespace:
+    """
+    CLI-equivalent arguments for a batch/server request, so every mode runs
+    the same code path. Keys are the long option names (vocal_mode or
+    vocal-mode); "vocal_intent" may be vocals, instrumental or unspecified.
+    Empty values (CSV cells) count as unset. Raises ValueError.
+    """
+    args = dict(REQUEST_DEFAULTS)
+    for key, value in request.items():
+        key = REQUEST_ALIASES.get(key, key)
+        if key == 'id' or value is None or value == "":
+            continue
+        if key == 'vocal_intent':
+            intent = str(value).strip().lower()
+            if intent not in ('vocals', 'instrumental', 'unspecified'):
+                raise ValueError(f"vocal_intent must be vocals, instrumental or unspecified, not {value!r}")
+            args['vocals'] = intent == 'vocals'
+            args['instrumental'] = intent == 'instrumental'
+        elif key in ('bpm', 'seed', 'detail'):
+            try:
+                args[key] = int(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"{key} must be an integer, not {value!r}")
+        elif key in ('instrumental', 'vocals'):
+            args[key] = _request_bool(value)
+        elif key in REQUEST_DEFAULTS:
+            args[key] = str(value)
+        else:
+            raise ValueError(f"unknown request field {key!r}")
+    if args['detail'] not in (1, 2, 3):
+        raise ValueError(f"detail must be 1, 2 or 3, not {args['detail']}")
+    return argparse.Namespace(**args)
+
+def run_request(data: Dict[str, Any], args: argparse.Namespace) -> Dict[str, Any]:
+    """The result single-call mode prints for these arguments ({'error': ...} when it would print an error)."""
+    if args.instrumental and args.vocals:
+        return {'error': "cannot use both --vocals and --instrumental"}
+    if args.preset:
+        return generate_from_preset(data, args.preset, args.seed if args.seed != 1 else None)
+    if args.subgenre:
+        return generate_prompt(
+            data,
+            subgenre_name=args.subgenre,
+            bpm=args.bpm,
+            momentum=args.momentum,
+            instrumental=args.instrumental,
+            vocals=args.vocals,
+            vocal_mode=args.vocal_mode,
+            vocal_delivery=args.vocal_delivery,
+            drum_source=args.drum_source,
+            seed=args.seed,
+            detail_level=args.detail
+        )
+    return {'error': "request needs a subgenre or a preset"}
+
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description='Generate Suno v5.0 prompts')
     parser.add_argument('--subgenre', '-s', help='Target subgenre name')
     parser.add_argument('--preset', '-p', help='Use a preset configuration')
@@ -475,7 +570,13 @@ def main():
     parser.add_argument('--list-subgenres', action='store_true', help='List all subgenres')
     parser.add_argument('--list-presets', action='store_true', help='List all presets')
     parser.add_argument('--list-genres', action='store_true', help='List all genres with roles')
+    parser.add_argument('--batch', metavar='FILE', help='Generate one prompt per line of a JSONL or CSV file ("-" = JSONL on stdin)')
+    parser.add_argument('--output', '-o', metavar='FILE', help='Batch mode: write JSONL results here instead of stdout')
+    parser.add_argument('--serve', action='store_true', help='Answer JSON-RPC 2.0 requests on stdin/stdout, one per line')
+    return parser
 
+def main():
+    parser = build_parser()
     args = parser.parse_args()
 
     # Guard against both vocal flags
@@ -485,6 +586,14 @@ def main():
 
     data = load_data()
 
+    if args.batch or args.serve:
+        import prompt_batch
+        if args.serve:
+            prompt_batch.serve(data, sys.stdin, sys.stdout)
+        else:
+            sys.exit(prompt_batch.run_batch_file(data, args.batch, args.output))
+        return
+
     if args.list_genres:
         print("Available genres:")
         for g in sorted(data['genres'], key=lambda x: x.get('sort_order', 0)):
@@ -510,26 +619,12 @@ def main():
             print(f"  {p['name']}")
         return
 
-    if args.preset:
-        result = generate_from_preset(data, args.preset, args.seed if args.seed != 1 else None)
-    elif args.subgenre:
-        result = generate_prompt(
-            data,
-            subgenre_name=args.subgenre,
-            bpm=args.bpm,
-            momentum=args.momentum,
-            instrumental=args.instrumental,
-            vocals=args.vocals,
-            vocal_mode=args.vocal_mode,
-            vocal_delivery=args.vocal_delivery,
-            drum_source=args.drum_source,
-            seed=args.seed,
-            detail_level=args.detail
-        )
-    else:
+    if not (args.preset or args.subgenre):
         parser.print_help()
         return
 
+    result = run_request(data, args)
+
     if 'error' in result:
         print(f"Error: {result['error']}")
         return
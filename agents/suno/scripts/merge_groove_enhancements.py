@@ -2,6 +2,8 @@
 """
 Merge groove_enhancements.json into subgenre_tags.json.
 Creates a backup before modifying and validates the merge.
+Duplicates are found with asset_toolkit's (phrase, subgenre_id, engine) key
+set and the merged file is written atomically.
 """
 
 import json
@@ -9,6 +11,8 @@ import shutil
 from pathlib import Path
 from datetime import datetime
 
+import asset_toolkit
+
 ASSETS_DIR = Path(__file__).parent.parent / "assets"
 SUBGENRE_TAGS_FILE = ASSETS_DIR / "subgenre_tags.json"
 ENHANCEMENTS_FILE = ASSETS_DIR / "groove_enhancements.json"
@@ -22,10 +26,8 @@ def load_json(filepath: Path) -> list | dict:
 
 
 def save_json(filepath: Path, data: list | dict) -> None:
-    """Save JSON file with proper formatting."""
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-        f.write('\n')
+    """Save JSON file with proper formatting (atomically: a crash never leaves a truncated file)."""
+    asset_toolkit.save_json(filepath, data)
 
 
 def create_backup(filepath: Path) -> Path:
@@ -39,7 +41,10 @@ def create_backup(filepath: Path) -> Path:
 
 
 def check_duplicates(existing_tags: list, new_entry: dict) -> bool:
-    """Check if a tag entry already exists (by phrase and subgenre_id)."""
+    """Check if a tag entry already exists (by phrase and subgenre_id).
+
+    Scans every tag; merge_enhancements() checks against a key set instead.
+    """
     for tag in existing_tags:
         if (tag.get('phrase') == new_entry.get('phrase') and
             tag.get('subgenre_id') == new_entry.get('subgenre_id') and
@@ -66,16 +71,14 @@ def merge_enhancements():
         'duplicates_skipped': 0
     }
 
-    # Merge general groove descriptors (global tags)
+    # Each entry is checked against the existing tags and the ones merged before it
+    entries = list(asset_toolkit.enhancement_entries(enhancements))
+
+    # Merge general groove descriptors (global tags, no subgenre_id)
     print("\nMerging general groove descriptors...")
-    for entry in enhancements.get('general_groove_descriptors', []):
-        # Remove the 'global' flag for JSON structure (it's metadata)
-        tag_entry = {k: v for k, v in entry.items() if k != 'global'}
-        # Ensure subgenre_id is None for global tags
-        tag_entry['subgenre_id'] = None
-
-        if not check_duplicates(subgenre_tags, tag_entry):
-            subgenre_tags.append(tag_entry)
+    general = [e for kind, e in entries if kind == 'general']
+    for tag_entry, added in asset_toolkit.merge_tags(subgenre_tags, general):
+        if added:
             stats['general_added'] += 1
             print(f"  + Added global: {tag_entry['phrase']}")
         else:
@@ -84,9 +87,9 @@ def merge_enhancements():
 
     # Merge subgenre-specific groove descriptors
     print("\nMerging subgenre-specific groove descriptors...")
-    for entry in enhancements.get('subgenre_specific_groove_descriptors', []):
-        if not check_duplicates(subgenre_tags, entry):
-            subgenre_tags.append(entry)
+    specific = [e for kind, e in entries if kind == 'subgenre']
+    for entry, added in asset_toolkit.merge_tags(subgenre_tags, specific):
+        if added:
             stats['subgenre_added'] += 1
             print(f"  + Added for {entry['subgenre_id']}: {entry['phrase']}")
         else:
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Suno v5.0 Prompt Generator - Batch and Server Modes
+Generates many prompts with the data loaded once, instead of one process
+(and one asset load) per prompt.
+
+Batch mode reads requests from a JSONL or CSV file and writes one JSONL
+line per request:
+    {"id": <request id or line number>, "result": {"style", "exclude", "debug"}}
+or {"id": ..., "result": {"error": "..."}} for a request single-call mode
+would reject. "result" is exactly the dict `generate_prompt.py --json`
+prints for the same options.
+
+Server mode answers JSON-RPC 2.0 requests, one JSON object per line on
+stdin, one response per line on stdout:
+    generate       params: a request object            -> result dict
+    generate_many  params: {"requests": [...]}          -> list of result dicts
+    list_presets / list_subgenres / list_genres          -> list of names
+    reload         reread assets (bundle if fresh)      -> {"subgenres": n, ...}
+
+Request fields are the long CLI options: subgenre, preset, bpm, momentum,
+instrumental, vocals, vocal_intent, vocal_mode, vocal_delivery, drum_source,
+seed, detail (plus an optional id).
+
+Usage:
+    python generate_prompt.py --batch album.jsonl -o prompts.jsonl
+    python generate_prompt.py --batch sweep.csv
+    python generate_prompt.py --serve
+"""
+
+import csv
+import json
+import sys
+from typing import Any, Dict, Iterable, Iterator, TextIO, Tuple
+
+import generate_prompt
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+GENERATION_ERROR = 1
+
+# ----------------------------
+# Batch
+# ----------------------------
+def read_requests(stream: TextIO, fmt: str) -> Iterator[Tuple[Any, Any]]:
+    """(line number, request dict or error message) for each request in a JSONL or CSV stream."""
+    if fmt == 'csv':
+        for n, row in enumerate(csv.DictReader(stream), start=2):
+            yield n, {k.strip(): (v.strip() if isinstance(v, str) else v) for k, v in row.items() if k}
+        return
+    for n, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield n, f"invalid JSON: {e}"
+            continue
+        yield n, request if isinstance(request, dict) else "request must be a JSON object"
+
+def generate(data: Dict[str, Any], request: Dict[str, Any]) -> Dict[str, Any]:
+    """The single-call result for one request dict."""
+    try:
+        args = generate_prompt.request_args(request)
+    except ValueError as e:
+        return {'error': str(e)}
+    return generate_prompt.run_request(data, args)
+
+def run_batch(data: Dict[str, Any], requests: Iterable[Tuple[Any, Any]], out: TextIO) -> Tuple[int, int]:
+    """Write one JSONL result per request; returns (prompts generated, errors)."""
+    ok = failed = 0
+    for n, request in requests:
+        if isinstance(request, str):
+            rid, result = n, {'error': request}
+        else:
+            rid, result = request.get('id', n), generate(data, request)
+        out.write(json.dumps({'id': rid, 'result': result}) + "\n")
+        if 'error' in result:
+            failed += 1
+        else:
+            ok += 1
+    return ok, failed
+
+def run_batch_file(data: Dict[str, Any], path: str, output: str = None) -> int:
+    """Batch mode entry point; returns the process exit code (1 if any request failed)."""
+    fmt = 'csv' if path.lower().endswith('.csv') else 'jsonl'
+    source = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8', newline='' if fmt == 'csv' else None)
+    sink = open(output, 'w', encoding='utf-8') if output else sys.stdout
+    try:
+        ok, failed = run_batch(data, read_requests(source, fmt), sink)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    print(f"{ok} prompt(s) generated, {failed} error(s)", file=sys.stderr)
+    return 1 if failed else 0
+
+# ----------------------------
+# JSON-RPC server
+# ----------------------------
+def _error(rid, code: int, message: str) -> Dict[str, Any]:
+    return {'jsonrpc': '2.0', 'id': rid, 'error': {'code': code, 'message': message}}
+
+def handle(state: Dict[str, Any], message: Any):
+    """The response to one decoded JSON-RPC message (None for notifications)."""
+    if not isinstance(message, dict) or message.get('jsonrpc') != '2.0' or not isinstance(message.get('method'), str):
+        return _error(message.get('id') if isinstance(message, dict) else None, INVALID_REQUEST, "Invalid Request")
+    rid, method, params = message.get('id'), message['method'], message.get('params', {})
+    notification = 'id' not in message
+    data = state['data']
+
+    if method == 'generate':
+        if not isinstance(params, dict):
+            response = _error(rid, INVALID_PARAMS, "params must be a request object")
+        else:
+            result = generate(data, params)
+            if 'error' in result:
+                response = _error(rid, GENERATION_ERROR, result['error'])
+            else:
+                response = {'jsonrpc': '2.0', 'id': rid, 'result': result}
+    elif method == 'generate_many':
+        requests = params.get('requests') if isinstance(params, dict) else None
+        if not isinstance(requests, list) or not all(isinstance(r, dict) for r in requests):
+            response = _error(rid, INVALID_PARAMS, "params must be {\"requests\": [request objects]}")
+        else:
+            response = {'jsonrpc': '2.0', 'id': rid, 'result': [generate(data, r) for r in requests]}
+    elif method == 'list_presets':
+        response = {'jsonrpc': '2.0', 'id': rid, 'result': [p['name'] for p in data['presets']]}
+    elif method == 'list_subgenres':
+        response = {'jsonrpc': '2.0', 'id': rid, 'result': sorted(sg['name'] for sg in data['subgenres'])}
+    elif method == 'list_genres':
+        genres = sorted(data['genres'], key=lambda x: x.get('sort_order', 0))
+        response = {'jsonrpc': '2.0', 'id': rid, 'result': [g['name'] for g in genres]}
+    elif method == 'reload':
+        state['data'] = data = generate_prompt.load_data()
+        response = {'jsonrpc': '2.0', 'id': rid, 'result': {
+            'subgenres': len(data['subgenres']), 'tags': len(data['tags']), 'presets': len(data['presets'])}}
+    else:
+        response = _error(rid, METHOD_NOT_FOUND, f"Method not found: {method}")
+    return None if notification else response
+
+def serve(data: Dict[str, Any], stdin: TextIO, stdout: TextIO) -> None:
+    """Answer line-delimited JSON-RPC 2.0 messages until stdin closes."""
+    state = {'data': data}
+    for line in stdin:
+        if not line.strip():
+            continue
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError as e:
+            response = _error(None, PARSE_ERROR, f"Parse error: {e}")
+        else:
+            response = handle(state, message)
+        if response is not None:
+            stdout.write(json.dumps(response) + "\n")
+            stdout.flush()
+
+if __name__ == '__main__':
+    # Same as generate_prompt.py --serve
+    serve(generate_prompt.load_data(), sys.stdin, sys.stdout)
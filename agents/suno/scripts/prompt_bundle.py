@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Suno v5.0 Prompt Data Bundle
+Compiles the eight JSON assets and every lookup index into one pickle, so the
+generator does not re-parse JSON and rebuild indexes on each invocation.
+
+The bundle is keyed by a content hash of the asset files (plus the bundle
+format and the source of the code that builds the indexes). load() returns
+the bundle when that key matches and otherwise rebuilds from JSON and
+rewrites it, so editing an asset never serves stale data.
+
+Usage:
+    python prompt_bundle.py            # validate assets and (re)compile the bundle
+    python prompt_bundle.py --check    # report whether the bundle is fresh
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+BUNDLE_FORMAT = 1
+BUNDLE_FILE = "prompt_bundle.pickle"
+
+# data key -> asset file
+ASSET_FILES = {
+    'genres': 'genres.json',
+    'subgenres': 'subgenres.json',
+    'tags': 'subgenre_tags.json',
+    'instruments': 'instruments.json',
+    'presets': 'presets.json',
+    'aliases': 'aliases.json',
+    'constraints': 'constraints.json',
+    'modifiers': 'modifiers.json',
+}
+
+# Fields every record of a list asset must have
+REQUIRED_FIELDS = {
+    'genres': ('genre_id', 'name'),
+    'subgenres': ('subgenre_id', 'name', 'primary_genre_id'),
+    'tags': ('engine', 'phrase'),
+    'instruments': ('subgenre_id', 'instrument_name'),
+    'presets': ('name', 'subgenre'),
+    'aliases': ('canonical',),
+    'modifiers': ('name',),
+}
+
+# ----------------------------
+# Errors
+# ----------------------------
+class BundleError(Exception):
+    """Assets that cannot be compiled (every problem found is listed in .errors)."""
+    def __init__(self, errors: List[str]):
+        super().__init__(f"{len(errors)} asset error(s): " + "; ".join(errors[:5]))
+        self.errors = errors
+
+# ----------------------------
+# Assets
+# ----------------------------
+def read_assets(assets_dir: Path) -> Dict[str, bytes]:
+    """Raw bytes of each asset file (None when the file is missing)."""
+    raw = {}
+    for key, filename in ASSET_FILES.items():
+        try:
+            raw[key] = (assets_dir / filename).read_bytes()
+        except FileNotFoundError:
+            raw[key] = None
+    return raw
+
+def bundle_key(raw: Dict[str, bytes], build: Callable) -> str:
+    """Content hash of the assets, the bundle format and the index-building code."""
+    h = hashlib.sha256(f"format:{BUNDLE_FORMAT}\n".encode())
+    for key in ASSET_FILES:
+        content = raw[key]
+        h.update(f"{key}:{-1 if content is None else len(content)}\n".encode())
+        h.update(content or b"")
+    source = Path(build.__code__.co_filename)
+    if source.is_file():
+        h.update(source.read_bytes())
+    return h.hexdigest()
+
+def parse_assets(raw: Dict[str, bytes]) -> Dict[str, Any]:
+    """Parsed assets with the generator's defaults for missing files."""
+    assets = {}
+    for key, content in raw.items():
+        value = json.loads(content) if content is not None else None
+        assets[key] = value if key == 'constraints' else (value or [])
+    return assets
+
+def structure_problems(assets: Dict[str, Any]) -> Iterator[Tuple[str, Optional[int], str]]:
+    """(asset key, record index or None, problem) for each structural problem that would break prompt generation."""
+    for key, fields in REQUIRED_FIELDS.items():
+        records = assets.get(key)
+        if not isinstance(records, list):
+            yield key, None, f"expected a list, got {type(records).__name__}"
+            continue
+        for i, record in enumerate(records):
+            if not isinstance(record, dict):
+                yield key, i, "expected an object"
+                continue
+            missing = [f for f in fields if record.get(f) in (None, "")]
+            if missing and not (key == 'tags' and missing == ['subgenre_id']):
+                yield key, i, f"missing {', '.join(missing)}"
+    for key, id_field in (('genres', 'genre_id'), ('subgenres', 'subgenre_id')):
+        seen = set()
+        for record in assets.get(key) or []:
+            rid = record.get(id_field) if isinstance(record, dict) else None
+            if rid in seen:
+                yield key, None, f"duplicate {id_field} {rid}"
+            seen.add(rid)
+    constraints = assets.get('constraints')
+    if constraints is not None and not isinstance(constraints.get('rules', []), list):
+        yield 'constraints', None, "'rules' must be a list"
+
+def validate_assets(assets: Dict[str, Any]) -> List[str]:
+    """Structural problems that would break prompt generation (all of them, not just the first)."""
+    return [f"{ASSET_FILES[key]}{'' if i is None else f'[{i}]'}: {problem}"
+            for key, i, problem in structure_problems(assets)]
+
+# ----------------------------
+# Bundle
+# ----------------------------
+def _write_atomic(path: Path, payload: bytes) -> None:
+    import tempfile  # only needed when compiling; keeps the generator's cold start lean
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.chmod(tmp, 0o644)  # mkstemp creates 0600
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def compile_bundle(assets_dir: Path, build: Callable[[Dict[str, Any]], Dict[str, Any]],
+                   bundle_path: Path = None, raw: Dict[str, bytes] = None) -> Dict[str, Any]:
+    """Validate the assets, build the data dict with build(assets) and write the bundle. Raises BundleError."""
+    raw = raw if raw is not None else read_assets(assets_dir)
+    assets = parse_assets(raw)
+    errors = validate_assets(assets)
+    if errors:
+        raise BundleError(errors)
+    data = build(assets)
+    bundle = {'format': BUNDLE_FORMAT, 'key': bundle_key(raw, build), 'data': data}
+    _write_atomic(bundle_path or assets_dir / BUNDLE_FILE, pickle.dumps(bundle, protocol=pickle.HIGHEST_PROTOCOL))
+    return data
+
+def read_bundle(bundle_path: Path, key: str):
+    """The bundled data if the bundle exists and was compiled from the same key, else None."""
+    try:
+        with open(bundle_path, 'rb') as f:
+            bundle = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+    if not isinstance(bundle, dict) or bundle.get('format') != BUNDLE_FORMAT or bundle.get('key') != key:
+        return None
+    return bundle['data']
+
+def load(assets_dir: Path, build: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    The generator's data dict: from the bundle when it is fresh, otherwise
+    built from JSON (and the bundle rewritten when the assets validate and the
+    directory is writable). SUNO_PROMPT_BUNDLE=off always builds from JSON.
+    """
+    raw = read_assets(assets_dir)
+    if os.environ.get('SUNO_PROMPT_BUNDLE', '').lower() == 'off':
+        return build(parse_assets(raw))
+    bundle_path = assets_dir / BUNDLE_FILE
+    data = read_bundle(bundle_path, bundle_key(raw, build))
+    if data is not None:
+        return data
+    try:
+        return compile_bundle(assets_dir, build, bundle_path, raw)
+    except (BundleError, OSError):
+        return build(parse_assets(raw))
+
+def main():
+    import argparse
+    from generate_prompt import ASSETS_DIR, build_data
+
+    parser = argparse.ArgumentParser(description='Compile the Suno prompt assets into a bundle')
+    parser.add_argument('--check', action='store_true', help='Only report whether the bundle is fresh')
+    args = parser.parse_args()
+
+    bundle_path = ASSETS_DIR / BUNDLE_FILE
+    raw = read_assets(ASSETS_DIR)
+    key = bundle_key(raw, build_data)
+    if args.check:
+        fresh = read_bundle(bundle_path, key) is not None
+        print(f"{'✅ Bundle is fresh' if fresh else '⚠️  Bundle is missing or stale'}: {bundle_path.name} ({key[:12]})")
+        sys.exit(0 if fresh else 1)
+
+    try:
+        data = compile_bundle(ASSETS_DIR, build_data, bundle_path, raw)
+    except BundleError as e:
+        print("Errors:")
+        for error in e.errors:
+            print(f"  ❌ {error}")
+        sys.exit(1)
+    print(f"✅ Compiled {bundle_path.name} ({bundle_path.stat().st_size / 1024:.0f} KB, key {key[:12]})")
+    print(f"  {len(data['subgenres'])} subgenres, {len(data['tags'])} tags, "
+          f"{len(data['instruments'])} instruments, {len(data['presets'])} presets")
+
+if __name__ == '__main__':
+    main()